@@ -0,0 +1,51 @@
+# Copyright 2022- Python Language Server Contributors.
+
+"""Persistent storage of the rope autoimport cache."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import sys
+
+import jedi
+from rope.base.project import Project
+from rope.contrib.autoimport.sqlite import AutoImport
+
+# Seconds a connection waits for the database to be unlocked by a writer
+DATABASE_TIMEOUT = 1.0
+
+
+def database_path(root_path: str, executable: str = sys.executable) -> str:
+    """Return where the autoimport database of a workspace is saved.
+
+    Names available in an environment depend on the interpreter, so a
+    database is kept per interpreter and workspace, and reused across
+    sessions.
+    """
+    key = "\n".join([executable, os.path.abspath(root_path)])
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return os.path.join(
+        jedi.settings.cache_directory, "pylsp-autoimport", digest + ".db"
+    )
+
+
+class PersistentAutoImport(AutoImport):
+    """AutoImport saved to an on-disk database shared across sessions.
+
+    The database uses write-ahead logging so completions can read names
+    while the cache is being refreshed in another thread.
+    """
+
+    def __init__(self, project: Project, path: str, **kwargs) -> None:
+        self.database_path = path
+        super().__init__(project, memory=False, **kwargs)
+
+    def create_database_connection(
+        self, *, project: Project | None = None, memory: bool = False
+    ) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.database_path), exist_ok=True)
+        connection = sqlite3.connect(self.database_path, timeout=DATABASE_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
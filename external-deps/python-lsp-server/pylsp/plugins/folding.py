@@ -11,13 +11,25 @@
 SKIP_NODES = (tree_nodes.Module, tree_nodes.IfStmt, tree_nodes.TryStmt)
 IDENTATION_REGEX = re.compile(r"(\s+).+")
 
+GRAMMAR = parso.load_grammar()
+# Key of the folding ranges saved in Document.shared_data, also used to
+# identify the parso trees used for folding
+FOLDING_CACHE_KEY = "pylsp-folding:"
+
 
 @hookimpl
 def pylsp_folding_range(document):
     program = document.source + "\n"
     lines = program.splitlines()
-    tree = parso.parse(program)
-    ranges = __compute_folding_ranges(tree, lines)
+    # Reuse the tree of the previous version of the document, so that only
+    # the parts that changed are parsed again. The tree is kept under a
+    # different path than jedi's, because it's modified in place.
+    tree = GRAMMAR.parse(
+        program, path=FOLDING_CACHE_KEY + document.uri, diff_cache=True
+    )
+    node_cache = document.shared_data.get(FOLDING_CACHE_KEY, {})
+    ranges, node_cache = __compute_folding_ranges(tree, lines, node_cache)
+    document.shared_data[FOLDING_CACHE_KEY] = node_cache
 
     results = []
     for start_line, end_line in ranges:
@@ -178,24 +190,23 @@ def __compute_start_end_lines(node, stack):
     return start_line, end_line, stack
 
 
-def __compute_folding_ranges(tree, lines):
+def __compute_node_folding_ranges(node, next_node):
+    """
+    Compute the folding ranges of a top-level node.
+
+    Returns the ranges found and the first error node in `node`, if any,
+    after which the ranges can't be computed from the tree.
+    """
     folding_ranges = {}
-    stack = [tree]
+    stack = [node, next_node]
 
-    while len(stack) > 0:
+    while stack[0] is not next_node:
         node = stack.pop(0)
         if isinstance(node, tree_nodes.Newline):
             # Skip newline nodes
             continue
         if isinstance(node, tree_nodes.PythonErrorNode):
-            # Fallback to indentation-based (best-effort) folding
-            start_line, _ = node.start_pos
-            start_line -= 1
-            padding = [""] * start_line
-            text = "\n".join(padding + lines[start_line:]) + "\n"
-            identation_ranges = __compute_folding_ranges_identation(text)
-            folding_ranges = __merge_folding_ranges(folding_ranges, identation_ranges)
-            break
+            return folding_ranges, node
         if not isinstance(node, SKIP_NODES):
             valid = __check_if_node_is_valid(node)
             if valid:
@@ -206,5 +217,63 @@ def __compute_folding_ranges(tree, lines):
         if hasattr(node, "children"):
             stack = node.children + stack
 
+    return folding_ranges, None
+
+
+def __compute_folding_ranges(tree, lines, node_cache=None):
+    """
+    Compute the folding ranges of a module.
+
+    The ranges of each top-level node are computed separately and saved in
+    `node_cache`, relative to the node's first line and keyed by its code,
+    so nodes that didn't change since the previous version of the module
+    don't need to be traversed again. Returns the sorted ranges and the
+    cache for the nodes in `tree`.
+    """
+    node_cache = node_cache or {}
+    new_node_cache = {}
+    folding_ranges = {}
+    children = tree.children
+
+    for i, node in enumerate(children):
+        next_node = children[i + 1] if i + 1 < len(children) else None
+        node_line, node_column = node.start_pos
+        # Ranges also depend on where the next node starts
+        next_line = None if next_node is None else next_node.start_pos[0]
+        key = (
+            node.get_code(include_prefix=False),
+            node_column,
+            None if next_line is None else next_line - node_line,
+        )
+
+        node_ranges = node_cache.get(key)
+        if node_ranges is None:
+            absolute_ranges, error_node = __compute_node_folding_ranges(
+                node, next_node
+            )
+            if error_node is not None:
+                for start, end in absolute_ranges.items():
+                    folding_ranges[start] = max(folding_ranges.get(start, -1), end)
+                # Fallback to indentation-based (best-effort) folding
+                start_line, _ = error_node.start_pos
+                start_line -= 1
+                padding = [""] * start_line
+                text = "\n".join(padding + lines[start_line:]) + "\n"
+                identation_ranges = __compute_folding_ranges_identation(text)
+                folding_ranges = __merge_folding_ranges(
+                    folding_ranges, identation_ranges
+                )
+                break
+            node_ranges = [
+                (start - node_line, end - node_line)
+                for start, end in absolute_ranges.items()
+            ]
+
+        new_node_cache[key] = node_ranges
+        for start, end in node_ranges:
+            start += node_line
+            end += node_line
+            folding_ranges[start] = max(folding_ranges.get(start, -1), end)
+
     folding_ranges = sorted(folding_ranges.items())
-    return folding_ranges
+    return folding_ranges, new_node_cache
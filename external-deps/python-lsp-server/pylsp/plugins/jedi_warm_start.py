@@ -0,0 +1,246 @@
+# Copyright 2021- Python Language Server Contributors.
+
+"""Warm start jedi with the modules used in previous sessions.
+
+The top-level modules imported by the documents opened in a workspace are
+counted and saved per interpreter. After the server is initialized, the
+most used ones are completed in a background thread. This parses them and
+loads them into parso's module cache, which is shared by all jedi scripts,
+so the first completions on them don't have to wait for that. Parso keeps
+the trees of library modules on disk too, so later sessions load them
+instead of parsing the modules again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import jedi
+
+from pylsp import _utils, hookimpl, uris
+from pylsp.workspace import Document
+
+log = logging.getLogger(__name__)
+
+# Version of the statistics file format
+STATS_VERSION = 1
+
+# Seconds to wait after a document is opened before saving statistics
+SAVE_DELAY = 5.0
+
+COMMAND_STATS = "pylsp.jedi_warm_start.stats"
+
+RE_IMPORT = re.compile(r"^[ \t]*(?:from|import)[ \t]+([^\W\d]\w*)", re.MULTILINE)
+
+
+def imported_modules(source):
+    """Return the top-level modules imported in `source`."""
+    return set(RE_IMPORT.findall(source))
+
+
+class WarmStart:
+    """Module usage statistics of an interpreter and warm start state."""
+
+    def __init__(self, stats_file) -> None:
+        self.stats_file = stats_file
+        self.counts = Counter()
+        # Seconds it took to prime each module
+        self.primed = {}
+        self.failed = set()
+        # Imports of opened documents that were (not) primed when opened
+        self.hits = 0
+        self.misses = 0
+        self.thread = None
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.stats_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == STATS_VERSION:
+            self.counts.update(data.get("counts", {}))
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"version": STATS_VERSION, "counts": dict(self.counts)}
+        dirname = os.path.dirname(self.stats_file)
+        try:
+            os.makedirs(dirname, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.stats_file)
+        except OSError:
+            log.warning("Failed to save warm start statistics to %s", dirname)
+
+    @_utils.debounce(SAVE_DELAY, keyed_by="self")
+    def schedule_save(self) -> None:
+        self.save()
+
+    def record(self, source) -> None:
+        """Count the modules imported by a document that was opened."""
+        modules = imported_modules(source)
+        with self._lock:
+            self.counts.update(modules)
+            for module in modules:
+                if module in self.primed:
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        if modules:
+            self.schedule_save()
+
+    def most_used(self, limit):
+        with self._lock:
+            return [module for module, __ in self.counts.most_common(limit)]
+
+    def start(self, create_script, limit) -> None:
+        """Prime the most used modules in a background thread."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(
+            target=self.prime,
+            args=(create_script, self.most_used(limit)),
+            name="pylsp-jedi-warm-start",
+            daemon=True,
+        )
+        self.thread.start()
+
+    def prime(self, create_script, modules) -> None:
+        for module in modules:
+            if module in self.primed or module in self.failed:
+                continue
+            start = time.perf_counter()
+            try:
+                script = create_script(f"import {module}\n{module}.")
+                script.complete(2, len(module) + 1)
+            except Exception:  # pylint: disable=broad-except
+                log.debug("Failed to prime %s", module, exc_info=True)
+                self.failed.add(module)
+                continue
+            self.primed[module] = time.perf_counter() - start
+            log.debug("Primed %s in %.2fs", module, self.primed[module])
+
+    def to_dict(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "primed": {
+                    module: round(seconds, 3) for module, seconds in self.primed.items()
+                },
+                "failed": sorted(self.failed),
+                "priming": self.thread is not None and self.thread.is_alive(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            }
+
+
+# Warm start state by interpreter
+_warm_starts = {}
+
+
+def _stats_file(executable):
+    digest = hashlib.sha1(executable.encode("utf-8")).hexdigest()
+    return os.path.join(
+        jedi.settings.cache_directory, "pylsp-warm-start", digest + ".json"
+    )
+
+
+def _script_factory(config, workspace):
+    """
+    Return the interpreter used by jedi and a function that creates scripts
+    to prime it.
+
+    Scripts are created with their own environment, so they don't share the
+    subprocess used by jedi to inspect compiled modules with the scripts
+    used to answer requests in the main thread.
+    """
+    path = os.path.join(workspace.root_path, "__pylsp_warm_start__.py")
+    document = Document(uris.from_fs_path(path), workspace, source="")
+    jedi_settings = config.plugin_settings("jedi")
+    environment_path = jedi_settings.get("environment")
+    if environment_path and os.name != "nt":
+        environment_path = os.path.expanduser(environment_path)
+    env_vars = jedi_settings.get("env_vars")
+    if env_vars is None:
+        env_vars = os.environ.copy()
+    env_vars.pop("PYTHONPATH", None)
+
+    environment = document.get_enviroment(environment_path, env_vars=env_vars)
+    executable = environment.executable
+    primer = {}
+
+    def create_script(code):
+        if not primer:
+            primer["environment"] = jedi.create_environment(
+                executable, safe=False, env_vars=env_vars
+            )
+            sys_path = document.sys_path(
+                environment_path,
+                env_vars,
+                jedi_settings.get("prioritize_extra_paths"),
+                jedi_settings.get("extra_paths") or [],
+            )
+            primer["project"] = jedi.Project(
+                path=workspace.root_path, sys_path=sys_path
+            )
+        return jedi.Script(code=code, path=path, **primer)
+
+    return executable, create_script
+
+
+def get_warm_start(config, workspace):
+    executable, create_script = _script_factory(config, workspace)
+    if executable not in _warm_starts:
+        _warm_starts[executable] = WarmStart(_stats_file(executable))
+    return _warm_starts[executable], create_script
+
+
+@hookimpl
+def pylsp_settings():
+    return {"plugins": {"jedi_warm_start": {"enabled": True, "max_modules": 20}}}
+
+
+@hookimpl
+def pylsp_initialize(config, workspace) -> None:
+    settings = config.plugin_settings("jedi_warm_start")
+    try:
+        warm_start, create_script = get_warm_start(config, workspace)
+    except Exception:  # pylint: disable=broad-except
+        log.warning("Failed to get jedi environment to warm start", exc_info=True)
+        return
+    warm_start.start(create_script, settings.get("max_modules", 20))
+
+
+@hookimpl
+def pylsp_document_did_open(config, workspace, document) -> None:
+    executable, __ = _script_factory(config, workspace)
+    warm_start = _warm_starts.get(executable)
+    if warm_start is not None:
+        warm_start.record(document.source)
+
+
+@hookimpl
+def pylsp_commands():
+    return [COMMAND_STATS]
+
+
+@hookimpl
+def pylsp_execute_command(config, workspace, command, arguments):
+    if command != COMMAND_STATS:
+        return None
+    executable, __ = _script_factory(config, workspace)
+    warm_start = _warm_starts.get(executable)
+    stats = {} if warm_start is None else warm_start.to_dict()
+    log.info("Jedi warm start statistics: %s", stats)
+    return stats
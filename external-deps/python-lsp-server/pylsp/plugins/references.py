@@ -4,6 +4,9 @@
 import logging
 
 from pylsp import _utils, hookimpl, uris
+from pylsp.plugins.symbols import use_symbol_index
+from pylsp.symbol_index import find_occurrences
+from pylsp.workspace import Notebook
 
 log = logging.getLogger(__name__)
 
@@ -11,7 +14,12 @@
 @hookimpl
 def pylsp_references(document, position, exclude_declaration):
     code_position = _utils.position_to_jedi_linecolumn(document, position)
-    usages = document.jedi_script().get_references(**code_position)
+
+    usages = None
+    if use_symbol_index(document._config):
+        usages = _indexed_references(document, code_position)
+    if usages is None:
+        usages = document.jedi_script().get_references(**code_position)
 
     if exclude_declaration:
         # Filter out if the usage is the actual declaration of the thing
@@ -31,3 +39,69 @@ def pylsp_references(document, position, exclude_declaration):
         for d in usages
         if not d.in_builtin_module()
     ]
+
+
+def _definition_keys(definitions):
+    return {(str(d.module_path), d.line, d.column) for d in definitions}
+
+
+def _indexed_references(document, code_position):
+    """Find references only in the files where the symbol index says the
+    name appears, using jedi to confirm each candidate.
+
+    Returns None if the index can't be used for this request.
+    """
+    workspace = document._workspace
+    index = workspace.symbol_index
+    if not index.ready:
+        return None
+
+    script = document.jedi_script()
+    targets = script.goto(follow_imports=True, **code_position)
+    if not targets:
+        return None
+    name = targets[0].name
+    if not name or any(d.type == "module" for d in targets):
+        # Module names appear in import paths, that are not identifiers
+        return None
+    target_keys = _definition_keys(targets)
+
+    # Open documents may have unsaved changes, so they are always searched
+    candidates = {document.uri: document}
+    for doc_uri, doc in list(workspace.documents.items()):
+        if isinstance(doc, Notebook) or doc_uri in candidates:
+            continue
+        if name in doc.source:
+            candidates[doc_uri] = doc
+    for path in index.files_with_name(name):
+        doc_uri = uris.from_fs_path(path)
+        if doc_uri not in candidates:
+            candidates[doc_uri] = workspace.get_document(doc_uri)
+
+    usages = []
+    for doc in candidates.values():
+        try:
+            usages.extend(_document_references(doc, name, target_keys))
+        except Exception:  # pylint: disable=broad-except
+            log.debug("Failed to find references in %s", doc.uri, exc_info=True)
+    return usages
+
+
+def _document_references(document, name, target_keys):
+    """Return the references to `target_keys` in a single document."""
+    script = document.jedi_script()
+    covered = set()
+    usages = []
+    for line, column in find_occurrences(document.source, name):
+        if (line, column) in covered:
+            continue
+        definitions = script.goto(line, column, follow_imports=True)
+        if not _definition_keys(definitions) & target_keys:
+            continue
+        # Let jedi find the rest of the references in this file
+        for usage in script.get_references(line, column, scope="file"):
+            key = (usage.line, usage.column)
+            if key not in covered:
+                covered.add(key)
+                usages.append(usage)
+    return usages
@@ -1,6 +1,10 @@
 # Copyright 2022- Python Language Server Contributors.
 
+import hashlib
 import logging
+import os
+import sqlite3
+import sys
 import threading
 from collections.abc import Generator
 from typing import Any, Optional, Union
@@ -26,12 +30,27 @@
 MAX_RESULTS_COMPLETIONS = 1000
 MAX_RESULTS_CODE_ACTIONS = 5
 
+# Niceness of the thread that updates the cache
+WORKER_NICENESS = 10
+
 
 class AutoimportCache:
-    """Handles the cache creation."""
+    """Handles the cache creation.
+
+    The cache is refreshed incrementally: only project files whose
+    modification time and contents changed, and packages whose directory
+    changed, are parsed again. Refreshes requested with
+    ``single_thread=False`` are queued and run by a low priority worker
+    thread, so that they never block other requests.
+    """
 
     def __init__(self) -> None:
         self.thread = None
+        self._lock = threading.Lock()
+        # Pending refreshes by workspace, with the files to refresh or None
+        # to refresh everything.
+        self._pending = {}
+        self._memory = False
 
     def reload_cache(
         self,
@@ -40,9 +59,6 @@ def reload_cache(
         files: Optional[list[Document]] = None,
         single_thread: Optional[bool] = True,
     ):
-        if self.is_blocked():
-            return
-
         memory: bool = config.plugin_settings("rope_autoimport").get("memory", False)
         rope_config = config.settings().get("rope", {})
         autoimport = workspace._rope_autoimport(rope_config, memory)
@@ -54,13 +70,39 @@ def reload_cache(
 
         if single_thread:
             self._reload_cache(workspace, autoimport, resources)
-        else:
-            # Creating the cache may take 10-20s for a environment with 5k python modules. That's
-            # why we decided to move cache creation into its own thread.
-            self.thread = threading.Thread(
-                target=self._reload_cache, args=(workspace, autoimport, resources)
-            )
-            self.thread.start()
+            return
+
+        # Creating the cache may take 10-20s for a environment with 5k python
+        # modules, so it's done in its own thread. Requests made while it's
+        # running are merged and run afterwards.
+        with self._lock:
+            self._memory = memory
+            key = id(workspace)
+            if key in self._pending:
+                __, __, pending = self._pending[key]
+                if pending is None or resources is None:
+                    resources = None
+                else:
+                    resources = pending + resources
+            self._pending[key] = (workspace, autoimport, resources)
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._worker, name="pylsp-autoimport", daemon=True
+                )
+                self.thread.start()
+
+    def _worker(self) -> None:
+        _lower_thread_priority()
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self.thread = None
+                    return
+                __, (workspace, autoimport, resources) = self._pending.popitem()
+            try:
+                self._reload_cache(workspace, autoimport, resources)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("autoimport: Failed to update the cache")
 
     def _reload_cache(
         self,
@@ -69,11 +111,172 @@ def _reload_cache(
         resources: Optional[list[Resource]] = None,
     ) -> None:
         task_handle = PylspTaskHandle(workspace)
-        autoimport.generate_cache(task_handle=task_handle, resources=resources)
-        autoimport.generate_modules_cache(task_handle=task_handle)
+        full_reload = resources is None
+        if full_reload:
+            resources = autoimport.project.get_python_files()
+
+        signatures = _ResourceSignatures(autoimport)
+        changed, removed = signatures.changed(resources, full_reload)
+        for resource in removed:
+            autoimport._removed(resource)
+        if changed:
+            job_set = task_handle.create_jobset(
+                "Updating autoimport cache", len(changed)
+            )
+            for resource in changed:
+                job_set.started_job(resource.path)
+                autoimport.update_resource(resource, commit=False)
+                job_set.finished_job()
+        signatures.save()
+        autoimport.connection.commit()
+
+        if full_reload:
+            signatures.forget_changed_packages()
+            autoimport.generate_modules_cache(
+                task_handle=task_handle, single_thread=True
+            )
+            signatures.save()
+            autoimport.connection.commit()
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
 
     def is_blocked(self):
-        return self.thread and self.thread.is_alive()
+        """Check if the cache can't be queried because it's being updated.
+
+        On-disk databases can be read while they are updated, but in-memory
+        ones can't.
+        """
+        return self._memory and self.is_running()
+
+
+class _ResourceSignatures:
+    """Modification times and hashes of what's stored in the cache."""
+
+    def __init__(self, autoimport: AutoImport) -> None:
+        self.autoimport = autoimport
+        self.connection = autoimport.connection
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pylsp_signatures"
+            "(path TEXT PRIMARY KEY, mtime INTEGER, hash TEXT)"
+        )
+        # Rope discards its cache when it's upgraded or the project
+        # preferences change, and then the signatures are no longer valid.
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS pylsp_metadata(created_at TEXT)"
+        )
+        created_at = self.connection.execute(
+            "SELECT created_at FROM metadata"
+        ).fetchone()
+        saved_created_at = self.connection.execute(
+            "SELECT created_at FROM pylsp_metadata"
+        ).fetchone()
+        if created_at != saved_created_at:
+            self.connection.execute("DELETE FROM pylsp_signatures")
+            self.connection.execute("DELETE FROM pylsp_metadata")
+            if created_at is not None:
+                self.connection.execute(
+                    "INSERT INTO pylsp_metadata VALUES (?)", created_at
+                )
+        self.signatures = {
+            path: (mtime, hash_)
+            for path, mtime, hash_ in self.connection.execute(
+                "SELECT path, mtime, hash FROM pylsp_signatures"
+            )
+        }
+        self._updated = {}
+        self._removed = []
+
+    def changed(self, resources, all_resources):
+        """Return the resources that changed and those that were removed.
+
+        If `all_resources` is True, cached files missing from `resources`
+        are considered removed too.
+        """
+        changed = []
+        removed = []
+        existing = set()
+        for resource in resources:
+            path = resource.real_path
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                # Rope may still list files that were just removed
+                if path in self.signatures:
+                    removed.append(resource)
+                    self._removed.append(path)
+                continue
+            existing.add(path)
+            old = self.signatures.get(path)
+            if old is not None and old[0] == mtime:
+                continue
+            content_hash = _file_hash(path)
+            if old is None or old[1] != content_hash:
+                changed.append(resource)
+            self._updated[path] = (mtime, content_hash)
+
+        if all_resources:
+            project = self.autoimport.project
+            for path, (__, content_hash) in self.signatures.items():
+                if content_hash and path not in existing and path not in self._removed:
+                    removed.append(
+                        project.get_file(os.path.relpath(path, project.address))
+                    )
+                    self._removed.append(path)
+        return changed, removed
+
+    def forget_changed_packages(self) -> None:
+        """Drop packages that changed on disk, so they are cached again."""
+        autoimport = self.autoimport
+        for package in autoimport._get_available_packages():
+            if package.path is None:
+                continue
+            path = str(package.path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            old = self.signatures.get(path)
+            if old is not None and old[0] != mtime:
+                self.connection.execute(
+                    "DELETE FROM names WHERE package = ?", (package.name,)
+                )
+                self.connection.execute(
+                    "DELETE FROM packages WHERE package = ?", (package.name,)
+                )
+            # Packages are stored with an empty hash
+            self._updated[path] = (mtime, "")
+
+    def save(self) -> None:
+        self.connection.executemany(
+            "DELETE FROM pylsp_signatures WHERE path = ?",
+            [(path,) for path in self._removed],
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO pylsp_signatures VALUES (?, ?, ?)",
+            [(path, mtime, hash_) for path, (mtime, hash_) in self._updated.items()],
+        )
+        self.signatures.update(self._updated)
+        self._updated = {}
+        self._removed = []
+
+
+def _file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _lower_thread_priority() -> None:
+    """Make the current thread yield the CPU to requests.
+
+    Only Linux allows setting the priority of a single thread.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+    try:
+        os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WORKER_NICENESS)
+    except OSError:
+        pass
 
 
 @hookimpl
@@ -256,7 +459,12 @@ def pylsp_completions(
         document.jedi_script(use_document_path=True)
     )
     autoimport = workspace._rope_autoimport(rope_config)
-    suggestions = list(autoimport.search_full(word, ignored_names=ignored_names))
+    try:
+        suggestions = list(autoimport.search_full(word, ignored_names=ignored_names))
+    except sqlite3.OperationalError:
+        # The database is locked by a cache update
+        log.debug("autoimport: cache is not available")
+        return []
     results = sorted(
         _process_statements(
             suggestions, document.uri, word, autoimport, document, "completions"
@@ -344,7 +552,11 @@ def pylsp_code_actions(
         log.debug(f"autoimport: searching for word: {word}")
         rope_config = config.settings(document_path=document.path).get("rope", {})
         autoimport = workspace._rope_autoimport(rope_config)
-        suggestions = list(autoimport.search_full(word))
+        try:
+            suggestions = list(autoimport.search_full(word))
+        except sqlite3.OperationalError:
+            log.debug("autoimport: cache is not available")
+            return code_actions
         log.debug("autoimport: suggestions: %s", suggestions)
         results = sorted(
             _process_statements(
@@ -371,7 +583,7 @@ def pylsp_initialize(config: Config, workspace: Workspace) -> None:
 
     Generates the cache for local and global items.
     """
-    cache.reload_cache(config, workspace)
+    cache.reload_cache(config, workspace, single_thread=False)
 
 
 @hookimpl
@@ -380,7 +592,7 @@ def pylsp_document_did_open(config: Config, workspace: Workspace) -> None:
 
     Generates the cache for local and global items.
     """
-    cache.reload_cache(config, workspace)
+    cache.reload_cache(config, workspace, single_thread=False)
 
 
 @hookimpl
@@ -388,7 +600,7 @@ def pylsp_document_did_save(
     config: Config, workspace: Workspace, document: Document
 ) -> None:
     """Update the names associated with this document."""
-    cache.reload_cache(config, workspace, [document])
+    cache.reload_cache(config, workspace, [document], single_thread=False)
 
 
 @hookimpl
@@ -400,7 +612,7 @@ def pylsp_workspace_configuration_changed(config: Config, workspace: Workspace)
     Generates the cache for local and global items.
     """
     if config.plugin_settings("rope_autoimport").get("enabled", False):
-        cache.reload_cache(config, workspace)
+        cache.reload_cache(config, workspace, single_thread=False)
     else:
         log.debug("autoimport: Skipping cache reload.")
 
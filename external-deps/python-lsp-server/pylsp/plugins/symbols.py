@@ -5,11 +5,59 @@
 import re
 from pathlib import Path
 
-from pylsp import hookimpl
+from pylsp import hookimpl, uris
 from pylsp.lsp import SymbolKind
 
 log = logging.getLogger(__name__)
 
+# Maximum number of results returned for a workspace/symbol request
+MAX_WORKSPACE_SYMBOLS = 500
+
+
+def use_symbol_index(config):
+    """Check if the workspace symbol index is enabled."""
+    if config is None:
+        return True
+    return config.settings().get("symbolIndex", {}).get("enabled", True)
+
+
+@hookimpl
+def pylsp_initialize(config, workspace):
+    if use_symbol_index(config) and workspace.is_local():
+        # Start building the index so it's ready for the first request
+        workspace.symbol_index  # pylint: disable=pointless-statement
+
+
+@hookimpl
+def pylsp_workspace_symbols(config, workspace, query):
+    if not use_symbol_index(config):
+        return []
+
+    index = workspace.symbol_index
+    return [
+        {
+            "name": name,
+            "containerName": container,
+            "kind": _SYMBOL_KIND_MAP[kind],
+            "location": {
+                "uri": uris.from_fs_path(path),
+                "range": {
+                    "start": {"line": start_line, "character": start_column},
+                    "end": {"line": end_line, "character": end_column},
+                },
+            },
+        }
+        for path, (
+            name,
+            kind,
+            start_line,
+            start_column,
+            end_line,
+            end_column,
+            container,
+        ) in index.find_symbols(query, limit=MAX_WORKSPACE_SYMBOLS)
+    ]
+
 
 @hookimpl
 def pylsp_document_symbols(config, document):
@@ -6,6 +6,7 @@
 import socketserver
 import threading
 import uuid
+from concurrent.futures import CancelledError, ThreadPoolExecutor
 from functools import partial
 from typing import Any
 
@@ -27,6 +28,7 @@
 
 
 LINT_DEBOUNCE_S = 0.5  # 500 ms
+LINT_MAX_WORKERS = min(4, os.cpu_count() or 1)
 PARENT_PROCESS_WATCH_INTERVAL = 10  # 10 s
 MAX_WORKERS = 64
 PYTHON_FILE_EXTENSIONS = (".py", ".pyi")
@@ -206,6 +208,14 @@ def __init__(
         self._dispatchers = []
         self._shutdown = False
 
+        # Lint plugins run in parallel in this pool. Pending runs for a
+        # document are cancelled when a newer version of it is linted.
+        self._lint_executor = ThreadPoolExecutor(
+            max_workers=LINT_MAX_WORKERS, thread_name_prefix="pylsp-lint"
+        )
+        self._lint_futures = {}
+        self._lint_lock = threading.Lock()
+
     def start(self) -> None:
         """Entry point for the server."""
         self._jsonrpc_stream_reader.listen(self._endpoint.consume)
@@ -248,6 +258,7 @@ def m_invalid_request_after_shutdown(self, **_kwargs):
         }
 
     def m_exit(self, **_kwargs) -> None:
+        self._lint_executor.shutdown(wait=False, cancel_futures=True)
         self._endpoint.shutdown()
         if self._jsonrpc_stream_reader is not None:
             self._jsonrpc_stream_reader.close()
@@ -306,6 +317,7 @@ def capabilities(self):
             "workspace": {
                 "workspaceFolders": {"supported": True, "changeNotifications": True}
             },
+            "workspaceSymbolProvider": True,
             "experimental": merge(self._hook("pylsp_experimental_capabilities")),
         }
         log.info("Server capabilities: %s", server_capabilities)
@@ -430,6 +442,9 @@ def document_symbols(self, doc_uri):
     def document_did_save(self, doc_uri):
         return self._hook("pylsp_document_did_save", doc_uri)
 
+    def workspace_symbols(self, query):
+        return flatten(self._hook("pylsp_workspace_symbols", query=query))
+
     def execute_command(self, command, arguments):
         return self._hook("pylsp_execute_command", command=command, arguments=arguments)
 
@@ -463,11 +478,88 @@ def lint(self, doc_uri, is_saved) -> None:
     def _lint_text_document(
         self, doc_uri, workspace, is_saved, doc_version=None
     ) -> None:
-        workspace.publish_diagnostics(
-            doc_uri,
-            flatten(self._hook("pylsp_lint", doc_uri, is_saved=is_saved)),
-            doc_version,
+        diagnostics = self._lint_hook(doc_uri, workspace, is_saved, doc_version)
+
+        # Drop results computed for an older version of the document
+        if diagnostics is None or self._is_stale(workspace, doc_uri, doc_version):
+            log.debug("Dropping stale lint results for %s", doc_uri)
+            return
+
+        workspace.publish_diagnostics(doc_uri, flatten(diagnostics), doc_version)
+
+    def _is_stale(self, workspace, doc_uri, doc_version):
+        """Check if a newer version of the document than doc_version is open."""
+        if doc_version is None:
+            return False
+        document = workspace.documents.get(doc_uri)
+        return document is None or document.version != doc_version
+
+    def _lint_hook(self, doc_uri, workspace, is_saved, doc_version=None):
+        """
+        Run the pylsp_lint hook implementations in parallel.
+
+        Returns the list of results of all plugins, in the same order used by
+        pluggy, or None if the run was cancelled because doc_version is stale.
+        """
+        hook_caller = self.config.plugin_manager.subset_hook_caller(
+            "pylsp_lint", self.config.disabled_plugins
         )
+        hookimpls = hook_caller.get_hookimpls()
+
+        # Wrappers need to run around the other implementations, so in that
+        # case we let pluggy call them sequentially.
+        if any(impl.hookwrapper or getattr(impl, "wrapper", False) for impl in hookimpls):
+            return self._hook("pylsp_lint", doc_uri, is_saved=is_saved)
+
+        kwargs = {
+            "config": self.config,
+            "workspace": workspace,
+            "document": workspace.get_document(doc_uri),
+            "is_saved": is_saved,
+        }
+
+        # Pluggy calls implementations in LIFO registration order
+        futures = [
+            self._lint_executor.submit(
+                self._run_lint_plugin, impl, kwargs, doc_uri, workspace, doc_version
+            )
+            for impl in reversed(hookimpls)
+        ]
+
+        with self._lint_lock:
+            for future in self._lint_futures.pop(doc_uri, []):
+                future.cancel()
+            self._lint_futures[doc_uri] = futures
+
+        results = []
+        try:
+            for future in futures:
+                if future.cancelled():
+                    return None
+                result = future.result()
+                if result is not None:
+                    results.append(result)
+        except CancelledError:
+            return None
+        finally:
+            with self._lint_lock:
+                if self._lint_futures.get(doc_uri) is futures:
+                    del self._lint_futures[doc_uri]
+
+        return results
+
+    def _run_lint_plugin(self, hookimpl, kwargs, doc_uri, workspace, doc_version):
+        """Run a single lint plugin unless doc_version is already stale."""
+        if self._is_stale(workspace, doc_uri, doc_version):
+            return None
+
+        try:
+            return hookimpl.function(
+                **{arg: kwargs[arg] for arg in hookimpl.argnames}
+            )
+        except Exception:
+            log.exception("Failed to run lint plugin %s", hookimpl.plugin_name)
+            return None
 
     def _lint_notebook_document(self, notebook_document, workspace) -> None:
         """
@@ -689,6 +781,8 @@ def m_text_document__did_change(
         self.lint(textDocument["uri"], is_saved=False)
 
     def m_text_document__did_save(self, textDocument=None, **_kwargs) -> None:
+        workspace = self._match_uri_to_workspace(textDocument["uri"])
+        workspace.update_symbol_index([textDocument["uri"]])
         self.lint(textDocument["uri"], is_saved=True)
         self.document_did_save(textDocument["uri"])
 
@@ -890,6 +984,10 @@ def m_workspace__did_change_watched_files(self, changes=None, **_kwargs):
             elif d["uri"].endswith(CONFIG_FILEs):
                 config_changed = True
 
+        for doc_uri in changed_py_files:
+            workspace = self._match_uri_to_workspace(doc_uri)
+            workspace.update_symbol_index([doc_uri])
+
         if config_changed:
             self.config.settings.cache_clear()
         elif not changed_py_files:
@@ -905,6 +1003,9 @@ def m_workspace__did_change_watched_files(self, changes=None, **_kwargs):
     def m_workspace__execute_command(self, command=None, arguments=None):
         return self.execute_command(command, arguments)
 
+    def m_workspace__symbol(self, query=None, **_kwargs):
+        return self.workspace_symbols(query)
+
 
 def flatten(list_of_lists):
     return [item for lst in list_of_lists for item in lst]
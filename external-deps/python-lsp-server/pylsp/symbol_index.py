@@ -0,0 +1,334 @@
+# Copyright 2021- Python Language Server Contributors.
+
+"""Persistent index of the names used and defined in a workspace.
+
+The index maps every identifier to the files it appears in, and keeps the
+classes, functions and top-level assignments defined in each file. It is
+built in a background thread, saved in jedi's cache directory and updated
+file by file afterwards, so that project-wide requests (references and
+workspace symbols) only need to ask jedi about the files that can contain
+a name.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+
+import jedi
+
+from . import _utils
+
+log = logging.getLogger(__name__)
+
+# Version of the on-disk format. Indexes saved with another version are
+# rebuilt from scratch.
+INDEX_VERSION = 1
+
+# Files larger than this are usually generated and are not indexed
+MAX_FILE_SIZE = 1024 * 1024
+
+# Seconds to wait after an update before saving the index to disk
+SAVE_DELAY = 2.0
+
+# Directories that never contain workspace sources
+SKIP_DIRS = {"__pycache__", "node_modules", "site-packages", "build", "dist"}
+
+PYTHON_FILE_EXTENSIONS = (".py", ".pyi")
+
+RE_IDENTIFIER = re.compile(r"[^\W\d]\w*")
+
+
+def index_directory():
+    """Return the directory where workspace indexes are saved."""
+    return os.path.join(jedi.settings.cache_directory, "pylsp-symbol-index")
+
+
+def find_occurrences(source, name):
+    """Yield the (line, column) of every occurrence of `name` in `source`.
+
+    Lines are 1-based and columns 0-based, like jedi's.
+    """
+    pattern = re.compile(r"(?<!\w)%s(?!\w)" % re.escape(name))
+    for line_number, line in enumerate(source.splitlines(), 1):
+        if name not in line:
+            continue
+        for match in pattern.finditer(line):
+            yield line_number, match.start()
+
+
+def _definitions(tree):
+    """Return the symbols defined in a module ast."""
+    symbols = []
+
+    def add(name, kind, node, container):
+        symbols.append(
+            [
+                name,
+                kind,
+                node.lineno - 1,
+                node.col_offset,
+                node.end_lineno - 1,
+                node.end_col_offset,
+                container,
+            ]
+        )
+
+    def visit(node, container, in_class):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                add(child.name, "class", child, container)
+                visit(child, child.name, True)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "method" if in_class else "function"
+                add(child.name, kind, child, container)
+                # Names local to functions are not workspace symbols
+                visit_nested(child, child.name)
+            elif isinstance(child, (ast.Assign, ast.AnnAssign)):
+                targets = (
+                    child.targets if isinstance(child, ast.Assign) else [child.target]
+                )
+                kind = "field" if in_class else "variable"
+                for target in targets:
+                    for name_node in ast.walk(target):
+                        if isinstance(name_node, ast.Name):
+                            add(name_node.id, kind, name_node, container)
+            elif isinstance(child, (ast.If, ast.Try, ast.With)):
+                # Definitions made conditionally, e.g. under `try: import`
+                visit(child, container, in_class)
+
+    def visit_nested(node, container):
+        for child in ast.walk(node):
+            if child is node:
+                continue
+            if isinstance(child, ast.ClassDef):
+                add(child.name, "class", child, container)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                add(child.name, "function", child, container)
+
+    visit(tree, None, False)
+    return symbols
+
+
+def index_source(source):
+    """Return the index entry of a file with the given source."""
+    names = sorted(set(RE_IDENTIFIER.findall(source)))
+    try:
+        symbols = _definitions(ast.parse(source))
+    except (SyntaxError, ValueError, RecursionError):
+        symbols = []
+    return {"names": names, "symbols": symbols}
+
+
+class SymbolIndex:
+    """Name to locations index of the Python files in a workspace."""
+
+    def __init__(self, root_path, cache_dir=None) -> None:
+        self.root_path = root_path
+        self._cache_dir = cache_dir or index_directory()
+        self._files = {}
+        self._files_by_name = {}
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dirty = False
+
+    @property
+    def cache_file(self):
+        digest = hashlib.sha1(os.path.abspath(self.root_path).encode("utf-8"))
+        return os.path.join(self._cache_dir, digest.hexdigest() + ".json")
+
+    @property
+    def ready(self):
+        """Whether the initial build of the index has finished."""
+        return self._ready.is_set()
+
+    def __len__(self):
+        return len(self._files)
+
+    # ---- Building
+    def start(self) -> None:
+        """Build the index in a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._build, name="pylsp-symbol-index", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self, timeout=None):
+        """Wait for the initial build to finish."""
+        return self._ready.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop building the index and save it if it was modified."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        if self._dirty:
+            self.save()
+
+    def _build(self) -> None:
+        try:
+            cached = self.load()
+            for path in self._walk():
+                if self._stop.is_set():
+                    return
+                entry = cached.get(path)
+                mtime = _mtime(path)
+                if entry is None or entry["mtime"] != mtime:
+                    entry = self._index_file(path, mtime)
+                    self._dirty = True
+                if entry is not None:
+                    self._set_entry(path, entry)
+            if set(cached) - set(self._files):
+                self._dirty = True
+            if self._dirty:
+                self.save()
+            log.debug("Indexed %s files in %s", len(self._files), self.root_path)
+        except Exception:  # pylint: disable=broad-except
+            log.exception("Failed to build the symbol index of %s", self.root_path)
+        finally:
+            self._ready.set()
+
+    def _walk(self):
+        if not self.root_path or not os.path.isdir(self.root_path):
+            return
+        for dirpath, dirnames, filenames in os.walk(self.root_path):
+            # Skip hidden directories, caches and virtual environments
+            dirnames[:] = [
+                d
+                for d in dirnames
+                if not d.startswith(".")
+                and d not in SKIP_DIRS
+                and not os.path.exists(os.path.join(dirpath, d, "pyvenv.cfg"))
+            ]
+            for filename in filenames:
+                if filename.endswith(PYTHON_FILE_EXTENSIONS):
+                    yield os.path.join(dirpath, filename)
+
+    def _index_file(self, path, mtime):
+        try:
+            if os.path.getsize(path) > MAX_FILE_SIZE:
+                return None
+            with open(path, encoding="utf-8", errors="replace") as f:
+                source = f.read()
+        except OSError:
+            return None
+        entry = index_source(source)
+        entry["mtime"] = mtime
+        return entry
+
+    def _set_entry(self, path, entry) -> None:
+        with self._lock:
+            self._remove_entry(path)
+            self._files[path] = entry
+            for name in entry["names"]:
+                self._files_by_name.setdefault(name, set()).add(path)
+
+    def _remove_entry(self, path) -> None:
+        old_entry = self._files.pop(path, None)
+        if old_entry is None:
+            return
+        for name in old_entry["names"]:
+            paths = self._files_by_name.get(name)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._files_by_name[name]
+
+    # ---- Incremental updates
+    def update_file(self, path) -> None:
+        """Reindex `path`, or remove it from the index if it doesn't exist."""
+        if not path.endswith(PYTHON_FILE_EXTENSIONS):
+            return
+        mtime = _mtime(path)
+        entry = None if mtime is None else self._index_file(path, mtime)
+        with self._lock:
+            if entry is None:
+                if path not in self._files:
+                    return
+                self._remove_entry(path)
+            else:
+                self._set_entry(path, entry)
+            self._dirty = True
+        self._schedule_save()
+
+    @_utils.debounce(SAVE_DELAY, keyed_by="self")
+    def _schedule_save(self) -> None:
+        if not self._stop.is_set() and self._dirty:
+            self.save()
+
+    # ---- Persistence
+    def load(self):
+        """Load the index saved on disk, keyed by path."""
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root_path:
+            return {}
+        return data.get("files", {})
+
+    def save(self) -> None:
+        """Save the index to disk atomically."""
+        with self._lock:
+            data = {
+                "version": INDEX_VERSION,
+                "root": self.root_path,
+                "files": dict(self._files),
+            }
+            self._dirty = False
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            log.warning("Failed to save the symbol index to %s", self._cache_dir)
+
+    # ---- Queries
+    def files_with_name(self, name):
+        """Return the indexed files where the identifier `name` appears."""
+        with self._lock:
+            return sorted(self._files_by_name.get(name, ()))
+
+    def find_symbols(self, query, limit=None):
+        """Return the definitions whose name contains `query`.
+
+        The matching is case-insensitive. Results whose name starts with
+        `query` come first, and are followed by shorter names.
+
+        Returns
+        -------
+        list
+            (path, symbol) tuples, where symbol is a [name, kind, start_line,
+            start_column, end_line, end_column, container_name] list.
+        """
+        query = (query or "").lower()
+        results = []
+        with self._lock:
+            for path, entry in self._files.items():
+                for symbol in entry["symbols"]:
+                    lower_name = symbol[0].lower()
+                    if query in lower_name:
+                        key = (not lower_name.startswith(query), len(symbol[0]))
+                        results.append((key, path, symbol))
+        results.sort(key=lambda result: result[0])
+        if limit is not None:
+            results = results[:limit]
+        return [(path, symbol) for __, path, symbol in results]
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
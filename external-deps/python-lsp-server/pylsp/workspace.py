@@ -7,6 +7,7 @@
 import os
 import re
 import uuid
+from collections import OrderedDict
 from collections.abc import Generator
 from contextlib import contextmanager
 from threading import RLock
@@ -20,6 +21,10 @@
 
 DEFAULT_AUTO_IMPORT_MODULES = ["numpy"]
 
+# Maximum number of jedi scripts cached per document. More than one can be
+# needed because some plugins ask for scripts with a different sys_path.
+MAX_CACHED_JEDI_SCRIPTS = 4
+
 # TODO: this is not the best e.g. we capture numbers
 RE_START_WORD = re.compile("[A-Za-z_0-9]*$")
 RE_END_WORD = re.compile("^[A-Za-z_0-9]*")
@@ -60,6 +65,8 @@ def __init__(self, root_uri, endpoint, config=None) -> None:
         self.__rope_config = None
         self.__rope_autoimport = None
 
+        self.__symbol_index = None
+
     def _rope_autoimport(
         self,
         rope_config: Optional,
@@ -67,9 +74,16 @@ def _rope_autoimport(
     ):
         from rope.contrib.autoimport.sqlite import AutoImport
 
+        from .plugins._rope_autoimport_db import PersistentAutoImport, database_path
+
         if self.__rope_autoimport is None:
             project = self._rope_project_builder(rope_config)
-            self.__rope_autoimport = AutoImport(project, memory=memory)
+            if memory:
+                self.__rope_autoimport = AutoImport(project, memory=True)
+            else:
+                self.__rope_autoimport = PersistentAutoImport(
+                    project, database_path(self._root_path)
+                )
         return self.__rope_autoimport
 
     def _rope_project_builder(self, rope_config):
@@ -90,6 +104,23 @@ def _rope_project_builder(self, rope_config):
         self.__rope.validate()
         return self.__rope
 
+    @property
+    def symbol_index(self):
+        """Index of the names in the workspace, built in the background."""
+        from .symbol_index import SymbolIndex
+
+        if self.__symbol_index is None:
+            self.__symbol_index = SymbolIndex(self._root_path)
+            self.__symbol_index.start()
+        return self.__symbol_index
+
+    def update_symbol_index(self, doc_uris) -> None:
+        """Reindex the given files if the symbol index was built."""
+        if self.__symbol_index is None:
+            return
+        for doc_uri in doc_uris:
+            self.__symbol_index.update_file(uris.to_fs_path(doc_uri))
+
     @property
     def documents(self):
         return self._docs
@@ -390,6 +421,8 @@ def _create_cell_document(
     def close(self) -> None:
         if self.__rope_autoimport:
             self.__rope_autoimport.close()
+        if self.__symbol_index is not None:
+            self.__symbol_index.stop()
 
 
 class Document:
@@ -418,9 +451,20 @@ def __init__(
         self._rope_project_builder = rope_project_builder
         self._lock = RLock()
 
+        # Jedi scripts and names for the current version of the document,
+        # so that requests against the same version don't parse it again.
+        self._jedi_scripts = OrderedDict()
+        self._jedi_names = {}
+
     def __str__(self):
         return str(self.uri)
 
+    @lock
+    def invalidate_jedi_cache(self) -> None:
+        """Discard the cached jedi scripts and names of this document."""
+        self._jedi_scripts.clear()
+        self._jedi_names.clear()
+
     def _rope_resource(self, rope_config):
         from rope.base import libutils
 
@@ -443,10 +487,12 @@ def source(self):
 
     def update_config(self, settings) -> None:
         self._config.update((settings or {}).get("pylsp", {}))
+        self.invalidate_jedi_cache()
 
     @lock
     def apply_change(self, change):
         """Apply a change to the document."""
+        self.invalidate_jedi_cache()
         text = change["text"]
         change_range = change.get("range")
 
@@ -515,9 +561,17 @@ def word_at_position(self, position):
     @lock
     def jedi_names(self, all_scopes=False, definitions=True, references=False):
         script = self.jedi_script()
-        return script.get_names(
-            all_scopes=all_scopes, definitions=definitions, references=references
-        )
+        if not any(script is cached for cached in self._jedi_scripts.values()):
+            return script.get_names(
+                all_scopes=all_scopes, definitions=definitions, references=references
+            )
+
+        key = (script, all_scopes, definitions, references)
+        if key not in self._jedi_names:
+            self._jedi_names[key] = script.get_names(
+                all_scopes=all_scopes, definitions=definitions, references=references
+            )
+        return list(self._jedi_names[key])
 
     @lock
     def jedi_script(self, position=None, use_document_path=False):
@@ -560,6 +614,21 @@ def jedi_script(self, position=None, use_document_path=False):
         if use_document_path:
             sys_path += [os.path.normpath(os.path.dirname(self.path))]
 
+        # Scripts can only be reused for the same version of the document,
+        # which is not known if it's read from disk.
+        cache_key = None
+        if self._source is not None and not position:
+            cache_key = (
+                self.version,
+                environment_path,
+                project_path,
+                tuple(sys_path),
+            )
+            script = self._jedi_scripts.get(cache_key)
+            if script is not None:
+                self._jedi_scripts.move_to_end(cache_key)
+                return script
+
         kwargs = {
             "code": self.source,
             "path": self.path,
@@ -571,7 +640,16 @@ def jedi_script(self, position=None, use_document_path=False):
             # Deprecated by Jedi to use in Script() constructor
             kwargs += _utils.position_to_jedi_linecolumn(self, position)
 
-        return jedi.Script(**kwargs)
+        script = jedi.Script(**kwargs)
+
+        if cache_key is not None:
+            self._jedi_scripts[cache_key] = script
+            while len(self._jedi_scripts) > MAX_CACHED_JEDI_SCRIPTS:
+                _, evicted = self._jedi_scripts.popitem(last=False)
+                for key in [k for k in self._jedi_names if k[0] is evicted]:
+                    del self._jedi_names[key]
+
+        return script
 
     def get_enviroment(self, environment_path=None, env_vars=None):
         # TODO(gatesn): #339 - make better use of jedi environments, they seem pretty powerful
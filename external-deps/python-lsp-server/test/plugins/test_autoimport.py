@@ -1,5 +1,7 @@
 # Copyright 2022- Python Language Server Contributors.
 
+import os
+import pathlib
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -177,6 +179,35 @@ def test_autoimport_defined_name(config, workspace) -> None:
     assert not check_dict({"label": "List"}, completions)
 
 
+def test_autoimport_incremental_reload(tmp_path_factory, monkeypatch, workspace) -> None:
+    cache_dir = tmp_path_factory.mktemp("cache")
+    monkeypatch.setattr(jedi.settings, "cache_directory", str(cache_dir))
+    module = pathlib.Path(workspace.root_path) / "spam_module.py"
+    module.write_text("def spam_function():\n    pass\n")
+    doc = workspace.get_document(uris.from_fs_path(str(module)))
+    autoimport = workspace._rope_autoimport({})
+    assert autoimport.database_path.startswith(str(cache_dir))
+
+    def names():
+        return {result.name for result in autoimport.search_full("spam_")}
+
+    cache._reload_cache(workspace, autoimport, [doc._rope_resource({})])
+    assert names() == {"spam_module", "spam_function"}
+
+    # Unchanged files are not parsed again, even if they were touched
+    os.utime(module)
+    with patch.object(autoimport, "update_resource") as update_resource:
+        cache._reload_cache(workspace, autoimport, [doc._rope_resource({})])
+    update_resource.assert_not_called()
+
+    # Updates requested from hooks run in the background
+    module.write_text("def spam_other():\n    pass\n")
+    cache.reload_cache(workspace._config, workspace, [doc], single_thread=False)
+    wait_for_condition(lambda: not cache.is_running())
+    assert not cache.is_blocked()
+    assert names() == {"spam_module", "spam_other"}
+
+
 class TestShouldInsert:
     def test_dot(self) -> None:
         assert not should_insert("""str.""", 4)
@@ -1,6 +1,7 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
+import random
 import sys
 from textwrap import dedent
 
@@ -179,3 +180,74 @@ def test_folding_syntax_error(workspace) -> None:
         {"startLine": 27, "endLine": 28},
     ]
     assert ranges == expected
+
+
+def test_folding_incremental(workspace) -> None:
+    doc = Document(DOC_URI, workspace, DOC)
+    pylsp_folding_range(doc)
+    lines = DOC.splitlines(True)
+
+    edits = [
+        # Insert a line above some functions, so they are shifted
+        (9, "x = 1\n"),
+        # Make a function bigger
+        (14, "        pass\n"),
+        # Introduce a syntax error
+        (30, "def broken(:\n"),
+    ]
+    for line, text in edits:
+        lines.insert(line, text)
+        doc.apply_change({"text": "".join(lines)})
+        ranges = pylsp_folding_range(doc)
+        # Compare with the ranges of a document parsed from scratch
+        other_uri = uris.from_fs_path(f"{__file__}-{line}")
+        expected = pylsp_folding_range(Document(other_uri, workspace, doc.source))
+        assert ranges == expected
+
+
+def test_folding_incremental_random(workspace) -> None:
+    """Compare the ranges after random edits with those of a new document."""
+    snippets = [
+        "(",
+        ")",
+        ":",
+        "[",
+        "]",
+        " ",
+        "\\\n",
+        "\n",
+        "\n    ",
+        "x = 1\n",
+        "def f():\n",
+        "    return 1\n",
+        "class A:\n",
+        "    def g(self):\n",
+        "        pass\n",
+        "if x:\n",
+        "else:\n",
+        "a = [\n",
+        "    1,\n",
+        "]\n",
+        "# comment\n",
+        "):\n",
+        "@deco\n",
+    ]
+
+    for seed in range(15):
+        rng = random.Random(seed)
+        doc = Document(DOC_URI, workspace, DOC)
+        pylsp_folding_range(doc)
+        text = DOC
+
+        for i in range(10):
+            position = rng.randint(0, len(text))
+            if text and rng.random() < 0.4:
+                text = text[:position] + text[position + rng.randint(1, 5) :]
+            else:
+                text = text[:position] + rng.choice(snippets) + text[position:]
+            doc.apply_change({"text": text})
+            ranges = pylsp_folding_range(doc)
+
+            other_uri = uris.from_fs_path(f"{__file__}-{seed}-{i}")
+            expected = pylsp_folding_range(Document(other_uri, workspace, text))
+            assert ranges == expected, text
@@ -0,0 +1,47 @@
+# Copyright 2021- Python Language Server Contributors.
+
+import os
+
+from pylsp.plugins.jedi_warm_start import (
+    WarmStart,
+    _script_factory,
+    imported_modules,
+)
+
+DOC = """import os.path
+from json import dumps
+from . import sibling
+    import textwrap  # Indented imports count too
+x = "import spam"
+"""
+
+
+def test_imported_modules() -> None:
+    assert imported_modules(DOC) == {"os", "json", "textwrap"}
+
+
+def test_warm_start(tmpdir, config, workspace) -> None:
+    stats_file = os.path.join(str(tmpdir), "stats", "python.json")
+    warm_start = WarmStart(stats_file)
+    warm_start.record(DOC)
+    warm_start.record("import json\nimport os\n")
+    warm_start.record("import json\n")
+    warm_start.save()
+    assert warm_start.to_dict()["misses"] == 6
+
+    # Statistics persist across sessions
+    warm_start = WarmStart(stats_file)
+    assert warm_start.most_used(2) == ["json", "os"]
+
+    __, create_script = _script_factory(config, workspace)
+    warm_start.start(create_script, 2)
+    warm_start.thread.join(60)
+    stats = warm_start.to_dict()
+    assert set(stats["primed"]) == {"json", "os"}
+    assert not stats["priming"]
+
+    warm_start.record("import json\nimport spam\n")
+    stats = warm_start.to_dict()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
@@ -80,3 +80,25 @@ def test_references_builtin(tmp_workspace) -> None:
     }
     ranges = [r["range"] for r in refs]
     assert expected in ranges
+
+
+def test_references_with_symbol_index(tmp_workspace) -> None:
+    DOC1_URI = uris.from_fs_path(os.path.join(tmp_workspace.root_path, DOC1_NAME))
+    DOC2_URI = uris.from_fs_path(os.path.join(tmp_workspace.root_path, DOC2_NAME))
+    doc1 = Document(DOC1_URI, tmp_workspace)
+    assert tmp_workspace.symbol_index.wait(10)
+
+    # Over 'Test1' in class Test1():
+    refs = pylsp_references(doc1, {"line": 0, "character": 8}, False)
+    assert sorted(
+        (ref["uri"], ref["range"]["start"]["line"], ref["range"]["start"]["character"])
+        for ref in refs
+    ) == sorted([(DOC1_URI, 0, 6), (DOC2_URI, 0, 18), (DOC2_URI, 3, 4)])
+
+    no_def_refs = pylsp_references(doc1, {"line": 0, "character": 8}, True)
+    assert len(no_def_refs) == 1
+
+    # Names that only shadow the definition are not references
+    tmp_workspace.put_document(DOC2_URI, DOC2 + "\ndef f(Test1):\n    return Test1\n")
+    refs = pylsp_references(doc1, {"line": 0, "character": 8}, False)
+    assert len(refs) == 3
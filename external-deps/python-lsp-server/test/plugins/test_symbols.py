@@ -8,7 +8,7 @@
 
 from pylsp import uris
 from pylsp.lsp import SymbolKind
-from pylsp.plugins.symbols import pylsp_document_symbols
+from pylsp.plugins.symbols import pylsp_document_symbols, pylsp_workspace_symbols
 from pylsp.workspace import Document
 
 PY2 = sys.version[0] == "2"
@@ -130,3 +130,20 @@ def test_symbols_all_scopes_with_jedi_environment(workspace) -> None:
     doc.update_config(settings)
     symbols = pylsp_document_symbols(doc._config, doc)
     helper_check_symbols_all_scope(symbols)
+
+
+def test_workspace_symbols(config, workspace) -> None:
+    path = os.path.join(workspace.root_path, "module.py")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(DOC)
+    assert workspace.symbol_index.wait(10)
+
+    symbols = pylsp_workspace_symbols(config, workspace, "MAI")
+    assert [s["name"] for s in symbols] == ["main"]
+    assert symbols[0]["kind"] == SymbolKind.Function
+    assert symbols[0]["location"]["uri"] == uris.from_fs_path(path)
+    assert symbols[0]["location"]["range"]["start"] == {"line": 9, "character": 0}
+
+    # Prefix matches come first
+    names = [s["name"] for s in pylsp_workspace_symbols(config, workspace, "")]
+    assert names[:3] == ["a", "B", "main"]
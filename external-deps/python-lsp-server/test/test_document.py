@@ -1,7 +1,7 @@
 # Copyright 2017-2020 Palantir Technologies, Inc.
 # Copyright 2021- Python Language Server Contributors.
 
-from pylsp.workspace import Document
+from pylsp.workspace import MAX_CACHED_JEDI_SCRIPTS, Document
 from test.fixtures import DOC, DOC_URI
 
 
@@ -103,3 +103,39 @@ def test_document_end_of_file_edit(workspace) -> None:
         "print 'b'\n",
         "o",
     ]
+
+
+def test_jedi_script_cache(workspace) -> None:
+    doc = Document(DOC_URI, workspace, DOC, version=1)
+
+    script = doc.jedi_script()
+    assert doc.jedi_script() is script
+    names = doc.jedi_names()
+    assert [n.name for n in names] == [n.name for n in doc.jedi_names()]
+
+    # A different sys_path needs a different script
+    other = doc.jedi_script(use_document_path=True)
+    assert other is not script
+    assert doc.jedi_script(use_document_path=True) is other
+    assert doc.jedi_script() is script
+
+    # Changes invalidate the cache
+    doc.apply_change({"text": DOC + "\nx = 1\n"})
+    doc.version = 2
+    new_script = doc.jedi_script()
+    assert new_script is not script
+    assert "x" in [n.name for n in doc.jedi_names()]
+
+
+def test_jedi_script_cache_is_bounded(workspace, tmpdir) -> None:
+    doc = Document(DOC_URI, workspace, DOC, version=1)
+    for i in range(MAX_CACHED_JEDI_SCRIPTS + 2):
+        doc._extra_sys_path = [str(tmpdir.mkdir(f"path{i}"))]
+        doc.jedi_names()
+    assert len(doc._jedi_scripts) == MAX_CACHED_JEDI_SCRIPTS
+    assert len(doc._jedi_names) == MAX_CACHED_JEDI_SCRIPTS
+
+
+def test_jedi_script_not_cached_for_disk_documents(workspace) -> None:
+    doc = Document(DOC_URI, workspace)
+    assert doc.jedi_script() is not doc.jedi_script()
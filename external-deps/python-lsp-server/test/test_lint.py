@@ -0,0 +1,66 @@
+# Copyright 2021- Python Language Server Contributors.
+
+from unittest.mock import patch
+
+from pylsp import uris
+from pylsp.python_lsp import flatten
+
+DOC_URI = uris.from_fs_path(__file__)
+DOC = """import sys
+
+def main():
+    print(undefined_name)
+"""
+
+
+def test_lint_runs_all_plugins(pylsp) -> None:
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+    workspace = pylsp.workspace
+
+    parallel = pylsp._lint_hook(DOC_URI, workspace, True, 1)
+    sequential = pylsp._hook("pylsp_lint", DOC_URI, is_saved=True)
+
+    assert parallel == sequential
+    sources = {diag["source"] for diag in flatten(parallel)}
+    assert "pyflakes" in sources
+
+
+def test_lint_drops_stale_results(pylsp) -> None:
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+    workspace = pylsp.workspace
+
+    with patch.object(workspace, "publish_diagnostics") as publish:
+        # A newer version arrived before the lint run finished
+        workspace.update_document(
+            DOC_URI, {"text": DOC + "\nprint(sys)\n"}, version=2
+        )
+        pylsp._lint_text_document(DOC_URI, workspace, False, 1)
+        publish.assert_not_called()
+
+        # Plugins are not run for stale versions
+        assert pylsp._lint_hook(DOC_URI, workspace, False, 1) == []
+
+        pylsp._lint_text_document(DOC_URI, workspace, False, 2)
+        publish.assert_called_once()
+        uri, diagnostics, version = publish.call_args[0]
+        assert uri == DOC_URI
+        assert version == 2
+        assert any("undefined_name" in diag["message"] for diag in diagnostics)
+
+
+def test_lint_plugin_errors_are_isolated(pylsp) -> None:
+    pylsp.workspace.put_document(DOC_URI, DOC, version=1)
+
+    with patch(
+        "pylsp.plugins.pyflakes_lint.pyflakes_api.check",
+        side_effect=RuntimeError("boom"),
+    ):
+        results = pylsp._lint_hook(DOC_URI, pylsp.workspace, True, 1)
+
+    # The other plugins still report their diagnostics
+    sources = {diag["source"] for diag in flatten(results)}
+    assert "pyflakes" not in sources
+    assert any(
+        diag["source"] == "pycodestyle" and diag["code"] == "E302"
+        for diag in flatten(results)
+    )
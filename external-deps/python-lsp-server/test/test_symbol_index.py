@@ -0,0 +1,71 @@
+# Copyright 2021- Python Language Server Contributors.
+
+import os
+
+from pylsp.symbol_index import SymbolIndex, find_occurrences, index_source
+
+MODULE = """import os
+
+CONSTANT = 1
+
+
+class Spam:
+    size = 2
+
+    def eggs(self):
+        def inner():
+            pass
+        return os.path
+"""
+
+
+def test_index_source() -> None:
+    entry = index_source(MODULE)
+    assert {"os", "CONSTANT", "Spam", "eggs", "inner", "path"} <= set(entry["names"])
+
+    symbols = {symbol[0]: symbol for symbol in entry["symbols"]}
+    assert symbols["CONSTANT"][1:4] == ["variable", 2, 0]
+    assert symbols["Spam"][1:4] == ["class", 5, 0]
+    assert symbols["size"][1] == "field"
+    assert symbols["eggs"][1] == "method"
+    assert symbols["eggs"][6] == "Spam"
+    assert symbols["inner"][6] == "eggs"
+
+    # Files with syntax errors are still searchable by name
+    entry = index_source("def broken(:\n    spam")
+    assert entry["symbols"] == []
+    assert "spam" in entry["names"]
+
+
+def test_find_occurrences() -> None:
+    source = "spam = 1\nspam_eggs = spam + spam2\n"
+    assert list(find_occurrences(source, "spam")) == [(1, 0), (2, 12)]
+
+
+def test_build_update_and_persist(tmpdir) -> None:
+    root = tmpdir.mkdir("project")
+    root.join("spam.py").write(MODULE)
+    root.mkdir("pkg").join("eggs.py").write("from spam import Spam\n")
+    root.mkdir(".hidden").join("hidden.py").write("Spam = 1\n")
+    cache_dir = str(tmpdir.mkdir("cache"))
+    spam_path = os.path.join(str(root), "spam.py")
+    eggs_path = os.path.join(str(root), "pkg", "eggs.py")
+
+    index = SymbolIndex(str(root), cache_dir=cache_dir)
+    index.start()
+    assert index.wait(10)
+    assert index.files_with_name("Spam") == sorted([spam_path, eggs_path])
+    assert [path for path, __ in index.find_symbols("spa")] == [spam_path]
+
+    # Files are reindexed or dropped incrementally
+    root.join("spam.py").write("Ham = 1\n")
+    index.update_file(spam_path)
+    assert index.files_with_name("Spam") == [eggs_path]
+    assert index.find_symbols("ham")[0][1][0] == "Ham"
+    os.remove(eggs_path)
+    index.update_file(eggs_path)
+    assert index.files_with_name("Spam") == []
+    index.stop()
+
+    # The saved index is reused when files haven't changed
+    assert set(SymbolIndex(str(root), cache_dir=cache_dir).load()) == {spam_path}
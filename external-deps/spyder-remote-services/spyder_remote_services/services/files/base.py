@@ -1,14 +1,18 @@
 from __future__ import annotations
 import asyncio
 import base64
+import bisect
 from contextlib import contextmanager
 import datetime
 import errno
+import hashlib
 from http import HTTPStatus
+import itertools
 import os
 from pathlib import Path
-from shutil import copy, copy2, rmtree
+from shutil import copy, copy2, copymode, rmtree
 import stat
+import struct
 import threading
 import time
 import traceback
@@ -16,7 +20,7 @@
 import zlib
 
 import orjson
-from tornado.websocket import WebSocketHandler
+from tornado.websocket import WebSocketClosedError, WebSocketHandler
 
 from spyder_remote_services.services.files.compression import ZipStream, MemberFile, CompressionType
 
@@ -24,6 +28,87 @@
     from io import FileIO
 
 
+# Length of the JSON header at the start of binary frames
+FRAME_HEADER = struct.Struct("!I")
+
+
+def pack_frame(header: bytes, chunks: typing.Sequence[bytes] = ()) -> bytes:
+    """
+    Pack a JSON header and raw data chunks in a binary frame.
+
+    The header must already contain the sizes of the chunks (see
+    `FileWebSocketHandler` for the protocol).
+    """
+    return b"".join([FRAME_HEADER.pack(len(header)), header, *chunks])
+
+
+def unpack_frame(frame: bytes) -> tuple[dict, list[memoryview]]:
+    """Unpack a binary frame into its header and raw data chunks."""
+    view = memoryview(frame)
+    (size,) = FRAME_HEADER.unpack_from(view)
+    start = FRAME_HEADER.size + size
+    header = orjson.loads(view[FRAME_HEADER.size:start])
+
+    chunks = []
+    for chunk_size in header.pop("chunks", []):
+        chunks.append(view[start:start + chunk_size])
+        start += chunk_size
+
+    return header, chunks
+
+
+# Content-defined blocks used to send only the changed parts of files
+DELTA_MIN_BLOCK_SIZE = 4096
+DELTA_MAX_BLOCK_SIZE = 65536
+DELTA_BOUNDARY_MASK = 0x3F
+DELTA_BOUNDARY_WINDOW = 32
+
+
+def split_blocks(data: bytes) -> list[int]:
+    """
+    Split data in content-defined blocks and return their sizes.
+
+    Blocks end at a line end after DELTA_MIN_BLOCK_SIZE bytes if the CRC32
+    of the DELTA_BOUNDARY_WINDOW bytes before it has no bits of
+    DELTA_BOUNDARY_MASK set, or after DELTA_MAX_BLOCK_SIZE bytes. Since
+    boundaries only depend on the data around them, inserting or removing
+    data only changes the blocks next to it.
+
+    This must give the same result as the client implementation.
+    """
+    sizes = []
+    size = len(data)
+    start = 0
+    while start < size:
+        limit = min(start + DELTA_MAX_BLOCK_SIZE, size)
+        end = limit
+        pos = start + DELTA_MIN_BLOCK_SIZE - 1
+        while pos < limit:
+            newline = data.find(b"\n", pos, limit)
+            if newline == -1:
+                break
+            cut = newline + 1
+            window = data[max(cut - DELTA_BOUNDARY_WINDOW, 0):cut]
+            if not zlib.crc32(window) & DELTA_BOUNDARY_MASK:
+                end = cut
+                break
+            pos = cut
+
+        sizes.append(end - start)
+        start = end
+
+    return sizes
+
+
+def hash_block(block: bytes) -> str:
+    """Hash a block to find it in another version of a file."""
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+class StaleFileError(Exception):
+    """The file changed after getting the checksums of its blocks."""
+
+
 class FileWebSocketHandler(WebSocketHandler):
     """
     WebSocket handler for opening files and streaming data.
@@ -42,6 +127,39 @@ class FileWebSocketHandler(WebSocketHandler):
         "error": {"message": "error message",  (required)
                   "traceback": ["line1", "line2", ...]  (optional)}  # if an error occurred  (optional)
       }
+
+    Binary protocol:
+      If the client opens the file with `binary=true` and the server
+      supports it, the first response has `"binary": true` and all
+      following responses are binary frames. Clients can then send binary
+      frames too. A frame is a 4-byte big-endian length, a JSON header of
+      that length and the raw data chunks:
+        [length][{"method": "write", "payload": "data", "chunks": [5]}][hello]
+        [length][{"status": 200, "payload": "data", "chunks": [5]}][hello]
+      `chunks` are the sizes of the chunks that follow the header,
+      `payload` is the argument (or response field) they are for and
+      `"list": true` means it is a list of chunks instead of a single one.
+      Data is not base64-encoded and text is encoded with the file
+      encoding. JSON text messages are still accepted from the client.
+
+    Delta transfer:
+      Files opened atomically in "wb" mode can be written by sending only
+      the parts that changed. `block_checksums` returns the sizes and
+      hashes of the blocks of the current file (see `split_blocks`) and its
+      version. `apply_delta` then writes the new file from a list of ops:
+        ["copy", offset, length]  copy bytes of the current file
+        ["data", index]  write the chunk at index of `data`
+      It fails with a 409 (Conflict) status if the file changed after its
+      checksums were computed. The file is replaced when it's closed, as
+      usual. The open response includes `"delta": true` if the server
+      supports this.
+
+    Atomic writes:
+      Files opened with `atomic=true` are written to a temporary file next
+      to them that replaces them when closed. The permission bits of the
+      original file are kept and its owner too if the server is allowed to
+      change it. If the path is a symlink, the file it points to is
+      replaced instead of the link.
     """
 
     LOCK_TIMEOUT = 100  # seconds
@@ -60,6 +178,10 @@ async def open(self):
         self.atomic = self.get_argument("atomic", default="false") == "true"
         lock = self.get_argument("lock", default="false") == "true"
         self.encoding = self.get_argument("encoding", default="utf-8")
+        # Binary frames are only sent after the open response, which is
+        # always JSON so clients can check if the server supports them.
+        binary = self.get_argument("binary", default="false") == "true"
+        self.binary = False
 
         self.file: FileIO = None
         try:
@@ -82,7 +204,8 @@ async def open(self):
             self.log.exception("Error opening file")
             self.close(1002, self._parse_error(e))
         else:
-            await self._send_json(HTTPStatus.OK)
+            await self._send_json(HTTPStatus.OK, binary=binary, delta=True)
+            self.binary = binary
 
     def on_close(self):
         """Close file."""
@@ -98,14 +221,17 @@ async def on_message(self, raw_message):
             await self.handle_message(raw_message)
         except Exception as e:
             self.log.exception("Error handling message")
-            await self.write_message(self._parse_error(e), binary=True)
+            await self._write(self._parse_error(e))
 
     # ----------------------------------------------------------------
     # Internal Helpers
     # ----------------------------------------------------------------
     async def handle_message(self, raw_message):
-        msg = self._decode_json(raw_message)
-        method, kwargs = await self._parse_message(msg)
+        if self.binary and isinstance(raw_message, bytes):
+            method, kwargs = self._parse_frame(raw_message)
+        else:
+            msg = self._decode_json(raw_message)
+            method, kwargs = await self._parse_message(msg)
         await self._run_method(method, kwargs)
 
     async def _open_file(self):
@@ -122,7 +248,21 @@ async def _open_file(self):
     def _close_file(self):
         self.file.close()
         if self.atomic:
-            self.atomic_path.replace(self.path)
+            path = self.path.resolve()
+            try:
+                original = path.stat()
+            except FileNotFoundError:
+                pass
+            else:
+                copymode(path, self.atomic_path)
+                if hasattr(os, "chown"):
+                    try:
+                        os.chown(self.atomic_path, original.st_uid,
+                                 original.st_gid)
+                    except OSError:
+                        # Only root can give files to other users
+                        pass
+            self.atomic_path.replace(path)
 
     async def _run_method(self, method, kwargs):
         """Run a method with kwargs."""
@@ -130,7 +270,12 @@ async def _run_method(self, method, kwargs):
             result = await getattr(self, f"_handle_{method}")(**kwargs)
         except OSError as e:
             self.log.warning("Error handling method: %s", method)
-            await self.write_message(self._parse_os_error(e), binary=True)
+            await self._write(self._parse_os_error(e))
+        except StaleFileError as e:
+            await self._send_json(
+                HTTPStatus.CONFLICT,
+                message=f"File changed while writing it: {e}",
+            )
         else:
             await self._send_result(result)
 
@@ -138,10 +283,23 @@ async def _parse_message(self, msg):
         """Parse a message into method and kwargs."""
         method = msg.pop("method", None)
 
-        if "data" in msg and isinstance(msg["data"], list):
-            msg["data"] = [self._decode_data(d) for d in msg["data"]]
-        elif "data" in msg:
-            msg["data"] = self._decode_data(msg["data"])
+        for key in ("data", "lines"):
+            if key in msg and isinstance(msg[key], list):
+                msg[key] = [self._decode_data(d) for d in msg[key]]
+            elif key in msg:
+                msg[key] = self._decode_data(msg[key])
+
+        return method, msg
+
+    def _parse_frame(self, frame: bytes):
+        """Parse a binary frame into method and kwargs."""
+        msg, chunks = unpack_frame(frame)
+        method = msg.pop("method", None)
+
+        payload = msg.pop("payload", None)
+        if payload is not None:
+            chunks = [self._decode_chunk(chunk) for chunk in chunks]
+            msg[payload] = chunks if msg.pop("list", False) else chunks[0]
 
         return method, msg
 
@@ -170,7 +328,9 @@ def _release_lock(self):
     @property
     def atomic_path(self):
         """Get the path to the atomic file."""
-        return self.path.parent / f".{self.path.name}.spyder.tmp"
+        # Next to the real file, so symlinks are kept when it's replaced
+        path = self.path.resolve()
+        return path.parent / f".{path.name}.spyder.tmp"
 
     @property
     def lock_path(self):
@@ -187,7 +347,13 @@ def _decode_json(self, raw_message):
 
     async def _send_json(self, status: HTTPStatus, **data: dict):
         """Send a single JSON message."""
-        await self.write_message(self._parse_json(status, **data), binary=True)
+        await self._write(self._parse_json(status, **data))
+
+    async def _write(self, message: bytes, chunks: list[bytes] = ()):
+        """Send a JSON message, as the header of a frame if binary."""
+        if self.binary:
+            message = pack_frame(message, chunks)
+        await self.write_message(message, binary=True)
 
     def _parse_json(self, status: HTTPStatus, **data: dict) -> bytes:
         """Parse a single JSON message."""
@@ -219,7 +385,19 @@ async def _send_msg_error(self, message):
         )
 
     async def _send_result(self, result):
-        if result is None:
+        if self.binary and isinstance(result, (bytes, str, list)):
+            many = isinstance(result, list)
+            chunks = [
+                self._encode_chunk(r) for r in (result if many else [result])
+            ]
+            header = self._parse_json(
+                HTTPStatus.OK,
+                payload="data",
+                list=many,
+                chunks=[len(chunk) for chunk in chunks],
+            )
+            await self._write(header, chunks)
+        elif result is None:
             await self._send_json(HTTPStatus.NO_CONTENT)
         elif isinstance(result, list):
             await self._send_json(
@@ -248,6 +426,18 @@ def _encode_data(self, data: bytes | str | object) -> str:
             return base64.b64encode(data.encode(self.encoding)).decode("ascii")
         return data
 
+    def _decode_chunk(self, chunk: memoryview) -> bytes | str:
+        """Decode a raw data chunk from a binary frame."""
+        if "b" in self.mode:
+            return chunk
+        return str(chunk, self.encoding)
+
+    def _encode_chunk(self, data: bytes | str) -> bytes:
+        """Encode data as a raw chunk for a binary frame."""
+        if isinstance(data, str):
+            return data.encode(self.encoding)
+        return data
+
     def _load_path(self, path_str: str) -> Path:
         """Convert path string to a Path object."""
         return Path(path_str).expanduser()
@@ -295,6 +485,77 @@ async def _handle_writelines(self, lines: list[bytes | str]):
         """Write lines to the file."""
         return self.file.writelines(lines)
 
+    async def _handle_block_checksums(self) -> dict:
+        """Get the blocks of the file to send a delta to write it."""
+        if not (self.atomic and "w" in self.mode and "b" in self.mode):
+            # The current file can't be read while writing the new one
+            return {"sizes": [], "hashes": [], "version": None}
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._block_checksums)
+
+    async def _handle_apply_delta(
+        self, ops: list, data: list[bytes], size: int, version: list
+    ) -> int:
+        """Write the file from the current one and the changed blocks."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, self._apply_delta, ops, data, size, version
+        )
+
+    def _file_version(self) -> list[int]:
+        out = self.path.stat()
+        return [out.st_mtime_ns, out.st_size]
+
+    def _block_checksums(self) -> dict:
+        try:
+            version = self._file_version()
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            return {"sizes": [], "hashes": [], "version": None}
+
+        sizes = split_blocks(data)
+        view = memoryview(data)
+        hashes = []
+        start = 0
+        for block_size in sizes:
+            hashes.append(hash_block(view[start:start + block_size]))
+            start += block_size
+
+        return {"sizes": sizes, "hashes": hashes, "version": version}
+
+    def _apply_delta(
+        self, ops: list, data: list[bytes], size: int, version: list
+    ) -> int:
+        if self._file_version() != version:
+            raise StaleFileError(str(self.path))
+
+        written = 0
+        with self.path.open("rb") as current:
+            for op in ops:
+                if op[0] == "copy":
+                    __, offset, length = op
+                    current.seek(offset)
+                    while length > 0:
+                        chunk = current.read(min(length, 1024 * 1024))
+                        if not chunk:
+                            raise StaleFileError(str(self.path))
+                        written += self.file.write(chunk)
+                        length -= len(chunk)
+                elif op[0] == "data":
+                    written += self.file.write(data[op[1]])
+                else:
+                    raise ValueError(f"Unknown delta op: {op[0]}")
+
+        if written != size:
+            raise OSError(
+                errno.EIO,
+                f"Wrote {written} bytes instead of {size}",
+                str(self.path),
+            )
+
+        return written
+
     async def _handle_isatty(self) -> bool:
         """Check if the file is a TTY."""
         return self.file.isatty()
@@ -308,12 +569,184 @@ async def _handle_writable(self) -> bool:
         return self.file.writable()
 
 
+class WatchWebSocketHandler(WebSocketHandler):
+    """
+    WebSocket handler for getting notified of changes in directories.
+
+    Protocol:
+      Client sends JSON messages to start and stop watching directories:
+      {
+        "method": "watch" | "unwatch",  (required)
+        "path": "/path/to/directory"  (required)
+      }
+      Server sends a JSON message when entries of a watched directory are
+      created, deleted, renamed or modified, or when the directory itself is
+      removed:
+      {
+        "path": "/path/to/directory"  (as sent by the client)
+      }
+
+    Directories are polled every WATCH_INTERVAL seconds in a thread. Only
+    the directories themselves are stat'ed on each poll, which is enough to
+    notice entries that are created, deleted or renamed. The entries are
+    stat'ed again when that changes, and otherwise a few directories at a
+    time, up to WATCH_SCAN_ENTRIES entries per poll, to notice modified
+    files. The entries of directories with more than WATCH_MAX_ENTRIES are
+    never stat'ed.
+    """
+
+    WATCH_INTERVAL = 1  # seconds
+    WATCH_MAX_ENTRIES = 5000
+    WATCH_MAX_PATHS = 500
+    WATCH_SCAN_ENTRIES = 2000
+
+    # ----------------------------------------------------------------
+    # Tornado WebSocket / Handler Hooks
+    # ----------------------------------------------------------------
+    async def open(self):
+        """Start polling watched directories."""
+        self.watched: dict[str, typing.Any] = {}
+        self._scan_start = 0
+        self._poll_task = asyncio.create_task(self._poll())
+
+    def on_close(self):
+        """Stop polling watched directories."""
+        self._poll_task.cancel()
+        self.watched.clear()
+
+    async def on_message(self, raw_message):
+        """Handle incoming messages."""
+        self.log.debug("Received message: %s", raw_message)
+        try:
+            msg = orjson.loads(raw_message)
+            method, path = msg["method"], msg["path"]
+            if method == "watch":
+                await self._watch(path)
+            elif method == "unwatch":
+                self.watched.pop(path, None)
+            else:
+                self.log.warning("Unknown watch method: %s", method)
+        except Exception:
+            self.log.exception("Error handling message")
+
+    # ----------------------------------------------------------------
+    # Internal Helpers
+    # ----------------------------------------------------------------
+    async def _watch(self, path: str):
+        if path in self.watched:
+            return
+        if len(self.watched) >= self.WATCH_MAX_PATHS:
+            self.log.warning("Too many watched paths, ignoring: %s", path)
+            return
+
+        loop = asyncio.get_running_loop()
+        self.watched[path] = await loop.run_in_executor(
+            None, self._snapshot, path
+        )
+
+    async def _poll(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.WATCH_INTERVAL)
+            if not self.watched:
+                continue
+
+            snapshots = await loop.run_in_executor(
+                None, self._poll_snapshots, dict(self.watched)
+            )
+            for path, snapshot in snapshots.items():
+                # Skip paths that were unwatched while polling
+                if path not in self.watched:
+                    continue
+                if snapshot != self.watched[path]:
+                    self.watched[path] = snapshot
+                    try:
+                        await self.write_message(
+                            orjson.dumps({"path": path}), binary=True
+                        )
+                    except WebSocketClosedError:
+                        return
+
+    def _poll_snapshots(self, snapshots: dict) -> dict:
+        """Get the new snapshots of watched paths. This runs in a thread."""
+        paths = list(snapshots)
+        new_snapshots = {}
+
+        # Directories whose entries are stat'ed this time. Those without
+        # entries (too large or not readable) are only rescanned when their
+        # state changes.
+        scan = set()
+        scanned = 0
+        start = self._scan_start % len(paths)
+        i = 0
+        while i < len(paths) and scanned < self.WATCH_SCAN_ENTRIES:
+            path = paths[(start + i) % len(paths)]
+            entries = snapshots[path][1]
+            if entries is not None:
+                scan.add(path)
+                scanned += len(entries) + 1
+            i += 1
+        self._scan_start = start + i
+
+        for path, (state, entries) in snapshots.items():
+            new_state = self._stat_path(path)
+            if new_state is None:
+                new_snapshots[path] = (None, None)
+            elif new_state != state or path in scan:
+                new_snapshots[path] = (new_state, self._scan_entries(path))
+            else:
+                new_snapshots[path] = (state, entries)
+
+        return new_snapshots
+
+    def _snapshot(self, path: str):
+        """Get the state of path and its entries to compare it later."""
+        state = self._stat_path(path)
+        if state is None:
+            return (None, None)
+        return (state, self._scan_entries(path))
+
+    def _stat_path(self, path: str):
+        try:
+            out = os.stat(os.path.expanduser(path))
+        except OSError:
+            return None
+        return (out.st_ino, out.st_mtime_ns, out.st_size)
+
+    def _scan_entries(self, path: str):
+        try:
+            with os.scandir(os.path.expanduser(path)) as it:
+                # Not all entries are read for large directories
+                dir_entries = list(
+                    itertools.islice(it, self.WATCH_MAX_ENTRIES + 1)
+                )
+        except OSError:
+            # Not a directory or not readable
+            return None
+
+        if len(dir_entries) > self.WATCH_MAX_ENTRIES:
+            return None
+
+        entries = set()
+        for entry in dir_entries:
+            try:
+                entry_stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            entries.add(
+                (entry.name, entry_stat.st_mtime_ns, entry_stat.st_size)
+            )
+        return frozenset(entries)
+
+
 class FilesRESTMixin:
     """
     REST handler for fsspec-like filesystem operations, using pathlib.Path.
 
     Supports:
-        - fs_ls(path_str, detail=True)
+        - fs_ls(path_str, detail=True, cursor=None, limit=None)
+        - fs_ls_batches(path_str, detail=True, batch_size=LS_BATCH_SIZE,
+                        cursor=None, limit=None)
         - fs_info(path_str)
         - fs_exists(path_str)
         - fs_isfile(path_str)
@@ -324,9 +757,29 @@ class FilesRESTMixin:
         - fs_touch(path_str, truncate=True)
     """
 
-    def _info_for_path(self, path: Path) -> dict:
+    LS_BATCH_SIZE = 1000  # entries
+
+    # Threads used to compress zip files, leaving a core to send them
+    ZIP_MAX_WORKERS = min(4, (os.cpu_count() or 1) - 1)
+
+    # Files that are already compressed, so they are stored as is in zip
+    # files
+    ZIP_STORED_SUFFIXES = frozenset(
+        {
+            ".7z", ".bz2", ".gz", ".jar", ".lz4", ".tgz", ".whl", ".xz",
+            ".zip", ".zst",
+            ".gif", ".heic", ".jpeg", ".jpg", ".png", ".webp",
+            ".avi", ".flac", ".m4a", ".mkv", ".mov", ".mp3", ".mp4", ".ogg",
+            ".webm",
+            ".parquet",
+        }
+    )
+
+    def _info_for_path(
+        self, path: Path, lstat: os.stat_result | None = None
+    ) -> dict:
         """Get fsspec-like info about a single path."""
-        out = path.stat(follow_symlinks=False)
+        out = path.stat(follow_symlinks=False) if lstat is None else lstat
         link = stat.S_ISLNK(out.st_mode)
         if link:
             # If it's a link, stat the target
@@ -356,8 +809,35 @@ def _load_path(self, path_str: str) -> Path | None:
         """Convert a path string to a pathlib.Path object."""
         return Path(path_str).expanduser()
 
-    def fs_ls(self, path_str: str, detail: bool = True):
+    def fs_ls(
+        self,
+        path_str: str,
+        detail: bool = True,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ):
         """List objects at path, like fsspec.ls()."""
+        for batch in self.fs_ls_batches(
+            path_str, detail, cursor=cursor, limit=limit
+        ):
+            yield from batch
+
+    def fs_ls_batches(
+        self,
+        path_str: str,
+        detail: bool = True,
+        batch_size: int = LS_BATCH_SIZE,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ):
+        """
+        List objects at path in batches of at most batch_size entries.
+
+        Directory entries are sorted by name, so a listing can be continued
+        by passing the name of the last entry received as cursor. Only up to
+        limit entries after cursor are listed, if given. Entries are only
+        stat'ed when their batch is requested.
+        """
         path = self._load_path(path_str)
         if not path.exists():
             raise FileNotFoundError(errno.ENOENT,
@@ -366,17 +846,36 @@ def fs_ls(self, path_str: str, detail: bool = True):
         if path.is_file():
             # fsspec.ls of a file often returns a single entry
             if detail:
-                yield self._info_for_path(path)
+                yield [self._info_for_path(path)]
             else:
-                yield str(path)
+                yield [str(path)]
             return
 
         # Otherwise, it's a directory
-        for p in path.glob("*"):
-            if detail:
-                yield self._info_for_path(p)
-            else:
-                yield str(p)
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        names = [entry.name for entry in entries]
+
+        start = 0
+        if cursor is not None:
+            start = bisect.bisect_right(names, cursor)
+        stop = len(entries) if limit is None else start + limit
+
+        for i in range(start, min(stop, len(entries)), batch_size):
+            batch = []
+            for entry in entries[i:min(i + batch_size, stop)]:
+                p = path / entry.name
+                if not detail:
+                    batch.append(str(p))
+                    continue
+
+                try:
+                    lstat = entry.stat(follow_symlinks=False)
+                    batch.append(self._info_for_path(p, lstat))
+                except FileNotFoundError:
+                    # Removed after the directory was scanned
+                    continue
+            yield batch
 
     def fs_info(self, path_str: str):
         """Get info about a single path, like fsspec.info()."""
@@ -461,22 +960,36 @@ def fs_zip_dir(
         path_str: str,
         compression: int = 9,
         chunk_size: int = 65536,
+        max_workers: int | None = None,
     ):
-        """Stream compressed directory content."""
+        """
+        Stream compressed directory content.
+
+        Files are compressed in up to max_workers threads, ZIP_MAX_WORKERS
+        by default. Already compressed files are stored without compressing
+        them again.
+        """
         path = self._load_path(path_str)
+        if max_workers is None:
+            max_workers = self.ZIP_MAX_WORKERS
 
         zip_files = []
         for p in path.glob("**/*"):
             if p.is_file():
                 arcname = p.relative_to(path)
+                out = p.stat()
                 zip_files.append(
                     MemberFile(
                         name=str(arcname),
-                        modified_at=datetime.datetime.fromtimestamp(p.stat().st_mtime),
+                        modified_at=datetime.datetime.fromtimestamp(out.st_mtime),
                         data=p.open("rb"),
-                        mode=0x7777 & p.stat().st_mode,
-                        size=p.stat().st_size,
-                        method=CompressionType.ZIP_64,
+                        mode=0x7777 & out.st_mode,
+                        size=out.st_size,
+                        method=(
+                            CompressionType.STORED_64
+                            if p.suffix.lower() in self.ZIP_STORED_SUFFIXES
+                            else CompressionType.ZIP_64
+                        ),
                     )
                 )
 
@@ -489,6 +1002,7 @@ def fs_zip_dir(
                         wbits=-zlib.MAX_WBITS, level=compression,
                     ),
                     chunk_size=chunk_size,
+                    max_workers=max(max_workers, 0),
                 )
         finally:
             for f in zip_files:
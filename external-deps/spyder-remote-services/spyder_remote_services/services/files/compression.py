@@ -1,8 +1,11 @@
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 import enum
+import queue
 from struct import Struct
+import threading
 from typing import (
     Any,
     BinaryIO,
@@ -24,6 +27,10 @@ class CompressionType(enum.Enum):
     NO_COMPRESSION_BUFFERED_64 = enum.auto()
     NO_COMPRESSION_STREAMED_32 = enum.auto()
     NO_COMPRESSION_STREAMED_64 = enum.auto()
+    # Not compressed, with the CRC32 and sizes in a data descriptor, so
+    # neither has to be known in advance
+    STORED_32 = enum.auto()
+    STORED_64 = enum.auto()
 
 
 @dataclass(frozen=True)
@@ -76,8 +83,24 @@ class ZipStream:
         CompressionType.NO_COMPRESSION_BUFFERED_32: 0,
         CompressionType.NO_COMPRESSION_STREAMED_64: 0,
         CompressionType.NO_COMPRESSION_STREAMED_32: 0,
+        CompressionType.STORED_64: 0,
+        CompressionType.STORED_32: 0,
     }
 
+    # Methods whose data can be compressed ahead in parallel
+    parallel_methods = frozenset(
+        (
+            CompressionType.ZIP_64,
+            CompressionType.ZIP_32,
+            CompressionType.STORED_64,
+            CompressionType.STORED_32,
+        )
+    )
+
+    # Chunks that each member can have ready before it is written, when
+    # compressing in parallel
+    read_ahead_chunks = 16
+
     def __init__(
         self,
         files: Iterable[MemberFile],
@@ -87,12 +110,22 @@ def __init__(
         ),
         extended_timestamps: bool = True,
         auto_upgrade_central_directory: bool = True,
+        max_workers: int = 0,
     ):
+        """
+        Stream a zip file of files.
+
+        If max_workers is not 0, up to that many ZIP_* and STORED_* members
+        are read and compressed ahead in a thread pool, since zlib releases
+        the GIL. Members are still written in order and each of them can
+        only have read_ahead_chunks chunks ready, so memory is bounded.
+        """
         self.files = files
         self.chunk_size = chunk_size
         self.get_compressobj = get_compressobj
         self.extended_timestamps = extended_timestamps
         self.auto_upgrade_central_directory = auto_upgrade_central_directory
+        self.max_workers = max_workers
 
         self.offset = 0
         self.central_directory: Deque[Tuple[bytes, bytes, bytes]] = deque()
@@ -107,6 +140,8 @@ def __init__(
             CompressionType.NO_COMPRESSION_BUFFERED_32: self._no_compression_32_local_header_and_data,
             CompressionType.NO_COMPRESSION_STREAMED_64: self._no_compression_streamed_64_local_header_and_data,
             CompressionType.NO_COMPRESSION_STREAMED_32: self._no_compression_streamed_32_local_header_and_data,
+            CompressionType.STORED_64: self._zip_64_local_header_and_data,
+            CompressionType.STORED_32: self._zip_32_local_header_and_data,
         }
 
     def __iter__(self) -> Iterator[bytes]:
@@ -154,7 +189,7 @@ def _raise_if_beyond(
             raise exception_class()
 
     def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
-        for memberfile in self.files:
+        for memberfile, chunks in self._members_and_chunks():
             name_encoded = memberfile.name.encode("utf-8")
             self._raise_if_beyond(
                 len(name_encoded),
@@ -200,7 +235,7 @@ def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
                 memberfile.size,
                 memberfile.crc32,
                 crc_32_mask,
-                self.io_to_chunks(memberfile.data),
+                chunks,
             )
             self.central_directory_size += (
                 len(self.central_directory_header_signature)
@@ -227,6 +262,7 @@ def get_zipped_chunks_uneven(self) -> Iterable[bytes]:
                     CompressionType.ZIP_64,
                     CompressionType.NO_COMPRESSION_BUFFERED_64,
                     CompressionType.NO_COMPRESSION_STREAMED_64,
+                    CompressionType.STORED_64,
                 )
             )
 
@@ -301,6 +337,82 @@ def io_to_chunks(self, data: BinaryIO) -> Iterable[bytes]:
         while chunk := data.read(self.chunk_size):
             yield chunk
 
+    def _members_and_chunks(
+        self,
+    ) -> Iterable[Tuple[MemberFile, Iterable[bytes]]]:
+        """Yield members with the chunks of their data, in order."""
+        if not self.max_workers:
+            for memberfile in self.files:
+                yield memberfile, self.io_to_chunks(memberfile.data)
+            return
+
+        stop = threading.Event()
+        pending: Deque[Tuple[MemberFile, Iterable[bytes]]] = deque()
+        files = iter(self.files)
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            try:
+                while True:
+                    # At most max_workers members are in progress, so all of
+                    # them have a thread and none waits for another
+                    while len(pending) < self.max_workers:
+                        memberfile = next(files, None)
+                        if memberfile is None:
+                            break
+                        pending.append(
+                            (memberfile,
+                             self._submit_member(executor, memberfile, stop))
+                        )
+
+                    if not pending:
+                        break
+                    yield pending.popleft()
+            finally:
+                # Unblock workers if the stream is not consumed to the end
+                stop.set()
+
+    def _submit_member(
+        self,
+        executor: ThreadPoolExecutor,
+        memberfile: MemberFile,
+        stop: threading.Event,
+    ) -> Iterable[bytes]:
+        if memberfile.method not in self.parallel_methods:
+            # Other methods need the data before their header
+            return self.io_to_chunks(memberfile.data)
+
+        chunks = _CompressedChunks(self.read_ahead_chunks, stop)
+        executor.submit(
+            self._compress_member,
+            memberfile.data,
+            self.raw_compression[memberfile.method],
+            chunks,
+        )
+        return chunks
+
+    def _compress_member(
+        self, data: BinaryIO, compression: int, chunks: "_CompressedChunks"
+    ) -> None:
+        """Read and compress a member. This runs in a thread."""
+        try:
+            compress_obj = self.get_compressobj() if compression else None
+            crc_32 = zlib.crc32(b"")
+            for chunk in self.io_to_chunks(data):
+                crc_32 = zlib.crc32(chunk, crc_32)
+                chunks.put(
+                    len(chunk),
+                    compress_obj.compress(chunk) if compress_obj else chunk,
+                )
+            if compress_obj:
+                chunks.put(0, compress_obj.flush())
+            chunks.finish(crc_32)
+        except _Stopped:
+            pass
+        except BaseException as e:
+            try:
+                chunks.finish(error=e)
+            except _Stopped:
+                pass
+
     def write_zip64_end_of_central_directory(self) -> Iterable[bytes]:
         central_directory_end_offset = self.offset
 
@@ -350,10 +462,31 @@ def _zip_data(
         chunks: Iterable[bytes],
         max_uncompressed_size: int,
         max_compressed_size: int,
+        compression: int = 8,
     ) -> Generator[bytes, None, Tuple[int, int, int]]:
+        if isinstance(chunks, _CompressedChunks):
+            return (
+                yield from self._zip_compressed_data(
+                    chunks, max_uncompressed_size, max_compressed_size
+                )
+            )
+
         uncompressed_size = 0
         compressed_size = 0
         crc_32 = zlib.crc32(b"")
+        if not compression:
+            # Stored, so the data is written as is
+            for chunk in chunks:
+                uncompressed_size += len(chunk)
+                self._raise_if_beyond(
+                    uncompressed_size,
+                    maximum=max_uncompressed_size,
+                    exception_class=UncompressedSizeOverflowError,
+                )
+                crc_32 = zlib.crc32(chunk, crc_32)
+                yield from self.write_chunk(chunk)
+            return uncompressed_size, uncompressed_size, crc_32
+
         compress_obj = self.get_compressobj()
         for chunk in chunks:
             uncompressed_size += len(chunk)
@@ -389,6 +522,34 @@ def _zip_data(
 
         return uncompressed_size, compressed_size, crc_32
 
+    def _zip_compressed_data(
+        self,
+        chunks: "_CompressedChunks",
+        max_uncompressed_size: int,
+        max_compressed_size: int,
+    ) -> Generator[bytes, None, Tuple[int, int, int]]:
+        """Write the data of a member compressed in a thread."""
+        uncompressed_size = 0
+        compressed_size = 0
+        for size, compressed_chunk in chunks:
+            uncompressed_size += size
+            self._raise_if_beyond(
+                uncompressed_size,
+                maximum=max_uncompressed_size,
+                exception_class=UncompressedSizeOverflowError,
+            )
+
+            compressed_size += len(compressed_chunk)
+            self._raise_if_beyond(
+                compressed_size,
+                maximum=max_compressed_size,
+                exception_class=CompressedSizeOverflowError,
+            )
+
+            yield from self.write_chunk(compressed_chunk)
+
+        return uncompressed_size, compressed_size, chunks.crc_32
+
     def _zip_64_local_header_and_data(
         self,
         compression: int,
@@ -443,7 +604,7 @@ def _zip_64_local_header_and_data(
             raw_compressed_size,
             crc_32,
         ) = yield from self._zip_data(
-            chunks, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF
+            chunks, 0xFFFFFFFFFFFFFFFF, 0xFFFFFFFFFFFFFFFF, compression
         )
 
         compressed_size = raw_compressed_size
@@ -536,7 +697,9 @@ def _zip_32_local_header_and_data(
             uncompressed_size,
             raw_compressed_size,
             crc_32,
-        ) = yield from self._zip_data(chunks, 0xFFFFFFFF, 0xFFFFFFFF)
+        ) = yield from self._zip_data(
+            chunks, 0xFFFFFFFF, 0xFFFFFFFF, compression
+        )
 
         compressed_size = raw_compressed_size
 
@@ -950,6 +1113,51 @@ def _no_compression_streamed_data(
             raise UncompressedSizeIntegrityError()
 
 
+class _Stopped(Exception):
+    """The stream was closed before a member was written."""
+
+
+class _CompressedChunks:
+    """
+    Chunks of a member compressed in a thread, with the size of their
+    uncompressed data.
+
+    Iterating blocks until the thread puts the next chunk. The thread blocks
+    when there are maxsize chunks that were not written yet.
+    """
+
+    def __init__(self, maxsize: int, stop: threading.Event):
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._stop = stop
+        self.crc_32 = None
+
+    def put(self, size: int, chunk: bytes) -> None:
+        self._put((size, chunk))
+
+    def finish(self, crc_32: int = 0, error: BaseException = None) -> None:
+        self._put((None, error if error is not None else crc_32))
+
+    def _put(self, item) -> None:
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        while True:
+            size, data = self._queue.get()
+            if size is None:
+                if isinstance(data, BaseException):
+                    raise data
+                self.crc_32 = data
+                return
+            yield size, data
+
+
 class ZipError(Exception):
     pass
 
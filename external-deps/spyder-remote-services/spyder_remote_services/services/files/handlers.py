@@ -1,4 +1,5 @@
 from __future__ import annotations
+import asyncio
 from contextlib import asynccontextmanager
 from http import HTTPStatus
 from http.client import responses
@@ -15,6 +16,7 @@
 from spyder_remote_services.services.files.base import (
     FilesRESTMixin,
     FileWebSocketHandler,
+    WatchWebSocketHandler,
 )
 
 
@@ -60,6 +62,19 @@ async def get(self, *args, **kwargs):
         await super().get(*args, **kwargs)
 
 
+class WatchHandler(
+    WebSocketMixin,
+    WatchWebSocketHandler,
+    JupyterHandler,
+):
+    auth_resource = "spyder-services"
+
+    @ws_authenticated
+    async def get(self, *args, **kwargs):
+        """Handle the initial websocket upgrade GET request."""
+        await super().get(*args, **kwargs)
+
+
 class BaseFSHandler(FilesRESTMixin, JupyterHandler):
     auth_resource = "spyder-services"
 
@@ -101,8 +116,8 @@ def write_json(self, data, status=200):
     async def stream_json(self, status=200):
         self.set_status(status)
         self.set_header("Content-Type", "application/stream+json")
-        async def write_json(data):
-            self.write(orjson.dumps(data) + b"\n")
+        async def write_json(*data):
+            self.write(b"".join(orjson.dumps(d) + b"\n" for d in data))
             await self.flush()
         yield write_json
         await self.finish()
@@ -161,9 +176,29 @@ async def get(self):
         detail_arg = self.get_argument("detail", default="true").lower()
         detail = detail_arg == "true"
         path = self.get_path_argument("path")
+        batch_size = int(
+            self.get_argument("batch_size", default=str(self.LS_BATCH_SIZE))
+        )
+        cursor = self.get_argument("cursor", default=None)
+        limit = self.get_argument("limit", default=None)
+        if limit is not None:
+            limit = int(limit)
+
+        # Scanning and stat'ing large directories is slow, so it's done in a
+        # thread to not block the server.
+        batches = self.fs_ls_batches(
+            path,
+            detail=detail,
+            batch_size=max(batch_size, 1),
+            cursor=cursor,
+            limit=limit,
+        )
+        loop = asyncio.get_running_loop()
         async with self.stream_json() as write_json:
-            for result in self.fs_ls(path, detail=detail):
-                await write_json(result)
+            while (
+                batch := await loop.run_in_executor(None, next, batches, None)
+            ) is not None:
+                await write_json(*batch)
 
 class InfoHandler(BaseFSHandler):
     @web.authenticated
@@ -266,8 +301,13 @@ class ZipHandler(BaseFSHandler):
     def post(self):
         path = self.get_path_argument("path")
         compression = int(self.get_argument("compression", "0"))
+        max_workers = self.get_argument("max_workers", default=None)
+        if max_workers is not None:
+            max_workers = int(max_workers)
 
-        with self.fs_zip_dir(path, compression=compression) as zip_stream:
+        with self.fs_zip_dir(
+            path, compression=compression, max_workers=max_workers
+        ) as zip_stream:
             if zip_stream is None:
                 raise web.HTTPError(
                     HTTPStatus.BAD_REQUEST,
@@ -287,6 +327,7 @@ def post(self):
 
 handlers = [
     (r"/fs/open", ReadWriteWebsocketHandler),  # WebSocket
+    (r"/fs/watch", WatchHandler),              # WebSocket
     (r"/fs/ls", LsHandler),                  # GET
     (r"/fs/info", InfoHandler),              # GET
     (r"/fs/exists", ExistsHandler),          # GET
@@ -91,6 +91,7 @@
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.qthelpers import file_uri, qapplication, start_file
 from spyder.utils.stylesheet import APP_STYLESHEET
+from spyder.utils.vcs_status import close_vcs_status_service
 
 # Spyder API Imports
 from spyder.api.exceptions import SpyderAPIError
@@ -1176,6 +1177,9 @@ def closing(self, cancelable=False, close_immediately=False):
 
         self.already_closed = True
 
+        # Stop getting Git statuses for the Editor and Files
+        close_vcs_status_service()
+
         if self.get_conf('single_instance') and self.open_files_server:
             self.open_files_server.close()
 
@@ -345,6 +345,8 @@
               'type_column': False,
               'date_column': False,
               'search_files_in_switcher': True,
+              'native_file_watcher': True,
+              'watcher_ignore_patterns': ['.*', '__pycache__', 'build'],
               }),
             ('explorer',
              {
@@ -372,6 +374,9 @@
               'case_sensitive': False,
               'exclude_case_sensitive': False,
               'max_results': 1000,
+              'project_index': True,
+              'use_ignore_files': True,
+              'max_file_size': 10,
               }),
             ('completions',
              {
@@ -16,6 +16,7 @@
 import os
 import os.path as osp
 import pathlib
+import pickle
 import signal
 import sys
 import time
@@ -37,6 +38,8 @@
     ClientConstants)
 from spyder.plugins.completion.providers.languageserver.decorators import (
     send_request, send_notification, class_register, handles)
+from spyder.plugins.completion.providers.languageserver.metrics import (
+    LSPMetrics)
 from spyder.plugins.completion.providers.languageserver.transport import (
     MessageKind)
 from spyder.plugins.completion.providers.languageserver.providers import (
@@ -135,6 +138,10 @@ def __init__(self, parent,
         # Save requests name and id. This is only necessary for testing.
         self._requests = []
 
+        # Latency, payload size and in-flight metrics of the messages
+        # exchanged with the server.
+        self.metrics = LSPMetrics()
+
     def _get_log_filename(self, kind):
         """
         Get filename to redirect server or transport logs to in
@@ -337,6 +344,9 @@ def start_transport(self):
 
     def start(self):
         """Start client."""
+        # Requests sent to a previous server won't get a response
+        self.metrics.reset()
+
         # NOTE: DO NOT change the order in which these methods are called.
         self.create_transport_sockets()
         self.start_server()
@@ -460,6 +470,10 @@ def send(self, method, params, kind):
         if running_under_pytest():
             self._requests.append((_id, method))
 
+        # Serialize the message here instead of using send_pyobj to know
+        # its size.
+        data = pickle.dumps(msg, pickle.DEFAULT_PROTOCOL)
+
         # Try sending a message. If the send queue is full, keep trying for a
         # a second before giving up.
         timeout = 1
@@ -467,7 +481,11 @@ def send(self, method, params, kind):
         timeout_time = start_time + timeout
         while True:
             try:
-                self.zmq_out_socket.send_pyobj(msg, flags=zmq.NOBLOCK)
+                self.zmq_out_socket.send(data, flags=zmq.NOBLOCK)
+                if kind == MessageKind.REQUEST:
+                    self.metrics.request_sent(_id, method, len(data))
+                else:
+                    self.metrics.notification_sent(method, len(data))
                 self.request_seq += 1
                 return int(_id)
             except zmq.error.Again:
@@ -486,7 +504,15 @@ def on_msg_received(self):
         while True:
             try:
                 # events = self.zmq_in_socket.poll(1500)
-                resp = self.zmq_in_socket.recv_pyobj(flags=zmq.NOBLOCK)
+                data = self.zmq_in_socket.recv(flags=zmq.NOBLOCK)
+                resp = pickle.loads(data)
+
+                if 'method' in resp:
+                    self.metrics.notification_received(
+                        resp['method'], len(data))
+                elif 'id' in resp:
+                    self.metrics.response_received(
+                        resp['id'], len(data), error='error' in resp)
 
                 try:
                     method = resp['method']
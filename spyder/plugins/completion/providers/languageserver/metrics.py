@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Latency and throughput metrics for Language Server Protocol requests.
+
+These are collected by the LSP client (time spent in the transport and the
+server) and the provider (time spent since the completion plugin sent a
+request), and shown in the LSP diagnostics dialog.
+"""
+
+# Standard library imports
+from collections import deque, OrderedDict
+import json
+import time
+
+
+# Requests without a response after this many seconds are counted as timed
+# out if no timeout is given
+MAX_PENDING_TIME = 60
+
+# Maximum number of timed out requests kept to record late responses
+MAX_EXPIRED = 1000
+
+
+class MethodMetrics:
+    """Metrics collected for a single LSP method."""
+
+    # Maximum number of latency samples kept to compute percentiles
+    MAX_SAMPLES = 1000
+
+    def __init__(self):
+        self.count = 0
+        self.in_flight = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.max_bytes_sent = 0
+        self.max_bytes_received = 0
+        self.latencies = deque(maxlen=self.MAX_SAMPLES)
+
+    def percentile(self, percent):
+        """Return the given latency percentile in milliseconds."""
+        if not self.latencies:
+            return None
+        samples = sorted(self.latencies)
+        index = min(len(samples) - 1, int(len(samples) * percent / 100))
+        return round(samples[index] * 1000, 2)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'in_flight': self.in_flight,
+            'timeouts': self.timeouts,
+            'errors': self.errors,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'max_bytes_sent': self.max_bytes_sent,
+            'max_bytes_received': self.max_bytes_received,
+        }
+
+
+class LSPMetrics:
+    """
+    Per-method latency histograms, in-flight counts, payload sizes and
+    timeout counts.
+
+    Requests are tracked by an arbitrary hashable key (e.g. the request id)
+    between calls to `request_sent` and `response_received`. Requests that
+    don't get a response in time are counted as timed out and stop being
+    tracked as in flight, so requests that never get one don't accumulate.
+    """
+
+    def __init__(self, timeout=None, clock=time.perf_counter):
+        """
+        Parameters
+        ----------
+        timeout: float, optional
+            Time in seconds after which a response is counted as timed out.
+        clock: callable, optional
+            Function that returns the current time in seconds.
+        """
+        self.timeout = timeout
+        self.clock = clock
+        self.methods = {}
+        self._pending = {}
+        self._expired = OrderedDict()
+
+    def _get(self, method):
+        if method not in self.methods:
+            self.methods[method] = MethodMetrics()
+        return self.methods[method]
+
+    def _expire(self):
+        """Count requests without a response in time as timed out."""
+        timeout = self.timeout
+        if timeout is None:
+            timeout = MAX_PENDING_TIME
+        limit = self.clock() - timeout
+
+        # Requests are kept in the order they were sent
+        while self._pending:
+            key, (method, start) = next(iter(self._pending.items()))
+            if start >= limit:
+                break
+
+            del self._pending[key]
+            metrics = self._get(method)
+            metrics.in_flight -= 1
+            metrics.timeouts += 1
+
+            # Keep it to record its latency if its response arrives later
+            self._expired[key] = (method, start)
+            if len(self._expired) > MAX_EXPIRED:
+                self._expired.popitem(last=False)
+
+    def request_sent(self, key, method, size=0):
+        """Register that a request was sent."""
+        metrics = self._get(method)
+        metrics.in_flight += 1
+        metrics.bytes_sent += size
+        metrics.max_bytes_sent = max(metrics.max_bytes_sent, size)
+        self._pending[key] = (method, self.clock())
+        self._expire()
+
+    def response_received(self, key, size=0, error=False):
+        """
+        Register the response to a request.
+
+        Returns the request latency in seconds, or None if the request was
+        not being tracked.
+        """
+        self._expire()
+        if key in self._pending:
+            method, start = self._pending.pop(key)
+            timed_out = False
+        elif key in self._expired:
+            method, start = self._expired.pop(key)
+            timed_out = True
+        else:
+            return None
+
+        latency = self.clock() - start
+
+        metrics = self._get(method)
+        if not timed_out:
+            metrics.in_flight -= 1
+        metrics.count += 1
+        metrics.bytes_received += size
+        metrics.max_bytes_received = max(metrics.max_bytes_received, size)
+        metrics.latencies.append(latency)
+        if error:
+            metrics.errors += 1
+        if (
+            not timed_out
+            and self.timeout is not None
+            and latency > self.timeout
+        ):
+            metrics.timeouts += 1
+
+        return latency
+
+    def notification_sent(self, method, size=0):
+        """Register a notification sent to the server."""
+        metrics = self._get(method)
+        metrics.count += 1
+        metrics.bytes_sent += size
+        metrics.max_bytes_sent = max(metrics.max_bytes_sent, size)
+
+    def notification_received(self, method, size=0):
+        """Register a notification or request sent by the server."""
+        metrics = self._get(method)
+        metrics.count += 1
+        metrics.bytes_received += size
+        metrics.max_bytes_received = max(metrics.max_bytes_received, size)
+
+    def in_flight(self):
+        """Total number of requests waiting for a response."""
+        self._expire()
+        return len(self._pending)
+
+    def reset(self):
+        """Discard all collected metrics."""
+        self.methods = {}
+        self._pending = {}
+        self._expired = OrderedDict()
+
+    def to_dict(self):
+        return {
+            'in_flight': self.in_flight(),
+            'methods': {
+                method: metrics.to_dict()
+                for method, metrics in sorted(self.methods.items())
+            }
+        }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
@@ -11,13 +11,14 @@
 
 # Standard library imports
 import functools
+import json
 import logging
 import os
 import os.path as osp
 import sys
 
 # Third-party imports
-from qtpy.QtCore import Signal, Slot, QTimer
+from qtpy.QtCore import QProcess, Signal, Slot, QTimer
 from qtpy.QtWidgets import QMessageBox
 from qtpy import PYSIDE2, PYSIDE6
 from superqt.utils import qdebounced
@@ -33,9 +34,12 @@
                                            WorkspaceUpdateKind)
 from spyder.plugins.completion.providers.languageserver.client import LSPClient
 from spyder.plugins.completion.providers.languageserver.conftabs import TABS
+from spyder.plugins.completion.providers.languageserver.metrics import (
+    LSPMetrics)
 from spyder.plugins.completion.providers.languageserver.widgets import (
     ClientStatus, LSPStatusWidget, ServerDisabledMessageBox)
-from spyder.utils.introspection.module_completion import PREFERRED_MODULES
+from spyder.utils.introspection.module_completion import (
+    get_module_cache_command, load_missing_modules, PREFERRED_MODULES)
 
 
 # Modules to be preloaded for Rope and Jedi
@@ -136,6 +140,10 @@ def __init__(self, parent, config):
         # To keep track of the current interpreter used for completions
         self._interpreter = sys.executable
 
+        # Process that updates the cache of modules importable from the
+        # current interpreter
+        self._module_cache_process = None
+
         self.clients = {}
         self.clients_restart_count = {}
         self.clients_restart_timers = {}
@@ -148,6 +156,12 @@ def __init__(self, parent, config):
         self.show_no_external_server_warning = True
         self.current_project_path = None
 
+        # Latency metrics of the requests sent by the completion plugin,
+        # per language.
+        self.metrics = {}
+        self.wait_for_ms = self.get_conf(
+            'completions_wait_for_ms', default=200, section='completions')
+
         # Status bar widget
         self.STATUS_BAR_CLASSES = [
             self.create_statusbar
@@ -530,10 +544,14 @@ def register_client_instance(self, instance):
             self.sig_language_completions_available)
 
     def start(self):
+        self.update_module_cache()
         self.sig_provider_ready.emit(self.COMPLETION_PROVIDER_NAME)
 
     def shutdown(self):
         logger.info("Shutting down LSP manager...")
+        if self._module_cache_process is not None:
+            self._module_cache_process.kill()
+            self._module_cache_process.waitForFinished(1000)
         for language in self.clients:
             self.stop_completion_services_for_language(language)
 
@@ -574,6 +592,75 @@ def interpreter_changed(self, interpreter: str):
             logger.debug(f"LSP interpreter changed to {interpreter}")
             self._interpreter = interpreter
             self.update_lsp_configuration(python_only=True)
+            self.update_module_cache()
+
+    def update_module_cache(self):
+        """
+        Update the cache of modules importable from the current interpreter
+        in a background process.
+
+        The cache saved by a previous session is used until this finishes.
+        """
+        process = self._module_cache_process
+        if process is not None and process.state() != QProcess.NotRunning:
+            # Update the cache of the new interpreter instead
+            process.finished.disconnect()
+            process.kill()
+            process.waitForFinished(1000)
+
+        command = get_module_cache_command(
+            self._interpreter,
+            check_modules=sorted(
+                {module.split('.')[0] for module in self._get_conf_preload()}
+            )
+        )
+        process = QProcess(self)
+        process.setProgram(command[0])
+        process.setArguments(command[1:])
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.setStandardOutputFile(QProcess.nullDevice())
+        process.finished.connect(self._on_module_cache_updated)
+        self._module_cache_process = process
+
+        logger.debug(f"Updating module cache of {self._interpreter}")
+        process.start()
+
+    def _on_module_cache_updated(self, exit_code=None, exit_status=None):
+        """Send the modules to preload to the server if they changed."""
+        logger.debug(f"Module cache of {self._interpreter} updated")
+        self._module_cache_process = None
+
+        python_client = self.clients.get('python')
+        if python_client is None:
+            return
+
+        preload = python_client['config']['configurations']['pylsp'][
+            'plugins']['preload']['modules']
+        if preload != self.get_preload_modules():
+            self.update_lsp_configuration(python_only=True)
+
+    def get_preload_modules(self):
+        """
+        Get the modules to preload in the Python server that can be imported
+        from the current interpreter.
+
+        Only modules whose top-level package was found missing when updating
+        the module cache are left out, so all the modules set in Preferences
+        are returned until then.
+        """
+        missing = set(load_missing_modules(self._interpreter))
+        return ', '.join(
+            module for module in self._get_conf_preload()
+            if module.split('.')[0] not in missing
+        )
+
+    def _get_conf_preload(self):
+        """Get the list of modules to preload set in Preferences."""
+        return [
+            module.strip()
+            for module in self.get_conf('preload_modules').split(',')
+            if module.strip()
+        ]
 
     def file_opened_closed_or_updated(self, filename: str, language: str):
         self.sig_call_statusbar.emit(
@@ -593,6 +680,12 @@ def on_pyls_spyder_configuration_change(self, option, value):
     def on_code_snippets_enabled_disabled(self, value):
         self.update_lsp_configuration()
 
+    @on_conf_change(section='completions', option='completions_wait_for_ms')
+    def on_wait_for_ms_update(self, value):
+        self.wait_for_ms = value
+        for metrics in self.metrics.values():
+            metrics.timeout = value / 1000
+
     @on_conf_change(
         section='pythonpath_manager',
         option=['spyder_pythonpath', 'prioritize']
@@ -684,6 +777,7 @@ def stop_completion_services_for_language(self, language):
     def receive_response(self, response_type, response, language, req_id):
         if req_id in self.requests:
             self.requests.discard(req_id)
+            self.get_metrics_collector(language).response_received(req_id)
             self.sig_response_ready.emit(
                 self.COMPLETION_PROVIDER_NAME, req_id, response)
 
@@ -692,6 +786,8 @@ def send_request(self, language, request, params, req_id):
             language_client = self.clients[language]
             if language_client['status'] == self.RUNNING:
                 self.requests.add(req_id)
+                self.get_metrics_collector(language).request_sent(
+                    req_id, request)
                 client = self.clients[language]['instance']
                 params['response_callback'] = functools.partial(
                     self.receive_response, language=language, req_id=req_id)
@@ -707,6 +803,51 @@ def send_notification(self, language, request, params):
                 client = self.clients[language]['instance']
                 client.perform_request(request, params)
 
+    # --- Metrics
+    def get_metrics_collector(self, language):
+        """Get the object that collects request metrics for `language`."""
+        if language not in self.metrics:
+            self.metrics[language] = LSPMetrics(
+                timeout=self.wait_for_ms / 1000)
+        return self.metrics[language]
+
+    def get_metrics(self, language):
+        """
+        Get latency, in-flight, payload size and timeout metrics for the
+        requests sent to the `language` server.
+
+        Returns
+        -------
+        dict
+            Metrics collected by the provider (time since the completion
+            plugin sent a request until its response was received) and by
+            the client (round trip through the transport and the server).
+        """
+        metrics = {
+            'language': language,
+            'timeout_ms': self.wait_for_ms,
+            'provider': self.get_metrics_collector(language).to_dict(),
+            'client': None
+        }
+
+        instance = self.clients.get(language, {}).get('instance')
+        if instance is not None:
+            metrics['client'] = instance.metrics.to_dict()
+
+        return metrics
+
+    def export_metrics(self, language, filename):
+        """Save the metrics for `language` as JSON to `filename`."""
+        with open(filename, 'w') as f:
+            json.dump(self.get_metrics(language), f, indent=2)
+
+    def reset_metrics(self, language):
+        """Discard the metrics collected for `language`."""
+        self.get_metrics_collector(language).reset()
+        instance = self.clients.get(language, {}).get('instance')
+        if instance is not None:
+            instance.metrics.reset()
+
     def broadcast_notification(self, request, params):
         """Send notification/request to all available LSP servers."""
         language = params.pop('language', None)
@@ -898,7 +1039,7 @@ def generate_python_config(self):
         plugins['jedi_completion'].update(jedi_completion)
         plugins['jedi_signature_help'].update(jedi_signature_help)
         plugins['jedi_definition'].update(jedi_definition)
-        plugins['preload']['modules'] = self.get_conf('preload_modules')
+        plugins['preload']['modules'] = self.get_preload_modules()
         for fmt in formatters:
             plugins[fmt].update(formatter_options[fmt])
 
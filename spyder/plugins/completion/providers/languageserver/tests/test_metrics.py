@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the LSP metrics collector."""
+
+# Standard library imports
+import json
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.providers.languageserver.metrics import (
+    LSPMetrics, MAX_PENDING_TIME)
+
+
+class FakeClock:
+    """Clock that only moves forward when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_latency_percentiles_and_timeouts():
+    """Test latencies, in-flight counts and timeouts."""
+    clock = FakeClock()
+    metrics = LSPMetrics(timeout=0.505, clock=clock)
+
+    for i in range(100):
+        metrics.request_sent(i, 'textDocument/completion', size=10)
+    metrics.request_sent(100, 'textDocument/hover', size=1000)
+    assert metrics.in_flight() == 101
+
+    for i in range(100):
+        clock.now += 0.01
+        metrics.response_received(i, size=20, error=(i == 0))
+
+    summary = metrics.to_dict()
+    completion = summary['methods']['textDocument/completion']
+    assert summary['in_flight'] == 0
+    assert completion['count'] == 100
+    assert completion['in_flight'] == 0
+    assert completion['errors'] == 1
+    assert completion['p50_ms'] == 510.0
+    assert completion['p99_ms'] == 1000.0
+    assert completion['timeouts'] == 50
+    assert completion['bytes_sent'] == 1000
+    assert completion['max_bytes_received'] == 20
+
+    # Requests without a response in time are not in flight anymore
+    hover = summary['methods']['textDocument/hover']
+    assert hover['in_flight'] == 0
+    assert hover['timeouts'] == 1
+    assert hover['p50_ms'] is None
+
+    # Late responses are recorded without counting the timeout again
+    clock.now += 1
+    assert metrics.response_received(100) == pytest.approx(2.0)
+    hover = metrics.to_dict()['methods']['textDocument/hover']
+    assert hover['timeouts'] == 1
+    assert hover['p50_ms'] == 2000.0
+
+    # Unknown responses are ignored
+    assert metrics.response_received('unknown') is None
+
+    # Metrics are serializable for bug reports
+    summary = metrics.to_dict()
+    assert json.loads(metrics.to_json()) == summary
+
+
+def test_expire_without_timeout():
+    """Test that requests without a timeout still expire eventually."""
+    clock = FakeClock()
+    metrics = LSPMetrics(clock=clock)
+    for i in range(10):
+        metrics.request_sent(i, 'textDocument/hover')
+    assert metrics.in_flight() == 10
+
+    clock.now += MAX_PENDING_TIME + 1
+    metrics.request_sent(10, 'textDocument/hover')
+    assert metrics.in_flight() == 1
+    assert metrics.to_dict()['methods']['textDocument/hover']['timeouts'] == 10
+
+
+def test_notifications_and_reset():
+    """Test notifications are counted and reset discards everything."""
+    metrics = LSPMetrics()
+    metrics.notification_sent('textDocument/didChange', size=100)
+    metrics.notification_received('textDocument/publishDiagnostics', size=50)
+
+    summary = metrics.to_dict()['methods']
+    assert summary['textDocument/didChange']['bytes_sent'] == 100
+    assert summary['textDocument/publishDiagnostics']['bytes_received'] == 50
+
+    metrics.reset()
+    assert metrics.to_dict() == {'in_flight': 0, 'methods': {}}
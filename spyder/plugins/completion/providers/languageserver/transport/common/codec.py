@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2009- Spyder Project Contributors
+#
+# Distributed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Spyder MS Language Server Protocol v3.0 transport codec.
+
+This module provides the JSON codecs used to serialize JSONRPC messages and
+an incremental parser for the Content-Length framing used by the LSP base
+protocol.
+"""
+
+# Standard library imports
+import json
+import logging
+
+# Third party imports
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+logger = logging.getLogger(__name__)
+
+HEADER_END = b'\r\n\r\n'
+CONTENT_LENGTH = b'Content-Length'
+CONTENT_TYPE = b'Content-Type'
+
+# Compact the read buffer once the consumed prefix is larger than this
+COMPACT_THRESHOLD = 1024 * 1024
+
+
+# ---- JSON codecs
+# -----------------------------------------------------------------------------
+class JSONCodec:
+    """JSON codec based on the standard library."""
+
+    name = 'json'
+
+    def dumps(self, obj):
+        """Serialize `obj` to UTF-8 encoded bytes."""
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        """Deserialize `data` (bytes, bytearray, memoryview or str)."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on orjson."""
+
+    name = 'orjson'
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            # orjson only accepts str keys and 64 bit integers
+            return super().dumps(obj)
+
+    def loads(self, data):
+        # orjson can parse memoryviews directly, which avoids a copy
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec based on ujson."""
+
+    name = 'ujson'
+
+    def dumps(self, obj):
+        try:
+            return ujson.dumps(
+                obj, ensure_ascii=False, escape_forward_slashes=False
+            ).encode('utf-8')
+        except (TypeError, OverflowError):
+            return super().dumps(obj)
+
+    def loads(self, data):
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return ujson.loads(data)
+
+
+CODECS = {JSONCodec.name: JSONCodec}
+if ujson is not None:
+    CODECS[UjsonCodec.name] = UjsonCodec
+if orjson is not None:
+    CODECS[OrjsonCodec.name] = OrjsonCodec
+
+# Codecs in order of preference
+PREFERRED_CODECS = [OrjsonCodec.name, UjsonCodec.name, JSONCodec.name]
+
+
+def register_codec(codec_class):
+    """Register a new codec class, so it can be selected by name."""
+    CODECS[codec_class.name] = codec_class
+
+
+def get_codec(name=None):
+    """
+    Return a codec instance.
+
+    If `name` is None or not available, the fastest codec that can be
+    imported is returned.
+    """
+    if name is not None:
+        if name in CODECS:
+            return CODECS[name]()
+        logger.warning(
+            'JSON codec {0} is not available, using the default '
+            'one'.format(name))
+
+    for name in PREFERRED_CODECS:
+        if name in CODECS:
+            return CODECS[name]()
+
+
+def encode_frame(body):
+    """Prepend the Content-Length header to an encoded message body."""
+    return b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+
+# ---- Frame parsing
+# -----------------------------------------------------------------------------
+def parse_headers(headers):
+    """Parse a block of LSP headers into a dictionary."""
+    header_dict = {}
+    for line in bytes(headers).split(b'\r\n'):
+        if not line:
+            continue
+        key, __, value = line.partition(b':')
+        header_dict[key.strip()] = value.strip()
+    return header_dict
+
+
+class FrameReader:
+    """
+    Incremental parser of Content-Length delimited frames.
+
+    Incoming data is appended to a single bytearray and frames are handed
+    to the codec as memoryviews over it, so message bodies are never
+    copied before being decoded. The consumed prefix of the buffer is
+    discarded lazily, which makes it behave like a ring buffer.
+    """
+
+    def __init__(self, codec=None):
+        self.codec = codec if codec is not None else get_codec()
+        self._buffer = bytearray()
+        self._start = 0
+        self._headers = None
+        self._content_length = None
+
+    def __len__(self):
+        """Number of buffered bytes that were not consumed yet."""
+        return len(self._buffer) - self._start
+
+    def feed(self, data):
+        """Append raw data read from the transport."""
+        self._compact()
+        self._buffer += data
+
+    def next_frame(self):
+        """
+        Return the next complete frame as a (headers, body) tuple, or None if
+        more data is needed.
+
+        `body` is a memoryview that is only valid until the next call to
+        `feed`, so it must be released or decoded right away.
+        """
+        if self._headers is None:
+            end = self._buffer.find(HEADER_END, self._start)
+            if end == -1:
+                return None
+            self._headers = parse_headers(
+                memoryview(self._buffer)[self._start:end])
+            self._content_length = int(self._headers[CONTENT_LENGTH])
+            self._start = end + len(HEADER_END)
+
+        if len(self) < self._content_length:
+            return None
+
+        stop = self._start + self._content_length
+        body = memoryview(self._buffer)[self._start:stop]
+        headers = self._headers
+        self._start = stop
+        self._headers = None
+        self._content_length = None
+        return headers, body
+
+    def messages(self):
+        """
+        Decode and yield all complete messages currently buffered.
+
+        Frames that can't be decoded are logged and skipped, so the ones
+        after them are not held until more data arrives.
+        """
+        while True:
+            frame = self.next_frame()
+            if frame is None:
+                break
+            headers, body = frame
+            with body:
+                try:
+                    message = self.decode(body, headers)
+                except (ValueError, TypeError, LookupError) as e:
+                    logger.error('Error decoding message: {0}'.format(e))
+                    continue
+            yield message
+
+    def decode(self, body, headers):
+        """Decode a frame body according to its Content-Type charset."""
+        encoding = 'utf-8'
+        if CONTENT_TYPE in headers:
+            encoding = headers[CONTENT_TYPE].split(b'=')[-1].decode('utf8')
+        if encoding.lower().replace('-', '') != 'utf8':
+            body = str(body, encoding)
+        return self.codec.loads(body)
+
+    def _compact(self):
+        """Drop the consumed prefix of the buffer if it is worth it."""
+        if self._start == 0:
+            return
+        if self._start == len(self._buffer):
+            self._buffer.clear()
+            self._start = 0
+        elif self._start > COMPACT_THRESHOLD:
+            del self._buffer[:self._start]
+            self._start = 0
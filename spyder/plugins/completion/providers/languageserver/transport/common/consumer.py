@@ -16,18 +16,21 @@
 
 
 import os
-import json
 import socket
 import logging
+from collections import deque
 from threading import Thread, Lock
 
-if not os.name == 'nt':
-    from pexpect.fdpexpect import fdspawn
+from spyder.plugins.completion.providers.languageserver.transport.common.codec import (
+    CONTENT_LENGTH, FrameReader, get_codec, parse_headers)
 
 
 TIMEOUT = 5000
 PID = os.getpid()
 
+# Number of bytes requested from the transport on each read
+READ_CHUNK_SIZE = 64 * 1024
+
 
 logger = logging.getLogger(__name__)
 
@@ -35,69 +38,54 @@
 class IncomingMessageThread(Thread):
     """Base LSP message consumer."""
 
-    def __init__(self):
+    def __init__(self, codec=None):
         Thread.__init__(self)
         self.stopped = False
         self.daemon = True
         self.expect_body = False
         self.mutex = Lock()
+        self.codec = get_codec(codec)
+        self.reader = FrameReader(self.codec)
+        self.pending = deque()
 
     def initialize(self, fd, zmq_sock, req_status, expectable=False):
         self.fd = fd
         self.expect = None
         self.expectable = expectable
         logger.info('Reading thread initialized')
-        self.read_incoming = self.read_posix
-        self.expect = self.fd
-        if not expectable:
-            if os.name == 'nt':
-                self.read_incoming = self.expect_windows
-            else:
-                self.expect = fdspawn(self.fd)
+        logger.info('Using {0} codec'.format(self.codec.name))
+        if expectable:
+            self.read_incoming = self.read_expect
+            self.expect = self.fd
+        else:
+            self.read_incoming = self.read_frames
         self.zmq_sock = zmq_sock
         self.req_status = req_status
 
-    def read_posix(self):
+    def read_expect(self):
+        """Read a single message from a pexpect spawn instance."""
         self.expect.expect('\r\n\r\n', timeout=None)
-        headers = self.expect.before
-        headers = self.parse_headers(headers)
+        headers = self.parse_headers(self.expect.before)
         logger.debug(headers)
-        content_length = int(headers[b'Content-Length'])
+        content_length = int(headers[CONTENT_LENGTH])
         body = self.expect.read(size=content_length)
-        return self.encode_body(body, headers)
-
-    def encode_body(self, body, headers):
-        encoding = 'utf8'
-        if b'Content-Type' in headers:
-            encoding = headers[b'Content-Type'].split(b'=')[-1].decode('utf8')
-        body = body.decode(encoding)
-        return body
-
-    def expect_windows(self):
-        buffer = b''
-        headers = b''
-        continue_reading = True
-        while continue_reading:
-            try:
-                buffer += self.read_num_bytes(1)
-                if b'\r\n\r\n' in buffer:
-                    split = buffer.split(b'\r\n\r\n')
-                    if len(split) == 2:
-                        headers, buffer = split
-                        continue_reading = False
-            except socket.error as e:
-                logger.error(e)
-                raise e
-        headers = self.parse_headers(headers)
-        logger.debug(headers)
-        content_length = int(headers[b'Content-Length'])
-        pending_bytes = content_length - len(buffer)
-        while pending_bytes > 0:
-            logger.debug('Pending bytes...' + str(pending_bytes))
-            recv = self.read_num_bytes(min(1024, pending_bytes))
-            buffer += recv
-            pending_bytes -= len(recv)
-        return self.encode_body(buffer, headers)
+        return self.reader.decode(body, headers)
+
+    def read_frames(self):
+        """
+        Read messages from the transport in large chunks.
+
+        Several messages can arrive in a single chunk, so they are queued
+        and returned one at a time.
+        """
+        while not self.pending:
+            data = self.read_num_bytes(READ_CHUNK_SIZE)
+            if not data:
+                self.stop()
+                raise socket.error('Connection closed by the server')
+            self.reader.feed(data)
+            self.pending.extend(self.reader.messages())
+        return self.pending.popleft()
 
     def run(self):
         while True:
@@ -106,10 +94,9 @@ def run(self):
                     logger.debug('Stopping Thread...')
                     break
             try:
-                body = self.read_incoming()
                 err = False
                 try:
-                    body = json.loads(body)
+                    body = self.read_incoming()
                 except (ValueError, TypeError) as e:
                     err = True
                     logger.error(e)
@@ -123,9 +110,7 @@ def run(self):
 
     def parse_headers(self, headers):
         logger.debug('Headers: {0}'.format(headers))
-        headers = headers.split(b'\r\n')
-        header_dict = dict([x.split(b': ') for x in headers])
-        return header_dict
+        return parse_headers(headers)
 
     def stop(self):
         with self.mutex:
@@ -18,12 +18,15 @@
 """
 
 # Standard library imports
-import json
 import logging
 
 # Third party imports
 import zmq
 
+# Local imports
+from spyder.plugins.completion.providers.languageserver.transport.common.codec import (
+    encode_frame, get_codec)
+
 TIMEOUT = 5000
 LOCALHOST = '127.0.0.1'
 
@@ -32,11 +35,11 @@
 
 class LanguageServerClient(object):
     """Base implementation of a v3.0 compilant language server client."""
-    CONTENT_LENGTH = 'Content-Length: {0}\r\n\r\n'
 
-    def __init__(self, zmq_in_port=7000, zmq_out_port=7001):
+    def __init__(self, zmq_in_port=7000, zmq_out_port=7001, codec=None):
         self.zmq_in_port = zmq_in_port
         self.zmq_out_port = zmq_out_port
+        self.codec = get_codec(codec)
         self.context = None
         self.zmq_in_socket = None
         self.zmq_out_socket = None
@@ -66,23 +69,26 @@ def finalize_initialization(self):
 
     def listen(self):
         events = self.zmq_in_socket.poll(TIMEOUT)
-        # requests = []
+        frames = []
         while events > 0:
             client_request = self.zmq_in_socket.recv_pyobj()
-            logger.debug("Client Event: {0}".format(client_request))
+            logger.debug("Client Event: %s", client_request)
             server_request = self.__compose_request(client_request)
-            self.__send_request(server_request)
-            # self.zmq_socket.send_pyobj({'a': 'b'})
-            events -= 1
+            frames.append(self.__encode_request(server_request))
+
+            # Drain all requests that are already queued, so they can be
+            # written to the server in a single call.
+            events = self.zmq_in_socket.poll(0)
+
+        if frames:
+            self.transport_send(b''.join(frames))
 
     def __compose_request(self, request):
         request['jsonrpc'] = '2.0'
         return request
 
-    def __send_request(self, request):
-        json_req = json.dumps(request)
-        content = bytes(json_req.encode('utf-8'))
-        content_length = len(content)
+    def __encode_request(self, request):
+        content = self.codec.dumps(request)
 
         if 'method' in request:
             if 'id' in request:
@@ -94,14 +100,16 @@ def __send_request(self, request):
                         request['method']))
         else:
             logger.debug('Sending reply to server')
-        logger.debug(json_req)
+        logger.debug(content)
 
-        content_length = self.CONTENT_LENGTH.format(
-            content_length).encode('utf-8')
-        self.transport_send(bytes(content_length), content)
+        return encode_frame(content)
 
-    def transport_send(self, content_length, body):
-        """Subclasses should override this method"""
+    def transport_send(self, data):
+        """
+        Send `data`, made of one or more complete frames, to the server.
+
+        Subclasses should override this method.
+        """
         raise NotImplementedError("Not implemented")
 
     def is_server_alive(self):
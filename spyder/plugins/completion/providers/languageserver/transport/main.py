@@ -61,6 +61,11 @@
 parser.add_argument('--stdio-server',
                     action="store_true",
                     help='Server communication should use stdio pipes')
+parser.add_argument('--transport-codec',
+                    default=None,
+                    help='JSON codec used to encode and decode messages '
+                         '(orjson, ujson or json). By default the fastest '
+                         'available one is used')
 parser.add_argument('--transport-debug',
                     default=0,
                     type=int,
@@ -134,7 +139,8 @@ def restore(self):
                                        host=args.server_host,
                                        port=args.server_port)
     client = LanguageServerClient(zmq_in_port=args.zmq_in_port,
-                                  zmq_out_port=args.zmq_out_port)
+                                  zmq_out_port=args.zmq_out_port,
+                                  codec=args.transport_codec)
     client.start()
     is_alive = True
 
@@ -36,9 +36,9 @@ class StdioLanguageServerClient(LanguageServerClient):
     MAX_TIMEOUT_TIME = 20000
 
     def __init__(self, server_args='', log_file=None,
-                 zmq_in_port=7000, zmq_out_port=7001):
+                 zmq_in_port=7000, zmq_out_port=7001, codec=None):
         super(StdioLanguageServerClient, self).__init__(
-            zmq_in_port, zmq_out_port)
+            zmq_in_port, zmq_out_port, codec)
         self.req_status = {}
         self.process = None
 
@@ -58,7 +58,7 @@ def __init__(self, server_args='', log_file=None,
         logger.info('Process pid: {0}'.format(self.process.pid))
         logger.info('Connecting to language server on stdio')
         super(StdioLanguageServerClient, self).finalize_initialization()
-        self.reading_thread = StdioIncomingMessageThread()
+        self.reading_thread = StdioIncomingMessageThread(codec)
         self.reading_thread.initialize(self.process, self.zmq_out_socket,
                                        self.req_status, expectable=True)
 
@@ -72,12 +72,10 @@ def stop(self):
         logger.debug('Joining thread...')
         logger.debug('Exit routine should be complete')
 
-    def transport_send(self, content_length, body):
+    def transport_send(self, data):
         if os.name == 'nt':
-            content_length = content_length.decode('utf-8')
-            body = body.decode('utf-8')
-        self.process.write(content_length)
-        self.process.write(body)
+            data = data.decode('utf-8')
+        self.process.write(data)
 
     def is_server_alive(self):
         """This method verifies if stdout is broken."""
@@ -35,8 +35,8 @@ class TCPLanguageServerClient(LanguageServerClient):
     MAX_TIMEOUT_TIME = 20000
 
     def __init__(self, host='127.0.0.1', port=2087, zmq_in_port=7000,
-                 zmq_out_port=7001):
-        LanguageServerClient.__init__(self, zmq_in_port, zmq_out_port)
+                 zmq_out_port=7001, codec=None):
+        LanguageServerClient.__init__(self, zmq_in_port, zmq_out_port, codec)
         self.req_status = {}
         self.host = host
         self.port = port
@@ -46,7 +46,7 @@ def __init__(self, host='127.0.0.1', port=2087, zmq_in_port=7000,
             self.host, self.port))
         super(TCPLanguageServerClient, self).finalize_initialization()
         self.socket.setblocking(True)
-        self.reading_thread = TCPIncomingMessageThread()
+        self.reading_thread = TCPIncomingMessageThread(codec)
         self.reading_thread.initialize(self.socket, self.zmq_out_socket,
                                        self.req_status)
 
@@ -61,11 +61,10 @@ def stop(self):
         self.reading_thread.stop()
         logger.debug('Exit routine should be complete')
 
-    def transport_send(self, content_length, body):
+    def transport_send(self, data):
         logger.debug('Sending message via TCP')
         try:
-            self.socket.send(content_length)
-            self.socket.send(body)
+            self.socket.sendall(data)
         except (BrokenPipeError, ConnectionError) as e:
             # This avoids a total freeze at startup
             # when we're trying to connect to a TCP
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Tests for the LSP transport codecs and frame reader."""
+
+# Standard library imports
+import socket
+import threading
+import time
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.providers.languageserver.transport.common.codec import (
+    CODECS, FrameReader, encode_frame, get_codec)
+from spyder.plugins.completion.providers.languageserver.transport.tcp.consumer import (
+    TCPIncomingMessageThread)
+
+
+MESSAGE = {
+    'jsonrpc': '2.0',
+    'method': 'textDocument/didOpen',
+    'params': {
+        'textDocument': {
+            'uri': 'file:///tmp/test.py',
+            'languageId': 'python',
+            'version': 1,
+            'text': 'import os\n# ñandú\n' * 5000
+        }
+    }
+}
+
+
+class ZMQSocketMock:
+    """Collect the messages the consumer thread relays to Spyder."""
+
+    def __init__(self, expected):
+        self.messages = []
+        self.expected = expected
+        self.done = threading.Event()
+
+    def send_pyobj(self, obj):
+        self.messages.append(obj)
+        if len(self.messages) == self.expected:
+            self.done.set()
+
+
+@pytest.mark.parametrize('name', list(CODECS))
+def test_codec_roundtrip(name):
+    """Test that all available codecs roundtrip messages."""
+    codec = get_codec(name)
+    assert codec.name == name
+    assert codec.loads(codec.dumps(MESSAGE)) == MESSAGE
+    assert codec.loads(memoryview(codec.dumps(MESSAGE))) == MESSAGE
+
+
+def test_codec_fallback():
+    """Test that an unknown codec name falls back to an available one."""
+    assert get_codec('unknown').name in CODECS
+
+
+def test_frame_reader_split_chunks():
+    """Test that frames split across and packed in chunks are decoded."""
+    codec = get_codec()
+    data = b''.join(
+        encode_frame(codec.dumps(dict(MESSAGE, id=i))) for i in range(5))
+
+    reader = FrameReader(codec)
+    messages = []
+    for i in range(0, len(data), 1000):
+        reader.feed(data[i:i + 1000])
+        messages.extend(reader.messages())
+
+    assert [m['id'] for m in messages] == list(range(5))
+    assert messages[0]['params'] == MESSAGE['params']
+    assert len(reader) == 0
+
+
+def test_frame_reader_content_type():
+    """Test that the Content-Type charset is honored."""
+    body = '{"result": "ñandú"}'.encode('latin-1')
+    data = (b'Content-Length: %d\r\n'
+            b'Content-Type: application/vscode-jsonrpc; charset=latin-1'
+            b'\r\n\r\n' % len(body)) + body
+
+    reader = FrameReader()
+    reader.feed(data)
+    assert list(reader.messages()) == [{'result': 'ñandú'}]
+
+
+def test_frame_reader_invalid_frame():
+    """Test that frames after one that can't be decoded are not held."""
+    codec = get_codec()
+    data = b''.join([
+        encode_frame(codec.dumps({'id': 0})),
+        encode_frame(b'{"id": '),
+        encode_frame(codec.dumps({'id': 2})),
+    ])
+
+    reader = FrameReader(codec)
+    reader.feed(data)
+    assert list(reader.messages()) == [{'id': 0}, {'id': 2}]
+    assert len(reader) == 0
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize('name', list(CODECS))
+def test_tcp_consumer_throughput(name):
+    """Benchmark reading didOpen-sized messages from a fake TCP server."""
+    n_messages = 200
+    codec = get_codec(name)
+    frame = encode_frame(codec.dumps(MESSAGE))
+
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(1)
+
+    def serve():
+        connection, __ = server.accept()
+        connection.sendall(frame * n_messages)
+        connection.close()
+
+    server_thread = threading.Thread(target=serve, daemon=True)
+    server_thread.start()
+
+    client = socket.create_connection(server.getsockname())
+    zmq_socket = ZMQSocketMock(n_messages)
+    consumer = TCPIncomingMessageThread(name)
+    consumer.initialize(client, zmq_socket, {})
+
+    start = time.perf_counter()
+    consumer.start()
+    assert zmq_socket.done.wait(60)
+    elapsed = time.perf_counter() - start
+
+    consumer.stop()
+    client.close()
+    server.close()
+
+    megabytes = len(frame) * n_messages / 1024 ** 2
+    print('{0}: {1:.1f} MB/s'.format(name, megabytes / elapsed))
+    assert zmq_socket.messages[-1] == MESSAGE
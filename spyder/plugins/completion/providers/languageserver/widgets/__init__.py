@@ -6,6 +6,7 @@
 
 """LSP related widgets."""
 
+from .diagnostics import LSPDiagnosticsDialog
 from .messagebox import ServerDisabledMessageBox
 from .serversconfig import LSPServerTable
 from .status import ClientStatus, LSPStatusWidget
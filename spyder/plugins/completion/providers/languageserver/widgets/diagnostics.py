@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Language Server Protocol latency diagnostics dialog."""
+
+# Standard library imports
+import os.path as osp
+
+# Third party imports
+from qtpy.compat import getsavefilename
+from qtpy.QtCore import Qt, QTimer
+from qtpy.QtWidgets import (QAbstractItemView, QDialog, QDialogButtonBox,
+                            QHeaderView, QLabel, QTableWidget,
+                            QTableWidgetItem, QVBoxLayout)
+
+# Local imports
+from spyder.api.widgets.dialogs import SpyderDialogButtonBox
+from spyder.config.base import _
+from spyder.utils.misc import getcwd_or_home
+
+
+# Columns shown for each method and the metrics key they display
+COLUMNS = [
+    (_("Method"), None),
+    (_("Count"), 'count'),
+    (_("In flight"), 'in_flight'),
+    (_("Timeouts"), 'timeouts'),
+    (_("p50 (ms)"), 'p50_ms'),
+    (_("p95 (ms)"), 'p95_ms'),
+    (_("p99 (ms)"), 'p99_ms'),
+    (_("Max sent (bytes)"), 'max_bytes_sent'),
+    (_("Max received (bytes)"), 'max_bytes_received'),
+]
+
+
+class LSPDiagnosticsDialog(QDialog):
+    """Show latency and throughput metrics of a language server."""
+
+    REFRESH_INTERVAL = 1000  # ms
+
+    def __init__(self, parent, provider, language):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.provider = provider
+        self.language = language
+
+        self.setWindowTitle(
+            _("{} Language Server diagnostics").format(language.capitalize())
+        )
+
+        provider_label = QLabel(
+            _("Requests sent by the editor (including time queued in Spyder)")
+        )
+        self.provider_table = self._create_table()
+        client_label = QLabel(
+            _("Messages exchanged with the server (transport and server time)")
+        )
+        self.client_table = self._create_table()
+        self.summary_label = QLabel()
+
+        bbox = SpyderDialogButtonBox(
+            QDialogButtonBox.Save | QDialogButtonBox.Reset
+            | QDialogButtonBox.Close
+        )
+        bbox.button(QDialogButtonBox.Save).setText(_("Export..."))
+        bbox.button(QDialogButtonBox.Save).clicked.connect(self.export)
+        bbox.button(QDialogButtonBox.Reset).clicked.connect(self.reset)
+        bbox.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.summary_label)
+        layout.addWidget(provider_label)
+        layout.addWidget(self.provider_table)
+        layout.addWidget(client_label)
+        layout.addWidget(self.client_table)
+        layout.addWidget(bbox)
+        self.setLayout(layout)
+        self.resize(900, 600)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.refresh()
+
+    def _create_table(self):
+        table = QTableWidget(0, len(COLUMNS), self)
+        table.setHorizontalHeaderLabels([name for name, __ in COLUMNS])
+        table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        table.verticalHeader().hide()
+        table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.Stretch)
+        return table
+
+    def _fill_table(self, table, metrics):
+        methods = metrics['methods'] if metrics else {}
+        table.setRowCount(len(methods))
+        for row, (method, values) in enumerate(methods.items()):
+            for column, (__, key) in enumerate(COLUMNS):
+                value = method if key is None else values[key]
+                item = QTableWidgetItem('' if value is None else str(value))
+                if key is not None:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(row, column, item)
+
+    def refresh(self):
+        """Update tables with the current metrics."""
+        metrics = self.provider.get_metrics(self.language)
+        self._fill_table(self.provider_table, metrics['provider'])
+        self._fill_table(self.client_table, metrics['client'])
+
+        client_in_flight = (
+            metrics['client']['in_flight'] if metrics['client'] else 0
+        )
+        self.summary_label.setText(
+            _("Requests in flight: {0} in Spyder, {1} in the server. "
+              "Timeout: {2} ms").format(
+                  metrics['provider']['in_flight'],
+                  client_in_flight,
+                  metrics['timeout_ms'])
+        )
+
+    def reset(self):
+        """Discard the metrics collected so far."""
+        self.provider.reset_metrics(self.language)
+        self.refresh()
+
+    def export(self):
+        """Save metrics as JSON so they can be attached to bug reports."""
+        filename, __ = getsavefilename(
+            self,
+            _("Export diagnostics"),
+            osp.join(getcwd_or_home(), 'lsp-{}-metrics.json'.format(
+                self.language)),
+            _("JSON files") + " (*.json)"
+        )
+        if filename:
+            self.provider.export_metrics(self.language, filename)
+
+    def done(self, result):
+        self.timer.stop()
+        super().done(result)
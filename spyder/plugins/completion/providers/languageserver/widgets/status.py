@@ -16,6 +16,8 @@
 from spyder.api.widgets.menus import SpyderMenu
 from spyder.api.widgets.status import StatusBarWidget
 from spyder.config.base import _
+from spyder.plugins.completion.providers.languageserver.widgets.diagnostics import (
+    LSPDiagnosticsDialog)
 from spyder.utils.stylesheet import MAC, WIN
 
 
@@ -77,6 +79,15 @@ def show_menu(self):
         )
         self.add_item_to_menu(restart_action, self.menu)
 
+        diagnostics_action = self.create_action(
+            "show_diagnostics",
+            text=_("Show {} Language Server diagnostics").format(
+                language.capitalize()),
+            triggered=lambda: self.show_diagnostics(language),
+            register_action=False,
+        )
+        self.add_item_to_menu(diagnostics_action, self.menu)
+
         x_offset = (
             # Margin of menu items to left and right
             2 * SpyderMenu.HORIZONTAL_MARGIN_FOR_ITEMS
@@ -97,6 +108,11 @@ def show_menu(self):
 
         self.menu.popup(pos)
 
+    def show_diagnostics(self, language):
+        """Show latency and throughput metrics for `language`."""
+        dialog = LSPDiagnosticsDialog(self, self.provider, language)
+        dialog.show()
+
     def set_status(self, lsp_language=None, status=None):
         """Set LSP status."""
         # Spinner
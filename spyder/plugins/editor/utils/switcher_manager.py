@@ -15,7 +15,8 @@
 from spyder.api.config.mixins import SpyderConfigurationAccessor
 from spyder.config.base import _
 from spyder.utils.icon_manager import ima
-from spyder.plugins.switcher.utils import shorten_paths, get_file_icon
+from spyder.plugins.switcher.utils import (
+    get_file_icon, get_file_icons, shorten_paths)
 from spyder.plugins.completion.api import SymbolKind, SYMBOL_KIND_ICON
 
 
@@ -88,11 +89,12 @@ def create_editor_switcher(self):
         paths = [data.filename for data in editor_list]
         save_statuses = [data.newly_created for data in editor_list]
         short_paths = shorten_paths(paths, save_statuses)
+        icons = get_file_icons(paths)
 
         for idx, data in enumerate(editor_list):
             path = data.filename
             title = osp.basename(path)
-            icon = get_file_icon(path)
+            icon = icons[idx]
             # TODO: Handle of shorten paths based on font size
             # and available space per item
             if len(paths[idx]) > 75:
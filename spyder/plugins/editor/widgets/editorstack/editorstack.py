@@ -24,7 +24,7 @@
 from qtpy import PYSIDE2
 from qtpy.compat import getsavefilename
 from qtpy.QtCore import QFileInfo, Qt, QTimer, Signal, Slot
-from qtpy.QtGui import QFontMetrics, QTextCursor
+from qtpy.QtGui import QColor, QFontMetrics, QTextCursor
 from qtpy.QtWidgets import (QApplication, QFileDialog, QHBoxLayout, QLabel,
                             QMessageBox, QVBoxLayout, QWidget, QSizePolicy,
                             QToolBar, QToolButton)
@@ -59,6 +59,7 @@
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.qthelpers import mimedata2url, create_waitspinner
 from spyder.utils.stylesheet import PANES_TABBAR_STYLESHEET
+from spyder.utils.vcs_status import get_vcs_status_service
 from spyder.widgets.tabs import BaseTabs
 
 logger = logging.getLogger(__name__)
@@ -244,6 +245,12 @@ def __init__(self, parent, actions, use_switcher=True):
 
         self.stack_history = StackHistory(self)
 
+        # Version control status of files, shown with the tab text color
+        self._vcs_status = get_vcs_status_service()
+        self._vcs_status.sig_status_changed.connect(
+            self._update_vcs_status_colors
+        )
+
         # External panels
         self.external_panels = []
 
@@ -1312,6 +1319,22 @@ def set_stack_title(self, index, is_modified):
         if tab_text != self.tabs.tabText(index):
             self.tabs.setTabText(index, tab_text)
         self.tabs.setTabToolTip(index, tab_tip)
+        self._set_vcs_status_color(index)
+
+    def _set_vcs_status_color(self, index):
+        """Show the version control status of a file in its tab."""
+        color = self._vcs_status.get_color(self.data[index].filename)
+        self.tabs.tabBar().setTabTextColor(
+            index, QColor() if color is None else color
+        )
+
+    def _update_vcs_status_colors(self, root):
+        """Update tab colors after the statuses of a repository changed."""
+        # Trailing separator so sibling directories like root-2 don't match
+        prefix = osp.join(root, '')
+        for index, finfo in enumerate(self.data):
+            if finfo.filename.startswith(prefix):
+                self._set_vcs_status_color(index)
 
     # ---- Context menu
     def __setup_menu(self):
@@ -2004,6 +2027,7 @@ def _save_file(self, finfo):
         # have been rearranged. See spyder-ide/spyder#5703.
         self.file_saved.emit(str(id(self)),
                              finfo.filename, finfo.filename)
+        self._vcs_status.invalidate(osp.dirname(finfo.filename))
 
         finfo.editor.document().setModified(False)
         self.modification_changed(index=index)
@@ -2231,6 +2255,11 @@ def current_changed(self, index):
         self.stack_history.remove_and_append(index)
         self.sig_codeeditor_changed.emit(editor)
 
+        # Get the version control statuses again if the repository of the
+        # file changed since they were computed
+        if 0 <= index < len(self.data):
+            self._vcs_status.refresh(osp.dirname(self.data[index].filename))
+
         # Needed to avoid an error generated after moving/renaming
         # files outside Spyder while in debug mode.
         # See spyder-ide/spyder#8749.
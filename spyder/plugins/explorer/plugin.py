@@ -307,7 +307,7 @@ async def _get_remote_files_manager(self, server_id):
         if server_id not in self._file_managers:
             self._file_managers[server_id] = remoteclient.get_file_api(
                 server_id
-            )()
+            )(cache=True)
             await self._file_managers[server_id].connect()
         return self._file_managers.get(server_id, None)
 
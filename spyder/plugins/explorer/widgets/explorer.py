@@ -32,7 +32,7 @@
     Signal,
     Slot,
 )
-from qtpy.QtGui import QClipboard, QDrag
+from qtpy.QtGui import QClipboard, QDrag, QPalette
 from qtpy.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -67,6 +67,7 @@
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.qthelpers import (
     file_uri, keyevent_to_keysequence_str, start_file)
+from spyder.utils.vcs_status import get_vcs_status_service
 
 try:
     from nbconvert import PythonExporter as nbexporter
@@ -167,6 +168,7 @@ class DirViewItemDelegate(QStyledItemDelegate):
     def __init__(self, parent):
         super().__init__(parent)
         self._project_dir = ""
+        self._vcs_status = get_vcs_status_service()
 
     def set_project_dir(self, project_dir):
         self._project_dir = project_dir
@@ -184,17 +186,20 @@ def initStyleOption(self, option, index):
 
             if isinstance(model, QSortFilterProxyModel):
                 # This is necessary for Projects because it has a proxy model
-                is_dir = model.sourceModel().isDir(model.mapToSource(index))
+                source_model = model.sourceModel()
+                source_index = model.mapToSource(index)
             else:
-                is_dir = model.isDir(index)
+                source_model = model
+                source_index = index
+
+            is_dir = source_model.isDir(source_index)
+            path = source_model.filePath(source_index)
 
             if is_dir:
                 # This is necessary because Projects has a root directory and
                 # we want to set a different icon for it.
                 if isinstance(model, QSortFilterProxyModel):
-                    dir_path = model.sourceModel().filePath(
-                        model.mapToSource(index)
-                    )
+                    dir_path = path
                 else:
                     dir_path = None
 
@@ -203,6 +208,11 @@ def initStyleOption(self, option, index):
                 elif (option.state & QStyle.State_Open):
                     option.icon = ima.icon("DirOpenIcon")
 
+            # Show the version control status of files with the text color
+            color = self._vcs_status.get_color(path, is_dir)
+            if color is not None:
+                option.palette.setColor(QPalette.Text, color)
+
 
 # ---- Widgets
 # ----------------------------------------------------------------------------
@@ -338,6 +348,8 @@ def __init__(self, parent=None):
         self.common_actions = None
         self.filter_on = False
         self.expanded_or_colapsed_by_mouse = False
+        self._loaded_dirs = set()
+        self._vcs_status = get_vcs_status_service()
 
         # Widgets
         self.fsmodel = None
@@ -347,6 +359,9 @@ def __init__(self, parent=None):
 
         # Signals
         header.customContextMenuRequested.connect(self.show_header_menu)
+        self._vcs_status.sig_status_changed.connect(
+            self._on_vcs_status_changed
+        )
 
         # Style adjustments
         self._style = DirViewStyle(None)
@@ -959,6 +974,25 @@ def setup_view(self):
         self.fsmodel.modelReset.connect(self.reset_icon_provider)
         self.reset_icon_provider()
 
+        # Refresh version control statuses when files are created, removed
+        # or renamed in directories that were already loaded.
+        self.fsmodel.directoryLoaded.connect(self._loaded_dirs.add)
+        self.fsmodel.rowsInserted.connect(self._on_files_changed)
+        self.fsmodel.rowsRemoved.connect(self._on_files_changed)
+        self.fsmodel.fileRenamed.connect(
+            lambda path, old_name, new_name: self._vcs_status.invalidate(path)
+        )
+
+    def _on_files_changed(self, parent, first, last):
+        """Refresh version control statuses when files change in a dir."""
+        path = self.fsmodel.filePath(parent)
+        if path in self._loaded_dirs:
+            self._vcs_status.invalidate(path)
+
+    def _on_vcs_status_changed(self, root):
+        """Repaint files after the version control statuses changed."""
+        self.viewport().update()
+
     # ---- File/Dir Helpers
     # ------------------------------------------------------------------------
     def get_filename(self, index):
@@ -1732,6 +1766,9 @@ def set_show_hidden(self, state):
     def reset_icon_provider(self):
         """Reset file system model icon provider
         The purpose of this is to refresh files/directories icons"""
+        # Resolve the icons of common file types here so that the model
+        # finds them cached when it populates directories.
+        ima.prewarm_icons_by_extension(scale_factor=1.0)
         self.fsmodel.setIconProvider(IconProvider())
 
     def convert_notebook(self, fname):
@@ -1855,6 +1892,10 @@ def set_current_folder(self, folder):
         """
         index = self.fsmodel.setRootPath(folder)
         self.__last_folder = folder
+
+        # Get the statuses again if the repository changed since the last
+        # time they were computed
+        self._vcs_status.refresh(folder)
         self.setRootIndex(index)
         return index
 
@@ -4,7 +4,6 @@
 # Licensed under the terms of the MIT License
 # (see spyder/__init__.py for details)
 
-import asyncio
 import fnmatch
 import io
 import logging
@@ -111,8 +110,11 @@ def __init__(self, parent=None, class_parent=None, files=None):
         self.server_id = None
         self.root_prefix = ""
 
-        self.background_files_load = set()
-        self.extra_files = []
+        # Name of the last file listed in the current directory, to list the
+        # next ones, or None if all of them were listed
+        self.files_cursor = None
+        self.files_count = 0
+        self.fetching_more_files = False
         self.more_files_available = False
 
         self.filter_on = False
@@ -258,6 +260,7 @@ def __init__(self, parent=None, class_parent=None, files=None):
 
         self.view.sortByColumn(0, Qt.AscendingOrder)
         self.view.entered.connect(self._on_entered_item)
+        self.view.verticalScrollBar().valueChanged.connect(self._on_scrolled)
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
@@ -336,6 +339,12 @@ def _on_clicked_item(self, index):
             elif data_type == "ACTION" and data_name == "FETCH_MORE":
                 self.fetch_more_files()
 
+    def _on_scrolled(self, value):
+        # Get the next files when scrolling to the end of the view
+        maximum = self.view.verticalScrollBar().maximum()
+        if maximum > 0 and value == maximum:
+            self.fetch_more_files()
+
     def _handle_future_response_error(self, future, error_title, error_message):
         try:
             # Need to call `future.result()` to get any possible exception
@@ -561,31 +570,36 @@ async def _do_remote_upload_file(self, local_path):
         remote_file = posixpath.join(
             self.root_prefix, os.path.basename(local_path)
         )
-        file_content = None
+        with open(local_path, mode="rb") as local_file:
+            file_content = local_file.read()
 
+        # Only the parts that changed are sent if the file already exists
+        file_manager = await self.remote_files_manager.open(
+            remote_file, mode="wb", atomic=True
+        )
         try:
-            with open(local_path, mode="r") as local_file:
-                file_content = local_file.read()
-            file_manager = await self.remote_files_manager.open(
-                remote_file, mode="w"
-            )
-        except UnicodeDecodeError:
-            with open(local_path, mode="rb") as local_file:
-                file_content = local_file.read()
-            file_manager = await self.remote_files_manager.open(
-                remote_file, mode="wb"
-            )
-
-        if file_content:
-            remote_file_response = await file_manager.write(file_content)
-
-        await file_manager.close()
-        return remote_file_response
+            return await file_manager.write_delta(file_content)
+        finally:
+            await file_manager.close()
 
     @AsyncDispatcher.QtSlot
     def _on_remote_ls(self, future):
-        data = future.result()
-        self.set_files(data)
+        result = future.result()
+        if result is None:
+            self.files_cursor = None
+            self.set_files([])
+            return
+
+        path, files, cursor, count = result
+        if path != self.root_prefix:
+            return
+
+        self.files_cursor = None
+        self.files_count = 0
+        self.fetching_more_files = False
+        self.more_files_available = False
+        self._update_files_cursor(cursor, count)
+        self.set_files(files)
 
     @AsyncDispatcher(loop="explorer")
     async def _do_remote_ls(self, path, server_id):
@@ -593,90 +607,92 @@ async def _do_remote_ls(self, path, server_id):
             self.sig_stop_spinner_requested.emit()
             return
 
-        for task in self.background_files_load:
-            task.cancel()
-            try:
-                await task
-            except asyncio.CancelledError:
-                pass
+        return await self._get_files(
+            path, None, self.get_conf("init_files_display")
+        )
 
-        self.extra_files = []
-        self.more_files_available = False
+    @AsyncDispatcher.QtSlot
+    def _on_remote_fetch_more(self, future):
+        self.fetching_more_files = False
+        self.sig_stop_spinner_requested.emit()
+
+        result = future.result()
+        if result is None:
+            return
+
+        path, files, cursor, count = result
+        if path != self.root_prefix:
+            return
+
+        self._update_files_cursor(cursor, count)
+        self.set_files(files, reset=False)
+        logger.debug(f"{self.files_count} files listed")
+
+    @AsyncDispatcher(loop="explorer")
+    async def _do_remote_fetch_more(self, path, cursor, limit):
+        if not self.remote_files_manager:
+            return
+
+        return await self._get_files(path, cursor, limit)
+
+    async def _get_files(self, path, cursor, limit):
+        """
+        Get the files of a directory after cursor, up to limit.
+
+        The server sends them in batches sorted by name, so the first ones
+        can be shown without waiting for the whole directory to be listed.
+
+        Returns
+        -------
+        tuple
+            The directory, the files to show, the name of the last file
+            listed (or None if there are no more) and the number of files
+            listed, including those that are not shown.
+        """
         files = []
+        count = 0
+        last_name = None
         try:
-            init_files_display = self.get_conf("init_files_display")
-            generator = self.remote_files_manager.ls(path)
-            async for file in generator:
-                file_name = os.path.relpath(file["name"], self.root_prefix)
-                file_type = file["type"]
-                if len(files) < init_files_display:
-                    if not self.get_conf(
-                        "show_hidden"
-                    ) and file_name.startswith("."):
-                        continue
-                    if (
-                        self.name_filters
-                        and len(self.name_filters)
-                        and file_type == "file"
-                    ):
-                        for name_filter in self.name_filters:
-                            if file_type == "file" and fnmatch.fnmatch(
-                                file_name, name_filter
-                            ):
-                                files.append(file)
-                                break
-                    else:
-                        files.append(file)
-                else:
-                    break
-
-            if len(files) == init_files_display:
-                task = asyncio.create_task(
-                    self._get_extra_files(generator, len(files))
-                )
-                self.background_files_load.add(task)
-                task.add_done_callback(self.background_files_load.discard)
-
+            async for file in self.remote_files_manager.ls(
+                path, cursor=cursor, limit=limit
+            ):
+                count += 1
+                last_name = posixpath.basename(file["name"])
+                if self._is_file_shown(file):
+                    files.append(file)
         except RemoteOSError as error:
             # TODO: Should the error be shown in some way?
             logger.error(error)
         except SpyderRemoteSessionClosed:
             self.remote_files_manager = None
 
-        return files
+        # If fewer files than requested were listed, there are no more
+        cursor = last_name if count == limit else None
+        return path, files, cursor, count
 
-    async def _get_extra_files(self, generator, already_added):
-        self.extra_files = []
-        self.more_files_available = False
-        async for file in generator:
-            if len(self.extra_files) + already_added == self.get_conf(
-                "max_files_display"
-            ):
-                self.more_files_available = True
-                break
-
-            file_name = os.path.relpath(file["name"], self.root_prefix)
-            file_type = file["type"]
-            if not self.get_conf("show_hidden") and file_name.startswith("."):
-                continue
-
-            if (
-                self.name_filters
-                and len(self.name_filters)
-                and file_type == "file"
-            ):
-                for name_filter in self.name_filters:
-                    if file_type == "file" and fnmatch.fnmatch(
-                        file_name, name_filter
-                    ):
-                        self.extra_files.append(file)
-                        break
-            else:
-                self.extra_files.append(file)
+    def _is_file_shown(self, file):
+        """Check if file is hidden or filtered out."""
+        file_name = os.path.relpath(file["name"], self.root_prefix)
+        if not self.get_conf("show_hidden") and file_name.startswith("."):
+            return False
 
-        logger.debug(
-            f"{len(self.extra_files)} available extra files to be shown"
-        )
+        if self.name_filters and file["type"] == "file":
+            return any(
+                fnmatch.fnmatch(file_name, name_filter)
+                for name_filter in self.name_filters
+            )
+
+        return True
+
+    def _update_files_cursor(self, cursor, count):
+        self.files_count += count
+        self.files_cursor = cursor
+        if (
+            cursor is not None
+            and self.files_count >= self.get_conf("max_files_display")
+        ):
+            self.files_cursor = None
+            self.more_files_available = True
 
     def _new_item(self, new_name, for_file=False, with_content=False):
         new_path = posixpath.join(self.root_prefix, new_name)
@@ -740,26 +756,25 @@ def set_files(self, files, reset=True):
         if reset:
             self.model.setRowCount(0)
 
+        root = self.model.invisibleRootItem()
+        more_files_items = self.model.match(
+            self.model.index(0, 0), Qt.DisplayRole, _("Show more files")
+        )
+        if len(more_files_items):
+            # Remove more files item
+            self.model.removeRow(more_files_items[-1].row())
+
+        more_files_available = self.model.match(
+            self.model.index(0, 0),
+            Qt.DisplayRole,
+            _("Maximum number of files to display reached!"),
+        )
+        if len(more_files_available):
+            # Remove more items available item
+            self.model.removeRow(more_files_available[-1].row())
+
         if files:
             logger.debug(f"Setting {len(files)} files")
-            root = self.model.invisibleRootItem()
-
-            more_files_items = self.model.match(
-                self.model.index(0, 0), Qt.DisplayRole, _("Show more files")
-            )
-            if len(more_files_items):
-                # Remove more files item
-                self.model.removeRow(more_files_items[-1].row())
-
-            more_files_available = self.model.match(
-                self.model.index(0, 0),
-                Qt.DisplayRole,
-                _("Maximum number of files to display reached!"),
-            )
-            if len(more_files_available):
-                # Remove more items available item
-                self.model.removeRow(more_files_available[-1].row())
-
             for file in files:
                 path = file["name"]
                 name = os.path.relpath(path, self.root_prefix)
@@ -791,40 +806,43 @@ def set_files(self, files, reset=True):
                     standard_item.setEditable(False)
                 root.appendRow(items)
 
-            # Add fetch more or more items available item
-            if len(self.extra_files):
-                fetch_more_item = QStandardItem(_("Show more files"))
-                fetch_more_item.setEditable(False)
-                fetch_more_item.setData(
-                    {"name": "FETCH_MORE", "type": "ACTION"}
-                )
-                root.appendRow(fetch_more_item)
-                self.view.setFirstColumnSpanned(
-                    fetch_more_item.index().row(), root.index(), True
-                )
-            elif len(self.extra_files) == 0 and self.more_files_available:
-                more_items_available = QStandardItem(
-                    _("Maximum number of files to display reached!")
-                )
-                more_items_available.setEditable(False)
-                more_items_available.setData(
-                    {"name": "MESSAGE", "type": "ACTION"}
-                )
-                root.appendRow(more_items_available)
-                self.view.setFirstColumnSpanned(
-                    more_items_available.index().row(), root.index(), True
-                )
+        # Add fetch more or more items available item
+        if self.files_cursor is not None:
+            fetch_more_item = QStandardItem(_("Show more files"))
+            fetch_more_item.setEditable(False)
+            fetch_more_item.setData({"name": "FETCH_MORE", "type": "ACTION"})
+            root.appendRow(fetch_more_item)
+            self.view.setFirstColumnSpanned(
+                fetch_more_item.index().row(), root.index(), True
+            )
+        elif self.more_files_available:
+            more_items_available = QStandardItem(
+                _("Maximum number of files to display reached!")
+            )
+            more_items_available.setEditable(False)
+            more_items_available.setData(
+                {"name": "MESSAGE", "type": "ACTION"}
+            )
+            root.appendRow(more_items_available)
+            self.view.setFirstColumnSpanned(
+                more_items_available.index().row(), root.index(), True
+            )
 
+        if files:
             self.view.resizeColumnToContents(0)
 
     def fetch_more_files(self):
-        fetch_files_display = self.get_conf("fetch_files_display")
-        new_files = self.extra_files[:fetch_files_display]
-        del self.extra_files[:fetch_files_display]
-        self.set_files(new_files, reset=False)
-        logger.debug(
-            f"{len(self.extra_files)} extra files remaining to be shown"
-        )
+        """Get the next files of the current directory from the server."""
+        if self.files_cursor is None or self.fetching_more_files:
+            return
+
+        self.fetching_more_files = True
+        self.sig_start_spinner_requested.emit()
+        self._do_remote_fetch_more(
+            self.root_prefix,
+            self.files_cursor,
+            self.get_conf("fetch_files_display"),
+        ).connect(self._on_remote_fetch_more)
 
     def set_current_folder(self, folder):
         self.root_prefix = folder
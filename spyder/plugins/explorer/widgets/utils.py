@@ -101,12 +101,14 @@ def icon(self, icontype_or_qfileinfo):
         if isinstance(icontype_or_qfileinfo, QFileIconProvider.IconType):
             return super().icon(icontype_or_qfileinfo)
         else:
+            # Use the information QFileInfo already has instead of checking
+            # the file again because this is called for every file shown.
             qfileinfo = icontype_or_qfileinfo
-            fname = osp.normpath(str(qfileinfo.absoluteFilePath()))
-
-            if osp.isfile(fname) or osp.isdir(fname):
+            if qfileinfo.isFile() or qfileinfo.isDir():
                 icon = ima.get_icon_by_extension_or_type(
-                    fname, scale_factor=1.0
+                    qfileinfo.fileName(),
+                    scale_factor=1.0,
+                    is_dir=qfileinfo.isDir()
                 )
             else:
                 icon = ima.icon('binary')
@@ -16,6 +16,7 @@
 from spyder.api.plugin_registration.decorators import (
     on_plugin_available, on_plugin_teardown)
 from spyder.api.translations import _
+from spyder.plugins.findinfiles.utils.search_engine import shutdown_pool
 from spyder.plugins.findinfiles.widgets.main_widget import FindInFilesWidget
 from spyder.plugins.mainmenu.api import ApplicationMenus, SearchMenuSections
 from spyder.utils.misc import getcwd_or_home
@@ -87,6 +88,8 @@ def on_projects_available(self):
         projects = self.get_plugin(Plugins.Projects)
         projects.sig_project_loaded.connect(self.set_project_path)
         projects.sig_project_closed.connect(self.unset_project_path)
+        projects.sig_project_files_changed.connect(
+            self.get_widget().update_project_index)
 
     @on_plugin_available(plugin=Plugins.MainMenu)
     def on_main_menu_available(self):
@@ -119,6 +122,8 @@ def on_projects_teardon_plugin_teardown(self):
         projects = self.get_plugin(Plugins.Projects)
         projects.sig_project_loaded.disconnect(self.set_project_path)
         projects.sig_project_closed.disconnect(self.unset_project_path)
+        projects.sig_project_files_changed.disconnect(
+            self.get_widget().update_project_index)
 
     @on_plugin_teardown(plugin=Plugins.MainMenu)
     def on_main_menu_teardown(self):
@@ -140,6 +145,9 @@ def on_close(self, cancelable=False):
         self.get_widget()._update_options()
         if self.get_widget().running:
             self.get_widget()._stop_and_reset_thread(ignore_results=True)
+        self.get_widget()._stop_and_reset_replace_thread()
+        self.get_widget().stop_project_index()
+        shutdown_pool()
         return True
 
     # --- Public API
@@ -215,6 +223,15 @@ def find(self):
 
         widget.find()
 
+    # ---- Private API
+    # ------------------------------------------------------------------------
+    def _get_code_editor(self, filename):
+        """Get the editor where `filename` is open, or None if it's not."""
+        editor = self.get_plugin(Plugins.Editor, error=False)
+        if editor is None:
+            return None
+        return editor.get_codeeditor_for_filename(filename)
+
 
 def test():
     import sys
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Support for .gitignore and .ignore files.
+
+The rules of each directory are parsed and compiled once, when the directory
+is visited, and chained to the rules of its parent directory, so that files
+and directories can be checked while walking without reading any other file.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+# Files with ignore rules, in increasing order of precedence
+IGNORE_FILES = ['.gitignore', '.ignore']
+
+
+# ---- Patterns
+# ----------------------------------------------------------------------------
+def _translate_class(pattern, i):
+    """
+    Translate the character class that starts at `pattern[i]`.
+
+    Returns
+    -------
+    tuple
+        (regex, next_index), or (None, i) if the class is not closed.
+    """
+    j = i + 1
+    if j < len(pattern) and pattern[j] in '!^':
+        j += 1
+    if j < len(pattern) and pattern[j] == ']':
+        j += 1
+    j = pattern.find(']', j)
+    if j < 0:
+        return None, i
+
+    content = pattern[i + 1:j].replace('\\', '\\\\')
+    if content[0] in '!^':
+        content = '^' + content[1:]
+    return '[' + content + ']', j + 1
+
+
+def translate_pattern(pattern):
+    """
+    Translate a gitignore glob to a regular expression.
+
+    The expression matches paths relative to the directory of the ignore
+    file, with '/' as separator. Patterns without a slash match the name of
+    files and directories at any depth.
+    """
+    anchored = '/' in pattern
+    pattern = pattern.lstrip('/')
+
+    regex = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith('**', i):
+            at_start = i == 0 or pattern[i - 1] == '/'
+            if at_start and pattern.startswith('**/', i):
+                # Zero or more directories
+                regex.append('(?:.*/)?')
+                i += 3
+                continue
+            elif at_start and i + 2 == n:
+                # Everything inside a directory
+                regex.append('.*')
+                i += 2
+                continue
+            else:
+                regex.append('[^/]*')
+                i += 2
+                continue
+        elif c == '*':
+            regex.append('[^/]*')
+        elif c == '?':
+            regex.append('[^/]')
+        elif c == '[':
+            char_class, i = _translate_class(pattern, i)
+            if char_class is not None:
+                regex.append(char_class)
+                continue
+            regex.append(re.escape(c))
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(c))
+        i += 1
+
+    prefix = '' if anchored else '(?:.*/)?'
+    return prefix + ''.join(regex) + r'\Z'
+
+
+def parse_rules(lines):
+    """
+    Parse the lines of an ignore file.
+
+    Returns
+    -------
+    list
+        (regex, negate, dir_only) tuples, in the order they were given.
+    """
+    rules = []
+    for line in lines:
+        line = line.rstrip('\r\n')
+
+        # Trailing spaces are ignored unless they're escaped
+        stripped = line.rstrip(' ')
+        if stripped.endswith('\\') and len(stripped) < len(line):
+            stripped += ' '
+        line = stripped
+
+        if not line or line.startswith('#'):
+            continue
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith(('\\!', '\\#')):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+
+        try:
+            regex = re.compile(translate_pattern(line))
+        except re.error:
+            continue
+        rules.append((regex, negate, dir_only))
+
+    return rules
+
+
+# ---- Rules
+# ----------------------------------------------------------------------------
+class IgnoreRules:
+    """Ignore rules that apply to a directory and its contents."""
+
+    def __init__(self, base, rules, parent=None):
+        self.base = base
+        self.rules = rules
+        self.parent = parent
+
+    @classmethod
+    def from_directory(cls, dirname, parent=None, extra_files=()):
+        """
+        Read the ignore files of `dirname`.
+
+        Returns `parent` if the directory doesn't have any rules, so that
+        directories share the rules of their closest ancestor with them.
+        """
+        rules = []
+        for filename in list(extra_files) + IGNORE_FILES:
+            try:
+                with open(osp.join(dirname, filename), 'r',
+                          encoding='utf-8', errors='replace') as f:
+                    rules += parse_rules(f)
+            except OSError:
+                pass
+
+        if not rules:
+            return parent
+
+        return cls(osp.normpath(osp.abspath(dirname)), rules, parent)
+
+    def match(self, relpath, is_dir):
+        """
+        Check a path relative to the base directory against these rules only.
+
+        Returns
+        -------
+        bool or None
+            Whether the path is ignored, or None if no rule matches it.
+        """
+        for regex, negate, dir_only in reversed(self.rules):
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relpath):
+                return not negate
+        return None
+
+    def is_ignored(self, dirname, name, is_dir=False):
+        """
+        Check if the file or directory `name` in `dirname` is ignored.
+
+        `dirname` must be an absolute and normalized path.
+        """
+        rules = self
+        while rules is not None:
+            if dirname == rules.base:
+                relpath = name
+            else:
+                reldir = dirname[len(rules.base) + 1:]
+                relpath = reldir.replace(os.sep, '/') + '/' + name
+
+            ignored = rules.match(relpath, is_dir)
+            if ignored is not None:
+                return ignored
+            rules = rules.parent
+
+        return False
+
+
+def get_ignore_rules(path):
+    """
+    Get the ignore rules that apply to the contents of `path`.
+
+    This includes the rules of its parent directories up to the root of the
+    Git repository it belongs to, if any.
+
+    Returns
+    -------
+    IgnoreRules or None
+        None if there are no rules.
+    """
+    path = osp.normpath(osp.abspath(path))
+
+    dirnames = [path]
+    while not osp.exists(osp.join(dirnames[-1], '.git')):
+        parent = osp.dirname(dirnames[-1])
+        if parent == dirnames[-1]:
+            # Not in a repository
+            dirnames = [path]
+            break
+        dirnames.append(parent)
+
+    rules = None
+    for dirname in reversed(dirnames):
+        extra_files = ()
+        if osp.isdir(osp.join(dirname, '.git')):
+            extra_files = [osp.join('.git', 'info', 'exclude')]
+        rules = IgnoreRules.from_directory(dirname, rules, extra_files)
+
+    return rules
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Replacement of the matches found by Find in Files.
+
+Replacements are computed from the matches kept by the results browser, so
+files are only read again, one at a time, when their matches are replaced.
+Lines that changed since they were searched are left untouched.
+"""
+
+# Standard library imports
+import re
+
+# Local imports
+from spyder.utils import encoding
+
+
+# ---- Replacer
+# ----------------------------------------------------------------------------
+class Replacer:
+    """
+    Compute the replacements of the matches found by a search.
+
+    Parameters
+    ----------
+    texts: list
+        (text, encoding) tuples that were searched, as given to the search
+        thread.
+    text_re: bool
+        Whether texts are regular expressions.
+    case_sensitive: bool
+        Whether the search was case sensitive.
+    replacement: str
+        Text that replaces matches. If texts are regular expressions, it can
+        contain backreferences to their groups, as in `re.sub`.
+    """
+
+    def __init__(self, texts, text_re, case_sensitive, replacement):
+        self.text_re = text_re
+        self.case_sensitive = case_sensitive
+        self.replacement = replacement
+        self.encoding = texts[0][1]
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._texts = []
+        for text, enc in texts:
+            if text_re:
+                self._texts.append(re.compile(text.pattern.decode(enc), flags))
+            else:
+                self._texts.append(text.decode(enc))
+
+    def replace_match(self, line, start, end):
+        """
+        Get the text that replaces `line[start:end]`.
+
+        Returns
+        -------
+        str or None
+            None if there's no match at that position anymore.
+        """
+        if not isinstance(line, str):
+            # The line couldn't be decoded when it was searched
+            return None
+
+        for text in self._texts:
+            if self.text_re:
+                match = text.match(line, start)
+                if match is not None and match.end() == end:
+                    try:
+                        return match.expand(self.replacement)
+                    except (re.error, IndexError):
+                        return None
+            else:
+                found = line[start:end]
+                if not self.case_sensitive:
+                    found = found.lower()
+                if found == text:
+                    return self.replacement
+
+        return None
+
+    def replace_line(self, line, spans):
+        """
+        Replace the matches at `spans` in `line`.
+
+        Parameters
+        ----------
+        line: str
+            Line with matches.
+        spans: list
+            (start, end) tuples with the position of matches in the line.
+
+        Returns
+        -------
+        tuple
+            (new_line, count), where `count` is the number of matches that
+            were replaced.
+        """
+        count = 0
+        previous_start = len(line) + 1
+        for start, end in sorted(set(spans), reverse=True):
+            # Matches of literal texts can overlap
+            if end > previous_start:
+                continue
+
+            new_text = self.replace_match(line, start, end)
+            if new_text is None:
+                continue
+
+            line = line[:start] + new_text + line[end:]
+            previous_start = start
+            count += 1
+
+        return line, count
+
+
+# ---- Files
+# ----------------------------------------------------------------------------
+def group_matches(matches):
+    """
+    Group matches by line.
+
+    Parameters
+    ----------
+    matches: list
+        (lineno, start, end, line) tuples, as kept by the results browser.
+
+    Returns
+    -------
+    dict
+        Line number -> (line, spans).
+    """
+    lines = {}
+    for lineno, start, end, line in matches:
+        lines.setdefault(lineno, (line, []))[1].append((start, end))
+    return lines
+
+
+def split_lines(data):
+    """Split `data` in lines that keep their '\\n', like the search does."""
+    lines = data.split(b'\n')
+    last = lines.pop()
+    lines = [line + b'\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def replace_in_data(data, matches, replacer):
+    """
+    Replace matches in the contents of a file.
+
+    Only the lines with matches are decoded and encoded again, so the rest
+    of the file is kept as is.
+
+    Returns
+    -------
+    tuple
+        (new_data, count, skipped), where `skipped` is the number of matches
+        that were not replaced because their lines changed.
+    """
+    lines = split_lines(data)
+    count = 0
+    skipped = 0
+
+    for lineno, (line, spans) in group_matches(matches).items():
+        index = lineno - 1
+        try:
+            current = lines[index].decode(replacer.encoding)
+        except (IndexError, UnicodeDecodeError):
+            skipped += len(spans)
+            continue
+
+        if current != line:
+            skipped += len(spans)
+            continue
+
+        new_line, line_count = replacer.replace_line(line, spans)
+        try:
+            lines[index] = new_line.encode(replacer.encoding)
+        except UnicodeEncodeError:
+            skipped += len(spans)
+            continue
+
+        count += line_count
+        skipped += len(spans) - line_count
+
+    return b''.join(lines), count, skipped
+
+
+def replace_in_file(filename, matches, replacer):
+    """
+    Replace matches in a file and save it atomically.
+
+    Returns
+    -------
+    tuple
+        (count, skipped), as returned by `replace_in_data`.
+
+    Raises
+    ------
+    OSError
+        If the file can't be read or written.
+    """
+    with open(filename, 'rb') as f:
+        data = f.read()
+
+    new_data, count, skipped = replace_in_data(data, matches, replacer)
+    if count:
+        encoding.write(new_data, filename)
+
+    return count, skipped
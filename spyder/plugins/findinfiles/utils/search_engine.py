@@ -0,0 +1,423 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Search engine used by Find in Files.
+
+Files are searched as a whole instead of line by line: their contents are
+scanned with `bytes.find` for literal queries, or with a compiled bytes
+regular expression, to locate the lines that contain matches, and only
+those lines are decoded.
+
+Directory searches send batches of files to a pool of processes, where
+files are memory mapped, and the results of each file are returned in the
+same order in which files were given.
+"""
+
+# Standard library imports
+import collections
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+
+# Local imports
+from spyder.utils.encoding import is_text_file
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+# Number of bytes at the beginning of files checked for null bytes to detect
+# binary files
+BINARY_CHUNK_SIZE = 1024
+
+# Files smaller than this are read instead of memory mapped
+MMAP_MIN_SIZE = 64 * 1024
+
+# Size of the parts of memory mapped files copied at a time to count lines
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+# Number of files searched by each task sent to the pool
+BATCH_SIZE = 32
+
+# Maximum number of processes used to search files
+MAX_WORKERS = 8
+
+# Regular expression constructs that depend on the text around a line, so
+# they can't be used to locate lines when searching a whole file
+RE_CONTEXT_DEPENDENT = re.compile(rb'\\[AZ]|\(\?<?[=!]')
+
+
+# ---- Searching files
+# ----------------------------------------------------------------------------
+def search_line(line, lineno, texts, text_re, case_sensitive):
+    """
+    Get the matches of `texts` in a single line.
+
+    Returns
+    -------
+    list
+        (lineno, start, end, line) tuples, where `start` and `end` are the
+        positions of the match in the decoded `line`.
+    """
+    line_search = line if case_sensitive else line.lower()
+
+    for text, enc in texts:
+        if text_re:
+            if re.search(text, line_search) is not None:
+                break
+        elif line_search.find(text) > -1:
+            break
+    else:
+        return []
+
+    try:
+        line_dec = line.decode(enc)
+    except UnicodeDecodeError:
+        line_dec = line
+
+    matches = []
+    if text_re:
+        for match in re.finditer(text, line_search):
+            bstart, bend = match.start(), match.end()
+            try:
+                # Go from binary position to utf8 position
+                start = len(line_search[:bstart].decode(enc))
+                end = start + len(line_search[bstart:bend].decode(enc))
+            except UnicodeDecodeError:
+                start = bstart
+                end = bend
+            matches.append((lineno, start, end, line_dec))
+    else:
+        found = line_search.find(text)
+        while found > -1:
+            try:
+                # Go from binary position to utf8 position
+                start = len(line_search[:found].decode(enc))
+                end = start + len(text.decode(enc))
+            except UnicodeDecodeError:
+                start = found
+                end = found + len(text)
+            matches.append((lineno, start, end, line_dec))
+
+            for text, enc in texts:
+                found = line_search.find(text, found + 1)
+                if found > -1:
+                    break
+
+    return matches
+
+
+def _line_locator(texts, text_re, case_sensitive=True):
+    """
+    Get a function that returns the position of the first possible match in
+    a file after a given position, or -1 if there are none.
+
+    Case insensitive searches use regular expressions with `re.IGNORECASE`
+    instead of lowering the file contents, so memory mapped files are not
+    copied. Like `bytes.lower`, it only ignores the case of ASCII letters.
+    """
+    if not text_re and case_sensitive:
+        def locate(data, pos):
+            found = [data.find(text, pos) for text, __ in texts]
+            found = [f for f in found if f > -1]
+            return min(found) if found else -1
+
+        return locate
+
+    if text_re:
+        if any(
+            RE_CONTEXT_DEPENDENT.search(text.pattern) for text, __ in texts
+        ):
+            # Every line has to be checked
+            return lambda data, pos: pos
+
+        patterns = [
+            (text.pattern, text.flags | re.MULTILINE) for text, __ in texts
+        ]
+    else:
+        patterns = [(re.escape(text), 0) for text, __ in texts]
+
+    if not case_sensitive:
+        patterns = [
+            (pattern, flags | re.IGNORECASE) for pattern, flags in patterns
+        ]
+    patterns = [re.compile(pattern, flags) for pattern, flags in patterns]
+
+    def locate(data, pos):
+        found = [p.search(data, pos) for p in patterns]
+        found = [f.start() for f in found if f is not None]
+        return min(found) if found else -1
+
+    return locate
+
+
+def _count_lines(data, start, end):
+    """Count the line breaks of data between start and end."""
+    count = 0
+    while start < end:
+        stop = min(start + COUNT_CHUNK_SIZE, end)
+        count += data[start:stop].count(b'\n')
+        start = stop
+    return count
+
+
+def search_data(data, texts, text_re, case_sensitive):
+    """
+    Get the matches of `texts` in the contents of a file.
+
+    `data` can be a bytes or mmap object.
+    """
+    locate = _line_locator(texts, text_re, case_sensitive)
+    size = len(data)
+
+    matches = []
+    pos = 0
+    lineno = 1
+    line_start = 0
+    while pos < size:
+        found = locate(data, pos)
+        if found < 0:
+            break
+
+        # Number the line that contains the match
+        previous_start = line_start
+        line_start = data.rfind(b'\n', 0, found) + 1
+        lineno += _count_lines(data, previous_start, line_start)
+
+        line_end = data.find(b'\n', found)
+        line_end = size if line_end < 0 else line_end + 1
+
+        matches += search_line(
+            data[line_start:line_end], lineno, texts, text_re, case_sensitive
+        )
+        pos = line_end
+
+    return matches
+
+
+def search_file(filename, texts, text_re, case_sensitive, check_text=False,
+                use_mmap=False):
+    """
+    Get the matches of `texts` in `filename`.
+
+    Parameters
+    ----------
+    filename: str
+        Path of the file to search.
+    texts: list
+        (text, encoding) tuples to search, where text is a bytes string or
+        a compiled bytes regular expression if `text_re` is True.
+    text_re: bool
+        Whether texts are regular expressions.
+    case_sensitive: bool
+        Whether the search is case sensitive. If not, texts must be lower
+        case.
+    check_text: bool, optional
+        Check that the file is a text file before searching it. This is
+        needed for files without a known text extension.
+    use_mmap: bool, optional
+        Memory map large files instead of reading them. This should only be
+        done in worker processes because accessing a file that is truncated
+        while it's mapped crashes the process.
+
+    Returns
+    -------
+    list
+        (lineno, start, end, line) tuples, as returned by `search_line`.
+
+    Raises
+    ------
+    OSError
+        If the file can't be read.
+    """
+    with open(filename, 'rb') as f:
+        chunk = f.read(BINARY_CHUNK_SIZE)
+
+        # Skip binary files early
+        if not chunk or b'\x00' in chunk:
+            return []
+        if check_text and not is_text_file(filename):
+            return []
+
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap and size >= MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return search_data(data, texts, text_re, case_sensitive)
+            except (OSError, ValueError):
+                # Some file systems don't support memory mapping
+                pass
+
+        f.seek(0)
+        data = f.read()
+
+    return search_data(data, texts, text_re, case_sensitive)
+
+
+def search_files(files, texts, text_re, case_sensitive, use_mmap=False):
+    """
+    Search a batch of files.
+
+    Parameters
+    ----------
+    files: list
+        (filename, check_text) tuples of the files to search.
+
+    Returns
+    -------
+    list
+        (filename, matches, error) tuples, where `error` is True if the file
+        couldn't be read.
+    """
+    results = []
+    for filename, check_text in files:
+        try:
+            matches = search_file(
+                filename, texts, text_re, case_sensitive,
+                check_text=check_text, use_mmap=use_mmap
+            )
+            results.append((filename, matches, False))
+        except OSError:
+            results.append((filename, [], True))
+
+    return results
+
+
+# ---- Process pool
+# ----------------------------------------------------------------------------
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def default_workers():
+    """Number of processes used to search files, leaving a CPU for the UI."""
+    return max(1, min(MAX_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def get_pool(workers):
+    """
+    Get the pool of processes used to search files.
+
+    The pool is shared by all searches so processes are only started once.
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None and _pool_workers != workers:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+        if _pool is None:
+            # Forking a process with Qt threads running is not safe
+            context = multiprocessing.get_context('spawn')
+            _pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=context
+            )
+            _pool_workers = workers
+
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the processes used to search files."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+# ---- Engine
+# ----------------------------------------------------------------------------
+def _batches(files, size):
+    batch = []
+    for item in files:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class SearchEngine:
+    """Search files in parallel and return their matches in order."""
+
+    def __init__(self, texts, text_re, case_sensitive, workers=None):
+        self.texts = texts
+        self.text_re = text_re
+        self.case_sensitive = case_sensitive
+        self.workers = default_workers() if workers is None else workers
+
+    def _search_batch(self, batch):
+        return search_files(
+            batch, self.texts, self.text_re, self.case_sensitive
+        )
+
+    def search(self, files):
+        """
+        Search files and yield their results in order.
+
+        Parameters
+        ----------
+        files: iterable
+            (filename, check_text) tuples. It's consumed while files are
+            being searched, so it can be a generator that walks directories.
+
+        Yields
+        ------
+        tuple
+            (filename, matches, error), as returned by `search_files`.
+            Closing the generator cancels the search of pending files.
+        """
+        if self.workers <= 1:
+            for batch in _batches(files, BATCH_SIZE):
+                yield from self._search_batch(batch)
+            return
+
+        pool = get_pool(self.workers)
+        pending = collections.deque()
+        try:
+            for batch in _batches(files, BATCH_SIZE):
+                if pool is None:
+                    yield from self._search_batch(batch)
+                    continue
+
+                try:
+                    future = pool.submit(
+                        search_files, batch, self.texts, self.text_re,
+                        self.case_sensitive, use_mmap=True
+                    )
+                except RuntimeError:
+                    # The pool is broken or was shut down
+                    pool = None
+                    shutdown_pool()
+                    yield from self._search_batch(batch)
+                    continue
+                pending.append((future, batch))
+
+                # Limit the number of batches in flight, so that walking
+                # doesn't get too far ahead of searching
+                while len(pending) > 2 * self.workers:
+                    yield from self._get_results(*pending.popleft())
+
+            while pending:
+                yield from self._get_results(*pending.popleft())
+        finally:
+            for future, __ in pending:
+                future.cancel()
+
+    def _get_results(self, future, batch):
+        try:
+            return future.result()
+        except (RuntimeError, CancelledError):
+            # A worker died, e.g. because a mapped file was truncated, or the
+            # pool was shut down. Search the batch again in this process.
+            shutdown_pool()
+            return self._search_batch(batch)
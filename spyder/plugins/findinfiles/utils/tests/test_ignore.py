@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the support of ignore files in Find in Files.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils.ignore import (
+    IgnoreRules,
+    get_ignore_rules,
+    parse_rules
+)
+
+
+def is_ignored(lines, relpath, is_dir=False):
+    """Check a path relative to the directory of an ignore file."""
+    base = osp.abspath(os.sep + 'project')
+    rules = IgnoreRules(base, parse_rules(lines))
+    parts = relpath.split('/')
+    dirname = osp.join(base, *parts[:-1]) if len(parts) > 1 else base
+    return rules.is_ignored(dirname, parts[-1], is_dir=is_dir)
+
+
+@pytest.mark.parametrize(
+    'pattern, relpath, is_dir, ignored',
+    [
+        # Names match at any depth
+        ('*.log', 'debug.log', False, True),
+        ('*.log', 'logs/debug.log', False, True),
+        ('*.log', 'debug.log.txt', False, False),
+        ('build', 'src/build', True, True),
+        # Patterns with a slash are relative to the ignore file
+        ('/build', 'build', True, True),
+        ('/build', 'src/build', True, False),
+        ('doc/*.txt', 'doc/notes.txt', False, True),
+        ('doc/*.txt', 'doc/server/notes.txt', False, False),
+        # Directory only patterns
+        ('build/', 'build', True, True),
+        ('build/', 'build', False, False),
+        # Double asterisks
+        ('**/foo', 'a/b/foo', False, True),
+        ('a/**/b', 'a/b', True, True),
+        ('a/**/b', 'a/x/y/b', True, True),
+        ('abc/**', 'abc/x/y', False, True),
+        # Character classes and escapes
+        ('*.py[co]', 'spam.pyc', False, True),
+        ('*.py[!co]', 'spam.pyc', False, False),
+        ('\\#spam', '#spam', False, True),
+        ('# spam', '# spam', False, False),
+    ]
+)
+def test_patterns(pattern, relpath, is_dir, ignored):
+    """Check that patterns follow the gitignore format."""
+    assert is_ignored([pattern], relpath, is_dir) == ignored
+
+
+def test_negation():
+    """Check that the last matching rule wins."""
+    lines = ['*.txt', '!keep.txt', '', '# comment']
+    assert is_ignored(lines, 'spam.txt')
+    assert not is_ignored(lines, 'keep.txt')
+    assert not is_ignored(lines, 'spam.py')
+
+
+def test_nested_rules(tmp_path):
+    """Check that rules of subdirectories take precedence."""
+    root = tmp_path / 'project'
+    (root / '.git' / 'info').mkdir(parents=True)
+    (root / 'src').mkdir()
+    (root / '.gitignore').write_text('*.txt\n')
+    (root / '.git' / 'info' / 'exclude').write_text('*.tmp\n')
+    (root / 'src' / '.ignore').write_text('!notes.txt\n')
+
+    # Rules of the repository root apply when searching a subdirectory
+    src = str(root / 'src')
+    rules = get_ignore_rules(src)
+    assert rules.is_ignored(src, 'spam.txt')
+    assert rules.is_ignored(src, 'spam.tmp')
+    assert not rules.is_ignored(src, 'notes.txt')
+    assert not rules.is_ignored(src, 'spam.py')
+
+    # Directories without rules share the ones of their parent
+    assert IgnoreRules.from_directory(str(root / '.git'), rules) is rules
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the replacement of Find in Files matches.
+"""
+
+# Standard library imports
+import os
+import re
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils.replace import (
+    Replacer,
+    replace_in_data,
+    replace_in_file
+)
+from spyder.plugins.findinfiles.utils.search_engine import search_file
+
+
+def get_texts(text, text_re=False, case_sensitive=True):
+    """Get texts as they are passed to the search thread."""
+    text = text.encode('utf-8')
+    if not case_sensitive:
+        text = text.lower()
+    if text_re:
+        text = re.compile(text)
+    return [(text, 'utf-8')]
+
+
+def get_replacer(text, replacement, text_re=False, case_sensitive=True):
+    texts = get_texts(text, text_re, case_sensitive)
+    return Replacer(texts, text_re, case_sensitive, replacement)
+
+
+@pytest.mark.parametrize(
+    'text, replacement, text_re, case_sensitive, expected',
+    [
+        ('spam', 'ham', False, True, 'ham = "ham ham" + Spam\n'),
+        ('spam', 'ham', False, False, 'ham = "ham ham" + ham\n'),
+        (r'(s)pam', r'\1ausage', True, True,
+         'sausage = "sausage sausage" + Spam\n'),
+        (r'sp(am)?', 'x', True, False, 'x = "x x" + x\n'),
+        ('aa', 'b', False, True, None),
+    ]
+)
+def test_replace_line(text, replacement, text_re, case_sensitive, expected):
+    """Check that lines are replaced like the search found them."""
+    line = 'spam = "spam spam" + Spam\n'
+    replacer = get_replacer(text, replacement, text_re, case_sensitive)
+
+    if expected is None:
+        # Overlapping matches are only replaced once
+        new_line, count = replacer.replace_line('aaa\n', [(0, 2), (1, 3)])
+        assert (new_line, count) == ('ab\n', 1)
+        return
+
+    if text_re:
+        spans = [
+            m.span() for m in re.finditer(
+                text, line, 0 if case_sensitive else re.IGNORECASE)
+        ]
+    else:
+        search_line = line if case_sensitive else line.lower()
+        spans = [m.span() for m in re.finditer(re.escape(text), search_line)]
+
+    new_line, count = replacer.replace_line(line, spans)
+    assert new_line == expected
+    assert count == len(spans)
+
+
+def test_replace_in_data_skips_changed_lines():
+    """Check that lines changed after the search are not replaced."""
+    replacer = get_replacer('spam', 'eggs')
+    data = b'spam\r\nham\r\nspam = 1\r\nspam'
+    matches = [
+        (1, 0, 4, 'spam\r\n'),
+        (3, 0, 4, 'spam = 2\r\n'),
+        (4, 0, 4, 'spam'),
+        (10, 0, 4, 'spam\n'),
+    ]
+    new_data, count, skipped = replace_in_data(data, matches, replacer)
+    assert new_data == b'eggs\r\nham\r\nspam = 1\r\neggs'
+    assert (count, skipped) == (2, 2)
+
+
+def test_replace_in_file(tmp_path):
+    """Check that files are replaced and keep their other contents."""
+    filename = tmp_path / 'spam.py'
+    latin = 'café'.encode('latin-1')
+    filename.write_bytes(b'spam = 1\n' + latin + b'\nspam = "spam"\n')
+    os.chmod(filename, 0o640)
+
+    texts = get_texts('spam')
+    replacer = get_replacer('spam', 'sausage')
+    matches = search_file(str(filename), texts, False, True)
+    assert replace_in_file(str(filename), matches, replacer) == (3, 0)
+    assert filename.read_bytes() == (
+        b'sausage = 1\n' + latin + b'\nsausage = "sausage"\n'
+    )
+    assert os.stat(filename).st_mode & 0o777 == 0o640
+
+    # Nothing is written if there's nothing to replace
+    mtime = os.stat(filename).st_mtime_ns
+    matches = search_file(str(filename), texts, False, True)
+    assert replace_in_file(str(filename), matches, replacer) == (0, 0)
+    assert os.stat(filename).st_mtime_ns == mtime
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
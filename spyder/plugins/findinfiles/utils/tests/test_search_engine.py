@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the Find in Files search engine.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import re
+import time
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils import search_engine
+from spyder.plugins.findinfiles.utils.search_engine import (
+    SearchEngine,
+    search_file,
+    search_line,
+    shutdown_pool
+)
+
+
+TEXT = (
+    "import os\n"
+    "# Spam and eggs\n"
+    "spam = 'spam spam'\n"
+    "\n"
+    "def eggs(ham):\n"
+    "    return 'Ăspam' + ham\n"
+    "SPAM"
+)
+
+
+def get_texts(text, text_re=False, case_sensitive=True):
+    """Get texts as they are passed to the search thread."""
+    text = text.encode('utf-8')
+    if not case_sensitive:
+        text = text.lower()
+    if text_re:
+        text = re.compile(text)
+    return [(text, 'utf-8')]
+
+
+def search_lines(filename, texts, text_re, case_sensitive):
+    """Search a file line by line, like Find in Files used to do."""
+    matches = []
+    with open(filename, 'rb') as f:
+        for lineno, line in enumerate(f, 1):
+            matches += search_line(line, lineno, texts, text_re,
+                                   case_sensitive)
+    return matches
+
+
+@pytest.fixture
+def text_file(tmp_path):
+    filename = tmp_path / 'spam.py'
+    filename.write_bytes(TEXT.encode('utf-8'))
+    return str(filename)
+
+
+@pytest.mark.parametrize('case_sensitive', [True, False])
+@pytest.mark.parametrize(
+    'text, text_re',
+    [
+        ('spam', False),
+        ('ham', False),
+        ("'", False),
+        ('notfound', False),
+        (r'sp[a-z]m', True),
+        (r'^spam', True),
+        (r'\w+$', True),
+        (r'(?<=\()ham', True),
+        (r'\Aspam', True),
+        (r'eggs\n', True),
+    ]
+)
+def test_search_file(text_file, text, text_re, case_sensitive):
+    """Check that searching whole files gives the same matches as lines."""
+    texts = get_texts(text, text_re, case_sensitive)
+    expected = search_lines(text_file, texts, text_re, case_sensitive)
+    matches = search_file(text_file, texts, text_re, case_sensitive)
+    assert matches == expected
+
+
+def test_search_file_positions(text_file):
+    """Check the line numbers and columns of matches."""
+    matches = search_file(text_file, get_texts('spam'), False, True)
+    assert [m[:3] for m in matches] == [
+        (3, 0, 4), (3, 8, 12), (3, 13, 17), (6, 13, 17)
+    ]
+    assert matches[0][3] == "spam = 'spam spam'\n"
+
+
+def test_search_file_mmap(tmp_path, monkeypatch):
+    """Check that memory mapped files give the same matches."""
+    monkeypatch.setattr(search_engine, 'MMAP_MIN_SIZE', 1)
+    filename = str(tmp_path / 'spam.txt')
+    with open(filename, 'wb') as f:
+        f.write(TEXT.encode('utf-8') * 10)
+
+    for case_sensitive in [True, False]:
+        texts = get_texts('Spam', case_sensitive=case_sensitive)
+        expected = search_file(filename, texts, False, case_sensitive)
+        matches = search_file(filename, texts, False, case_sensitive,
+                              use_mmap=True)
+        assert matches == expected
+        assert len(matches) == (10 if case_sensitive else 60)
+
+
+def test_search_file_binary(tmp_path):
+    """Check that binary and empty files are skipped."""
+    binary = tmp_path / 'spam.dat'
+    binary.write_bytes(b'spam\x00\x01\x02spam')
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    texts = get_texts('spam')
+
+    assert search_file(str(binary), texts, False, True) == []
+    assert search_file(str(empty), texts, False, True) == []
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_search_engine_order(tmp_path, workers):
+    """Check that results are returned in the order files are given."""
+    files = []
+    for i in range(3 * search_engine.BATCH_SIZE + 1):
+        filename = tmp_path / f'spam{i}.txt'
+        filename.write_text('ham\n' * (i % 3) + 'spam\n' * (i % 5))
+        files.append(str(filename))
+    files.append(str(tmp_path / 'missing.txt'))
+
+    engine = SearchEngine(get_texts('spam'), False, True, workers=workers)
+    try:
+        results = list(engine.search((f, False) for f in files))
+    finally:
+        shutdown_pool()
+
+    assert [r[0] for r in results] == files
+    for i, (filename, matches, error) in enumerate(results[:-1]):
+        assert not error
+        assert [m[0] for m in matches] == [
+            (i % 3) + n + 1 for n in range(i % 5)
+        ]
+    assert results[-1][2]
+
+
+@pytest.mark.slow
+def test_search_engine_benchmark(tmp_path):
+    """Compare the search engine with a line by line search."""
+    num_dirs, num_files, num_lines = 10, 50, 2000
+    line = 'value = compute(alpha, beta) + other_function(gamma)  # note\n'
+    files = []
+    for i in range(num_dirs):
+        dirname = tmp_path / f'package{i}'
+        dirname.mkdir()
+        for j in range(num_files):
+            filename = dirname / f'module{j}.py'
+            lines = [line] * num_lines
+            lines[j * 37 % num_lines] = 'needle = 1\n'
+            filename.write_text(''.join(lines))
+            files.append(str(filename))
+
+    texts = get_texts('needle')
+
+    start = time.perf_counter()
+    expected = [search_lines(f, texts, False, True) for f in files]
+    lines_time = time.perf_counter() - start
+
+    engine = SearchEngine(texts, False, True)
+    start = time.perf_counter()
+    results = list(engine.search((f, False) for f in files))
+    engine_time = time.perf_counter() - start
+    shutdown_pool()
+
+    size = sum(osp.getsize(f) for f in files) / 2**20
+    print(f'\nSearched {len(files)} files ({size:.0f} MB) with '
+          f'{engine.workers} worker(s): {lines_time:.2f}s line by line, '
+          f'{engine_time:.2f}s with the engine')
+
+    assert [r[1] for r in results] == expected
+    assert engine_time < lines_time
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the Find in Files trigram index.
+"""
+
+# Standard library imports
+import os
+import time
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.findinfiles.utils.trigram_index import (
+    TrigramIndex,
+    get_trigrams
+)
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project with a few files."""
+    root = tmp_path / 'project'
+    (root / 'package').mkdir(parents=True)
+    (root / '.git').mkdir()
+    (root / 'package' / 'spam.py').write_text('spam = "Eggs"\n')
+    (root / 'package' / 'ham.py').write_text('ham = 1\n')
+    (root / 'notes.txt').write_text('Some eggs and ham\n')
+    (root / 'data.txt').write_bytes(b'ham\x00\x01')
+    (root / '.git' / 'config.txt').write_text('spam eggs ham\n')
+    return root
+
+
+@pytest.fixture
+def index(project, tmp_path):
+    """Build the index of the project."""
+    index = TrigramIndex(str(project), cache_dir=str(tmp_path / 'cache'))
+    index.start()
+    assert index.wait(10)
+    yield index
+    index.stop()
+
+
+def candidates(index, text):
+    return index.candidates([(text.encode('utf-8'), 'utf-8')])
+
+
+def wait_for(condition, timeout=10):
+    start = time.time()
+    while not condition():
+        if time.time() - start > timeout:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_get_trigrams():
+    """Check that trigrams are lower case and unique."""
+    assert get_trigrams(b'ab') == set()
+    assert get_trigrams(b'AbcAbc') == get_trigrams(b'abcabc')
+    assert len(get_trigrams(b'abcabc')) == 3
+
+
+def test_candidates(index, project):
+    """Check the files that can contain a text."""
+    spam = os.path.join(str(project), 'package', 'spam.py')
+    ham = os.path.join(str(project), 'package', 'ham.py')
+    notes = os.path.join(str(project), 'notes.txt')
+    data = os.path.join(str(project), 'data.txt')
+
+    # Hidden directories are not indexed and binary files are always
+    # candidates
+    assert len(index) == 4
+    assert candidates(index, 'eggs') == {spam, notes, data}
+    assert candidates(index, 'EGGS') == {spam, notes, data}
+    assert candidates(index, 'ham = 1') == {ham, data}
+    assert candidates(index, 'notfound') == {data}
+
+    # Texts shorter than a trigram can't use the index
+    assert candidates(index, 'am') is None
+
+
+def test_update(index, project):
+    """Check that the index is updated after files change."""
+    spam = project / 'package' / 'spam.py'
+    toast = project / 'package' / 'toast.py'
+    assert str(spam) in candidates(index, 'spam')
+
+    spam.write_text('bacon = 2\n')
+    os.utime(spam, ns=(0, 0))
+    toast.write_text('toast = "spam"\n')
+    index.update([str(spam), str(toast)])
+    assert wait_for(lambda: str(toast) in candidates(index, 'spam'))
+    assert str(spam) not in candidates(index, 'spam')
+    assert index.is_current(str(spam), os.stat(spam))
+
+    # Deleting a directory removes its files from the index
+    for filename in (project / 'package').iterdir():
+        filename.unlink()
+    (project / 'package').rmdir()
+    index.update([str(project / 'package')])
+    assert wait_for(lambda: len(index) == 2)
+
+
+def test_persistence(index, project, tmp_path):
+    """Check that the index is reused after it's saved."""
+    index.stop()
+    assert os.path.isfile(index.cache_file)
+
+    new_index = TrigramIndex(str(project), cache_dir=str(tmp_path / 'cache'))
+    assert set(new_index.load()) == set(index._files)
+    new_index.start()
+    assert new_index.wait(10)
+    assert not new_index._dirty
+    assert candidates(new_index, 'eggs') == candidates(index, 'eggs')
+    new_index.stop()
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
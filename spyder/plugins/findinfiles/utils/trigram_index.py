@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Persistent trigram index of the files in a project.
+
+For every text file, the index keeps a small Bloom filter with the
+(lower case) trigrams it contains. Searches for a literal text only need to
+read the files whose filter contains all the trigrams of the text, and the
+rest of the files can be skipped as long as they didn't change since they
+were indexed.
+
+The index is built in a background thread, saved to Spyder's config
+directory and updated file by file afterwards, e.g. from the notifications
+of the project's file watcher.
+"""
+
+# Standard library imports
+import hashlib
+import logging
+import os
+import os.path as osp
+import pickle
+import queue
+import tempfile
+import threading
+
+# Local imports
+from spyder.config.base import get_conf_path
+from spyder.config.utils import EDIT_EXTENSIONS
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+
+# Version of the index format. Indexes saved with a different version are
+# rebuilt.
+INDEX_VERSION = 1
+
+# Files larger than this are not indexed, so they are always candidates
+MAX_FILE_SIZE = 2 * 1024 * 1024
+
+# Bits of the Bloom filter of a file per trigram it contains
+BITS_PER_TRIGRAM = 8
+
+# Minimum size of a Bloom filter in bits
+MIN_FILTER_BITS = 64
+
+# Seconds without updates before the index is saved
+SAVE_DELAY = 5
+
+# Directories that are not indexed
+SKIP_DIRS = {'__pycache__', 'node_modules'}
+
+
+# ---- Trigrams
+# ----------------------------------------------------------------------------
+def get_trigrams(data):
+    """Get the set of lower case trigrams in `data`, as integers."""
+    data = data.lower()
+    return {
+        (a << 16) | (b << 8) | c
+        for a, b, c in set(zip(data, data[1:], data[2:]))
+    }
+
+
+def _bit_positions(trigram, num_bits):
+    """Get the positions of a trigram in a filter with `num_bits`."""
+    mask = num_bits - 1
+    h1 = (trigram * 0x9E3779B1) & 0xFFFFFFFF
+    h2 = (trigram * 0x85EBCA6B) & 0xFFFFFFFF
+    return (h1 >> 8) & mask, (h2 >> 8) & mask
+
+
+def build_filter(trigrams):
+    """
+    Build the Bloom filter of a set of trigrams.
+
+    Returns
+    -------
+    tuple
+        (num_bits, bits), where `bits` is an integer used as a bit set.
+    """
+    num_bits = MIN_FILTER_BITS
+    while num_bits < len(trigrams) * BITS_PER_TRIGRAM:
+        num_bits *= 2
+
+    buffer = bytearray(num_bits // 8)
+    for trigram in trigrams:
+        for position in _bit_positions(trigram, num_bits):
+            buffer[position >> 3] |= 1 << (position & 7)
+
+    return num_bits, int.from_bytes(buffer, 'little')
+
+
+def build_filter_mask(trigrams, num_bits):
+    """Get the bits set by `trigrams` in a filter with `num_bits`."""
+    mask = 0
+    for trigram in trigrams:
+        for position in _bit_positions(trigram, num_bits):
+            mask |= 1 << position
+    return mask
+
+
+# ---- Index
+# ----------------------------------------------------------------------------
+class TrigramIndex:
+    """Trigram index of the text files in a directory."""
+
+    def __init__(self, root_path, cache_dir=None):
+        self.root_path = osp.normpath(root_path)
+        self._cache_dir = cache_dir or get_conf_path(
+            osp.join('find_in_files', 'index')
+        )
+
+        # Path -> (mtime_ns, size, num_bits, bits). Files that can't be
+        # indexed have no filter (i.e. num_bits is 0).
+        self._files = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._dirty = False
+
+    @property
+    def cache_file(self):
+        digest = hashlib.sha1(self.root_path.encode('utf-8')).hexdigest()
+        return osp.join(self._cache_dir, digest + '.pickle')
+
+    @property
+    def ready(self):
+        """Whether the initial build of the index has finished."""
+        return self._ready.is_set()
+
+    def __len__(self):
+        return len(self._files)
+
+    # ---- Building
+    def start(self):
+        """Build and update the index in a background thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name='findinfiles-trigram-index', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop updating the index and save it if it was modified."""
+        self._stop.set()
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._dirty:
+            self.save()
+
+    def wait(self, timeout=None):
+        """Wait for the initial build to finish."""
+        return self._ready.wait(timeout)
+
+    def _run(self):
+        try:
+            self._build()
+        except Exception:
+            logger.exception(f"Failed to index {self.root_path}")
+        finally:
+            self._ready.set()
+
+        while not self._stop.is_set():
+            try:
+                path = self._queue.get(timeout=SAVE_DELAY)
+            except queue.Empty:
+                if self._dirty:
+                    self.save()
+                continue
+
+            if path is None:
+                break
+
+            try:
+                self._update_path(path)
+            except Exception:
+                logger.exception(f"Failed to update the index of {path}")
+
+    def _build(self):
+        cached = self.load()
+        for path in self._walk(self.root_path):
+            if self._stop.is_set():
+                return
+
+            entry = cached.get(path)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            if (
+                entry is None
+                or entry[0] != st.st_mtime_ns
+                or entry[1] != st.st_size
+            ):
+                entry = self._index_file(path, st)
+                self._dirty = True
+
+            if entry is not None:
+                with self._lock:
+                    self._files[path] = entry
+
+        if set(cached) - set(self._files):
+            self._dirty = True
+        if self._dirty:
+            self.save()
+
+        logger.debug(
+            f"Indexed {len(self._files)} files in {self.root_path}"
+        )
+
+    def _walk(self, path):
+        for dirpath, dirnames, filenames in os.walk(path):
+            # Skip hidden directories, like the ones skipped by Find in Files
+            dirnames[:] = [
+                d for d in dirnames
+                if not d.startswith('.') and d not in SKIP_DIRS
+            ]
+            for filename in filenames:
+                if osp.splitext(filename)[1] in EDIT_EXTENSIONS:
+                    yield osp.join(dirpath, filename)
+
+    def _index_file(self, path, st):
+        """Get the index entry of a file, or None if it can't be read."""
+        if st.st_size > MAX_FILE_SIZE:
+            return (st.st_mtime_ns, st.st_size, 0, 0)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # Binary files are not searched by Find in Files, so there's no need
+        # to keep their trigrams
+        if b'\x00' in data[:1024]:
+            return (st.st_mtime_ns, st.st_size, 0, 0)
+
+        num_bits, bits = build_filter(get_trigrams(data))
+        return (st.st_mtime_ns, st.st_size, num_bits, bits)
+
+    # ---- Updates
+    def update(self, paths):
+        """
+        Reindex files or directories that were created, modified, moved or
+        deleted.
+
+        This is done in the index thread, so it returns immediately.
+        """
+        for path in paths:
+            path = osp.normpath(path)
+            if self.covers(path):
+                self._queue.put(path)
+
+    def _update_path(self, path):
+        if osp.isdir(path):
+            # Remove files that no longer exist in the directory
+            prefix = path + os.sep
+            with self._lock:
+                removed = [
+                    p for p in self._files
+                    if p.startswith(prefix) and not osp.isfile(p)
+                ]
+                for p in removed:
+                    del self._files[p]
+                self._dirty = self._dirty or bool(removed)
+
+            for filename in self._walk(path):
+                self._update_file(filename)
+        elif osp.isfile(path):
+            if osp.splitext(path)[1] in EDIT_EXTENSIONS:
+                self._update_file(path)
+        else:
+            # The file or directory was deleted or moved
+            prefix = path + os.sep
+            with self._lock:
+                removed = [
+                    p for p in self._files
+                    if p == path or p.startswith(prefix)
+                ]
+                for p in removed:
+                    del self._files[p]
+                self._dirty = self._dirty or bool(removed)
+
+    def _update_file(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+
+        if self.is_current(path, st):
+            return
+
+        entry = self._index_file(path, st)
+        with self._lock:
+            if entry is None:
+                self._files.pop(path, None)
+            else:
+                self._files[path] = entry
+            self._dirty = True
+
+    # ---- Persistence
+    def load(self):
+        """Load the index saved on disk, keyed by path."""
+        try:
+            with open(self.cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return {}
+
+        if (
+            not isinstance(data, dict)
+            or data.get('version') != INDEX_VERSION
+            or data.get('root') != self.root_path
+        ):
+            return {}
+
+        return {
+            path: (mtime, size, num_bits, int.from_bytes(bits, 'little'))
+            for path, (mtime, size, num_bits, bits) in data['files'].items()
+        }
+
+    def save(self):
+        """Save the index to disk atomically."""
+        with self._lock:
+            files = {
+                path: (
+                    mtime, size, num_bits,
+                    bits.to_bytes(num_bits // 8, 'little')
+                )
+                for path, (mtime, size, num_bits, bits) in self._files.items()
+            }
+            self._dirty = False
+
+        data = {'version': INDEX_VERSION, 'root': self.root_path,
+                'files': files}
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir,
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)
+        except OSError:
+            logger.warning(f"Failed to save the index of {self.root_path}")
+
+    # ---- Queries
+    def covers(self, path):
+        """Check if `path` is inside the indexed directory."""
+        path = osp.normpath(path)
+        return (
+            path == self.root_path
+            or path.startswith(osp.join(self.root_path, ''))
+        )
+
+    def is_current(self, path, st):
+        """
+        Check if `path` is indexed and didn't change since then.
+
+        Parameters
+        ----------
+        path: str
+            Normalized path of the file.
+        st: os.stat_result
+            Current status of the file.
+        """
+        entry = self._files.get(path)
+        return (
+            entry is not None
+            and entry[0] == st.st_mtime_ns
+            and entry[1] == st.st_size
+        )
+
+    def candidates(self, texts):
+        """
+        Get the indexed files that can contain any of `texts`.
+
+        Parameters
+        ----------
+        texts: list
+            (text, encoding) tuples, where text is a bytes string.
+
+        Returns
+        -------
+        set or None
+            The paths of the candidate files, or None if the texts are too
+            short to use the index.
+        """
+        queries = []
+        for text, __ in texts:
+            trigrams = get_trigrams(text)
+            if not trigrams:
+                return None
+            queries.append(trigrams)
+
+        masks = {}
+        candidates = set()
+        with self._lock:
+            for path, (__, __, num_bits, bits) in self._files.items():
+                if num_bits == 0:
+                    candidates.add(path)
+                    continue
+
+                if num_bits not in masks:
+                    masks[num_bits] = [
+                        build_filter_mask(trigrams, num_bits)
+                        for trigrams in queries
+                    ]
+                for mask in masks[num_bits]:
+                    if bits & mask == mask:
+                        candidates.add(path)
+                        break
+
+        return candidates
+
@@ -13,18 +13,22 @@
 # Third party imports
 from qtpy import PYSIDE2
 from qtpy.QtCore import Signal, Qt
-from qtpy.QtGui import QFontMetricsF
-from qtpy.QtWidgets import QInputDialog, QLabel
+from qtpy.QtGui import QFontMetricsF, QTextCursor
+from qtpy.QtWidgets import QInputDialog, QLabel, QMessageBox
 
 # Local imports
 from spyder.api.config.decorators import on_conf_change
 from spyder.api.translations import _
 from spyder.api.widgets.main_widget import PluginMainWidget
+from spyder.plugins.findinfiles.utils.replace import Replacer, group_matches
+from spyder.plugins.findinfiles.utils.trigram_index import TrigramIndex
 from spyder.plugins.findinfiles.widgets.results_browser import (
     ON, ResultsBrowser)
 from spyder.plugins.findinfiles.widgets.combobox import (
     MAX_PATH_HISTORY, SearchInComboBox)
+from spyder.plugins.findinfiles.widgets.replace_thread import ReplaceThread
 from spyder.plugins.findinfiles.widgets.search_thread import SearchThread
+from spyder.utils.qstringhelpers import qstring_length
 from spyder.utils.misc import regexp_error_msg
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.stylesheet import AppStyle
@@ -43,19 +47,25 @@
 class FindInFilesWidgetActions:
     # Triggers
     Find = 'find_action'
+    MaxFileSize = 'max_file_size_action'
     MaxResults = 'max_results_action'
+    Replace = 'replace_action'
 
     # Toggles
     ToggleCase = 'toggle_case_action'
     ToggleExcludeCase = 'toggle_exclude_case_action'
     ToggleExcludeRegex = 'togle_use_regex_on_exlude_action'
+    ToggleIgnoreFiles = 'toggle_ignore_files_action'
     ToggleMoreOptions = 'toggle_more_options_action'
+    ToggleProjectIndex = 'toggle_project_index_action'
+    ToggleReplace = 'toggle_replace_action'
     ToggleSearchRegex = 'toggle_use_regex_on_search_action'
 
 
 class FindInFilesWidgetToolbars:
     Exclude = 'exclude_toolbar'
     Location = 'location_toolbar'
+    Replace = 'replace_toolbar'
 
 
 class FindInFilesWidgetMainToolbarSections:
@@ -70,14 +80,21 @@ class FindInFilesWidgetLocationToolbarSections:
     Main = 'main_section'
 
 
+class FindInFilesWidgetReplaceToolbarSections:
+    Main = 'main_section'
+
+
 class FindInFilesWidgetToolbarItems:
     SearchPatternCombo = 'pattern_combo'
     SearchInLabel = 'search_in_label'
     ExcludeLabel = 'exclude_label'
     ExcludePatternCombo = 'exclude_pattern_combo'
+    ReplaceLabel = 'replace_label'
+    ReplacePatternCombo = 'replace_pattern_combo'
     Stretcher1 = 'stretcher_1'
     SearchInCombo = 'search_in_combo'
     Stretcher2 = 'stretcher_2'
+    Stretcher3 = 'stretcher_3'
 
 
 # ---- Main widget
@@ -133,6 +150,19 @@ class FindInFilesWidget(PluginMainWidget):
     to reaching the maximum number of results.
     """
 
+    sig_replace_finished = Signal(int, int)
+    """
+    This signal is emitted when matches were replaced.
+
+    Parameters
+    ----------
+    count: int
+        Number of matches that were replaced.
+    skipped: int
+        Number of matches that couldn't be replaced, e.g. because their
+        files changed after the search.
+    """
+
     def __init__(self, name=None, plugin=None, parent=None):
         if not PYSIDE2:
             super().__init__(name, plugin, parent=parent)
@@ -145,6 +175,11 @@ def __init__(self, name=None, plugin=None, parent=None):
         self.text_color = self.get_conf('text_color')
         self.supported_encodings = self.get_conf('supported_encodings')
         self.search_thread = None
+        self.replace_thread = None
+        self.project_index = None
+        self.replace_toolbar = None
+        self._search_options = None
+        self._replace_counts = [0, 0]
         self.running = False
         self.more_options_action = None
         self.extras_toolbar = None
@@ -213,6 +248,22 @@ def __init__(self, name=None, plugin=None, parent=None):
         )
         self.exclude_pattern_edit.setMaximumWidth(MAX_COMBOBOX_WIDTH)
 
+        self.replace_label = QLabel(_('Replace with:'))
+        self.replace_label.ID = FindInFilesWidgetToolbarItems.ReplaceLabel
+
+        self.replace_text_edit = PatternComboBox(
+            self,
+            items=[''],
+            tip=_("Replacement text"),
+            id_=FindInFilesWidgetToolbarItems.ReplacePatternCombo
+        )
+        self.replace_text_edit.lineEdit().setPlaceholderText(
+            _('Write text to replace matches'))
+        self.replace_text_edit.setMinimumSize(
+            MIN_COMBOBOX_WIDTH, AppStyle.FindHeight
+        )
+        self.replace_text_edit.setMaximumWidth(MAX_COMBOBOX_WIDTH)
+
         self.result_browser = ResultsBrowser(
             self,
             text_color=self.text_color,
@@ -235,6 +286,8 @@ def __init__(self, name=None, plugin=None, parent=None):
             self.sig_redirect_stdio_requested)
         self.search_text_edit.valid.connect(lambda valid: self.find())
         self.exclude_pattern_edit.valid.connect(lambda valid: self.find())
+        self.replace_text_edit.lineEdit().textChanged.connect(
+            self._update_replace_preview)
         self.result_browser.sig_edit_goto_requested.connect(
             self.sig_edit_goto_requested)
         self.result_browser.sig_max_results_reached.connect(
@@ -311,12 +364,56 @@ def setup(self):
             tip=_('Set maximum number of results'),
             triggered=lambda x=None: self.set_max_results(),
         )
+        self.set_max_file_size_action = self.create_action(
+            FindInFilesWidgetActions.MaxFileSize,
+            text=_('Set maximum file size'),
+            icon=self.create_icon("transparent"),
+            tip=_('Set the size of the largest files to search'),
+            triggered=lambda x=None: self.set_max_file_size(),
+        )
+        self.ignore_files_action = self.create_action(
+            FindInFilesWidgetActions.ToggleIgnoreFiles,
+            text=_('Skip files ignored by Git'),
+            tip=_(
+                'Skip the files and directories ignored by .gitignore and '
+                '.ignore files'
+            ),
+            toggled=True,
+            initial=self.get_conf('use_ignore_files'),
+            option='use_ignore_files'
+        )
+        self.replace_mode_action = self.create_action(
+            FindInFilesWidgetActions.ToggleReplace,
+            text=_('Replace'),
+            tip=_('Show replace options'),
+            icon=self.create_icon('replace'),
+            toggled=self.set_replace_mode,
+        )
+        self.replace_action = self.create_action(
+            FindInFilesWidgetActions.Replace,
+            text=_('Replace selected matches'),
+            tip=_('Replace the selected matches in their files'),
+            icon=self.create_icon('replace'),
+            triggered=self.replace,
+            register_shortcut=False,
+        )
+        self.project_index_action = self.create_action(
+            FindInFilesWidgetActions.ToggleProjectIndex,
+            text=_('Index project files for faster searches'),
+            tip=_(
+                'Keep an index of the files in the current project to only '
+                'search the ones that can contain the text'
+            ),
+            toggled=True,
+            initial=self.get_conf('project_index'),
+            option='project_index'
+        )
 
         # Toolbar
         toolbar = self.get_main_toolbar()
         for item in [self.search_text_edit, self.find_action,
                      self.search_regexp_action, self.case_action,
-                     self.more_options_action]:
+                     self.replace_mode_action, self.more_options_action]:
             self.add_item_to_toolbar(
                 item,
                 toolbar=toolbar,
@@ -337,6 +434,20 @@ def setup(self):
                 section=FindInFilesWidgetExcludeToolbarSections.Main,
             )
 
+        # Replace toolbar
+        self.replace_toolbar = self.create_toolbar(
+            FindInFilesWidgetToolbars.Replace)
+        stretcher3 = self.create_stretcher(
+            FindInFilesWidgetToolbarItems.Stretcher3)
+        for item in [self.replace_label, self.replace_text_edit,
+                     self.replace_action, stretcher3]:
+            self.add_item_to_toolbar(
+                item,
+                toolbar=self.replace_toolbar,
+                section=FindInFilesWidgetReplaceToolbarSections.Main,
+            )
+        self.replace_toolbar.setVisible(False)
+
         # Location toolbar
         location_toolbar = self.create_toolbar(
             FindInFilesWidgetToolbars.Location)
@@ -351,15 +462,24 @@ def setup(self):
             )
 
         menu = self.get_options_menu()
-        self.add_item_to_menu(
-            self.set_max_results_action,
-            menu=menu,
-        )
+        for item in [self.set_max_results_action,
+                     self.set_max_file_size_action,
+                     self.ignore_files_action,
+                     self.project_index_action]:
+            self.add_item_to_menu(
+                item,
+                menu=menu,
+            )
 
     def update_actions(self):
         self.find_action.setIcon(self.create_icon(
             'stop' if self.running else 'find')
         )
+        self.replace_action.setEnabled(
+            not self.running
+            and self.replace_thread is None
+            and self._search_options is not None
+        )
 
         if self.extras_toolbar and self.more_options_action:
             self.extras_toolbar.setVisible(
@@ -413,6 +533,13 @@ def on_more_options_update(self, value):
     def on_max_results_update(self, value):
         self.result_browser.set_max_results(value)
 
+    @on_conf_change(option='project_index')
+    def on_project_index_update(self, value):
+        if value:
+            self.start_project_index(self.project_path)
+        else:
+            self.stop_project_index()
+
     # ---- Qt methods
     # ------------------------------------------------------------------------
     def showEvent(self, event):
@@ -548,6 +675,7 @@ def _handle_search_complete(self, completed):
         self.result_browser.set_sorting(ON)
         self.result_browser.set_width()
         self.result_browser.expandAll()
+        self._update_replace_preview()
         if self.search_thread is None:
             return
 
@@ -577,6 +705,144 @@ def _stop_and_reset_thread(self, ignore_results=False):
         self.stop_spinner()
         self.update_actions()
 
+    def _get_replacer(self):
+        """Get the Replacer for the matches of the last search."""
+        __, __, __, texts, text_re, case_sensitive = self._search_options
+        return Replacer(
+            texts,
+            text_re,
+            case_sensitive,
+            str(self.replace_text_edit.currentText())
+        )
+
+    def _update_replace_preview(self):
+        """Show how matches will be replaced, if replacing is enabled."""
+        replacer = None
+        if (
+            self.replace_mode_action.isChecked()
+            and self._search_options is not None
+        ):
+            replacer = self._get_replacer()
+
+        self.result_browser.set_replacer(replacer)
+
+    def _get_code_editor(self, filename):
+        """Get the editor where `filename` is open, if any."""
+        if self._plugin is None:
+            return None
+        return self._plugin._get_code_editor(filename)
+
+    def _replace_in_editor(self, editor, matches, replacer):
+        """
+        Replace matches in a file that is open in the editor.
+
+        Only the changed parts of lines are edited, as a single undoable
+        action, and the file is left unsaved.
+
+        Returns
+        -------
+        tuple
+            (count, skipped), like `replace_in_file`.
+        """
+        document = editor.document()
+        cursor = QTextCursor(document)
+        count = 0
+        skipped = 0
+
+        cursor.beginEditBlock()
+        lines = sorted(group_matches(matches).items(), reverse=True)
+        for lineno, (line, spans) in lines:
+            block = document.findBlockByNumber(lineno - 1)
+            if (
+                not isinstance(line, str)
+                or not block.isValid()
+                or block.text() != line.rstrip('\r\n')
+            ):
+                # The line changed after it was searched
+                skipped += len(spans)
+                continue
+
+            old_line = block.text()
+            if line.endswith('\n') and block.next().isValid():
+                old_line += '\n'
+            new_line, line_count = replacer.replace_line(old_line, spans)
+            count += line_count
+            skipped += len(spans) - line_count
+            if not line_count:
+                continue
+
+            # Find the part of the line that changed
+            prefix = 0
+            max_prefix = min(len(old_line), len(new_line))
+            while (
+                prefix < max_prefix
+                and old_line[prefix] == new_line[prefix]
+            ):
+                prefix += 1
+
+            suffix = 0
+            max_suffix = max_prefix - prefix
+            while (
+                suffix < max_suffix
+                and old_line[-suffix - 1] == new_line[-suffix - 1]
+            ):
+                suffix += 1
+
+            start = block.position() + qstring_length(old_line[:prefix])
+            end = (
+                block.position()
+                + qstring_length(old_line[:len(old_line) - suffix])
+            )
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.insertText(new_line[prefix:len(new_line) - suffix])
+        cursor.endEditBlock()
+
+        return count, skipped
+
+    def _on_file_replaced(self, filename, count, skipped):
+        """Keep count of the matches replaced in a file."""
+        self._replace_counts[0] += count
+        self._replace_counts[1] += skipped
+        if count:
+            self.update_project_index([filename])
+
+    def _handle_replace_complete(self, completed):
+        """Current replace thread has finished."""
+        self._stop_and_reset_replace_thread()
+
+        count, skipped = self._replace_counts
+        title = _("{} matches replaced").format(count)
+        if skipped:
+            title += ' - ' + _(
+                "{} matches skipped because their files changed or "
+                "couldn't be written"
+            ).format(skipped)
+
+        # Results are outdated after replacing them
+        self._search_options = None
+        self.result_browser.set_replacer(None)
+        self.result_browser.clear_title(self.search_text_edit.currentText())
+        self.result_browser.set_title(title)
+
+        self.stop_spinner()
+        self.update_actions()
+        self.sig_replace_finished.emit(count, skipped)
+
+    def _stop_and_reset_replace_thread(self):
+        """Wait for the current replace thread to finish."""
+        if self.replace_thread is not None:
+            if self.replace_thread.isRunning():
+                # Files that were being written are finished, so that none of
+                # them is left half replaced
+                self.replace_thread.sig_finished.disconnect(
+                    self._handle_replace_complete)
+                self.replace_thread.stop()
+                self.replace_thread.wait()
+
+            self.replace_thread.setParent(None)
+            self.replace_thread = None
+
     # ---- Public API
     # ------------------------------------------------------------------------
     @property
@@ -615,10 +881,45 @@ def set_project_path(self, path):
             Project path string.
         """
         self.path_selection_combo.set_project_path(path)
+        self.start_project_index(path)
 
     def disable_project_search(self):
         """Disable project search path in combobox."""
         self.path_selection_combo.set_project_path(None)
+        self.stop_project_index()
+
+    def start_project_index(self, path):
+        """
+        Start indexing the files of a project, if that option is enabled.
+
+        Parameters
+        ----------
+        path: str
+            Project path string.
+        """
+        self.stop_project_index()
+        if path and self.get_conf('project_index'):
+            self.project_index = TrigramIndex(path)
+            self.project_index.start()
+
+    def stop_project_index(self):
+        """Stop updating the index of the current project and save it."""
+        if self.project_index is not None:
+            self.project_index.stop()
+            self.project_index = None
+
+    def update_project_index(self, paths):
+        """
+        Update the project index after files changed.
+
+        Parameters
+        ----------
+        paths: list
+            Paths of the files or directories that were created, modified,
+            moved or deleted.
+        """
+        if self.project_index is not None:
+            self.project_index.update(paths)
 
     def set_file_path(self, path):
         """
@@ -678,7 +979,9 @@ def stop(self):
     def start(self):
         """Start find thread."""
         options = self._get_options()
-        if options is None:
+
+        # Don't search while matches are being replaced
+        if options is None or self.replace_thread is not None:
             return
 
         self._stop_and_reset_thread(ignore_results=True)
@@ -688,6 +991,8 @@ def start(self):
         self._update_options()
 
         # Setup result_browser
+        self._search_options = options
+        self._update_replace_preview()
         self.result_browser.set_path(options[0])
         self.result_browser.longest_file_item = ''
         self.result_browser.longest_line_item = ''
@@ -699,7 +1004,10 @@ def start(self):
             None,
             search_text,
             self.text_color,
-            self.get_conf('max_results')
+            self.get_conf('max_results'),
+            index=self.project_index,
+            use_ignore_files=self.get_conf('use_ignore_files'),
+            max_file_size=self.get_conf('max_file_size') * 1024 * 1024
         )
         self.search_thread.sig_finished.connect(self._handle_search_complete)
         self.search_thread.sig_file_match.connect(
@@ -759,6 +1067,94 @@ def set_max_results(self, value=None):
         else:
             self.set_conf('max_results', value)
 
+    def set_replace_mode(self, value):
+        """Show or hide the replace options and preview."""
+        if self.replace_toolbar:
+            self.replace_toolbar.setVisible(value)
+        self._update_replace_preview()
+
+    def replace(self):
+        """Replace the selected matches of the last search."""
+        if (
+            self.running
+            or self.replace_thread is not None
+            or self._search_options is None
+        ):
+            return
+
+        files = self.result_browser.get_replacements()
+        if not files:
+            return
+
+        num_matches = sum(len(matches) for __, matches in files)
+        answer = QMessageBox.question(
+            self,
+            _("Replace"),
+            _(
+                "Do you want to replace {} matches in {} files?<br><br>"
+                "Files that are not open in the Editor are saved right away, "
+                "so this can't be undone for them."
+            ).format(num_matches, len(files)),
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if answer != QMessageBox.Yes:
+            return
+
+        replacer = self._get_replacer()
+        self._replace_counts = [0, 0]
+
+        # Files open in the editor are edited there and the rest are written
+        # by the replace thread
+        files_to_write = []
+        for filename, matches in files:
+            editor = self._get_code_editor(filename)
+            if editor is None:
+                files_to_write.append((filename, matches))
+            else:
+                count, skipped = self._replace_in_editor(
+                    editor, matches, replacer)
+                self._replace_counts[0] += count
+                self._replace_counts[1] += skipped
+
+        self.start_spinner()
+        self.replace_thread = ReplaceThread(None, replacer, files_to_write)
+        self.replace_thread.sig_file_replaced.connect(self._on_file_replaced)
+        self.replace_thread.sig_finished.connect(
+            self._handle_replace_complete)
+        self.replace_thread.start()
+        self.update_actions()
+
+    def set_max_file_size(self, value=None):
+        """
+        Set the size of the largest files to search.
+
+        Parameters
+        ----------
+        value: int, optional
+            Size in megabytes. If None an input dialog will be used.
+            Default is None.
+        """
+        if value is None:
+            # Create dialog
+            dialog = QInputDialog(self)
+
+            # Set dialog properties
+            dialog.setModal(False)
+            dialog.setWindowTitle(_('Max file size'))
+            dialog.setLabelText(_('Set maximum file size (MB): '))
+            dialog.setInputMode(QInputDialog.IntInput)
+            dialog.setIntStep(1)
+            dialog.setIntValue(self.get_conf('max_file_size'))
+            dialog.setIntRange(1, 1024)
+
+            # Connect slot
+            dialog.intValueSelected.connect(
+                lambda value: self.set_conf('max_file_size', value))
+
+            dialog.show()
+        else:
+            self.set_conf('max_file_size', value)
+
 
 # ---- Test
 # -----------------------------------------------------------------------------
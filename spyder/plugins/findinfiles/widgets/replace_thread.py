@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Replace thread."""
+
+# Standard library imports
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import traceback
+
+# Third party imports
+from qtpy.QtCore import QMutex, QMutexLocker, QThread, Signal
+
+# Local imports
+from spyder.plugins.findinfiles.utils.replace import replace_in_file
+
+
+# ---- Constants
+# ----------------------------------------------------------------------------
+# Number of threads used to write files
+MAX_WORKERS = 4
+
+
+# ---- Thread
+# ----------------------------------------------------------------------------
+class ReplaceThread(QThread):
+    """Replace matches in files with a pool of workers."""
+
+    sig_file_replaced = Signal(str, int, int)
+    """
+    This signal is emitted when the matches of a file were replaced.
+
+    Parameters
+    ----------
+    filename: str
+        Path of the file.
+    count: int
+        Number of matches replaced.
+    skipped: int
+        Number of matches that couldn't be replaced, e.g. because the file
+        changed after it was searched. All of them if the file couldn't be
+        written.
+    """
+
+    sig_finished = Signal(bool)
+    """
+    This signal is emitted when all files were processed or the thread was
+    stopped.
+
+    Parameters
+    ----------
+    completed: bool
+        Whether all files were processed.
+    """
+
+    def __init__(self, parent, replacer, files, workers=MAX_WORKERS):
+        """
+        Parameters
+        ----------
+        replacer: Replacer
+            Object that computes replacements.
+        files: iterable
+            (filename, matches) tuples, as returned by
+            `ResultsBrowser.get_replacements`.
+        """
+        super().__init__(parent)
+        self.replacer = replacer
+        self.files = files
+        self.workers = workers
+        self.mutex = QMutex()
+        self.stopped = False
+        self.completed = False
+
+    def run(self):
+        try:
+            self.replace_files()
+        except Exception:
+            # Important note: we have to handle unexpected exceptions by
+            # ourselves because they won't be catched by the main thread
+            # (known QThread limitation/bug)
+            traceback.print_exc()
+        self.sig_finished.emit(self.completed)
+
+    def stop(self):
+        with QMutexLocker(self.mutex):
+            self.stopped = True
+
+    def replace_files(self):
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for filename, matches in self.files:
+                with QMutexLocker(self.mutex):
+                    if self.stopped:
+                        break
+
+                future = executor.submit(
+                    replace_in_file, filename, matches, self.replacer
+                )
+                pending.append((filename, matches, future))
+
+                # Only keep a few files in flight, so that the contents of
+                # many files are not in memory at the same time
+                while len(pending) > 2 * self.workers:
+                    self._emit_result(*pending.popleft())
+            else:
+                self.completed = True
+
+            while pending:
+                self._emit_result(*pending.popleft())
+
+    def _emit_result(self, filename, matches, future):
+        try:
+            count, skipped = future.result()
+        except OSError:
+            count, skipped = 0, len(matches)
+        self.sig_file_replaced.emit(filename, count, skipped)
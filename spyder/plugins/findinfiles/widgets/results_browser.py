@@ -7,24 +7,30 @@
 """Results browser."""
 
 # Standard library imports
+import functools
+import itertools
 import os.path as osp
 
 # Third party imports
-from qtpy.QtCore import QPoint, QSize, Qt, Signal, Slot
+from qtpy import PYSIDE2
+from qtpy.QtCore import (QAbstractItemModel, QEvent, QModelIndex, QPoint,
+                         QSize, Qt, Signal, Slot)
 from qtpy.QtGui import (QAbstractTextDocumentLayout, QColor, QFontMetrics,
                         QTextDocument)
-from qtpy.QtWidgets import (QApplication, QStyle, QStyledItemDelegate,
-                            QStyleOptionViewItem, QTreeWidgetItem)
+from qtpy.QtWidgets import (QAbstractItemView, QApplication, QHeaderView,
+                            QStyle, QStyledItemDelegate, QStyleOptionViewItem,
+                            QTreeView)
 
 # Local imports
 from spyder.api.fonts import SpyderFontsMixin, SpyderFontType
 from spyder.api.translations import _
+from spyder.api.widgets.mixins import SpyderWidgetMixin
 from spyder.plugins.findinfiles.widgets.search_thread import (
-    ELLIPSIS, MAX_RESULT_LENGTH)
+    ELLIPSIS, MAX_RESULT_LENGTH, truncate_result)
 from spyder.utils import icon_manager as ima
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.stylesheet import AppStyle
-from spyder.widgets.onecolumntree import OneColumnTree
+from spyder.widgets.onecolumntree import OneColumnTreeActions
 
 
 # ---- Constants
@@ -32,51 +38,60 @@
 ON = 'on'
 OFF = 'off'
 
+# Role used to get the FileResults of file rows and the match tuples of
+# line rows
+RESULT_ROLE = Qt.UserRole + 1
 
-# ---- Items
-# ----------------------------------------------------------------------------
-class LineMatchItem(QTreeWidgetItem):
-
-    def __init__(self, parent, lineno, colno, match, font, text_color):
-        self.lineno = lineno
-        self.colno = colno
-        self.match = match['formatted_text']
-        self.plain_match = match['text']
-        self.text_color = text_color
-        self.font = font
-        super().__init__(parent, [self.__repr__()], QTreeWidgetItem.Type)
-
-    def __repr__(self):
-        match = str(self.match).rstrip()
-        _str = (
-            f"<!-- LineMatchItem -->"
-            f"<p style=\"color:'{self.text_color}';\">"
-            f'&nbsp;&nbsp;'
-            f"<b>{self.lineno}</b> ({self.colno}): "
-            f"<span style='font-family:{self.font.family()};"
-            f"font-size:{self.font.pointSize()}pt;'>{match}</span></p>"
-        )
-        return _str
 
-    def __unicode__(self):
-        return self.__repr__()
-
-    def __str__(self):
-        return self.__repr__()
-
-    def __lt__(self, x):
-        return self.lineno < x.lineno
-
-    def __ge__(self, x):
-        return self.lineno >= x.lineno
+# ---- Formatting
+# ----------------------------------------------------------------------------
+@functools.lru_cache(maxsize=1024)
+def format_line_match(lineno, colno, colend, line, text_color, font_family,
+                      font_size, replacement=None):
+    """Get the HTML shown for a line match."""
+    match = truncate_result(line, colno, colend, text_color, replacement)
+    match = match['formatted_text'].rstrip()
+    return (
+        f"<!-- LineMatchItem -->"
+        f"<p style=\"color:'{text_color}';\">"
+        f'&nbsp;&nbsp;'
+        f"<b>{lineno}</b> ({colno}): "
+        f"<span style='font-family:{font_family};"
+        f"font-size:{font_size}pt;'>{match}</span></p>"
+    )
+
+
+def format_file_match(basename, rel_dirname, text_color):
+    """Get the HTML shown for a file with matches."""
+    return (
+        f'<!-- FileMatchItem -->'
+        f'<b style="color:{text_color}">{basename}</b>'
+        f'&nbsp;&nbsp;&nbsp;'
+        f'<span style="color:{text_color}">'
+        f'<em>{rel_dirname}</em>'
+        f'</span>'
+    )
+
+
+# ---- Model
+# ----------------------------------------------------------------------------
+class FileResults:
+    """Matches found in a file."""
 
+    __slots__ = ('filename', 'basename', 'rel_dirname', 'row', 'matches',
+                 'excluded')
 
-class FileMatchItem(QTreeWidgetItem):
+    def __init__(self, path, filename, row):
+        self.filename = filename
+        self.basename = osp.basename(filename)
+        self.row = row
 
-    def __init__(self, parent, path, filename, sorting, text_color):
+        # (lineno, colno, colend, line) tuples. Matches in the same line
+        # share the line string.
+        self.matches = []
 
-        self.sorting = sorting
-        self.filename = osp.basename(filename)
+        # Rows of the matches that are not replaced
+        self.excluded = set()
 
         # Get relative dirname according to the path we're searching in.
         dirname = osp.dirname(filename)
@@ -93,42 +108,310 @@ def __init__(self, parent, path, filename, sorting, text_color):
 
         self.rel_dirname = rel_dirname
 
-        title = (
-            f'<!-- FileMatchItem -->'
-            f'<b style="color:{text_color}">{osp.basename(filename)}</b>'
-            f'&nbsp;&nbsp;&nbsp;'
-            f'<span style="color:{text_color}">'
-            f'<em>{self.rel_dirname}</em>'
-            f'</span>'
-        )
 
-        super().__init__(parent, [title], QTreeWidgetItem.Type)
+class ResultsModel(QAbstractItemModel):
+    """
+    Model of the matches found by a search.
 
-        self.setIcon(0, ima.get_icon_by_extension_or_type(filename, 1.0))
-        self.setToolTip(0, filename)
+    Files are top level rows and their matches are their children. Matches
+    are stored as plain tuples and formatted by the delegate only when they
+    are shown, so that hundreds of thousands of them can be browsed.
+    """
 
-    def __lt__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename < x.filename
+    def __init__(self, parent, sorting):
+        super().__init__(parent)
+        self.sorting = sorting
+        self.title = ''
+        self.path = None
+        self.replace_mode = False
+        self.num_matches = 0
+        self.files = []
+        self._files_by_name = {}
+
+    # ---- Qt methods
+    def index(self, row, column, parent=QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QModelIndex()
+
+        if not parent.isValid():
+            return self.createIndex(row, column, None)
+
+        # The internal pointer of line rows is the FileResults they belong to
+        return self.createIndex(row, column, self.files[parent.row()])
+
+    def parent(self, index=None):
+        if index is None:
+            # Called as QObject.parent
+            return super().parent()
+
+        if not index.isValid():
+            return QModelIndex()
+
+        file_results = index.internalPointer()
+        if file_results is None:
+            return QModelIndex()
+
+        return self.createIndex(file_results.row, 0, None)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.files)
+
+        if parent.internalPointer() is None:
+            return len(self.files[parent.row()].matches)
+
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if self.replace_mode:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        file_results = index.internalPointer()
+        if role == Qt.CheckStateRole:
+            if not self.replace_mode:
+                return None
+            elif file_results is not None:
+                if index.row() in file_results.excluded:
+                    return Qt.Unchecked
+                return Qt.Checked
+
+            file_results = self.files[index.row()]
+            if not file_results.excluded:
+                return Qt.Checked
+            elif len(file_results.excluded) == len(file_results.matches):
+                return Qt.Unchecked
+            return Qt.PartiallyChecked
+
+        if file_results is None:
+            file_results = self.files[index.row()]
+            if role == Qt.DisplayRole:
+                return f'{file_results.basename}   {file_results.rel_dirname}'
+            elif role == Qt.DecorationRole:
+                return ima.get_icon_by_extension_or_type(
+                    file_results.filename, 1.0
+                )
+            elif role == Qt.ToolTipRole:
+                return file_results.filename
+            elif role == RESULT_ROLE:
+                return file_results
         else:
+            match = file_results.matches[index.row()]
+            if role == Qt.DisplayRole:
+                lineno, colno, __, line = match
+                return f'{lineno} ({colno}): {str(line).strip()}'
+            elif role == RESULT_ROLE:
+                return match
+
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or not index.isValid():
             return False
 
-    def __ge__(self, x):
-        if self.sorting['status'] == ON:
-            return self.filename >= x.filename
+        checked = value == Qt.Checked
+        file_results = index.internalPointer()
+        if file_results is None:
+            # Check or uncheck all the matches of a file
+            file_results = self.files[index.row()]
+            if checked:
+                file_results.excluded.clear()
+            else:
+                file_results.excluded = set(range(len(file_results.matches)))
+
+            num_matches = len(file_results.matches)
+            if num_matches:
+                self.dataChanged.emit(
+                    self.index(0, 0, index),
+                    self.index(num_matches - 1, 0, index),
+                    [Qt.CheckStateRole]
+                )
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
         else:
-            return False
+            if checked:
+                file_results.excluded.discard(index.row())
+            else:
+                file_results.excluded.add(index.row())
+
+            parent = self.parent(index)
+            self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+            self.dataChanged.emit(parent, parent, [Qt.CheckStateRole])
+
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.title
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort files by name, once the search is complete."""
+        if self.sorting.get('status') != ON:
+            return
+
+        self.layoutAboutToBeChanged.emit()
+
+        old_files = list(self.files)
+        self.files.sort(
+            key=lambda f: f.basename,
+            reverse=(order == Qt.DescendingOrder)
+        )
+        for row, file_results in enumerate(self.files):
+            file_results.row = row
+
+        # Line rows keep their row and internal pointer, so only file rows
+        # (e.g. the ones that are expanded) need to be moved.
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            if index.internalPointer() is None:
+                new_row = old_files[index.row()].row
+                index = self.createIndex(new_row, index.column(), None)
+            new_indexes.append(index)
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+        self.layoutChanged.emit()
+
+    # ---- Public API
+    def set_title(self, title):
+        self.title = title
+        self.headerDataChanged.emit(Qt.Horizontal, 0, 0)
+
+    def set_replace_mode(self, value):
+        """Show or hide the check boxes used to select what to replace."""
+        self.layoutAboutToBeChanged.emit()
+        self.replace_mode = value
+        self.layoutChanged.emit()
+
+    def clear(self):
+        """Remove all results."""
+        self.beginResetModel()
+        self.files = []
+        self._files_by_name = {}
+        self.num_matches = 0
+        self.endResetModel()
+
+    def add_file(self, filename):
+        """Add a file with matches and return its FileResults."""
+        row = len(self.files)
+        self.beginInsertRows(QModelIndex(), row, row)
+        file_results = FileResults(self.path, filename, row)
+        self.files.append(file_results)
+        self._files_by_name[filename] = file_results
+        self.endInsertRows()
+        return file_results
+
+    def add_matches(self, items):
+        """
+        Add matches, given as (filename, lineno, colno, colend, line)
+        tuples.
+        """
+        for filename, group in itertools.groupby(items, key=lambda i: i[0]):
+            file_results = self._files_by_name.get(filename)
+            if file_results is None:
+                continue
+
+            matches = [item[1:] for item in group]
+            first = len(file_results.matches)
+            parent = self.createIndex(file_results.row, 0, None)
+            self.beginInsertRows(parent, first, first + len(matches) - 1)
+            file_results.matches += matches
+            self.num_matches += len(matches)
+            self.endInsertRows()
+
+    def get_match(self, index):
+        """
+        Get the match at `index` as a (filename, lineno, colno, colend)
+        tuple, or None if it's a file row.
+        """
+        file_results = index.internalPointer() if index.isValid() else None
+        if file_results is None:
+            return None
+
+        lineno, colno, colend, __ = file_results.matches[index.row()]
+        return (file_results.filename, lineno, colno, colend)
+
+    def get_replacements(self):
+        """
+        Get the matches to replace, as (filename, matches) tuples, where
+        matches are (lineno, colno, colend, line) tuples.
+        """
+        replacements = []
+        for file_results in self.files:
+            if file_results.excluded:
+                matches = [
+                    match for row, match in enumerate(file_results.matches)
+                    if row not in file_results.excluded
+                ]
+            else:
+                matches = file_results.matches
+
+            if matches:
+                replacements.append((file_results.filename, matches))
+
+        return replacements
+
+    def get_results(self):
+        """Get all matches as (filename, lineno, colno, colend) tuples."""
+        return [
+            (file_results.filename, lineno, colno, colend)
+            for file_results in self.files
+            for lineno, colno, colend, __ in file_results.matches
+        ]
 
 
 # ---- Browser
 # ----------------------------------------------------------------------------
 class ItemDelegate(QStyledItemDelegate):
 
-    def __init__(self, parent):
+    def __init__(self, parent, text_color):
         super().__init__(parent)
         self._margin = None
         self._background_color = QColor(SpyderPalette.COLOR_BACKGROUND_3)
         self.width = 0
+        self.text_color = text_color
+        self.font = None
+        self.replacer = None
+        self.check_toggled = False
+
+    def get_html(self, index):
+        """Format the row at `index`, which is only done when it's shown."""
+        result = index.data(RESULT_ROLE)
+        if isinstance(result, FileResults):
+            return format_file_match(
+                result.basename, result.rel_dirname, self.text_color
+            )
+
+        lineno, colno, colend, line = result
+        replacement = None
+        if (
+            self.replacer is not None
+            and index.data(Qt.CheckStateRole) == Qt.Checked
+        ):
+            replacement = self.replacer.replace_match(line, colno, colend)
+
+        return format_line_match(
+            lineno, colno, colend, line, self.text_color,
+            self.font.family(), self.font.pointSize(), replacement
+        )
+
+    def editorEvent(self, event, model, option, index):
+        handled = super().editorEvent(event, model, option, index)
+
+        # Remember if a check box was toggled with the mouse, to not go to
+        # the match that was clicked
+        if handled and event.type() == QEvent.MouseButtonRelease:
+            self.check_toggled = True
+
+        return handled
 
     def paint(self, painter, option, index):
         options = QStyleOptionViewItem(option)
@@ -156,12 +439,11 @@ def paint(self, painter, option, index):
 
         # Set text
         doc = QTextDocument()
-        text = options.text
-        doc.setHtml(text)
+        doc.setHtml(self.get_html(index))
         doc.setDocumentMargin(0)
 
         # This needs to be an empty string to avoid overlapping the
-        # normal text of the QTreeWidgetItem
+        # plain text of the row
         options.text = ""
         style.drawControl(QStyle.CE_ItemViewItem, options, painter)
 
@@ -179,55 +461,109 @@ def sizeHint(self, option, index):
         options = QStyleOptionViewItem(option)
         self.initStyleOption(options, index)
         doc = QTextDocument()
-        doc.setHtml(options.text)
+        doc.setHtml(self.get_html(index))
         doc.setTextWidth(options.rect.width())
         size = QSize(self.width, int(doc.size().height()))
         return size
 
 
-class ResultsBrowser(OneColumnTree, SpyderFontsMixin):
+class ResultsBrowser(QTreeView, SpyderWidgetMixin, SpyderFontsMixin):
 
     sig_edit_goto_requested = Signal(str, int, str, int, int)
     sig_max_results_reached = Signal()
 
     def __init__(self, parent, text_color, max_results=1000):
-        super().__init__(parent)
+        if not PYSIDE2:
+            super().__init__(parent, class_parent=parent)
+        else:
+            QTreeView.__init__(self, parent)
+            SpyderWidgetMixin.__init__(self, class_parent=parent)
+
         self.search_text = None
-        self.results = None
         self.max_results = max_results
-        self.total_matches = None
-        self.error_flag = None
-        self.completed = None
         self.sorting = {}
         self.font = self.get_font(SpyderFontType.MonospaceInterface)
-        self.data = None
-        self.files = None
-        self.root_items = None
         self.text_color = text_color
         self.path = None
         self.longest_file_item = ''
         self.longest_line_item = ''
+        self.model = ResultsModel(self, self.sorting)
+        self.delegate = ItemDelegate(self, text_color)
+        self.delegate.font = self.font
 
         # Setup
+        self.setModel(self.model)
+        self.setItemDelegate(self.delegate)
+        self.setItemsExpandable(True)
+        self.setUniformRowHeights(True)  # Needed for performance
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.header().setStretchLastSection(False)
+
+        # To use mouseMoveEvent
+        self.setMouseTracking(True)
+
         self.set_title('')
         self.set_sorting(OFF)
         self.setSortingEnabled(False)
-        self.setItemDelegate(ItemDelegate(self))
-        self.setUniformRowHeights(True)  # Needed for performance
         self.sortByColumn(0, Qt.AscendingOrder)
 
         # Only show the actions for collaps/expand all entries in the widget
         # For further information see spyder-ide/spyder#13178
-        self.common_actions = self.common_actions[:2]
+        self.menu = self.create_menu("context_menu")
+        self.collapse_all_action = self.create_action(
+            OneColumnTreeActions.CollapseAllAction,
+            text=_("Collapse all"),
+            icon=ima.icon("collapse"),
+            triggered=self.collapseAll,
+            register_shortcut=False,
+        )
+        self.expand_all_action = self.create_action(
+            OneColumnTreeActions.ExpandAllAction,
+            text=_("Expand all"),
+            icon=ima.icon("expand"),
+            triggered=self.expandAll,
+            register_shortcut=False,
+        )
+        for item in [self.collapse_all_action, self.expand_all_action]:
+            self.add_item_to_menu(item, self.menu)
 
         # Signals
+        self.activated.connect(self.on_item_activated)
+        self.clicked.connect(self.on_item_clicked)
         self.header().sectionClicked.connect(self.sort_section)
 
-    def on_item_activated(self, item):
+    # ---- SpyderWidgetMixin API
+    # ------------------------------------------------------------------------
+    def update_actions(self):
+        pass
+
+    # ---- Qt methods
+    # ------------------------------------------------------------------------
+    def contextMenuEvent(self, event):
+        """Override Qt method."""
+        self.menu.popup(event.globalPos())
+
+    def mouseMoveEvent(self, event):
+        """Change cursor shape."""
+        index = self.indexAt(event.pos())
+        if index.isValid():
+            vrect = self.visualRect(index)
+            item_identation = vrect.x() - self.visualRect(self.rootIndex()).x()
+            if event.pos().x() > item_identation:
+                # When hovering over results
+                self.setCursor(Qt.PointingHandCursor)
+            else:
+                # On every other element
+                self.setCursor(Qt.ArrowCursor)
+
+    # ---- Public API
+    # ------------------------------------------------------------------------
+    def on_item_activated(self, index):
         """Double-click event."""
-        itemdata = self.data.get(id(self.currentItem()))
-        if itemdata is not None:
-            filename, lineno, colno, colend = itemdata
+        match = self.model.get_match(index)
+        if match is not None:
+            filename, lineno, colno, colend = match
             self.sig_edit_goto_requested.emit(
                 filename, lineno, self.search_text, colno, colend - colno)
 
@@ -240,23 +576,26 @@ def set_sorting(self, flag):
     def sort_section(self, idx):
         self.setSortingEnabled(True)
 
-    def on_item_clicked(self, item):
+    def on_item_clicked(self, index):
         """Click event."""
-        if isinstance(item, FileMatchItem):
-            if item.isExpanded():
-                self.collapseItem(item)
+        if self.delegate.check_toggled:
+            self.delegate.check_toggled = False
+            return
+
+        if self.model.get_match(index) is None:
+            if self.isExpanded(index):
+                self.collapse(index)
             else:
-                self.expandItem(item)
+                self.expand(index)
         else:
-            self.on_item_activated(item)
+            self.on_item_activated(index)
 
     def clear_title(self, search_text):
         self.font = self.get_font(SpyderFontType.MonospaceInterface)
-        self.clear()
+        self.delegate.font = self.font
+        self.model.clear()
         self.setSortingEnabled(False)
         self.num_files = 0
-        self.data = {}
-        self.files = {}
         self.set_sorting(OFF)
         self.search_text = search_text
         title = "'%s' - " % search_text
@@ -273,54 +612,63 @@ def set_title(self, title):
         else:
             elided_title = title
 
-        self.setHeaderLabels([elided_title])
+        self.model.set_title(elided_title)
+
+    def get_results(self):
+        """Get the matches shown as (filename, lineno, colno, colend)."""
+        return self.model.get_results()
+
+    def get_files(self):
+        """Get the files shown."""
+        return [file_results.filename for file_results in self.model.files]
+
+    def set_replacer(self, replacer):
+        """
+        Set the Replacer used to preview replacements, or None to stop
+        showing them.
+        """
+        self.delegate.replacer = replacer
+        self.model.set_replace_mode(replacer is not None)
+        self.viewport().update()
+
+    def get_replacements(self):
+        """Get the matches selected to be replaced, grouped by file."""
+        return self.model.get_replacements()
 
     @Slot(object)
     def append_file_result(self, filename):
         """Real-time update of file items."""
-        if len(self.data) < self.max_results:
-            item = FileMatchItem(
-                self,
-                self.path,
-                filename,
-                self.sorting,
-                self.text_color
-            )
-
-            self.files[filename] = item
-
-            item.setExpanded(True)
+        if self.model.num_matches < self.max_results:
+            file_results = self.model.add_file(filename)
+            self.expand(self.model.index(file_results.row, 0))
             self.num_files += 1
 
-            item_text = osp.join(item.rel_dirname, item.filename)
+            item_text = osp.join(file_results.rel_dirname,
+                                 file_results.basename)
             if len(item_text) > len(self.longest_file_item):
                 self.longest_file_item = item_text
 
     @Slot(object, object)
     def append_result(self, items, title):
         """Real-time update of line items."""
-        if len(self.data) >= self.max_results:
+        if self.model.num_matches >= self.max_results:
             self.set_title(_('Maximum number of results reached! Try '
                              'narrowing the search.'))
             self.sig_max_results_reached.emit()
             return
 
-        available = self.max_results - len(self.data)
+        available = self.max_results - self.model.num_matches
         if available < len(items):
             items = items[:available]
 
         self.setUpdatesEnabled(False)
         self.set_title(title)
-        for item in items:
-            filename, lineno, colno, line, match_end = item
-            file_item = self.files.get(filename, None)
-            if file_item:
-                item = LineMatchItem(file_item, lineno, colno, line,
-                                     self.font, self.text_color)
-                self.data[id(item)] = (filename, lineno, colno, match_end)
+        self.model.add_matches(items)
 
-                if len(item.plain_match) > len(self.longest_line_item):
-                    self.longest_line_item = item.plain_match
+        for item in items:
+            line = str(item[4]).rstrip()
+            if len(line) > len(self.longest_line_item):
+                self.longest_line_item = line
 
         self.setUpdatesEnabled(True)
 
@@ -331,10 +679,11 @@ def set_max_results(self, value):
     def set_path(self, path):
         """Set path where the search is performed."""
         self.path = path
+        self.model.path = path
 
     def set_width(self):
         """Set widget width according to its longest item."""
-        if not self.data:
+        if not self.model.num_matches:
             return
 
         # File item width
@@ -372,4 +721,4 @@ def set_width(self):
             else:
                 width = width + 2 * AppStyle.MarginSize
 
-        self.itemDelegate().width = width
+        self.delegate.width = width
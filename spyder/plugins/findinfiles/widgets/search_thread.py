@@ -19,7 +19,14 @@
 # Local imports
 from spyder.api.translations import _
 from spyder.config.utils import EDIT_EXTENSIONS
-from spyder.utils.encoding import is_text_file
+from spyder.plugins.findinfiles.utils.ignore import (
+    IgnoreRules,
+    get_ignore_rules
+)
+from spyder.plugins.findinfiles.utils.search_engine import (
+    SearchEngine,
+    search_file
+)
 from spyder.utils.palette import SpyderPalette
 
 
@@ -29,6 +36,107 @@
 MAX_RESULT_LENGTH = 80
 MAX_NUM_CHAR_FRAGMENT = 40
 
+# Files larger than this (in bytes) are not searched by default
+MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+# ---- Functions
+# ----------------------------------------------------------------------------
+def truncate_result(line, start, end, text_color, replacement=None):
+    """
+    Shorten text on line to display the match within `max_line_length`.
+
+    If `replacement` is given, the HTML shows the match crossed out and
+    followed by it.
+
+    Returns
+    -------
+    dict
+        The plain `text` of the shortened line and its HTML
+        `formatted_text`, where the match is highlighted.
+    """
+    html_escape_table = {
+        "&": "&amp;",
+        '"': "&quot;",
+        "'": "&apos;",
+        ">": "&gt;",
+        "<": "&lt;",
+    }
+
+    def html_escape(text):
+        """Produce entities within text."""
+        return "".join(html_escape_table.get(c, c) for c in text)
+
+    line = str(line)
+    left, match, right = line[:start], line[start:end], line[end:]
+
+    if len(line) > MAX_RESULT_LENGTH:
+        offset = (len(line) - len(match)) // 2
+
+        left = left.split(' ')
+        num_left_words = len(left)
+
+        if num_left_words == 1:
+            left = left[0]
+            if len(left) > MAX_NUM_CHAR_FRAGMENT:
+                left = ELLIPSIS + left[-offset:]
+            left = [left]
+
+        right = right.split(' ')
+        num_right_words = len(right)
+
+        if num_right_words == 1:
+            right = right[0]
+            if len(right) > MAX_NUM_CHAR_FRAGMENT:
+                right = right[:offset] + ELLIPSIS
+            right = [right]
+
+        left = left[-4:]
+        right = right[:4]
+
+        if len(left) < num_left_words:
+            left = [ELLIPSIS] + left
+
+        if len(right) < num_right_words:
+            right = right + [ELLIPSIS]
+
+        left = ' '.join(left)
+        right = ' '.join(right)
+
+        if len(left) > MAX_NUM_CHAR_FRAGMENT:
+            left = ELLIPSIS + left[-30:]
+
+        if len(right) > MAX_NUM_CHAR_FRAGMENT:
+            right = right[:30] + ELLIPSIS
+
+    match_color = SpyderPalette.COLOR_OCCURRENCE_4
+    formatted_match = (
+        f'<span style="background-color:{match_color}">'
+        f'{html_escape(match)}'
+        f'</span>'
+    )
+    if replacement is not None:
+        replacement_color = SpyderPalette.COLOR_SUCCESS_1
+        formatted_match = (
+            f'<s>{html_escape(match)}</s>'
+            f'<span style="background-color:{replacement_color}">'
+            f'{html_escape(replacement)}'
+            f'</span>'
+        )
+
+    trunc_line = dict(
+        text=''.join([left, match, right]),
+        formatted_text=(
+            f'<span style="color:{text_color}">'
+            f'{html_escape(left)}'
+            f'{formatted_match}'
+            f'{html_escape(right)}'
+            f'</span>'
+        )
+    )
+
+    return trunc_line
+
 
 # ---- Thread
 # ----------------------------------------------------------------------------
@@ -44,6 +152,19 @@ class SearchThread(QThread):
 
     SKIPPED_EXTENSIONS = ['.svg']
 
+    # Files with these extensions are skipped without opening them
+    BINARY_EXTENSIONS = [
+        '.pyc', '.pyo', '.pyd', '.so', '.dll', '.dylib', '.exe', '.o', '.a',
+        '.lib', '.obj', '.class', '.jar', '.whl', '.egg', '.zip', '.gz',
+        '.bz2', '.xz', '.7z', '.tar', '.rar', '.png', '.jpg', '.jpeg', '.gif',
+        '.bmp', '.ico', '.tif', '.tiff', '.webp', '.pdf', '.mp3', '.mp4',
+        '.wav', '.avi', '.mov', '.ttf', '.otf', '.woff', '.woff2', '.npy',
+        '.npz', '.pkl', '.pickle', '.h5', '.hdf5', '.mat', '.sqlite', '.db'
+    ]
+
+    # Directories skipped when ignore files are used
+    SKIPPED_DIRECTORIES = ['__pycache__', 'node_modules']
+
     sig_finished = Signal(bool)
     sig_current_file = Signal(str)
     sig_current_folder = Signal(str)
@@ -55,11 +176,16 @@ class SearchThread(QThread):
     power = 0       # 0**1 = 1
     max_power = 9   # 2**9 = 512
 
-    def __init__(self, parent, search_text, text_color, max_results=1000):
+    def __init__(self, parent, search_text, text_color, max_results=1000,
+                 index=None, use_ignore_files=True,
+                 max_file_size=MAX_FILE_SIZE):
         super().__init__(parent)
         self.search_text = search_text
         self.text_color = text_color
         self.max_results = max_results
+        self.index = index
+        self.use_ignore_files = use_ignore_files
+        self.max_file_size = max_file_size
 
         self.mutex = QMutex()
         self.stopped = None
@@ -77,7 +203,9 @@ def __init__(self, parent, search_text, text_color, max_results=1000):
         self.results = {}
 
         self.num_files = 0
-        self.files = []
+        self.files = set()
+        self.candidates = None
+        self.stale_files = []
         self.partial_results = []
         self.total_items = 0
 
@@ -117,166 +245,180 @@ def find_files_in_path(self, path):
         if self.pathlist is None:
             self.pathlist = []
         self.pathlist.append(path)
+
+        # Use the project index to skip files that can't contain the text
+        if (
+            self.index is not None
+            and self.index.ready
+            and self.index.covers(path)
+            and not self.text_re
+        ):
+            self.candidates = self.index.candidates(self.texts)
+
+        # Files are searched in parallel while directories are walked
+        engine = SearchEngine(self.texts, self.text_re, self.case_sensitive)
+        results = engine.search(self.walk_files(path))
+        try:
+            for filename, matches, error in results:
+                with QMutexLocker(self.mutex):
+                    if self.stopped:
+                        return False
+                self.add_matches(filename, matches, error)
+        except re.error:
+            self.error_flag = _("invalid regular expression")
+            return False
+        except FileNotFoundError:
+            return False
+        finally:
+            # Cancel the search of pending files
+            results.close()
+
+            # Reindex the files that changed since they were indexed
+            if self.stale_files:
+                self.index.update(self.stale_files)
+
+        with QMutexLocker(self.mutex):
+            if self.stopped:
+                return False
+
+        # Process any pending results
+        if self.partial_results:
+            self.process_results()
+
+        self.completed = True
+        return True
+
+    def walk_files(self, path):
+        """
+        Yield the files to search in `path`.
+
+        Files are given as (filename, check_text) tuples, where `check_text`
+        is True if the file doesn't have a known text extension.
+
+        Directories and files ignored by .gitignore and .ignore files are
+        pruned before they're opened, if `use_ignore_files` is True.
+        """
+        # Ignore rules of the directories to visit, which are read when
+        # their parent directory is visited
+        dir_rules = {}
+        if self.use_ignore_files:
+            dir_rules[path] = get_ignore_rules(path)
+
         for path, dirs, files in os.walk(path):
             with QMutexLocker(self.mutex):
                 if self.stopped:
-                    return False
-            try:
-                # For directories
-                for d in dirs[:]:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-
-                    dirname = os.path.join(path, d)
-
-                    # Only search in regular directories
-                    st_dir_mode = os.stat(dirname).st_mode
-                    if not stat.S_ISDIR(st_dir_mode):
-                        dirs.remove(d)
+                    return
 
-                    if (self.exclude and
-                            re.search(self.exclude, dirname + os.sep)):
-                        # Exclude patterns defined by the user
-                        dirs.remove(d)
-                    elif d.startswith('.'):
-                        # Exclude all dot dirs.
-                        dirs.remove(d)
+            rules = dir_rules.pop(path, None)
+            if rules is not None:
+                abspath = osp.normpath(osp.abspath(path))
 
-                # For files
-                for f in files:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-
-                    filename = os.path.join(path, f)
-                    ext = osp.splitext(filename)[1]
-
-                    # Only search in regular files (i.e. not pipes).
-                    # The try/except is necessary to catch an error when
-                    # Python can't get the file status due to too many levels
-                    # of symbolic links.
-                    # Fixes spyder-ide/spyder#20798
-                    try:
-                        st_file_mode = os.stat(filename).st_mode
-                        if not stat.S_ISREG(st_file_mode):
-                            continue
-                    except OSError:
-                        continue
+            # For directories
+            for d in dirs[:]:
+                with QMutexLocker(self.mutex):
+                    if self.stopped:
+                        return
 
-                    # Exclude patterns defined by the user
-                    if self.exclude and re.search(self.exclude, filename):
-                        continue
+                dirname = os.path.join(path, d)
 
-                    # Don't search in plain text files with skipped extensions
-                    # (e.g .svg)
-                    if ext in self.SKIPPED_EXTENSIONS:
-                        continue
+                # Only search in regular directories
+                st_dir_mode = os.stat(dirname).st_mode
+                if not stat.S_ISDIR(st_dir_mode):
+                    dirs.remove(d)
+                    continue
 
-                    # It's much faster to check for extension first before
-                    # validating if the file is plain text.
-                    if (
-                        ext in self.PYTHON_EXTENSIONS
-                        or ext in self.USEFUL_EXTENSIONS
-                        or ext in EDIT_EXTENSIONS
-                        or is_text_file(filename)
+                if (self.exclude and
+                        re.search(self.exclude, dirname + os.sep)):
+                    # Exclude patterns defined by the user
+                    dirs.remove(d)
+                elif d.startswith('.'):
+                    # Exclude all dot dirs.
+                    dirs.remove(d)
+                elif self.use_ignore_files:
+                    if d in self.SKIPPED_DIRECTORIES or (
+                        rules is not None
+                        and rules.is_ignored(abspath, d, is_dir=True)
                     ):
-                        self.find_string_in_file(filename)
-            except re.error:
-                self.error_flag = _("invalid regular expression")
-                return False
-            except FileNotFoundError:
-                return False
-
-        # Process any pending results
-        if self.partial_results:
-            self.process_results()
+                        # Exclude directories ignored by the project
+                        dirs.remove(d)
+                    else:
+                        dir_rules[dirname] = IgnoreRules.from_directory(
+                            dirname, rules
+                        )
+
+            # For files
+            for f in files:
+                with QMutexLocker(self.mutex):
+                    if self.stopped:
+                        return
+
+                filename = os.path.join(path, f)
+                ext = osp.splitext(filename)[1]
+
+                # Only search in regular files (i.e. not pipes).
+                # The try/except is necessary to catch an error when
+                # Python can't get the file status due to too many levels
+                # of symbolic links.
+                # Fixes spyder-ide/spyder#20798
+                try:
+                    st = os.stat(filename)
+                    if not stat.S_ISREG(st.st_mode):
+                        continue
+                except OSError:
+                    continue
+
+                # Exclude patterns defined by the user
+                if self.exclude and re.search(self.exclude, filename):
+                    continue
+
+                # Don't search in plain text files with skipped extensions
+                # (e.g .svg) or in files that are known to be binary
+                if (
+                    ext in self.SKIPPED_EXTENSIONS
+                    or ext.lower() in self.BINARY_EXTENSIONS
+                ):
+                    continue
+
+                # Skip large files
+                if self.max_file_size and st.st_size > self.max_file_size:
+                    continue
+
+                # Exclude files ignored by the project
+                if rules is not None and rules.is_ignored(abspath, f):
+                    continue
+
+                # It's much faster to check for extension first before
+                # validating if the file is plain text, which is done by the
+                # search engine.
+                check_text = not (
+                    ext in self.PYTHON_EXTENSIONS
+                    or ext in self.USEFUL_EXTENSIONS
+                    or ext in EDIT_EXTENSIONS
+                )
+
+                # Skip files that didn't change since they were indexed and
+                # can't contain the text
+                if self.candidates is not None:
+                    normpath = osp.normpath(filename)
+                    if self.index.is_current(normpath, st):
+                        if normpath not in self.candidates:
+                            continue
+                    elif ext in EDIT_EXTENSIONS:
+                        self.stale_files.append(normpath)
 
-        return True
+                yield filename, check_text
 
     def find_string_in_file(self, fname):
         self.error_flag = False
-        self.sig_current_file.emit(fname)
         try:
-            for lineno, line in enumerate(open(fname, 'rb')):
-                for text, enc in self.texts:
-                    with QMutexLocker(self.mutex):
-                        if self.stopped:
-                            return False
-                    line_search = line
-                    if not self.case_sensitive:
-                        line_search = line_search.lower()
-                    if self.text_re:
-                        found = re.search(text, line_search)
-                        if found is not None:
-                            break
-                    else:
-                        found = line_search.find(text)
-                        if found > -1:
-                            break
-                try:
-                    line_dec = line.decode(enc)
-                except UnicodeDecodeError:
-                    line_dec = line
-
-                if not self.case_sensitive:
-                    line = line.lower()
-
-                if self.text_re:
-                    for match in re.finditer(text, line):
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        bstart, bend = match.start(), match.end()
-                        try:
-                            # Go from binary position to utf8 position
-                            start = len(line[:bstart].decode(enc))
-                            end = start + len(line[bstart:bend].decode(enc))
-                        except UnicodeDecodeError:
-                            start = bstart
-                            end = bend
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     start,
-                                                     end,
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-                else:
-                    found = line.find(text)
-                    while found > -1:
-                        with QMutexLocker(self.mutex):
-                            if self.stopped:
-                                return False
-                        self.total_matches += 1
-                        try:
-                            # Go from binary position to utf8 position
-                            start = len(line[:found].decode(enc))
-                            end = start + len(text.decode(enc))
-                        except UnicodeDecodeError:
-                            start = found
-                            end = found + len(text)
-
-                        self.partial_results.append((osp.abspath(fname),
-                                                     lineno + 1,
-                                                     start,
-                                                     end,
-                                                     line_dec))
-                        if len(self.partial_results) > (2**self.power):
-                            self.process_results()
-                            if self.power < self.max_power:
-                                self.power += 1
-
-                        for text, enc in self.texts:
-                            found = line.find(text, found + 1)
-                            if found > -1:
-                                break
-        except IOError as xxx_todo_changeme:
-            (_errno, _strerror) = xxx_todo_changeme.args
-            self.error_flag = _("permission denied errors were encountered")
+            matches = search_file(
+                fname, self.texts, self.text_re, self.case_sensitive
+            )
+            error = False
+        except OSError:
+            matches = []
+            error = True
+        self.add_matches(fname, matches, error)
 
         # Process any pending results
         if self.is_file and self.partial_results:
@@ -284,6 +426,21 @@ def find_string_in_file(self, fname):
 
         self.completed = True
 
+    def add_matches(self, fname, matches, error=False):
+        """Add the matches found in a file to the pending results."""
+        self.sig_current_file.emit(fname)
+        if error:
+            self.error_flag = _("permission denied errors were encountered")
+
+        filename = osp.abspath(fname)
+        for lineno, start, end, line in matches:
+            self.total_matches += 1
+            self.partial_results.append((filename, lineno, start, end, line))
+            if len(self.partial_results) > (2**self.power):
+                self.process_results()
+                if self.power < self.max_power:
+                    self.power += 1
+
     def process_results(self):
         """
         Process all matches found inside a file.
@@ -291,8 +448,9 @@ def process_results(self):
         Creates the necessary files and emits signal for the creation of file
         item.
 
-        Creates the necessary data for lines found and emits signal for the
-        creation of line items in batch.
+        Emits the lines found in batch, as (filename, lineno, colno,
+        match_end, line) tuples. Lines are formatted by the results browser
+        when they are shown.
 
         Creates the title based on the last entry of the lines batch.
         """
@@ -303,13 +461,11 @@ def process_results(self):
                 filename, lineno, colno, match_end, line = result
 
                 if filename not in self.files:
-                    self.files.append(filename)
+                    self.files.add(filename)
                     self.sig_file_match.emit(filename)
                     self.num_files += 1
 
-                line = self.truncate_result(line, colno, match_end)
-                item = (filename, lineno, colno, line, match_end)
-                items.append(item)
+                items.append(result)
                 self.total_items += 1
 
         # Process title
@@ -333,75 +489,7 @@ def truncate_result(self, line, start, end):
         """
         Shorten text on line to display the match within `max_line_length`.
         """
-        html_escape_table = {
-            "&": "&amp;",
-            '"': "&quot;",
-            "'": "&apos;",
-            ">": "&gt;",
-            "<": "&lt;",
-        }
-
-        def html_escape(text):
-            """Produce entities within text."""
-            return "".join(html_escape_table.get(c, c) for c in text)
-
-        line = str(line)
-        left, match, right = line[:start], line[start:end], line[end:]
-
-        if len(line) > MAX_RESULT_LENGTH:
-            offset = (len(line) - len(match)) // 2
-
-            left = left.split(' ')
-            num_left_words = len(left)
-
-            if num_left_words == 1:
-                left = left[0]
-                if len(left) > MAX_NUM_CHAR_FRAGMENT:
-                    left = ELLIPSIS + left[-offset:]
-                left = [left]
-
-            right = right.split(' ')
-            num_right_words = len(right)
-
-            if num_right_words == 1:
-                right = right[0]
-                if len(right) > MAX_NUM_CHAR_FRAGMENT:
-                    right = right[:offset] + ELLIPSIS
-                right = [right]
-
-            left = left[-4:]
-            right = right[:4]
-
-            if len(left) < num_left_words:
-                left = [ELLIPSIS] + left
-
-            if len(right) < num_right_words:
-                right = right + [ELLIPSIS]
-
-            left = ' '.join(left)
-            right = ' '.join(right)
-
-            if len(left) > MAX_NUM_CHAR_FRAGMENT:
-                left = ELLIPSIS + left[-30:]
-
-            if len(right) > MAX_NUM_CHAR_FRAGMENT:
-                right = right[:30] + ELLIPSIS
-
-        match_color = SpyderPalette.COLOR_OCCURRENCE_4
-        trunc_line = dict(
-            text=''.join([left, match, right]),
-            formatted_text=(
-                f'<span style="color:{self.text_color}">'
-                f'{html_escape(left)}'
-                f'<span style="background-color:{match_color}">'
-                f'{html_escape(match)}'
-                f'</span>'
-                f'{html_escape(right)}'
-                f'</span>'
-            )
-        )
-
-        return trunc_line
+        return truncate_result(line, start, end, self.text_color)
 
     def get_results(self):
         return self.results, self.pathlist, self.total_matches, self.error_flag
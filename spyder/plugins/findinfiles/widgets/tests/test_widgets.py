@@ -17,7 +17,7 @@
 from flaky import flaky
 import pytest
 from qtpy.QtCore import Qt
-from qtpy.QtWidgets import QMessageBox
+from qtpy.QtWidgets import QMessageBox, QPlainTextEdit
 
 # Local imports
 from spyder.config.base import running_in_ci
@@ -44,7 +44,7 @@ def process_search_results(results):
     test framework comparison representation.
     """
     matches = {}
-    for result in results.values():
+    for result in results:
         file, line, col, __ = result
         filename = osp.basename(file)
         if filename not in matches:
@@ -149,7 +149,7 @@ def test_find_in_files_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     assert expected_results() == matches
 
 
@@ -162,7 +162,7 @@ def test_exclude_extension_regex(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -181,7 +181,7 @@ def test_exclude_extension_string(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -200,7 +200,7 @@ def test_exclude_extension_empty_regex(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     assert expected_results() == matches
 
 
@@ -213,7 +213,7 @@ def test_exclude_extension_string_no_regexp(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     assert expected_results() == matches
 
 
@@ -226,7 +226,7 @@ def test_exclude_extension_multiple_string(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     files_filtered = True
     for file in matches:
         filename, ext = osp.splitext(file)
@@ -273,7 +273,7 @@ def test_case_unsensitive_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     print(matches)
     assert expected_case_unsensitive_results() == matches
 
@@ -287,7 +287,7 @@ def test_case_sensitive_search(findinfiles, qtbot):
     findinfiles.find()
     blocker = qtbot.waitSignal(findinfiles.sig_finished)
     blocker.wait()
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     print(matches)
     assert matches == {'ham.txt': [(9, 0)]}
 
@@ -336,16 +336,16 @@ def test_no_empty_file_items(findinfiles, qtbot):
     # expected because os.walk (used by findinfiles) gives an arbitrary file
     # ordering.)
     spamfiles = set(['spam.py', 'spam.txt', 'spam.cpp'])
-    find_results = process_search_results(findinfiles.result_browser.data)
+    find_results = process_search_results(findinfiles.result_browser.get_results())
     assert set(find_results.keys()).issubset(spamfiles)
     assert sum(len(finds) for finds in find_results.values()) == max_results
 
     # Assert that the files with results are exactly the same as those
     # displayed in the results browser.
     files_with_results = set(
-        [v[0] for v in findinfiles.result_browser.data.values()]
+        [v[0] for v in findinfiles.result_browser.get_results()]
     )
-    displayed_files = set(findinfiles.result_browser.files.keys())
+    displayed_files = set(findinfiles.result_browser.get_files())
     assert files_with_results == displayed_files
 
 
@@ -576,6 +576,137 @@ def test_delete_path(searchin_combobox, qtbot, mocker):
     )
 
 
+@flaky(max_runs=5)
+def test_find_in_files_search_with_project_index(findinfiles, qtbot):
+    """
+    Test that searching in a project with an index gives the same results
+    as without it.
+    """
+    findinfiles.set_project_path(osp.join(LOCATION, "data"))
+    index = findinfiles.project_index
+    assert index is not None
+    assert index.wait(10)
+
+    findinfiles.path_selection_combo.setCurrentIndex(
+        SearchInComboBoxItems.Project)
+    findinfiles.set_search_text("spam")
+    with qtbot.waitSignal(findinfiles.sig_finished):
+        findinfiles.find()
+
+    matches = process_search_results(findinfiles.result_browser.get_results())
+    assert expected_results() == matches
+
+    # Disabling the option stops the index
+    findinfiles.set_conf('project_index', False)
+    assert findinfiles.project_index is None
+    findinfiles.set_conf('project_index', True)
+    assert findinfiles.project_index is not None
+    findinfiles.disable_project_search()
+    assert findinfiles.project_index is None
+
+
+@flaky(max_runs=5)
+def test_find_in_files_skips_ignored_files(findinfiles, qtbot, tmp_path):
+    """
+    Test that files ignored by the project, large files and binary files
+    are not searched.
+    """
+    root = tmp_path / 'project'
+    (root / 'build').mkdir(parents=True)
+    (root / 'node_modules').mkdir()
+    (root / 'src').mkdir()
+    (root / '.gitignore').write_text('build/\n*.md\n')
+    (root / 'src' / '.ignore').write_text('!keep.md\n')
+    (root / 'spam.py').write_text('spam = 1\n')
+    (root / 'spam.md').write_text('spam\n')
+    (root / 'build' / 'spam.py').write_text('spam = 2\n')
+    (root / 'node_modules' / 'spam.js').write_text('spam = 3\n')
+    (root / 'src' / 'keep.md').write_text('spam\n')
+    (root / 'src' / 'large.txt').write_text('spam\n' * 300000)
+    (root / 'src' / 'spam.png').write_text('spam\n')
+
+    findinfiles.set_search_text("spam")
+    findinfiles.set_directory(str(root))
+    findinfiles.set_max_file_size(1)
+    with qtbot.waitSignal(findinfiles.sig_finished):
+        findinfiles.find()
+
+    matches = process_search_results(findinfiles.result_browser.get_results())
+    assert set(matches.keys()) == {'spam.py', 'keep.md'}
+
+    # All files are searched when ignore files are not used
+    findinfiles.set_conf('use_ignore_files', False)
+    with qtbot.waitSignal(findinfiles.sig_finished):
+        findinfiles.find()
+
+    files = findinfiles.result_browser.get_files()
+    assert len(files) == 5
+    assert str(root / 'build' / 'spam.py') in files
+
+    # Restore defaults
+    findinfiles.set_conf('use_ignore_files', True)
+    findinfiles.set_max_file_size(10)
+
+
+def test_replace(findinfiles, qtbot, tmp_path, monkeypatch):
+    """
+    Test replacing the matches selected in the results browser, both in
+    files and in the editor.
+    """
+    root = tmp_path / 'project'
+    root.mkdir()
+    (root / 'spam.py').write_text('spam = 1\nham = "spam"\n')
+    (root / 'eggs.py').write_text('eggs = "spam"\n')
+    (root / 'open.py').write_text('x = 1\nspam = 2\n')
+
+    # Files that are open in the editor are replaced there
+    editor = QPlainTextEdit('x = 1\nspam = 2\n')
+    findinfiles._plugin._get_code_editor = (
+        lambda filename: editor if filename.endswith('open.py') else None
+    )
+    monkeypatch.setattr(
+        QMessageBox, 'question', lambda *args: QMessageBox.Yes
+    )
+
+    findinfiles.set_search_text("spam")
+    findinfiles.set_directory(str(root))
+    with qtbot.waitSignal(findinfiles.sig_finished):
+        findinfiles.find()
+
+    # Show the preview of replacements
+    findinfiles.replace_mode_action.setChecked(True)
+    findinfiles.replace_text_edit.setEditText('sausage')
+    browser = findinfiles.result_browser
+    model = browser.model
+    spam_row = browser.get_files().index(str(root / 'spam.py'))
+    spam_index = model.index(spam_row, 0)
+    assert model.data(spam_index, Qt.CheckStateRole) == Qt.Checked
+    html = browser.delegate.get_html(model.index(0, 0, spam_index))
+    assert '<s>spam</s>' in html
+    assert 'sausage' in html
+
+    # Exclude a match and the whole eggs.py file
+    model.setData(model.index(1, 0, spam_index), Qt.Unchecked,
+                  Qt.CheckStateRole)
+    assert model.data(spam_index, Qt.CheckStateRole) == Qt.PartiallyChecked
+    eggs_row = browser.get_files().index(str(root / 'eggs.py'))
+    model.setData(model.index(eggs_row, 0), Qt.Unchecked, Qt.CheckStateRole)
+
+    with qtbot.waitSignal(findinfiles.sig_replace_finished) as blocker:
+        findinfiles.replace()
+
+    assert blocker.args == [2, 0]
+    assert (root / 'spam.py').read_text() == 'sausage = 1\nham = "spam"\n'
+    assert (root / 'eggs.py').read_text() == 'eggs = "spam"\n'
+    assert (root / 'open.py').read_text() == 'x = 1\nspam = 2\n'
+    assert editor.toPlainText() == 'x = 1\nsausage = 2\n'
+
+    # Results are cleared after replacing them
+    assert browser.get_results() == []
+    assert not findinfiles.replace_action.isEnabled()
+    findinfiles.replace_mode_action.setChecked(False)
+
+
 def test_set_project_path(findinfiles, qtbot):
     """
     Test setting the project path of the SearchInComboBox from the
@@ -720,13 +851,68 @@ def test_max_results(findinfiles, qtbot):
     blocker = qtbot.waitSignal(findinfiles.sig_max_results_reached)
     blocker.wait()
 
-    print(len(findinfiles.result_browser.data), value)
-    assert len(findinfiles.result_browser.data) == value
+    print(len(findinfiles.result_browser.get_results()), value)
+    assert len(findinfiles.result_browser.get_results()) == value
 
     # Restore defaults
     findinfiles.set_max_results(1000)
 
 
+def test_results_browser_many_matches(findinfiles, qtbot):
+    """
+    Test that the results browser stores many matches without creating
+    items for them and that they are sorted and activated correctly.
+    """
+    browser = findinfiles.result_browser
+    model = browser.model
+    num_files, num_lines = 10, 10000
+    path = osp.join(LOCATION, 'data')
+    browser.set_path(path)
+    browser.set_max_results(num_files * num_lines)
+    browser.clear_title('spam')
+
+    line = 'spam = "<eggs>" + spam\n'
+    for i in reversed(range(num_files)):
+        filename = osp.join(path, f'spam{i}.py')
+        browser.append_file_result(filename)
+        items = [
+            (filename, lineno, 0, 4, line)
+            for lineno in range(1, num_lines + 1)
+        ]
+        browser.append_result(items, 'title')
+
+    assert model.num_matches == num_files * num_lines
+    assert len(browser.get_results()) == num_files * num_lines
+
+    # Only the results shown are formatted, and their HTML is escaped
+    file_index = model.index(0, 0)
+    index = model.index(1, 0, file_index)
+    html = browser.delegate.get_html(index)
+    assert '&lt;eggs&gt;' in html
+    assert '<b>2</b> (0)' in html
+
+    # Files are sorted by name when the search finishes and their matches
+    # keep being expanded
+    browser.set_sorting('on')
+    browser.sortByColumn(0, Qt.AscendingOrder)
+    assert browser.get_files()[0] == osp.join(path, 'spam0.py')
+    assert all(
+        browser.isExpanded(model.index(row, 0))
+        for row in range(num_files)
+    )
+
+    # Activating a match requests to go to its position
+    file_index = model.index(0, 0)
+    index = model.index(2, 0, file_index)
+    with qtbot.waitSignal(browser.sig_edit_goto_requested) as blocker:
+        browser.on_item_activated(index)
+    assert blocker.args == [osp.join(path, 'spam0.py'), 3, 'spam', 0, 4]
+
+    # Restore defaults
+    browser.set_max_results(1000)
+    browser.clear_title('')
+
+
 @flaky(max_runs=5)
 def test_find_in_single_file(findinfiles, qtbot):
     """
@@ -742,7 +928,7 @@ def test_find_in_single_file(findinfiles, qtbot):
     with qtbot.waitSignal(findinfiles.sig_finished):
         findinfiles.find()
 
-    matches = process_search_results(findinfiles.result_browser.data)
+    matches = process_search_results(findinfiles.result_browser.get_results())
     assert list(matches.keys()) == ['spam.txt']
     assert expected_results()['spam.txt'] == matches['spam.txt']
 
@@ -83,6 +83,18 @@ class Projects(SpyderDockablePlugin):
         between projects (signature 2).
     """
 
+    sig_project_files_changed = Signal(list)
+    """
+    This signal is emitted when files or directories of the current project
+    are created, modified, moved or deleted.
+
+    Parameters
+    ----------
+    paths: list
+        Paths that changed. For moves, both the source and destination paths
+        are included.
+    """
+
     # ---- SpyderDockablePlugin API
     # -------------------------------------------------------------------------
     @staticmethod
@@ -108,6 +120,8 @@ def on_initialize(self):
         widget.sig_project_created.connect(self.sig_project_created)
         widget.sig_project_closed.connect(self.sig_project_closed)
         widget.sig_project_loaded.connect(self.sig_project_loaded)
+        widget.sig_project_files_changed.connect(
+            self.sig_project_files_changed)
 
         treewidget.sig_delete_project.connect(self.delete_project)
         treewidget.sig_redirect_stdio_requested.connect(
@@ -143,6 +157,8 @@ def on_editor_available(self):
         widget.sig_project_closed[bool].connect(self._setup_editor_files)
         widget.sig_project_loaded.connect(self._set_path_in_editor)
         widget.sig_project_closed.connect(self._unset_path_in_editor)
+        widget.sig_open_file_at_line_requested.connect(
+            self._open_file_at_line)
 
     @on_plugin_available(plugin=Plugins.Completions)
     def on_completions_available(self):
@@ -205,6 +221,11 @@ def on_main_menu_available(self):
     def on_switcher_available(self):
         # Connect to switcher
         self._switcher = self.get_plugin(Plugins.Switcher)
+        self._switcher.add_mode(
+            self.get_widget().SYMBOL_SWITCHER_MODE,
+            _('Go to Symbol in Project'),
+            search=True
+        )
         self._switcher.sig_mode_selected.connect(self._handle_switcher_modes)
         self._switcher.sig_item_selected.connect(
             self._handle_switcher_selection)
@@ -235,6 +256,8 @@ def on_editor_teardown(self):
         widget.sig_project_closed[bool].disconnect(self._setup_editor_files)
         widget.sig_project_loaded.disconnect(self._set_path_in_editor)
         widget.sig_project_closed.disconnect(self._unset_path_in_editor)
+        widget.sig_open_file_at_line_requested.disconnect(
+            self._open_file_at_line)
 
     @on_plugin_teardown(plugin=Plugins.Completions)
     def on_completions_teardown(self):
@@ -271,6 +294,7 @@ def on_main_menu_teardown(self):
     @on_plugin_teardown(plugin=Plugins.Switcher)
     def on_switcher_teardown(self):
         # Disconnect from switcher
+        self._switcher.remove_mode(self.get_widget().SYMBOL_SWITCHER_MODE)
         self._switcher.sig_mode_selected.disconnect(
             self._handle_switcher_modes)
         self._switcher.sig_item_selected.disconnect(
@@ -467,6 +491,10 @@ def _unset_path_in_editor(self, __unused):
         editor = self.get_plugin(Plugins.Editor)
         editor.set_current_project_path()
 
+    def _open_file_at_line(self, filename, line_number):
+        editor = self.get_plugin(Plugins.Editor)
+        editor.load(filename, goto=line_number)
+
     def _add_path_to_completions(self, path):
         self._completions.project_path_update(
             path,
@@ -510,22 +538,25 @@ def _broadcast_notification(self, method, params):
 
     def _handle_switcher_modes(self, mode):
         """
-        Populate switcher with files in active project.
+        Populate switcher with files or symbols in active project.
 
         List the file names of the current active project with their
-        directories in the switcher. It only handles the files mode, i.e.
-        an empty string.
+        directories in the switcher for the files mode, i.e. an empty string,
+        and its symbols for the project symbols mode.
 
         Parameters
         ----------
         mode: str
-            The selected mode (open files "", symbol "@" or line ":").
+            The selected mode (open files "", symbol "@", line ":" or project
+            symbol "#").
         """
-        # Don't compute anything if we're not in files mode
-        if mode != "":
-            return
-
-        self.get_widget().display_default_switcher_items()
+        widget = self.get_widget()
+        if mode == widget.SYMBOL_SWITCHER_MODE:
+            self._switcher.clear()
+            self._switcher.set_placeholder_text(_('Select symbol'))
+            widget.display_switcher_symbols()
+        elif mode == "":
+            widget.display_default_switcher_items()
 
     def _handle_switcher_selection(self, item, mode, search_text):
         """
@@ -556,7 +587,9 @@ def _handle_switcher_search(self, search_text):
         text: str
             The current search text in the switcher dialog box.
         """
-        self.get_widget().handle_switcher_search(search_text)
+        self.get_widget().handle_switcher_search(
+            search_text, mode=self._switcher.get_mode()
+        )
 
     def _display_items_in_switcher(self, items, setup, clear_section):
         """
@@ -29,6 +29,7 @@
 from spyder.plugins.preferences.tests.conftest import MainWindowMock
 from spyder.plugins.projects.api import BaseProjectType
 from spyder.plugins.projects.plugin import Projects
+from spyder.plugins.projects.utils.watcher import WorkspaceEventKind
 from spyder.plugins.projects.widgets.main_widget import QMessageBox
 from spyder.plugins.projects.widgets.projectdialog import ProjectDialog
 from spyder.py3compat import to_text_string
@@ -473,6 +474,55 @@ def test_filesystem_notifications(qtbot, projects, tmpdir):
         png_file.write("")
 
 
+def test_switcher_index(qtbot, projects, tmpdir, mocker):
+    """
+    Test that switcher searches use the project index once it's built and
+    that it follows the filesystem notifications.
+    """
+    project_root = tmpdir.mkdir('project0')
+    project_root.join('spam.py').write('def spam():\n    pass\n')
+    project_root.mkdir('folder0').join('ham.txt').write('')
+
+    projects.open_project(path=str(project_root))
+    widget = projects.get_widget()
+    qtbot.waitUntil(lambda: widget._default_switcher_paths != [])
+    assert widget._index.is_ready()
+    assert widget._default_switcher_paths == [
+        str(project_root.join('folder0', 'ham.txt')),
+        str(project_root.join('spam.py')),
+    ]
+
+    display_paths = mocker.patch.object(widget, '_display_paths_in_switcher')
+    display_symbols = mocker.patch.object(
+        widget, '_display_symbols_in_switcher'
+    )
+    call_fzf = mocker.spy(widget, '_call_fzf')
+
+    # New files are found without walking the project again
+    eggs = project_root.join('eggs.py')
+    eggs.write('class Eggs:\n    pass\n')
+    widget.files_changed(
+        [(WorkspaceEventKind.Created, str(eggs), None, False)]
+    )
+
+    widget.handle_switcher_search('egs')
+    display_paths.assert_called_once_with(
+        [str(eggs)], setup=True, clear_section=True
+    )
+
+    # Their symbols are found after they're parsed in the index thread
+    qtbot.waitUntil(lambda: widget._index.search_symbols('egs', 5) != [])
+    widget.handle_switcher_search('egs', mode=widget.SYMBOL_SWITCHER_MODE)
+    display_symbols.assert_called_once_with(
+        [(str(eggs), 'Eggs', 5, 1)]
+    )
+    assert call_fzf.call_count == 0
+
+    # The index is discarded when closing the project
+    projects.close_project()
+    assert widget._index is None
+
+
 def test_loaded_and_closed_signals(create_projects, tmpdir, mocker, qtbot):
     """
     Test that loaded and closed signals are emitted when switching
@@ -0,0 +1,511 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Index of the files and symbols of a project, used by the switcher."""
+
+# Standard lib imports
+import ast
+import os
+import os.path as osp
+import threading
+import traceback
+
+# Third-party imports
+from qtpy.QtCore import QThread, Signal
+
+# Local imports
+from spyder.plugins.completion.api import SymbolKind
+from spyder.plugins.projects.utils.watcher import (
+    IgnoreFilter, is_editable_path)
+from spyder.utils.stringmatching import SearchScorer
+
+
+# ---- Constants
+# -----------------------------------------------------------------------------
+# Files whose symbols are indexed
+PYTHON_EXTENSIONS = ('.py', '.pyw', '.pyi')
+
+# Larger files are usually generated, so their symbols are not indexed
+MAX_PARSE_SIZE = 1024 * 1024
+
+
+# ---- Auxiliary functions
+# -----------------------------------------------------------------------------
+def get_python_symbols(source):
+    """
+    Get the classes, functions and methods defined in Python source.
+
+    Parameters
+    ----------
+    source: str or bytes
+        Python source code.
+
+    Returns
+    -------
+    list
+        (name, kind, line) tuples, where `name` is qualified with the name of
+        the classes and functions that contain the symbol, `kind` is a
+        `SymbolKind` and `line` starts at 1.
+    """
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError, RecursionError):
+        return []
+
+    symbols = []
+
+    def visit(node, prefix, in_class):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef):
+                kind = SymbolKind.CLASS
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = SymbolKind.METHOD if in_class else SymbolKind.FUNCTION
+            elif isinstance(child, (ast.stmt, ast.excepthandler)):
+                # Look for definitions inside if, try, with, etc.
+                visit(child, prefix, in_class)
+                continue
+            else:
+                continue
+
+            name = prefix + child.name
+            symbols.append((name, kind, child.lineno))
+            visit(child, name + '.', kind == SymbolKind.CLASS)
+
+    visit(tree, '', False)
+    return symbols
+
+
+# ---- Index
+# -----------------------------------------------------------------------------
+class ProjectIndex:
+    """
+    Paths of the editable files in a project and the symbols of its Python
+    files.
+
+    The index is built once (usually in a thread, see `ProjectIndexThread`)
+    and then kept current with the changes reported by the project watcher,
+    so that searches don't need to walk the disk.
+
+    Notes
+    -----
+    Changes reported while the index is being built or updated are applied
+    after it finishes, so that they are not overwritten by what was found.
+    Created directories are walked and modified files are parsed again by
+    `update`, so searches return what was indexed until then.
+    """
+
+    def __init__(self, root_path, ignore_patterns=None):
+        """
+        Parameters
+        ----------
+        root_path: str
+            Project directory.
+        ignore_patterns: list, optional
+            Patterns of the files and folders that are not indexed, as used
+            by the project watcher (see `IgnoreFilter`).
+        """
+        self.root_path = osp.normpath(root_path)
+        self._ignore = IgnoreFilter(self.root_path, ignore_patterns)
+
+        self._lock = threading.RLock()
+        self._ready = False
+        self._building = False
+        self._stopped = False
+        self._pending = []
+        self._changed = threading.Event()
+
+        # Path -> (mtime, size, symbols). Symbols are None for files that
+        # are not parsed yet.
+        self._files = {}
+
+        # Modified files that need to be parsed again and created
+        # directories that need to be walked by `update`
+        self._stale = set()
+        self._new_dirs = set()
+
+        # Scorers are created when searching and reset when files change
+        self._paths = None
+        self._path_scorer = None
+        self._symbols = None
+        self._symbol_scorer = None
+
+    # ---- API
+    # -------------------------------------------------------------------------
+    def is_ready(self):
+        """Return whether the index was built."""
+        return self._ready
+
+    def build(self):
+        """Walk the project directory and parse its Python files."""
+        with self._lock:
+            self._building = True
+            self._pending = []
+
+        files = {}
+        for path, stat in self._walk(self.root_path):
+            if self._stopped:
+                return
+            files[path] = self._get_entry(path, stat)
+
+        with self._lock:
+            self._building = False
+            if self._stopped:
+                return
+
+            self._files = files
+            self._stale = set()
+            self._new_dirs = set()
+            self._reset_searches()
+            self._ready = True
+            self._apply_pending()
+
+    def update(self):
+        """
+        Walk the directories created and parse the files modified since the
+        last update.
+
+        This reads the disk, so it should be run in a thread (see
+        `ProjectIndexThread`).
+        """
+        with self._lock:
+            if not self._ready or self._building:
+                return
+            self._building = True
+            new_dirs, self._new_dirs = self._new_dirs, set()
+            stale, self._stale = self._stale, set()
+
+        files = {}
+        for directory in new_dirs:
+            for path, stat in self._walk(directory):
+                if self._stopped:
+                    break
+                files[path] = self._get_entry(path, stat)
+        for path in stale - set(files):
+            if self._stopped:
+                break
+            files[path] = self._get_entry(path)
+
+        with self._lock:
+            self._building = False
+            if self._stopped:
+                return
+
+            for path, entry in files.items():
+                old_entry = self._files.get(path)
+                self._files[path] = entry
+                if old_entry is None:
+                    self._reset_searches()
+                elif entry[2] != old_entry[2]:
+                    self._symbols = None
+                    self._symbol_scorer = None
+            self._apply_pending()
+
+    def wait_for_changes(self):
+        """
+        Wait until there are changes to apply with `update`.
+
+        Returns
+        -------
+        bool
+            False if the index was stopped while waiting.
+        """
+        self._changed.wait()
+        self._changed.clear()
+        return not self._stopped
+
+    def stop(self):
+        """Stop building or updating the index."""
+        self._stopped = True
+        self._changed.set()
+
+    def add_path(self, path, is_dir=False):
+        """Add a created file or directory to the index."""
+        if self._defer(self.add_path, path, is_dir):
+            return
+
+        path = osp.normpath(path)
+        if is_dir:
+            if not self._is_ignored(path):
+                with self._lock:
+                    self._new_dirs.add(path)
+                self._changed.set()
+        elif is_editable_path(path) and not self._is_ignored(path):
+            with self._lock:
+                self._files[path] = (None, None, None)
+                self._stale.add(path)
+                self._reset_searches()
+            self._changed.set()
+
+    def remove_path(self, path, is_dir=False):
+        """Remove a deleted file or directory from the index."""
+        if self._defer(self.remove_path, path, is_dir):
+            return
+
+        path = osp.normpath(path)
+        with self._lock:
+            if is_dir:
+                removed = [p for p in self._files if self._is_in(p, path)]
+            else:
+                removed = [path] if path in self._files else []
+
+            for removed_path in removed:
+                del self._files[removed_path]
+                self._stale.discard(removed_path)
+            if is_dir:
+                self._new_dirs = {
+                    d for d in self._new_dirs
+                    if d != path and not self._is_in(d, path)
+                }
+
+            if removed:
+                self._reset_searches()
+
+    def move_path(self, src_path, dest_path, is_dir=False):
+        """Move a file or directory in the index."""
+        if self._defer(self.move_path, src_path, dest_path, is_dir):
+            return
+
+        src_path = osp.normpath(src_path)
+        dest_path = osp.normpath(dest_path)
+        if not is_dir:
+            with self._lock:
+                entry = self._files.pop(src_path, None)
+                self._stale.discard(src_path)
+                if (
+                    entry is not None
+                    and is_editable_path(dest_path)
+                    and not self._is_ignored(dest_path)
+                ):
+                    self._files[dest_path] = entry
+                    self._stale.add(dest_path)
+                    self._changed.set()
+                self._reset_searches()
+            if entry is None:
+                self.add_path(dest_path)
+            return
+
+        with self._lock:
+            moved = [p for p in self._files if self._is_in(p, src_path)]
+            for path in moved:
+                entry = self._files.pop(path)
+                self._stale.discard(path)
+                if not self._is_ignored(dest_path):
+                    new_path = dest_path + path[len(src_path):]
+                    self._files[new_path] = entry
+                    self._stale.add(new_path)
+
+            # Directories that were not walked yet are walked where they are
+            new_dirs = [
+                d for d in self._new_dirs
+                if d == src_path or self._is_in(d, src_path)
+            ]
+            for directory in new_dirs:
+                self._new_dirs.discard(directory)
+                if not self._is_ignored(dest_path):
+                    self._new_dirs.add(dest_path + directory[len(src_path):])
+
+            self._reset_searches()
+        self._changed.set()
+
+    def update_path(self, path):
+        """Mark a modified file to parse it again in the next update."""
+        if self._defer(self.update_path, path):
+            return
+
+        path = osp.normpath(path)
+        with self._lock:
+            if path not in self._files:
+                return
+            self._stale.add(path)
+        self._changed.set()
+
+    def get_paths(self):
+        """Return the indexed paths, sorted."""
+        with self._lock:
+            return list(self._get_paths())
+
+    def search_paths(self, query, limit):
+        """
+        Search paths that match query.
+
+        Parameters
+        ----------
+        query: str
+            Letters to look for in the path relative to the project root.
+        limit: int
+            Maximum number of results.
+
+        Returns
+        -------
+        list
+            Absolute paths, the best matches first. If query is empty, the
+            first `limit` paths are returned.
+        """
+        with self._lock:
+            paths = self._get_paths()
+            if not query:
+                return paths[:limit]
+
+            if self._path_scorer is None:
+                start = len(self.root_path) + 1
+                self._path_scorer = SearchScorer(
+                    [path[start:] for path in paths]
+                )
+
+            results = self._path_scorer.get_scores(query, limit=limit)
+            return [osp.join(self.root_path, text) for text, __, __ in results]
+
+    def search_symbols(self, query, limit):
+        """
+        Search symbols that match query.
+
+        Parameters
+        ----------
+        query: str
+            Letters to look for in the qualified symbol names.
+        limit: int
+            Maximum number of results.
+
+        Returns
+        -------
+        list
+            (path, name, kind, line) tuples, the best matches first. If query
+            is empty, the first `limit` symbols are returned. Files created
+            or modified since the last update are not parsed, so their
+            previous symbols are returned, if any.
+        """
+        with self._lock:
+            symbols = self._get_symbols()
+            if not query:
+                return symbols[:limit]
+
+            if self._symbol_scorer is None:
+                self._symbol_scorer = SearchScorer(
+                    [name for __, name, __, __ in symbols]
+                )
+
+            results = self._symbol_scorer.get_matches(query, limit=limit)
+            return [symbols[index] for index, __, __ in results]
+
+    # ---- Helpers
+    # -------------------------------------------------------------------------
+    def _defer(self, method, *args):
+        """Save a change to apply it after building or updating the index."""
+        with self._lock:
+            if self._building:
+                self._pending.append((method, args))
+                return True
+        return False
+
+    def _is_in(self, path, directory):
+        return path.startswith(directory + os.sep)
+
+    def _is_ignored(self, path):
+        """Check if path is outside the project or should be ignored."""
+        return not self._is_in(path, self.root_path) or self._ignore(path)
+
+    def _walk(self, directory):
+        """Yield (path, stat) for the files that are indexed in directory."""
+        pending = [directory]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not self._ignore.match_name(entry.name):
+                            pending.append(entry.path)
+                    elif (
+                        not self._ignore.match_name(entry.name)
+                        and is_editable_path(entry.name)
+                    ):
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+    def _get_entry(self, path, stat=None):
+        """Get the index entry of a file, parsing it if needed."""
+        try:
+            if stat is None:
+                stat = os.stat(path)
+        except OSError:
+            return (None, None, None)
+
+        symbols = None
+        if (
+            path.endswith(PYTHON_EXTENSIONS)
+            and stat.st_size <= MAX_PARSE_SIZE
+        ):
+            try:
+                with open(path, 'rb') as f:
+                    symbols = get_python_symbols(f.read())
+            except OSError:
+                pass
+
+        return (stat.st_mtime_ns, stat.st_size, symbols)
+
+    def _apply_pending(self):
+        """Apply the changes reported while building or updating."""
+        pending, self._pending = self._pending, []
+        for method, args in pending:
+            method(*args)
+
+    def _get_paths(self):
+        if self._paths is None:
+            self._paths = sorted(self._files)
+        return self._paths
+
+    def _get_symbols(self):
+        if self._symbols is None:
+            self._symbols = [
+                (path, name, kind, line)
+                for path in self._get_paths()
+                for name, kind, line in (self._files[path][2] or [])
+            ]
+        return self._symbols
+
+    def _reset_searches(self):
+        self._paths = None
+        self._path_scorer = None
+        self._symbols = None
+        self._symbol_scorer = None
+
+
+# ---- Thread
+# -----------------------------------------------------------------------------
+class ProjectIndexThread(QThread):
+    """
+    Build a project index in a thread and update it with the changes
+    reported afterwards, until it's stopped.
+    """
+
+    sig_finished = Signal()
+    """This signal is emitted when the index was built."""
+
+    def __init__(self, parent, index):
+        super().__init__(parent)
+        self.index = index
+
+    def run(self):
+        try:
+            self.index.build()
+            if not self.index.is_ready():
+                return
+            self.sig_finished.emit()
+
+            while self.index.wait_for_changes():
+                self.index.update()
+        except Exception:
+            # Important note: we have to handle unexpected exceptions by
+            # ourselves because they won't be catched by the main thread
+            # (known QThread limitation/bug)
+            traceback.print_exc()
+
+    def stop(self):
+        self.index.stop()
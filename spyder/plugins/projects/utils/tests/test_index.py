@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the project index.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import time
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.plugins.completion.api import SymbolKind
+from spyder.plugins.projects.utils.index import (
+    get_python_symbols, ProjectIndex, ProjectIndexThread)
+
+
+SOURCE = """
+import os
+
+class Spam:
+    def eggs(self):
+        def inner():
+            pass
+
+    async def ham(self):
+        pass
+
+if os.name == 'nt':
+    def sausage():
+        pass
+else:
+    try:
+        def sausage():
+            pass
+    except ImportError:
+        pass
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Create a project with some files."""
+    (tmp_path / 'spam.py').write_text(SOURCE)
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'bacon.py').write_text('def bacon():\n    pass\n')
+    (tmp_path / 'pkg' / 'notes.txt').write_text('bacon\n')
+    (tmp_path / 'pkg' / 'image.png').write_bytes(b'')
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'hidden.py').write_text('def hidden(): pass\n')
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'cached.py').write_text('')
+    return tmp_path
+
+
+def get_index(project):
+    index = ProjectIndex(str(project))
+    index.build()
+    assert index.is_ready()
+    return index
+
+
+def test_get_python_symbols():
+    """Check that symbols are found with their qualified names."""
+    assert get_python_symbols(SOURCE) == [
+        ('Spam', SymbolKind.CLASS, 4),
+        ('Spam.eggs', SymbolKind.METHOD, 5),
+        ('Spam.eggs.inner', SymbolKind.FUNCTION, 6),
+        ('Spam.ham', SymbolKind.METHOD, 9),
+        ('sausage', SymbolKind.FUNCTION, 13),
+        ('sausage', SymbolKind.FUNCTION, 17),
+    ]
+    assert get_python_symbols('def spam(:\n') == []
+
+
+def test_build(project):
+    """Check the files and symbols found when building the index."""
+    index = get_index(project)
+    assert index.get_paths() == [
+        osp.join(str(project), 'pkg', 'bacon.py'),
+        osp.join(str(project), 'pkg', 'notes.txt'),
+        osp.join(str(project), 'spam.py'),
+    ]
+
+    assert index.search_paths('bcn', 5) == [
+        osp.join(str(project), 'pkg', 'bacon.py')
+    ]
+    assert index.search_paths('', 1) == index.get_paths()[:1]
+
+    assert index.search_symbols('bacon', 5) == [
+        (osp.join(str(project), 'pkg', 'bacon.py'), 'bacon',
+         SymbolKind.FUNCTION, 1)
+    ]
+    assert [s[1] for s in index.search_symbols('egs', 5)] == [
+        'Spam.eggs', 'Spam.eggs.inner'
+    ]
+    assert index.search_symbols('hidden', 5) == []
+
+
+def test_updates(project):
+    """Check that the index follows the changes reported by the watcher."""
+    index = get_index(project)
+    root = str(project)
+
+    # Created files are found right away but only parsed when updating
+    new_file = project / 'pkg' / 'toast.py'
+    new_file.write_text('class Toast:\n    pass\n')
+    index.add_path(str(new_file))
+    assert str(new_file) in index.get_paths()
+    assert index.search_symbols('toast', 5) == []
+    index.update()
+    assert index.search_symbols('toast', 5) == [
+        (str(new_file), 'Toast', SymbolKind.CLASS, 1)
+    ]
+
+    # Modified files are parsed again
+    new_file.write_text('\nclass Toast:\n    pass\n')
+    index.update_path(str(new_file))
+    assert index.search_symbols('toast', 5)[0][-1] == 1
+    index.update()
+    assert index.search_symbols('toast', 5)[0][-1] == 2
+
+    # Created directories are walked when updating
+    (project / 'sub').mkdir()
+    (project / 'sub' / 'beans.py').write_text('def beans(): pass\n')
+    index.add_path(str(project / 'sub'), is_dir=True)
+    assert index.search_paths('beans', 5) == []
+    index.update()
+    assert index.search_paths('beans', 5) == [
+        osp.join(root, 'sub', 'beans.py')
+    ]
+
+    # Files in ignored directories are not added
+    index.add_path(osp.join(root, '.git', 'other.py'))
+    index.add_path(osp.join(root, 'build'), is_dir=True)
+    index.update()
+    assert len(index.get_paths()) == 5
+
+    # Moved directories keep their files
+    os.rename(project / 'sub', project / 'other')
+    index.move_path(
+        str(project / 'sub'), str(project / 'other'), is_dir=True
+    )
+    index.update()
+    assert index.search_symbols('beans', 5) == [
+        (osp.join(root, 'other', 'beans.py'), 'beans',
+         SymbolKind.FUNCTION, 1)
+    ]
+
+    # Moved files
+    index.move_path(str(new_file), osp.join(root, 'toast.py'))
+    assert osp.join(root, 'toast.py') in index.get_paths()
+    assert str(new_file) not in index.get_paths()
+
+    # Deleted files and directories
+    index.remove_path(osp.join(root, 'toast.py'))
+    index.remove_path(str(project / 'pkg'), is_dir=True)
+    assert index.get_paths() == [
+        osp.join(root, 'other', 'beans.py'),
+        osp.join(root, 'spam.py'),
+    ]
+
+
+def test_updates_while_building(project):
+    """Check that changes reported while building are applied after it."""
+    index = ProjectIndex(str(project))
+    walk = index._walk
+
+    def slow_walk(directory):
+        for entry in walk(directory):
+            # Report a deletion while the directory is walked
+            index.remove_path(str(project / 'spam.py'))
+            yield entry
+
+    index._walk = slow_walk
+    index.build()
+    assert str(project / 'spam.py') not in index.get_paths()
+    assert index.search_symbols('spam', 5) == []
+
+    # Also while updating
+    (project / 'sub').mkdir()
+    (project / 'sub' / 'beans.py').write_text('def beans(): pass\n')
+    index.add_path(str(project / 'sub'), is_dir=True)
+
+    def removing_walk(directory):
+        for entry in walk(directory):
+            index.remove_path(str(project / 'sub'), is_dir=True)
+            yield entry
+
+    index._walk = removing_walk
+    index.update()
+    assert str(project / 'sub' / 'beans.py') not in index.get_paths()
+
+
+def test_index_thread(project, qtbot):
+    """Check that the index is updated in its thread after building it."""
+    index = ProjectIndex(str(project))
+    thread = ProjectIndexThread(None, index)
+    with qtbot.waitSignal(thread.sig_finished, timeout=5000):
+        thread.start()
+
+    (project / 'sub').mkdir()
+    (project / 'sub' / 'beans.py').write_text('def beans(): pass\n')
+    index.add_path(str(project / 'sub'), is_dir=True)
+    qtbot.waitUntil(
+        lambda: index.search_symbols('beans', 5) == [
+            (str(project / 'sub' / 'beans.py'), 'beans',
+             SymbolKind.FUNCTION, 1)
+        ],
+        timeout=5000
+    )
+
+    thread.stop()
+    assert thread.wait(5000)
+
+
+@pytest.mark.slow
+def test_search_benchmark(tmp_path):
+    """Check searching a large project is fast."""
+    for i in range(200):
+        directory = tmp_path / f'package{i}'
+        directory.mkdir()
+        for j in range(100):
+            (directory / f'module{j}.py').write_text(
+                f'class Class{j}:\n    def method{i}(self): pass\n'
+            )
+
+    index = ProjectIndex(str(tmp_path))
+    t0 = time.time()
+    index.build()
+    build_time = time.time() - t0
+
+    path_queries = ['m', 'mod', 'module', 'module9', 'pkg9mod']
+    symbol_queries = ['c', 'cl', 'class', 'class9', 'method19']
+    t0 = time.time()
+    for query in path_queries:
+        index.search_paths(query, 50)
+    for query in symbol_queries:
+        index.search_symbols(query, 50)
+    n_queries = len(path_queries) + len(symbol_queries)
+    search_time = (time.time() - t0) / n_queries
+
+    print(f'Build: {build_time:.2f}s, search: {search_time:.3f}s per query')
+    assert len(index.get_paths()) == 20000
+
+    # Searches don't walk the project again
+    assert search_time < build_time / 2
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for the project watcher.
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import sys
+
+# Third party imports
+import pytest
+from watchdog.observers.polling import PollingObserverVFS
+
+# Local imports
+from spyder.plugins.projects.utils.watcher import (
+    coalesce_events, IgnoreFilter, WorkspaceEventKind, WorkspaceWatcher)
+
+
+Created = WorkspaceEventKind.Created
+Deleted = WorkspaceEventKind.Deleted
+Modified = WorkspaceEventKind.Modified
+Moved = WorkspaceEventKind.Moved
+
+
+@pytest.fixture
+def watcher(qtbot, request, tmp_path):
+    """Start a watcher for a temporary folder."""
+    watcher = WorkspaceWatcher(native=request.param)
+    watcher.start(str(tmp_path))
+    yield watcher
+    watcher.stop()
+
+
+def test_coalesce_events():
+    """Check that events for the same paths are merged."""
+    events = [
+        (Created, 'a', None, False),
+        (Modified, 'a', None, False),
+        (Modified, 'b', None, False),
+        (Deleted, 'b', None, False),
+        (Created, 'c', None, False),
+        (Deleted, 'c', None, False),
+        (Deleted, 'd', None, False),
+        (Created, 'd', None, False),
+        (Modified, 'e', None, False),
+        (Moved, 'f', 'g', True),
+        (Modified, 'e', None, False),
+        (Deleted, 'h', None, False),
+        (Created, 'h', None, True),
+    ]
+    assert coalesce_events(events) == [
+        (Created, 'a', None, False),
+        (Deleted, 'b', None, False),
+        (Modified, 'd', None, False),
+        (Modified, 'e', None, False),
+        (Moved, 'f', 'g', True),
+        (Modified, 'e', None, False),
+        (Deleted, 'h', None, False),
+        (Created, 'h', None, True),
+    ]
+
+
+def test_ignore_filter(tmp_path):
+    """Check the paths that are ignored in a folder."""
+    root = tmp_path / '.hidden' / 'project'
+    ignore = IgnoreFilter(str(root), ['.*', 'build', '*.egg-info'])
+
+    # The folder itself is not ignored, even if it's in a hidden one
+    assert not ignore(str(root))
+    assert not ignore(str(root / 'spam.py'))
+    assert not ignore(str(root / 'builder' / 'spam.py'))
+    assert ignore(str(root / '.git'))
+    assert ignore(str(root / '.git' / 'config'))
+    assert ignore(str(root / 'build' / 'spam.py'))
+    assert ignore(str(root / 'spam.egg-info' / 'PKG-INFO'))
+
+    # Nothing is ignored without patterns
+    assert not IgnoreFilter(str(root), [])(str(root / '.git'))
+
+
+@pytest.mark.parametrize('watcher', [True, False], indirect=True)
+def test_watcher_coalesces_events(watcher, qtbot, tmp_path):
+    """Check that many changes are reported together."""
+    if watcher.native and sys.platform.startswith('linux'):
+        assert not isinstance(watcher.observer, PollingObserverVFS)
+    else:
+        assert isinstance(watcher.observer, PollingObserverVFS)
+
+    # Let the polling observer take its first snapshot
+    qtbot.wait(1500)
+
+    batches = []
+    watcher.sig_files_changed.connect(batches.append)
+
+    for i in range(100):
+        (tmp_path / f'spam{i}.py').write_text('spam')
+    (tmp_path / '.git').mkdir()
+    (tmp_path / '.git' / 'ham.py').write_text('ham')
+    (tmp_path / 'eggs.png').write_bytes(b'')
+
+    def all_created():
+        created = {
+            path for batch in batches
+            for kind, path, __, __ in batch if kind == Created
+        }
+        return len(created) == 100
+
+    qtbot.waitUntil(all_created, timeout=10000)
+    qtbot.wait(1500)
+
+    # Events come in a few batches instead of one by one
+    assert len(batches) < 10
+
+    # Ignored folders and non-editable files are not reported
+    paths = [path for batch in batches for __, path, __, __ in batch]
+    assert not any('.git' in path for path in paths)
+    assert not any(path.endswith('.png') for path in paths)
+
+    # Files created and modified in the same batch are only created
+    for batch in batches:
+        created = {path for kind, path, __, __ in batch if kind == Created}
+        modified = {path for kind, path, __, __ in batch if kind == Modified}
+        assert not created & modified
+
+    # Moves are reported with both paths
+    batches.clear()
+    os.rename(tmp_path / 'spam0.py', tmp_path / 'sausage.py')
+    qtbot.waitUntil(lambda: len(batches) > 0, timeout=5000)
+    assert (
+        Moved,
+        osp.join(str(tmp_path), 'spam0.py'),
+        osp.join(str(tmp_path), 'sausage.py'),
+        False
+    ) in batches[0]
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
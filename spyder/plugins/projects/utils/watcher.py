@@ -7,15 +7,19 @@
 """Watcher to detect filesystem changes in the project's directory."""
 
 # Standard lib imports
-import os
+import fnmatch
 import logging
-from pathlib import Path
+import os
+import os.path as osp
+import re
+import sys
 
 # Third-party imports
-from qtpy.QtCore import QObject, Signal
-from superqt.utils import qthrottled
+from qtpy.QtCore import QObject, QTimer, Signal
 import watchdog
-from watchdog.events import FileSystemEventHandler, PatternMatchingEventHandler
+from watchdog.events import (
+    DirCreatedEvent, DirDeletedEvent, EVENT_TYPE_MOVED, FileCreatedEvent,
+    FileDeletedEvent, FileSystemEventHandler)
 from watchdog.observers.polling import PollingObserverVFS
 
 # Local imports
@@ -31,6 +35,49 @@
     "build",
 ]
 
+# Hidden files and folders (e.g. .git) and the folders above
+IGNORE_PATTERNS = [".*"] + FOLDERS_TO_IGNORE
+
+# Time to collect events before reporting them, in ms
+COALESCE_TIMEOUT = 200
+
+# Names of the files that can be opened in the editor. This is much faster
+# than matching the extensions one by one.
+EDITABLE_FILES_RE = re.compile(
+    '|'.join(fnmatch.translate(f"*{ext}") for ext in EDIT_EXTENSIONS),
+    re.IGNORECASE
+)
+
+
+class WorkspaceEventKind:
+    Created = "created"
+    Deleted = "deleted"
+    Modified = "modified"
+    Moved = "moved"
+
+
+# Kind of an event for a path that follows another one for it. None means
+# that both are dropped.
+_MERGED_KINDS = {
+    (WorkspaceEventKind.Created, WorkspaceEventKind.Created):
+        WorkspaceEventKind.Created,
+    (WorkspaceEventKind.Created, WorkspaceEventKind.Modified):
+        WorkspaceEventKind.Created,
+    (WorkspaceEventKind.Created, WorkspaceEventKind.Deleted): None,
+    (WorkspaceEventKind.Modified, WorkspaceEventKind.Created):
+        WorkspaceEventKind.Modified,
+    (WorkspaceEventKind.Modified, WorkspaceEventKind.Modified):
+        WorkspaceEventKind.Modified,
+    (WorkspaceEventKind.Modified, WorkspaceEventKind.Deleted):
+        WorkspaceEventKind.Deleted,
+    (WorkspaceEventKind.Deleted, WorkspaceEventKind.Created):
+        WorkspaceEventKind.Modified,
+    (WorkspaceEventKind.Deleted, WorkspaceEventKind.Modified):
+        WorkspaceEventKind.Modified,
+    (WorkspaceEventKind.Deleted, WorkspaceEventKind.Deleted):
+        WorkspaceEventKind.Deleted,
+}
+
 
 # ---- Monkey patches
 # -----------------------------------------------------------------------------
@@ -62,43 +109,116 @@ def run_wrapper(self):
 
 # ---- Auxiliary functions
 # -----------------------------------------------------------------------------
-def ignore_entry(entry: os.DirEntry) -> bool:
-    """Check if an entry should be ignored."""
-    parts = Path(entry.path).parts
-
-    # Ignore files in hidden directories (e.g. .git)
-    if any([p.startswith(".") for p in parts]):
-        return True
-
-    # Ignore specific folders
-    for folder in FOLDERS_TO_IGNORE:
-        if folder in parts:
-            return True
-
-    return False
+def is_editable_path(path: str) -> bool:
+    """Check if a file can be opened in the editor, given its path."""
+    return EDITABLE_FILES_RE.match(osp.basename(os.fsdecode(path))) is not None
 
 
 def editable_file(entry: os.DirEntry) -> bool:
     """Check if an entry file is editable."""
     if entry.is_file():
-        return (os.path.splitext(entry.path)[1] in EDIT_EXTENSIONS)
+        return is_editable_path(entry.name)
     return True
 
 
-def filter_scandir(path):
+def coalesce_events(events):
     """
-    Filter entries from os.scandir that we're not interested in tracking in the
-    observer.
+    Merge the events reported for the same paths.
+
+    Parameters
+    ----------
+    events: list
+        (kind, src_path, dest_path, is_dir) tuples, in the order they were
+        reported. `kind` is one of `WorkspaceEventKind` and `dest_path` is
+        only set for moves.
+
+    Returns
+    -------
+    list
+        Events with a single entry per path between moves. For instance, a
+        file that is deleted and created again is reported as modified and
+        a file that is created and deleted is not reported at all.
     """
-    return (
-        entry for entry in os.scandir(path)
-        if (not ignore_entry(entry) and editable_file(entry))
-    )
+    coalesced = []
+    pending = {}
+
+    for kind, src_path, dest_path, is_dir in events:
+        if kind == WorkspaceEventKind.Moved:
+            # Moves are not merged, so that the paths of moved directories
+            # can be updated without walking them again.
+            coalesced.extend(pending.values())
+            pending = {}
+            coalesced.append((kind, src_path, dest_path, is_dir))
+            continue
+
+        key = (src_path, is_dir)
+        previous = pending.get(key)
+        if previous is not None:
+            kind = _MERGED_KINDS[(previous[0], kind)]
+            if kind is None:
+                del pending[key]
+                continue
+
+        pending[key] = (kind, src_path, None, is_dir)
+
+    coalesced.extend(pending.values())
+    return coalesced
+
+
+# ---- Ignore filter
+# -----------------------------------------------------------------------------
+class IgnoreFilter:
+    """
+    Check if paths inside a folder match patterns that should be ignored.
+
+    Patterns are shell-style wildcards (see `fnmatch`) that are matched with
+    the names of the files and folders in the path, relative to the folder.
+    """
+
+    def __init__(self, root_path, patterns=None):
+        self.root_path = osp.normpath(root_path)
+        self.patterns = IGNORE_PATTERNS if patterns is None else patterns
+
+        if self.patterns:
+            self._regex = re.compile(
+                '|'.join(fnmatch.translate(p) for p in self.patterns)
+            )
+        else:
+            self._regex = None
+
+    def __call__(self, path: str) -> bool:
+        """Check if path should be ignored."""
+        if self._regex is None:
+            return False
+
+        path = osp.normpath(os.fsdecode(path))
+        if path.startswith(self.root_path + os.sep):
+            path = path[len(self.root_path) + 1:]
+        elif path == self.root_path:
+            return False
+
+        return any(self.match_name(name) for name in path.split(os.sep))
+
+    def match_name(self, name: str) -> bool:
+        """Check if a file or folder name matches one of the patterns."""
+        return (
+            self._regex is not None and self._regex.match(name) is not None
+        )
+
+    def scandir(self, path):
+        """
+        Filter entries from os.scandir that we're not interested in tracking
+        in the observer.
+        """
+        return (
+            entry for entry in os.scandir(path)
+            if not self(entry.path) and editable_file(entry)
+        )
 
 
 # ---- Event handler
 # -----------------------------------------------------------------------------
-class WorkspaceEventHandler(QObject, PatternMatchingEventHandler):
+class WorkspaceEventHandler(QObject, FileSystemEventHandler):
     """
     Event handler for watchdog notifications.
 
@@ -111,12 +231,14 @@ class WorkspaceEventHandler(QObject, PatternMatchingEventHandler):
     sig_file_deleted = Signal(str, bool)
     sig_file_modified = Signal(str, bool)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, ignore=None):
         QObject.__init__(self, parent)
-        PatternMatchingEventHandler.__init__(
-            self,
-            patterns=[f"*{ext}" for ext in EDIT_EXTENSIONS],
-        )
+        FileSystemEventHandler.__init__(self)
+
+        # IgnoreFilter for the watched folder. Native observers report
+        # events for all files, so they are ignored here instead of when
+        # listing folders.
+        self.ignore = ignore
 
     def fmt_is_dir(self, is_dir):
         return 'directory' if is_dir else 'file'
@@ -151,12 +273,42 @@ def on_modified(self, event):
         self.sig_file_modified.emit(src_path, is_dir)
 
     def dispatch(self, event):
-        # Don't apply patterns to directories, only to files
-        if event.is_directory:
-            FileSystemEventHandler.dispatch(self, event)
-        else:
+        if self.ignore is not None:
+            event = self._filter_event(event)
+            if event is None:
+                return
+
+        # Only report events of editable files, but of all directories
+        if (
+            event.is_directory
+            or is_editable_path(event.src_path)
+            or event.dest_path and is_editable_path(event.dest_path)
+        ):
             super().dispatch(event)
 
+    def _filter_event(self, event):
+        """Return the part of event that is not ignored, if any."""
+        src_ignored = self.ignore(event.src_path)
+        if event.event_type != EVENT_TYPE_MOVED:
+            return None if src_ignored else event
+
+        dest_ignored = self.ignore(event.dest_path)
+        if src_ignored and dest_ignored:
+            return None
+        elif src_ignored:
+            # Moved from an ignored folder, so it's new for us
+            event_class = (
+                DirCreatedEvent if event.is_directory else FileCreatedEvent
+            )
+            return event_class(event.dest_path)
+        elif dest_ignored:
+            event_class = (
+                DirDeletedEvent if event.is_directory else FileDeletedEvent
+            )
+            return event_class(event.src_path)
+
+        return event
+
 
 # ---- Watcher
 # -----------------------------------------------------------------------------
@@ -164,42 +316,91 @@ class WorkspaceWatcher(QObject):
     """
     Wrapper class around watchdog observer and notifier.
 
-    It provides methods to start and stop watching folders.
+    It provides methods to start and stop watching folders. Events are
+    collected for `COALESCE_TIMEOUT` ms and reported together, so that many
+    changes at once (e.g. when switching git branches) don't need to be
+    processed one by one.
     """
 
     observer = None
 
-    sig_file_moved = Signal(str, str, bool)
-    sig_file_created = Signal(str, bool)
-    sig_file_deleted = Signal(str, bool)
-    sig_file_modified = Signal(str, bool)
+    sig_files_changed = Signal(list)
+    """
+    This signal is emitted when files or folders were created, deleted,
+    modified or moved.
+
+    Parameters
+    ----------
+    events: list
+        (kind, src_path, dest_path, is_dir) tuples, as returned by
+        `coalesce_events`.
+    """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, native=True, ignore_patterns=None):
+        """
+        Parameters
+        ----------
+        native: bool, optional
+            Whether to use the OS-based observer on Linux (i.e. inotify)
+            instead of polling the watched folder.
+        ignore_patterns: list, optional
+            Patterns of the files and folders that are not watched. By
+            default, `IGNORE_PATTERNS`.
+        """
         super().__init__(parent)
-        self.event_handler = WorkspaceEventHandler(self)
+        self.native = native
+        self.ignore_patterns = (
+            IGNORE_PATTERNS if ignore_patterns is None else ignore_patterns
+        )
 
+        self.event_handler = WorkspaceEventHandler(self)
         self.event_handler.sig_file_moved.connect(self.on_moved)
         self.event_handler.sig_file_created.connect(self.on_created)
         self.event_handler.sig_file_deleted.connect(self.on_deleted)
         self.event_handler.sig_file_modified.connect(self.on_modified)
 
+        self._events = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(COALESCE_TIMEOUT)
+        self._timer.timeout.connect(self._emit_events)
+
     def connect_signals(self, project):
-        self.sig_file_created.connect(project.file_created)
-        self.sig_file_moved.connect(project.file_moved)
-        self.sig_file_deleted.connect(project.file_deleted)
-        self.sig_file_modified.connect(project.file_modified)
+        self.sig_files_changed.connect(project.files_changed)
 
     def start(self, workspace_folder):
-        # We use a polling observer because:
-        # * It doesn't introduce long freezes on Linux when switching git
-        #   branches that have many changes between them. That's because the
-        #   OS-based observer (i.e. inotify) generates way too many events.
+        ignore = IgnoreFilter(workspace_folder, self.ignore_patterns)
+        self.event_handler.ignore = ignore
+
+        # We use a native observer only on Linux because:
         # * The OS-based observer on Windows has many shortcomings (see
         #   openmsi/openmsistream#56).
         # * There doesn't seem to be issues on Mac, but it's simpler to use a
-        #   single observer for all OSes.
+        #   single observer for the other OSes.
+        # Inotify generates way too many events when switching git branches
+        # with many changes between them, but they are coalesced before
+        # they're processed.
+        if self.native and sys.platform.startswith('linux'):
+            try:
+                from watchdog.observers.inotify import InotifyObserver
+                observer = InotifyObserver()
+                observer.schedule(
+                    self.event_handler, workspace_folder, recursive=True
+                )
+                observer.start()
+            except Exception:
+                # This happens e.g. when the inotify watches limit is
+                # reached for a large project.
+                logger.debug(
+                    f"Native observer could not be started for: "
+                    f"{workspace_folder}. Using a polling one instead."
+                )
+            else:
+                self.observer = observer
+                return
+
         self.observer = PollingObserverVFS(
-            stat=os.stat, listdir=filter_scandir
+            stat=os.stat, listdir=ignore.scandir
         )
 
         self.observer.schedule(
@@ -214,6 +415,9 @@ def start(self, workspace_folder):
             )
 
     def stop(self):
+        self._timer.stop()
+        self._events = []
+
         if self.observer is not None:
             # This is required to avoid showing an error when closing
             # projects.
@@ -226,18 +430,27 @@ def stop(self):
             except RuntimeError:
                 pass
 
-    @qthrottled(timeout=200)
     def on_moved(self, src_path, dest_path, is_dir):
-        self.sig_file_moved.emit(src_path, dest_path, is_dir)
+        self._add_event(WorkspaceEventKind.Moved, src_path, dest_path, is_dir)
 
-    @qthrottled(timeout=200)
     def on_created(self, path, is_dir):
-        self.sig_file_created.emit(path, is_dir)
+        self._add_event(WorkspaceEventKind.Created, path, None, is_dir)
 
-    @qthrottled(timeout=200)
     def on_deleted(self, path, is_dir):
-        self.sig_file_deleted.emit(path, is_dir)
+        self._add_event(WorkspaceEventKind.Deleted, path, None, is_dir)
 
-    @qthrottled(timeout=200)
     def on_modified(self, path, is_dir):
-        self.sig_file_modified.emit(path, is_dir)
+        self._add_event(WorkspaceEventKind.Modified, path, None, is_dir)
+
+    def _add_event(self, kind, src_path, dest_path, is_dir):
+        """Save an event to report it with the next ones."""
+        self._events.append((kind, src_path, dest_path, is_dir))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _emit_events(self):
+        """Report the events saved since the last time."""
+        events = coalesce_events(self._events)
+        self._events = []
+        if events:
+            self.sig_files_changed.emit(events)
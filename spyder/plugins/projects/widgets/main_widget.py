@@ -31,17 +31,20 @@
     get_home_dir, get_project_config_folder, running_under_pytest)
 from spyder.config.utils import EDIT_EXTENSIONS
 from spyder.plugins.completion.api import (
-    CompletionRequestTypes, FileChangeType)
+    CompletionRequestTypes, FileChangeType, SYMBOL_KIND_ICON)
 from spyder.plugins.completion.decorators import (
     class_register, handles, request)
 from spyder.plugins.explorer.api import DirViewActions
 from spyder.plugins.projects.api import (
     BaseProjectType, EmptyProject, WORKSPACE)
-from spyder.plugins.projects.utils.watcher import WorkspaceWatcher
+from spyder.plugins.projects.utils.index import (
+    ProjectIndex, ProjectIndexThread)
+from spyder.plugins.projects.utils.watcher import (
+    WorkspaceEventKind, WorkspaceWatcher)
 from spyder.plugins.projects.widgets.projectdialog import ProjectDialog
 from spyder.plugins.projects.widgets.projectexplorer import (
     ProjectExplorerTreeWidget)
-from spyder.plugins.switcher.utils import get_file_icon, shorten_paths
+from spyder.plugins.switcher.utils import get_file_icons, shorten_paths
 from spyder.utils import encoding
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.programs import find_program
@@ -98,6 +101,7 @@ class ProjectExplorerWidget(PluginMainWidget):
     # ---- Constants
     # -------------------------------------------------------------------------
     MAX_SWITCHER_RESULTS = 50
+    SYMBOL_SWITCHER_MODE = '#'
 
     # ---- Signals
     # -------------------------------------------------------------------------
@@ -111,6 +115,19 @@ class ProjectExplorerWidget(PluginMainWidget):
         The path to the requested file.
     """
 
+    sig_open_file_at_line_requested = Signal(str, int)
+    """
+    This signal is emitted when a file is requested to be opened at a given
+    line.
+
+    Parameters
+    ----------
+    filename: str
+        The path to the requested file.
+    line_number: int
+        The line to go to.
+    """
+
     sig_project_created = Signal(str, str)
     """
     This signal is emitted to request the Projects plugin the creation of a
@@ -147,6 +164,18 @@ class ProjectExplorerWidget(PluginMainWidget):
         between projects (signature 2).
     """
 
+    sig_project_files_changed = Signal(list)
+    """
+    This signal is emitted when files or directories of the current project
+    are created, modified, moved or deleted.
+
+    Parameters
+    ----------
+    paths: list
+        Paths that changed. For moves, both the source and destination paths
+        are included.
+    """
+
     sig_save_open_files_requested = Signal()
     """
     This signal is emitted to request saving the list of open files in the
@@ -186,6 +215,8 @@ def __init__(self, name, plugin, parent=None):
         self.completions_available = False
         self._fzf = find_program('fzf')
         self._default_switcher_paths = []
+        self._index = None
+        self._index_thread = None
 
         # -- Tree widget
         self.treewidget = ProjectExplorerTreeWidget(self, self.show_hscrollbar)
@@ -196,7 +227,11 @@ def __init__(self, name, plugin, parent=None):
         self.set_content_widget(self.treewidget)
 
         # -- Watcher
-        self.watcher = WorkspaceWatcher(self)
+        self.watcher = WorkspaceWatcher(
+            self,
+            native=self.get_conf('native_file_watcher'),
+            ignore_patterns=self.get_conf('watcher_ignore_patterns'),
+        )
         self.watcher.connect_signals(self)
 
         # -- Worker manager for calls to fzf
@@ -213,6 +248,7 @@ def __init__(self, name, plugin, parent=None):
 
         # Clear saved paths for the switcher when closing the project.
         self.sig_project_closed.connect(lambda p: self._clear_switcher_paths())
+        self.sig_project_closed.connect(lambda p: self._stop_index())
 
         # -- Layout
         self.setMinimumWidth(200)
@@ -304,6 +340,7 @@ def update_actions(self):
 
     def on_close(self):
         self._worker_manager.terminate_all()
+        self._stop_index()
 
     # ---- Public API
     # -------------------------------------------------------------------------
@@ -422,6 +459,7 @@ def open_project(self, path=None, project_type=None, restart_console=True,
                 self.sig_project_loaded.emit(path)
 
         self.watcher.start(path)
+        self._start_index(path)
 
         if restart_console:
             self.sig_restart_console_requested.emit()
@@ -686,20 +724,50 @@ def handle_switcher_selection(self, item, mode, search_text):
         if item.get_section() != self.get_title():
             return
 
-        # Open file in editor
-        self.sig_open_file_requested.emit(item.get_data())
+        data = item.get_data()
+        if mode == self.SYMBOL_SWITCHER_MODE:
+            self.sig_open_file_at_line_requested.emit(*data)
+        else:
+            # Open file in editor
+            self.sig_open_file_requested.emit(data)
+
+    def display_switcher_symbols(self):
+        """Populate switcher with a default set of symbols in the project."""
+        self.handle_switcher_search('', mode=self.SYMBOL_SWITCHER_MODE)
 
-    def handle_switcher_search(self, search_text):
+    def handle_switcher_search(self, search_text, mode=''):
         """
         Handle user typing in switcher to filter results.
 
         Load switcher results when a search text is typed for projects.
+
         Parameters
         ----------
-        text: str
+        search_text: str
             The current search text in the switcher dialog box.
+        mode: str, optional
+            The current selected mode (files "" or project symbols "#").
         """
-        self._call_fzf(search_text)
+        if self._index is None or not self._index.is_ready():
+            if mode == '':
+                self._call_fzf(search_text)
+            return
+
+        if not self.get_conf("search_files_in_switcher"):
+            return
+
+        if mode == self.SYMBOL_SWITCHER_MODE:
+            symbols = self._index.search_symbols(
+                search_text, self.MAX_SWITCHER_RESULTS
+            )
+            self._display_symbols_in_switcher(symbols)
+        elif mode == '':
+            paths = self._index.search_paths(
+                search_text, self.MAX_SWITCHER_RESULTS
+            )
+            self._display_paths_in_switcher(
+                paths, setup=True, clear_section=True
+            )
 
     # ---- Public API for the LSP
     # -------------------------------------------------------------------------
@@ -730,83 +798,74 @@ def handle_response(self, method, params):
 
     @request(method=CompletionRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
              requires_response=False)
-    @Slot(str, bool)
-    def file_created(self, src_file, is_dir):
-        """Notify LSP server about file creation."""
-        self._update_default_switcher_paths()
-
-        # LSP specification only considers file updates
-        if is_dir:
-            return
+    @Slot(list)
+    def files_changed(self, events):
+        """
+        Notify LSP server about files that were created, moved, deleted or
+        modified.
 
-        params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.CREATED
-            }]
-        }
-        return params
+        Parameters
+        ----------
+        events: list
+            (kind, src_path, dest_path, is_dir) tuples, as reported by the
+            project watcher.
+        """
+        paths = []
+        entries = []
+        update_switcher = False
+
+        for kind, src_file, dest_file, is_dir in events:
+            paths.append(src_file)
+
+            if kind == WorkspaceEventKind.Moved:
+                paths.append(dest_file)
+                if self._index is not None:
+                    self._index.move_path(src_file, dest_file, is_dir)
+                update_switcher = True
+
+                # LSP specification only considers file updates
+                if not is_dir:
+                    entries.append(
+                        {'file': dest_file, 'kind': FileChangeType.CREATED}
+                    )
+                    entries.append(
+                        {'file': src_file, 'kind': FileChangeType.DELETED}
+                    )
+            elif kind == WorkspaceEventKind.Created:
+                if self._index is not None:
+                    self._index.add_path(src_file, is_dir)
+                update_switcher = True
+                if not is_dir:
+                    entries.append(
+                        {'file': src_file, 'kind': FileChangeType.CREATED}
+                    )
+            elif kind == WorkspaceEventKind.Deleted:
+                if self._index is not None:
+                    self._index.remove_path(src_file, is_dir)
+                update_switcher = True
+                if not is_dir:
+                    entries.append(
+                        {'file': src_file, 'kind': FileChangeType.DELETED}
+                    )
+            elif not is_dir:
+                if self._index is not None:
+                    self._index.update_path(src_file)
+                entries.append(
+                    {'file': src_file, 'kind': FileChangeType.CHANGED}
+                )
 
-    @Slot(str, str, bool)
-    @request(method=CompletionRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    def file_moved(self, src_file, dest_file, is_dir):
-        """Notify LSP server about a file that is moved."""
-        self._update_default_switcher_paths()
+        self.sig_project_files_changed.emit(paths)
+        if update_switcher:
+            self._update_default_switcher_paths()
 
-        if is_dir:
+        if not entries:
             return
 
-        deletion_entry = {
-            'file': src_file,
-            'kind': FileChangeType.DELETED
-        }
-
-        addition_entry = {
-            'file': dest_file,
-            'kind': FileChangeType.CREATED
-        }
-
-        entries = [addition_entry, deletion_entry]
         params = {
             'params': entries
         }
         return params
 
-    @request(method=CompletionRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    @Slot(str, bool)
-    def file_deleted(self, src_file, is_dir):
-        """Notify LSP server about file deletion."""
-        self._update_default_switcher_paths()
-
-        if is_dir:
-            return
-
-        params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.DELETED
-            }]
-        }
-        return params
-
-    @request(method=CompletionRequestTypes.WORKSPACE_WATCHED_FILES_UPDATE,
-             requires_response=False)
-    @Slot(str, bool)
-    def file_modified(self, src_file, is_dir):
-        """Notify LSP server about file modification."""
-        if is_dir:
-            return
-
-        params = {
-            'params': [{
-                'file': src_file,
-                'kind': FileChangeType.CHANGED
-            }]
-        }
-        return params
-
     @request(method=CompletionRequestTypes.WORKSPACE_FOLDERS_CHANGE,
              requires_response=False)
     def notify_project_open(self, path):
@@ -1119,12 +1178,14 @@ def _convert_paths_to_switcher_items(self, paths):
 
         is_unsaved = [False] * len(paths)
         short_paths = shorten_paths(paths, is_unsaved)
+        icons = get_file_icons(paths)
         section = self.get_title()
 
         items = []
-        for i, (path, short_path) in enumerate(zip(paths, short_paths)):
+        for i, (path, short_path, icon) in enumerate(
+            zip(paths, short_paths, icons)
+        ):
             title = osp.basename(path)
-            icon = get_file_icon(path)
             description = osp.dirname(path)
             if len(path) > 75:
                 description = short_path
@@ -1145,6 +1206,27 @@ def _display_paths_in_switcher(self, paths, setup, clear_section):
         # because it's faster.
         self._plugin._display_items_in_switcher(items, setup, clear_section)
 
+    def _display_symbols_in_switcher(self, symbols):
+        """
+        Display a list of symbols, as returned by
+        `ProjectIndex.search_symbols`, in the switcher.
+        """
+        project_path = self.get_active_project_path()
+        section = self.get_title()
+
+        items = []
+        for i, (path, name, kind, line) in enumerate(symbols):
+            icon = self.create_icon(SYMBOL_KIND_ICON.get(kind, 'no_match'))
+            description = f"{osp.relpath(path, project_path)}:{line}"
+            is_last_item = (i + 1 == len(symbols))
+            items.append(
+                (name, description, icon, section, (path, line), is_last_item)
+            )
+
+        self._plugin._display_items_in_switcher(
+            items, setup=True, clear_section=True
+        )
+
     def _clear_switcher_paths(self):
         """Clear saved switcher results."""
         self._default_switcher_paths = []
@@ -1152,7 +1234,56 @@ def _clear_switcher_paths(self):
     def _update_default_switcher_paths(self):
         """Update default paths to be shown in the switcher."""
         self._default_switcher_paths = []
-        self._call_fzf()
+        if self._index is not None and self._index.is_ready():
+            if self.get_conf("search_files_in_switcher"):
+                self._default_switcher_paths = self._index.search_paths(
+                    '', self.MAX_SWITCHER_RESULTS
+                )
+        else:
+            self._call_fzf()
+
+    def _start_index(self, path):
+        """
+        Build the index of the project files in a thread, which then keeps
+        it updated with the changes found by the watcher.
+
+        Switcher searches use it when it's ready instead of walking the
+        project directory with fzf.
+        """
+        self._stop_index()
+        self._index = ProjectIndex(
+            path, ignore_patterns=self.watcher.ignore_patterns
+        )
+        self._index_thread = ProjectIndexThread(self, self._index)
+        self._index_thread.sig_finished.connect(
+            self._update_default_switcher_paths
+        )
+        self._index_thread.start()
+
+    def _stop_index(self):
+        """Stop building or updating the project index and discard it."""
+        if self._index_thread is not None:
+            self._index_thread.sig_finished.disconnect(
+                self._update_default_switcher_paths
+            )
+            self._index_thread.stop()
+            self._index_thread.wait()
+            self._index_thread = None
+        self._index = None
+
+    @on_conf_change(option=["native_file_watcher", "watcher_ignore_patterns"])
+    def _on_watcher_options_changed(self, option, value):
+        """Restart the watcher to apply its new options."""
+        if option == "native_file_watcher":
+            self.watcher.native = value
+        else:
+            self.watcher.ignore_patterns = value
+
+        path = self.get_active_project_path()
+        if path is not None:
+            self.watcher.stop()
+            self.watcher.start(path)
+            self._start_index(path)
 
     @on_conf_change(option="search_files_in_switcher")
     def _on_search_files_in_switcher_changed(self, value):
@@ -6,9 +6,18 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+import hashlib
 import json
+import logging
+import posixpath
+import struct
+import time
 import typing
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
 from http import HTTPStatus
 from io import RawIOBase
 
@@ -27,6 +36,145 @@
     from pathlib import Path
 
 
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = 60  # seconds
+CACHE_MAX_SIZE = 1000  # entries
+
+# Length of the JSON header at the start of binary frames
+FRAME_HEADER = struct.Struct("!I")
+
+
+def pack_frame(header: dict, chunks: typing.Sequence[bytes] = ()) -> bytes:
+    """
+    Pack a header and raw data chunks in a binary frame.
+
+    Frames are a 4-byte big-endian length, a JSON header of that length and
+    the chunks, whose sizes are added to the header.
+    """
+    if chunks:
+        header = {**header, "chunks": [len(chunk) for chunk in chunks]}
+    header = json.dumps(header).encode()
+    return b"".join([FRAME_HEADER.pack(len(header)), header, *chunks])
+
+
+def unpack_frame(frame: bytes) -> tuple[dict, list[bytes]]:
+    """Unpack a binary frame into its header and raw data chunks."""
+    (size,) = FRAME_HEADER.unpack_from(frame)
+    start = FRAME_HEADER.size + size
+    header = json.loads(frame[FRAME_HEADER.size:start])
+
+    chunks = []
+    for chunk_size in header.pop("chunks", []):
+        chunks.append(frame[start:start + chunk_size])
+        start += chunk_size
+
+    return header, chunks
+
+
+# Content-defined blocks used to send only the changed parts of files. These
+# must be the same as in the server.
+DELTA_MIN_BLOCK_SIZE = 4096
+DELTA_MAX_BLOCK_SIZE = 65536
+DELTA_BOUNDARY_MASK = 0x3F
+DELTA_BOUNDARY_WINDOW = 32
+
+
+def split_blocks(data: bytes) -> list[int]:
+    """
+    Split data in content-defined blocks and return their sizes.
+
+    Blocks end at a line end after DELTA_MIN_BLOCK_SIZE bytes if the CRC32
+    of the DELTA_BOUNDARY_WINDOW bytes before it has no bits of
+    DELTA_BOUNDARY_MASK set, or after DELTA_MAX_BLOCK_SIZE bytes. Since
+    boundaries only depend on the data around them, inserting or removing
+    data only changes the blocks next to it.
+    """
+    sizes = []
+    size = len(data)
+    start = 0
+    while start < size:
+        limit = min(start + DELTA_MAX_BLOCK_SIZE, size)
+        end = limit
+        pos = start + DELTA_MIN_BLOCK_SIZE - 1
+        while pos < limit:
+            newline = data.find(b"\n", pos, limit)
+            if newline == -1:
+                break
+            cut = newline + 1
+            window = data[max(cut - DELTA_BOUNDARY_WINDOW, 0):cut]
+            if not zlib.crc32(window) & DELTA_BOUNDARY_MASK:
+                end = cut
+                break
+            pos = cut
+
+        sizes.append(end - start)
+        start = end
+
+    return sizes
+
+
+def hash_block(block: bytes) -> str:
+    """Hash a block to find it in another version of a file."""
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+def compute_delta(
+    data: bytes, sizes: list[int], hashes: list[str]
+) -> tuple[list[list], list[bytes]]:
+    """
+    Compute the ops to write data from the blocks of the remote file.
+
+    Parameters
+    ----------
+    data : bytes
+        New contents of the file.
+    sizes : list[int]
+        Sizes of the blocks of the remote file.
+    hashes : list[str]
+        Hashes of the blocks of the remote file.
+
+    Returns
+    -------
+    tuple[list[list], list[bytes]]
+        The ops, ``["copy", offset, length]`` to copy bytes of the remote
+        file or ``["data", index]`` to write a chunk, and the chunks of data
+        that are not in the remote file.
+    """
+    remote_blocks = {}
+    offset = 0
+    for size, block_hash in zip(sizes, hashes):
+        remote_blocks.setdefault((block_hash, size), offset)
+        offset += size
+
+    ops = []
+    chunks = []
+    view = memoryview(data)
+    start = 0
+    for size in split_blocks(data):
+        offset = remote_blocks.get(
+            (hash_block(view[start:start + size]), size)
+        )
+        last = ops[-1] if ops else None
+        if offset is None:
+            if last is not None and last[0] == "data":
+                chunks[-1][1] = start + size
+            else:
+                ops.append(["data", len(chunks)])
+                chunks.append([start, start + size])
+        elif (
+            last is not None
+            and last[0] == "copy"
+            and last[1] + last[2] == offset
+        ):
+            last[2] += size
+        else:
+            ops.append(["copy", offset, size])
+        start += size
+
+    return ops, [data[begin:end] for begin, end in chunks]
+
+
 class RemoteFileServicesError(SpyderRemoteAPIError):
     """
     Exception for errors related to remote file services.
@@ -59,6 +207,121 @@ def __str__(self):
         return super(OSError, self).__str__()
 
 
+class RemoteStaleFileError(RemoteFileServicesError):
+    """
+    Exception for files that changed on the remote server while writing a
+    delta to them.
+    """
+
+
+class RemoteMetadataCache:
+    """
+    Cache of remote file metadata with a time to live and LRU eviction.
+
+    Values are grouped by the directory whose changes make them stale, e.g.
+    the listing of a directory with the directory itself and the info of a
+    file with its parent, so they can be invalidated when a directory
+    changes.
+
+    Parameters
+    ----------
+    ttl : float, optional
+        Seconds after which values are stale, by default CACHE_TTL.
+    max_size : int, optional
+        Maximum number of values, by default CACHE_MAX_SIZE. The least
+        recently used ones are evicted first.
+    on_directory_removed : callable, optional
+        Called with a directory when no values are cached for it anymore.
+    """
+
+    def __init__(
+        self,
+        ttl: float = CACHE_TTL,
+        max_size: int = CACHE_MAX_SIZE,
+        on_directory_removed: typing.Callable[[str], None] | None = None,
+    ):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._on_directory_removed = on_directory_removed
+
+        # Key -> (expiration time, directory, value)
+        self._values = OrderedDict()
+
+        # Directory -> keys of its values
+        self._directories: dict[str, set] = {}
+
+        # Increased on every invalidation, to not cache values requested
+        # before it (see `set`)
+        self.version = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key) -> tuple[bool, typing.Any]:
+        """Return whether key is cached and its value."""
+        try:
+            expiration, __, value = self._values[key]
+        except KeyError:
+            return False, None
+
+        if expiration < time.monotonic():
+            self._remove(key)
+            return False, None
+
+        self._values.move_to_end(key)
+        return True, value
+
+    def set(self, key, directory: str, value, version: int | None = None):
+        """
+        Cache the value of key, which is stale when directory changes.
+
+        If version is given and the cache was invalidated after it, the
+        value is not cached because it could be stale already.
+        """
+        if version is not None and version != self.version:
+            return
+
+        if key in self._values:
+            self._remove(key)
+
+        self._values[key] = (time.monotonic() + self.ttl, directory, value)
+        self._directories.setdefault(directory, set()).add(key)
+
+        while len(self._values) > self.max_size:
+            self._remove(next(iter(self._values)))
+
+    def invalidate(self, directory: str, recursive: bool = False):
+        """Remove the values that are stale when directory changes."""
+        self.version += 1
+        if recursive:
+            prefix = directory.rstrip("/") + "/"
+            directories = [
+                d for d in self._directories
+                if d == directory or d.startswith(prefix)
+            ]
+        else:
+            directories = [directory] if directory in self._directories else []
+
+        for d in directories:
+            for key in list(self._directories.get(d, ())):
+                self._remove(key)
+
+    def clear(self):
+        """Remove all values."""
+        self.version += 1
+        for key in list(self._values):
+            self._remove(key)
+
+    def _remove(self, key):
+        __, directory, __ = self._values.pop(key)
+        keys = self._directories[directory]
+        keys.discard(key)
+        if not keys:
+            del self._directories[directory]
+            if self._on_directory_removed is not None:
+                self._on_directory_removed(directory)
+
+
 @SpyderRemoteAPIManagerBase.register_api
 class SpyderRemoteFileIOAPI(SpyderBaseJupyterAPI, RawIOBase):
     """
@@ -91,6 +354,9 @@ class SpyderRemoteFileIOAPI(SpyderBaseJupyterAPI, RawIOBase):
     encoding : str, optional
         The encoding to use when reading and writing the file, by default
         "utf-8".
+    binary : bool, optional
+        Whether to send file data in binary frames instead of base64 in JSON
+        messages, by default True. It's only used if the server supports it.
 
     Raises
     ------
@@ -109,6 +375,7 @@ def __init__(
         lock=False,
         encoding="utf-8",
         *args,
+        binary=True,
         **kwargs,
     ):
         super().__init__(*args, **kwargs)
@@ -117,9 +384,19 @@ def __init__(
         self.encoding = encoding
         self.atomic = atomic
         self.lock = lock
+        self.binary = binary
 
         self._websocket: aiohttp.ClientWebSocketResponse = None
 
+        # Called when the file is closed
+        self.on_close: typing.Callable[[], None] | None = None
+
+        # Whether the server agreed to use binary frames
+        self._binary = False
+
+        # Whether the server supports delta transfers
+        self._delta = False
+
     async def _raise_for_status(self, response):
         response.raise_for_status()
 
@@ -137,6 +414,7 @@ async def connect(self):
                 "atomic": str(self.atomic).lower(),
                 "lock": str(self.lock).lower(),
                 "encoding": self.encoding,
+                "binary": str(self.binary).lower(),
             },
         )
 
@@ -175,6 +453,11 @@ async def _check_connection(self):
                     [],
                 )
 
+        # Servers that don't support binary frames don't reply with this
+        data = json.loads(status.data)
+        self._binary = self.binary and data.get("binary", False)
+        self._delta = data.get("delta", False)
+
     async def close(self):
         await self._websocket.close()
         try:
@@ -182,6 +465,8 @@ async def close(self):
         except Exception:
             pass
         await super().close()
+        if self.on_close is not None:
+            self.on_close()
 
     @property
     def closed(self):
@@ -207,20 +492,63 @@ def _encode_data(self, data: bytes | str | object) -> str:
             return base64.b64encode(data.encode(self.encoding)).decode("ascii")
         return data
 
+    def _decode_chunk(self, chunk: bytes) -> bytes | str:
+        """Decode a raw data chunk from a binary frame."""
+        if "b" in self.mode:
+            return chunk
+        return chunk.decode(self.encoding)
+
+    def _encode_chunk(self, data: bytes | str) -> bytes:
+        """Encode data as a raw chunk for a binary frame."""
+        if isinstance(data, str):
+            return data.encode(self.encoding)
+        return data
+
     async def _send_request(self, method: str, **args):
         await self._websocket.send_json({"method": method, **args})
 
-    async def _get_response(self, timeout=None):
-        message = json.loads(
-            await self._websocket.receive_bytes(timeout=timeout)
+    async def _send_data_request(
+        self, method: str, payload: str, data: bytes | str | list, **args
+    ):
+        """Send a request with file data in argument payload."""
+        if not self._binary:
+            if isinstance(data, list):
+                encoded = list(map(self._encode_data, data))
+            else:
+                encoded = self._encode_data(data)
+            await self._send_request(method, **{payload: encoded}, **args)
+            return
+
+        many = isinstance(data, list)
+        chunks = [self._encode_chunk(d) for d in (data if many else [data])]
+        await self._websocket.send_bytes(
+            pack_frame(
+                {"method": method, "payload": payload, "list": many, **args},
+                chunks,
+            )
         )
 
+    async def _get_response(self, timeout=None):
+        raw_message = await self._websocket.receive_bytes(timeout=timeout)
+        if self._binary:
+            message, chunks = unpack_frame(raw_message)
+        else:
+            message, chunks = json.loads(raw_message), None
+
         if message["status"] > 400:
             if message["status"] == HTTPStatus.EXPECTATION_FAILED:
                 raise RemoteOSError.from_json(
                     message, url=self._websocket._response.url
                 )
 
+            if message["status"] == HTTPStatus.CONFLICT:
+                raise RemoteStaleFileError(
+                    "StaleFileError",
+                    message.get("message", "File changed"),
+                    self._websocket._response.url,
+                    [],
+                )
+
             raise RemoteFileServicesError(
                 message.get("type", "UnknownError"),
                 message.get("message", "Unknown error"),
@@ -228,9 +556,13 @@ async def _get_response(self, timeout=None):
                 message.get("tracebacks", []),
             )
 
+        if chunks is not None and message.get("payload") == "data":
+            chunks = [self._decode_chunk(chunk) for chunk in chunks]
+            return chunks if message.get("list", False) else chunks[0]
+
         data = message.get("data")
-        if data is None:
-            return None
+        if data is None or self._binary:
+            return data
 
         if isinstance(data, list):
             return [self._decode_data(d) for d in data]
@@ -253,9 +585,50 @@ async def __anext__(self):
 
     async def write(self, s: bytes | str) -> int:
         """Write data to the file."""
-        await self._send_request("write", data=self._encode_data(s))
+        await self._send_data_request("write", "data", s)
         return await self._get_response()
 
+    async def write_delta(self, data: bytes) -> int:
+        """
+        Write data to the file, sending only the parts that changed.
+
+        The blocks of the remote file are compared with the ones of data, so
+        that only the new ones are sent. This is only done for files opened
+        in "wb" mode with atomic=True, since the remote file is replaced by
+        the new one when it's closed, and if the server supports it.
+        Otherwise, all data is written.
+        """
+        if not self._delta:
+            return await self.write(data)
+
+        await self._send_request("block_checksums")
+        checksums = await self._get_response()
+        if not checksums["sizes"]:
+            return await self.write(data)
+
+        ops, chunks = compute_delta(
+            data, checksums["sizes"], checksums["hashes"]
+        )
+        position = await self.tell()
+        try:
+            await self._send_data_request(
+                "apply_delta",
+                "data",
+                chunks,
+                ops=ops,
+                size=len(data),
+                version=checksums["version"],
+            )
+            return await self._get_response()
+        except RemoteStaleFileError:
+            pass
+
+        # The remote file changed after getting its blocks
+        await self.seek(position)
+        written = await self.write(data)
+        await self.truncate()
+        return written
+
     async def flush(self):
         """Flush the file."""
         await self._send_request("flush")
@@ -272,9 +645,16 @@ async def readall(self):
 
     async def readinto(self, b) -> int:
         """Read data into a buffer."""
-        raise NotImplementedError(
-            "readinto() is not supported by the remote file API"
-        )
+        if "b" not in self.mode:
+            raise NotImplementedError(
+                "readinto() is only supported for files opened in binary "
+                "mode"
+            )
+
+        view = memoryview(b).cast("B")
+        data = await self.read(len(view))
+        view[:len(data)] = data
+        return len(data)
 
     async def seek(self, pos: int, whence: int = 0) -> int:
         """Seek to a new position in the file."""
@@ -308,9 +688,7 @@ async def readlines(self, hint: int = -1) -> list[bytes | str]:
 
     async def writelines(self, lines: list[bytes | str]):
         """Write lines to the file."""
-        await self._send_request(
-            "writelines", lines=list(map(self._encode_data, lines))
-        )
+        await self._send_data_request("writelines", "lines", list(lines))
         return await self._get_response()
 
     async def isatty(self) -> bool:
@@ -336,6 +714,19 @@ class SpyderRemoteFileServicesAPI(SpyderBaseJupyterAPI):
 
     This API allows for interacting with files on a remote server.
 
+    Parameters
+    ----------
+    cache : bool, optional
+        Whether to cache the results of `ls`, `info`, `exists`, `is_file` and
+        `is_dir`, by default False. Cached results are removed when they are
+        older than `cache_ttl`, when the server notifies that their
+        directory changed and when they are modified through this API.
+    cache_ttl : float, optional
+        Seconds after which cached results are requested again, by default
+        CACHE_TTL.
+    cache_size : int, optional
+        Maximum number of cached results, by default CACHE_MAX_SIZE.
+
     Raises
     ------
     RemoteFileServicesError
@@ -346,6 +737,37 @@ class SpyderRemoteFileServicesAPI(SpyderBaseJupyterAPI):
 
     base_url = SPYDER_PLUGIN_NAME + "/fs"
 
+    def __init__(
+        self,
+        *args,
+        cache=False,
+        cache_ttl=CACHE_TTL,
+        cache_size=CACHE_MAX_SIZE,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self._cache = None
+        if cache:
+            self._cache = RemoteMetadataCache(
+                cache_ttl, cache_size, on_directory_removed=self._unwatch
+            )
+
+        self._watch_websocket: aiohttp.ClientWebSocketResponse = None
+        self._watch_task: asyncio.Task = None
+        self._watch_supported = True
+        self._watched = set()
+
+    async def close(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+        if self._watch_websocket is not None:
+            await self._watch_websocket.close()
+            self._watch_websocket = None
+        if self._cache is not None:
+            self._cache.clear()
+        await super().close()
+
     async def _raise_for_status(self, response: aiohttp.ClientResponse):
         if response.status not in (
             HTTPStatus.INTERNAL_SERVER_ERROR,
@@ -373,41 +795,174 @@ async def _raise_for_status(self, response: aiohttp.ClientResponse):
             data.get("tracebacks", []),
         )
 
-    async def ls(self, path: Path, *, detail: bool = True):
-        async with self.session.get(
-            self.api_url / "ls",
-            params={"path": f"file://{path}", "detail": str(detail).lower()},
-        ) as response:
-            async for line in response.content:
-                yield json.loads(line)
+    # ---- Cache
+    async def _watch(self, directory: str):
+        """Ask the server to notify changes in directory."""
+        if directory in self._watched or not self._watch_supported:
+            return
+
+        if self._watch_websocket is None:
+            try:
+                self._watch_websocket = await self.session.ws_connect(
+                    self.api_url / "watch"
+                )
+            except (aiohttp.ClientError, SpyderRemoteAPIError) as error:
+                # Older servers can't notify changes, so only the TTL is used
+                logger.debug(f"Unable to watch remote changes: {error}")
+                self._watch_supported = False
+                return
+
+            self._watch_task = asyncio.create_task(self._receive_changes())
+
+        self._watched.add(directory)
+        await self._send_watch_request("watch", directory)
+
+    def _unwatch(self, directory: str):
+        """Stop getting notified of changes in directory."""
+        if directory not in self._watched:
+            return
+
+        self._watched.discard(directory)
+        if self._watch_websocket is not None:
+            asyncio.create_task(
+                self._send_watch_request("unwatch", directory)
+            )
+
+    async def _send_watch_request(self, method: str, directory: str):
+        try:
+            await self._watch_websocket.send_json(
+                {"method": method, "path": directory}
+            )
+        except (AttributeError, ConnectionError, aiohttp.ClientError):
+            # The connection was closed
+            pass
+
+    async def _receive_changes(self):
+        try:
+            async for message in self._watch_websocket:
+                if message.type in (
+                    aiohttp.WSMsgType.BINARY,
+                    aiohttp.WSMsgType.TEXT,
+                ):
+                    directory = json.loads(message.data)["path"]
+                    logger.debug(f"Remote directory changed: {directory}")
+                    self._cache.invalidate(directory)
+        finally:
+            # Changes can't be notified anymore, so cached values could get
+            # stale. The connection is opened again when needed.
+            self._watch_websocket = None
+            self._watch_task = None
+            self._watched.clear()
+            self._cache.clear()
+
+    def _invalidate(self, *paths: Path):
+        """Remove cached values affected by modifying paths."""
+        if self._cache is None:
+            return
+
+        for path in map(str, paths):
+            self._cache.invalidate(posixpath.dirname(path))
+            self._cache.invalidate(path, recursive=True)
+
+    @contextmanager
+    def _invalidating(self, *paths: Path):
+        """
+        Invalidate the cached values affected by modifying paths before and
+        after doing it.
+
+        Values requested in between could be answered before the change and
+        cached as fresh, so they are invalidated again when it's done.
+        """
+        self._invalidate(*paths)
+        try:
+            yield
+        finally:
+            self._invalidate(*paths)
+
+    async def _get_path_json(self, endpoint: str, path: Path):
+        """Get the JSON result of a GET endpoint for path, using the cache."""
+        path = str(path)
+        key = (endpoint, path)
+        directory = posixpath.dirname(path)
+        version = None
+        if self._cache is not None:
+            hit, value = self._cache.get(key)
+            if hit:
+                return value
+            await self._watch(directory)
+            version = self._cache.version
 
-    async def info(self, path: Path):
         async with self.session.get(
-            self.api_url / "info",
+            self.api_url / endpoint,
             params={"path": f"file://{path}"},
         ) as response:
-            return await response.json()
+            value = await response.json()
 
-    async def exists(self, path: Path):
+        if self._cache is not None:
+            self._cache.set(key, directory, value, version)
+        return value
+
+    # ---- API
+    async def ls(
+        self,
+        path: Path,
+        *,
+        detail: bool = True,
+        cursor: str | None = None,
+        limit: int | None = None,
+        batch_size: int | None = None,
+    ):
+        """
+        List the contents of a directory, sorted by name.
+
+        Only up to `limit` entries are listed, if given. To get the next
+        ones, pass the name (without its directory) of the last entry
+        received as `cursor`. The server sends entries in batches of
+        `batch_size`.
+        """
+        key = ("ls", str(path), detail, cursor, limit)
+        version = None
+        if self._cache is not None:
+            hit, entries = self._cache.get(key)
+            if hit:
+                for entry in entries:
+                    yield entry
+                return
+            await self._watch(str(path))
+            version = self._cache.version
+
+        params = {"path": f"file://{path}", "detail": str(detail).lower()}
+        if cursor is not None:
+            params["cursor"] = cursor
+        if limit is not None:
+            params["limit"] = limit
+        if batch_size is not None:
+            params["batch_size"] = batch_size
+
+        entries = []
         async with self.session.get(
-            self.api_url / "exists",
-            params={"path": f"file://{path}"},
+            self.api_url / "ls", params=params
         ) as response:
-            return await response.json()
+            async for line in response.content:
+                entry = json.loads(line)
+                entries.append(entry)
+                yield entry
+
+        # Only complete listings are cached
+        if self._cache is not None:
+            self._cache.set(key, str(path), entries, version)
+
+    async def info(self, path: Path):
+        return await self._get_path_json("info", path)
+
+    async def exists(self, path: Path):
+        return await self._get_path_json("exists", path)
 
     async def is_file(self, path: Path):
-        async with self.session.get(
-            self.api_url / "isfile",
-            params={"path": f"file://{path}"},
-        ) as response:
-            return await response.json()
+        return await self._get_path_json("isfile", path)
 
     async def is_dir(self, path: Path):
-        async with self.session.get(
-            self.api_url / "isdir",
-            params={"path": f"file://{path}"},
-        ) as response:
-            return await response.json()
+        return await self._get_path_json("isdir", path)
 
     async def mkdir(
         self,
@@ -416,87 +971,125 @@ async def mkdir(
         create_parents: bool = True,
         exist_ok: bool = False
     ):
-        async with self.session.post(
-            self.api_url / "mkdir",
-            params={
-                "path": f"file://{path}",
-                "create_parents": str(create_parents).lower(),
-                "exist_ok": str(exist_ok).lower(),
-            },
-        ) as response:
-            return await response.json()
+        with self._invalidating(path):
+            async with self.session.post(
+                self.api_url / "mkdir",
+                params={
+                    "path": f"file://{path}",
+                    "create_parents": str(create_parents).lower(),
+                    "exist_ok": str(exist_ok).lower(),
+                },
+            ) as response:
+                return await response.json()
 
     async def rmdir(self, path: Path, non_empty: bool = False):
-        async with self.session.delete(
-            self.api_url / "rmdir",
-            params={"path": f"file://{path}",
-                    "non_empty": str(non_empty).lower()},
-        ) as response:
-            return await response.json()
+        with self._invalidating(path):
+            async with self.session.delete(
+                self.api_url / "rmdir",
+                params={"path": f"file://{path}",
+                        "non_empty": str(non_empty).lower()},
+            ) as response:
+                return await response.json()
 
     async def unlink(self, path: Path, missing_ok: bool = False):
-        async with self.session.delete(
-            self.api_url / "file",
-            params={
-                "path": f"file://{path}",
-                "missing_ok": str(missing_ok).lower(),
-            },
-        ) as response:
-            return await response.json()
+        with self._invalidating(path):
+            async with self.session.delete(
+                self.api_url / "file",
+                params={
+                    "path": f"file://{path}",
+                    "missing_ok": str(missing_ok).lower(),
+                },
+            ) as response:
+                return await response.json()
 
     async def copy(self, path1: Path, path2: Path):
-        async with self.session.post(
-            self.api_url / "copy",
-            params={"path": f"file://{path1}", "dest": f"file://{path2}"},
-        ) as response:
-            return await response.json()
+        with self._invalidating(path2):
+            async with self.session.post(
+                self.api_url / "copy",
+                params={"path": f"file://{path1}", "dest": f"file://{path2}"},
+            ) as response:
+                return await response.json()
 
     async def copy2(self, path1: Path, path2: Path):
-        async with self.session.post(
-            self.api_url / "copy",
-            params={
-                "path": f"file://{path1}",
-                "dest": f"file://{path2}",
-                "metadata": "true",
-            },
-        ) as response:
-            return await response.json()
+        with self._invalidating(path2):
+            async with self.session.post(
+                self.api_url / "copy",
+                params={
+                    "path": f"file://{path1}",
+                    "dest": f"file://{path2}",
+                    "metadata": "true",
+                },
+            ) as response:
+                return await response.json()
 
     async def replace(self, path1: Path, path2: Path):
-        async with self.session.post(
-            self.api_url / "move",
-            params={"path": f"file://{path1}", "dest": f"file://{path2}"},
-        ) as response:
-            return await response.json()
+        with self._invalidating(path1, path2):
+            async with self.session.post(
+                self.api_url / "move",
+                params={"path": f"file://{path1}", "dest": f"file://{path2}"},
+            ) as response:
+                return await response.json()
 
     async def touch(self, path: Path, truncate: bool = True):
-        async with self.session.post(
-            self.api_url / "touch",
-            params={
-                "path": f"file://{path}",
-                "truncate": str(truncate).lower(),
-            },
-        ) as response:
-            return await response.json()
+        with self._invalidating(path):
+            async with self.session.post(
+                self.api_url / "touch",
+                params={
+                    "path": f"file://{path}",
+                    "truncate": str(truncate).lower(),
+                },
+            ) as response:
+                return await response.json()
 
     async def open(
-        self, path, mode="r", atomic=False, lock=False, encoding="utf-8"
+        self,
+        path,
+        mode="r",
+        atomic=False,
+        lock=False,
+        encoding="utf-8",
+        binary=True,
     ):
         file = SpyderRemoteFileIOAPI(
-            path, mode, atomic, lock, encoding, manager=self.manager
+            path,
+            mode,
+            atomic,
+            lock,
+            encoding,
+            binary=binary,
+            manager=self.manager,
         )
+        if any(m in mode for m in "wax+"):
+            # Later writes are notified by the server, but the file is only
+            # replaced on close if it's atomic
+            self._invalidate(path)
+            file.on_close = lambda: self._invalidate(path)
+
         await file.connect()
         return file
 
     async def zip_directory(
-        self, path: Path, *, compression_level: int = 5
+        self,
+        path: Path,
+        *,
+        compression_level: int = 5,
+        max_workers: int | None = None,
     ):
+        """
+        Stream a zip file of a directory.
+
+        Files are compressed in up to `max_workers` threads on the server, or
+        as many as the server chooses if not given.
+        """
+        params = {
+            "path": f"file://{path}",
+            "compression": compression_level,
+        }
+        if max_workers is not None:
+            params["max_workers"] = max_workers
+
         async with self.session.post(
-            self.api_url / "zip",
-            params={
-                "path": f"file://{path}",
-                "compression": compression_level,
-            },
+            self.api_url / "zip", params=params
         ) as response:
             while data := await response.content.read(65536):
                 yield data
@@ -6,7 +6,11 @@
 # -----------------------------------------------------------------------------
 
 """Tests for the remote files API."""
+import asyncio
 import io
+import os
+import random
+import time
 import zipfile
 
 # Third party imports
@@ -14,7 +18,15 @@
 
 from spyder.api.asyncdispatcher import AsyncDispatcher
 from spyder.plugins.remoteclient.plugin import RemoteClient
-from spyder.plugins.remoteclient.api.modules.file_services import RemoteOSError
+from spyder.plugins.remoteclient.api.modules.file_services import (
+    compute_delta,
+    hash_block,
+    RemoteFileServicesError,
+    RemoteMetadataCache,
+    RemoteOSError,
+    split_blocks,
+    SpyderRemoteFileServicesAPI,
+)
 from spyder.plugins.remoteclient.tests.conftest import mark_remote_test
 
 
@@ -120,25 +132,29 @@ async def test_zip_dir(
         file_api_class = remote_client.get_file_api(remote_client_id)
         assert file_api_class is not None
 
-        buffer = io.BytesIO()
-        async with file_api_class() as file_api:
-            async for chunk in file_api.zip_directory(self.remote_temp_dir):
-                buffer.write(chunk)
-            assert buffer.tell() > 0
-
-        buffer.seek(0)
-        with zipfile.ZipFile(buffer, "r") as zip_file:
-            assert zip_file.testzip() is None
-            zip_file_contents = zip_file.namelist()
-            assert len(zip_file_contents) == 2
-            with zip_file.open(
-                "test.txt"
-            ) as file:
-                assert file.read() == b"Hello, world!"
-            with zip_file.open(
-                "test2.txt"
-            ) as file:
-                assert file.read() == b"Hello, world!"
+        # Files are the same when compressed serially or in parallel
+        for max_workers in (0, 2):
+            buffer = io.BytesIO()
+            async with file_api_class() as file_api:
+                async for chunk in file_api.zip_directory(
+                    self.remote_temp_dir, max_workers=max_workers
+                ):
+                    buffer.write(chunk)
+                assert buffer.tell() > 0
+
+            buffer.seek(0)
+            with zipfile.ZipFile(buffer, "r") as zip_file:
+                assert zip_file.testzip() is None
+                zip_file_contents = zip_file.namelist()
+                assert len(zip_file_contents) == 2
+                with zip_file.open(
+                    "test.txt"
+                ) as file:
+                    assert file.read() == b"Hello, world!"
+                with zip_file.open(
+                    "test2.txt"
+                ) as file:
+                    assert file.read() == b"Hello, world!"
 
     @AsyncDispatcher(early_return=False)
     async def test_rm_file(
@@ -158,6 +174,184 @@ async def test_rm_file(
                 self.remote_temp_dir + "/test2.txt"
             ) == {"success": True}
 
+    @AsyncDispatcher(early_return=False)
+    async def test_binary_frames(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+    ):
+        """Test that file data round-trips in JSON and binary frames."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        path = self.remote_temp_dir + "/large.bin"
+        data = os.urandom(8 * 1024 * 1024)
+        chunk_size = 1024 * 1024
+
+        async with file_api_class() as file_api:
+            for binary in (False, True):
+                async with await file_api.open(
+                    path, "wb+", binary=binary
+                ) as f:
+                    for i in range(0, len(data), chunk_size):
+                        await f.write(data[i:i + chunk_size])
+                    await f.seek(0)
+                    buffer = bytearray(len(data))
+                    assert await f.readinto(buffer) == len(data)
+                    assert buffer == data
+                    await f.seek(0)
+                    assert await f.read() == data
+
+            # Text and lists of lines are sent in frames too
+            async with await file_api.open(path, "w+") as f:
+                await f.writelines(["Hello,\n", "wörld!\n"])
+                await f.seek(0)
+                assert await f.readlines() == ["Hello,\n", "wörld!\n"]
+
+            assert await file_api.unlink(path) == {"success": True}
+
+    @AsyncDispatcher(early_return=False)
+    async def test_list_directories_pages(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+    ):
+        """Test that a directory can be listed in pages."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        path = self.remote_temp_dir + "/pages"
+        names = [f"file{i:02}.txt" for i in range(25)]
+
+        async with file_api_class() as file_api:
+            await file_api.mkdir(path)
+            for name in reversed(names):
+                await file_api.touch(path + "/" + name)
+
+            listed = []
+            cursor = None
+            while True:
+                page = [
+                    ls_content["name"]
+                    async for ls_content in file_api.ls(
+                        path, cursor=cursor, limit=10, batch_size=3
+                    )
+                ]
+                listed += page
+                if len(page) < 10:
+                    break
+                cursor = page[-1].rsplit("/", 1)[-1]
+
+            # Entries are sorted and listed only once
+            assert listed == [path + "/" + name for name in names]
+
+            assert await file_api.rmdir(path, non_empty=True) == {
+                "success": True
+            }
+
+    @AsyncDispatcher(early_return=False)
+    async def test_cached_list_directories(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+    ):
+        """Test that cached listings are updated when the server changes."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        path = self.remote_temp_dir + "/cached"
+
+        async def ls(file_api):
+            return [
+                ls_content["name"]
+                async for ls_content in file_api.ls(path)
+            ]
+
+        async with file_api_class(cache=True) as cached_api:
+            async with file_api_class() as file_api:
+                await cached_api.mkdir(path)
+                assert await ls(cached_api) == []
+                assert await cached_api.exists(path + "/spam.txt") == {
+                    "exists": False
+                }
+
+                # Changes made through other clients are notified
+                await file_api.touch(path + "/spam.txt")
+                await asyncio.sleep(2)
+                assert await ls(cached_api) == [path + "/spam.txt"]
+                assert await cached_api.exists(path + "/spam.txt") == {
+                    "exists": True
+                }
+
+                # Changes made through the same client are applied right away
+                await cached_api.unlink(path + "/spam.txt")
+                assert await ls(cached_api) == []
+
+                assert await cached_api.rmdir(path) == {"success": True}
+
+    @AsyncDispatcher(early_return=False)
+    async def test_write_delta(
+        self,
+        remote_client: RemoteClient,
+        remote_client_id: str,
+    ):
+        """Test that only the changed parts of a file are sent."""
+        file_api_class = remote_client.get_file_api(remote_client_id)
+        assert file_api_class is not None
+
+        path = self.remote_temp_dir + "/delta.py"
+        lines = [f"x{i} = {i}\n".encode() for i in range(200000)]
+        data = b"".join(lines)
+        new_data = b"".join(lines[:1000] + [b"y = 0\n"] + lines[1010:])
+
+        async with file_api_class() as file_api:
+            async with await file_api.open(path, "wb", atomic=True) as f:
+                assert await f.write_delta(data) == len(data)
+
+            async with await file_api.open(path, "wb", atomic=True) as f:
+                sent = []
+                send_data_request = f._send_data_request
+
+                async def _send_data_request(method, payload, data, **args):
+                    sent.append(sum(map(len, data)))
+                    await send_data_request(method, payload, data, **args)
+
+                f._send_data_request = _send_data_request
+                assert await f.write_delta(new_data) == len(new_data)
+                assert sent[0] < len(new_data) / 100
+
+            async with await file_api.open(path, "rb") as f:
+                assert await f.read() == new_data
+
+            # Servers without delta transfers fail on their methods, so all
+            # data is written if they don't advertise them
+            async with await file_api.open(path, "wb", atomic=True) as f:
+                with pytest.raises(RemoteFileServicesError):
+                    await f._send_request("spam")
+                    await f._get_response()
+
+                f._delta = False
+                assert await f.write_delta(data) == len(data)
+
+            # Files that change while writing the delta are written again
+            async with await file_api.open(path, "wb", atomic=True) as f:
+                get_response = f._get_response
+
+                async def _get_response(timeout=None):
+                    response = await get_response(timeout)
+                    if isinstance(response, dict):
+                        async with await file_api.open(path, "ab") as other:
+                            await other.write(b"spam")
+                    return response
+
+                f._get_response = _get_response
+                assert await f.write_delta(new_data) == len(new_data)
+
+            async with await file_api.open(path, "rb") as f:
+                assert await f.read() == new_data
+
+            assert await file_api.unlink(path) == {"success": True}
+
     @AsyncDispatcher(early_return=False)
     async def test_rm_dir(
         self,
@@ -191,5 +385,110 @@ async def test_ls_nonexistent_dir(
         assert exc_info.value.errno == 2  # ENOENT: No such file or directory
 
 
+def test_metadata_cache(monkeypatch):
+    """Test the expiration, eviction and invalidation of cached values."""
+    removed = []
+    cache = RemoteMetadataCache(
+        ttl=10, max_size=3, on_directory_removed=removed.append
+    )
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    cache.set(("ls", "/a"), "/a", ["/a/b"])
+    cache.set(("info", "/a/b"), "/a", {"name": "/a/b"})
+    cache.set(("ls", "/a/b"), "/a/b", [])
+    assert cache.get(("ls", "/a")) == (True, ["/a/b"])
+
+    # The least recently used value is evicted
+    cache.set(("ls", "/c"), "/c", [])
+    assert cache.get(("info", "/a/b")) == (False, None)
+    assert cache.get(("ls", "/a")) == (True, ["/a/b"])
+    assert removed == []
+
+    # Values of a directory and its subdirectories are invalidated
+    version = cache.version
+    cache.invalidate("/a", recursive=True)
+    assert cache.get(("ls", "/a")) == (False, None)
+    assert cache.get(("ls", "/a/b")) == (False, None)
+    assert sorted(removed) == ["/a", "/a/b"]
+
+    # Values requested before an invalidation are not cached
+    cache.set(("ls", "/a"), "/a", ["/a/b"], version)
+    assert cache.get(("ls", "/a")) == (False, None)
+
+    # Values expire
+    now += 11
+    assert cache.get(("ls", "/c")) == (False, None)
+    assert len(cache) == 0
+    assert removed[-1] == "/c"
+
+
+def test_invalidate_around_changes():
+    """Test that values requested while a path changes are not cached."""
+    file_api = SpyderRemoteFileServicesAPI(manager=None, cache=True)
+    cache = file_api._cache
+    cache.set(("info", "/a/b"), "/a", {"name": "/a/b"})
+
+    with file_api._invalidating("/a/b"):
+        assert cache.get(("info", "/a/b")) == (False, None)
+
+        # A request is sent while the path changes and answered after it
+        version = cache.version
+
+    cache.set(("info", "/a/b"), "/a", {"name": "/a/b"}, version)
+    assert cache.get(("info", "/a/b")) == (False, None)
+
+
+def test_compute_delta():
+    """Test that only the changed blocks of a file are sent."""
+    rnd = random.Random(0)
+    data = b"".join(
+        f"x{i} = {rnd.random()}\n".encode() for i in range(100000)
+    )
+
+    def blocks(data):
+        sizes = split_blocks(data)
+        hashes = []
+        start = 0
+        for size in sizes:
+            hashes.append(hash_block(data[start:start + size]))
+            start += size
+        return sizes, hashes
+
+    # Blocks are split at content-defined line ends
+    sizes, hashes = blocks(data)
+    assert sum(sizes) == len(data)
+    assert len(sizes) > 10
+    assert compute_delta(data, sizes, hashes) == (
+        [["copy", 0, len(data)]], []
+    )
+
+    # Inserting data only changes the blocks next to it
+    new_data = data[:100000] + b"spam\n" + data[100000:]
+    ops, chunks = compute_delta(new_data, sizes, hashes)
+    assert [op[0] for op in ops] == ["copy", "data", "copy"]
+    assert sum(map(len, chunks)) < 3 * max(sizes)
+
+    def apply(ops, chunks):
+        result = []
+        for op in ops:
+            if op[0] == "copy":
+                result.append(data[op[1]:op[1] + op[2]])
+            else:
+                result.append(chunks[op[1]])
+        return b"".join(result)
+
+    assert apply(ops, chunks) == new_data
+
+    # Removing data and binary files
+    for new_data in [
+        data[:50000] + data[60000:],
+        data[:-1],
+        b"",
+        bytes(200000),
+    ]:
+        assert apply(*compute_delta(new_data, sizes, hashes)) == new_data
+
+
 if __name__ == "__main__":
     pytest.main()
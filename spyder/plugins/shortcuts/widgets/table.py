@@ -29,7 +29,7 @@
 from spyder.utils.icon_manager import ima
 from spyder.utils.palette import SpyderPalette
 from spyder.utils.qthelpers import create_toolbutton
-from spyder.utils.stringmatching import get_search_regex, get_search_scores
+from spyder.utils.stringmatching import SearchScorer, get_search_regex
 from spyder.widgets.helperwidgets import (
     ClearLineEdit,
     HTMLDelegate,
@@ -504,6 +504,8 @@ def __init__(self, parent):
         self.normal_text = []
         self.context_rich_text = []
         self.letters = ''
+        self._context_scorer = None
+        self._name_scorer = None
         self.label = QLabel()
         self.widths = []
 
@@ -614,9 +616,16 @@ def update_search_letters(self, text):
         self.letters = text
         contexts = [shortcut.context for shortcut in self.shortcuts]
         names = [shortcut.name for shortcut in self.shortcuts]
-        context_results = get_search_scores(
-            text, contexts, template='<b>{0}</b>')
-        results = get_search_scores(text, names, template='<b>{0}</b>')
+        if (
+            self._name_scorer is None
+            or self._context_scorer.choices != contexts
+            or self._name_scorer.choices != names
+        ):
+            self._context_scorer = SearchScorer(
+                contexts, template='<b>{0}</b>')
+            self._name_scorer = SearchScorer(names, template='<b>{0}</b>')
+        context_results = self._context_scorer.get_scores(text)
+        results = self._name_scorer.get_scores(text)
         __, self.context_rich_text, context_scores = (
             zip(*context_results))
         self.normal_text, self.rich_text, self.scores = zip(*results)
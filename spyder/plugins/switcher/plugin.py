@@ -212,9 +212,14 @@ def remove_section(self, section):
         self._switcher.remove_section(section)
 
     # --- Mode methods
-    def add_mode(self, token, description):
-        """Add mode by token key and description."""
-        self._switcher.add_mode(token, description)
+    def add_mode(self, token, description, search=False):
+        """
+        Add mode by token key and description.
+
+        If `search` is True, `sig_search_text_available` is also emitted when
+        the search text changes in this mode.
+        """
+        self._switcher.add_mode(token, description, search=search)
 
     def get_mode(self):
         """Get the current mode the switcher is in."""
@@ -124,6 +124,69 @@ def test_switcher_filter_unicode(dlg_switcher, qtbot):
     assert dlg_switcher.count() == 2
 
 
+def test_switcher_narrow_filter(dlg_switcher, monkeypatch):
+    """Test that results are narrowed when the search text grows."""
+    from superqt.utils import signals_blocked
+    from spyder.utils.stringmatching import SearchScorer
+
+    titles = ['spyder', 'spider', 'python', 'spy', 'pyside', 'sypder',
+              'spam spy']
+    dlg_switcher.clear()
+    for title in titles:
+        dlg_switcher.add_item(title=title, last_item=False)
+
+    narrowed = []
+    refilter = dlg_switcher.proxy.refilter
+
+    def record_refilter(narrow=False):
+        narrowed.append(narrow)
+        refilter(narrow=narrow)
+
+    monkeypatch.setattr(dlg_switcher.proxy, 'refilter', record_refilter)
+
+    for text in ['s', 'sp', 'spy', 'sp', 'spd', 'x']:
+        with signals_blocked(dlg_switcher.edit):
+            dlg_switcher.set_search_text(text)
+        dlg_switcher.setup()
+
+        shown = []
+        for row in range(dlg_switcher.count()):
+            dlg_switcher.set_current_row(row)
+            shown.append(dlg_switcher.current_item().get_title())
+
+        expected = SearchScorer(titles).get_scores(
+            text, valid_only=True, sort=True)
+        assert shown == [title for title, __, __ in expected]
+
+    # Only rows shown for the previous text were evaluated when it grew
+    assert narrowed[-5:] == [True, True, False, True, False]
+
+
+
+def test_switcher_search_modes(dlg_switcher, qtbot):
+    """Test that the search text is emitted for modes that ask for it."""
+    edit = dlg_switcher.edit
+    dlg_switcher.add_mode('#', _('Go to Symbol in Project'), search=True)
+
+    # The mode token is not part of the emitted text
+    with qtbot.waitSignal(dlg_switcher.sig_search_text_available) as blocker:
+        edit.setText('#spam')
+    assert blocker.args == ['spam']
+    assert dlg_switcher.get_mode() == '#'
+
+    # Other modes only filter their items
+    dlg_switcher.set_search_text('')
+    qtbot.waitUntil(lambda: dlg_switcher.get_mode() == '')
+    with qtbot.assertNotEmitted(
+        dlg_switcher.sig_search_text_available, wait=500
+    ):
+        edit.setText('@spam')
+    assert dlg_switcher.get_mode() == '@'
+
+    dlg_switcher.set_search_text('')
+    dlg_switcher.remove_mode('#')
+    assert '#' not in dlg_switcher._search_modes
+
 # --- Helper functions for tests
 # -----------------------------------------------------------------------------
 def create_vcs_example_switcher(sw):
@@ -129,17 +129,28 @@ def recurse_level(level_idx):
     return result_paths
 
 
-def get_file_icon(path):
-    """Get icon for file by extension."""
-
+def get_file_icon_scale_factor():
+    """Get the scale factor of file icons in the switcher."""
     if sys.platform == 'darwin':
-        scale_factor = 0.9
+        return 0.9
     elif os.name == 'nt':
-        scale_factor = 0.8
+        return 0.8
     else:
-        scale_factor = 0.6
+        return 0.6
+
+
+def get_file_icon(path):
+    """Get icon for file by extension."""
+    return ima.get_icon_by_extension_or_type(
+        path, get_file_icon_scale_factor()
+    )
+
 
-    return ima.get_icon_by_extension_or_type(path, scale_factor)
+def get_file_icons(paths):
+    """Get icons for several files (not directories) by extension."""
+    return ima.get_icons_by_extension_or_type(
+        paths, get_file_icon_scale_factor(), [False] * len(paths)
+    )
 
 
 def clean_string(text):
@@ -38,6 +38,7 @@ def __init__(self, parent=None, styles=None, use_score=True):
         self._score = -1
         self._height = self._get_height()
         self._use_score = use_score
+        self._rendered_text = None
 
         # Setup
         # self._height is a float from QSizeF but
@@ -49,8 +50,14 @@ def _render_text(self):
         raise NotImplementedError
 
     def _set_rendered_text(self):
-        """Set the rendered html template as text of this item."""
-        self.setText(self._render_text())
+        """
+        Set the rendered html template as text of this item.
+
+        The template is only rendered when views ask for the item's text (see
+        data), so updating many items while filtering is cheap.
+        """
+        self._rendered_text = None
+        self.emitDataChanged()
 
     def _set_styles(self):
         """Set the styles for this item."""
@@ -91,7 +98,19 @@ def is_action_item(self):
         """Return whether the item is of action type."""
         return bool(self._action_item)
 
+    def uses_score(self):
+        """Return whether the item score is set by the search text."""
+        return self._use_score
+
     # ---- Qt overrides
+    def data(self, role=Qt.UserRole + 1):
+        """Override Qt method to render the item's text lazily."""
+        if role == Qt.DisplayRole:
+            if self._rendered_text is None:
+                self._rendered_text = self._render_text()
+            return self._rendered_text
+        return super().data(role)
+
     def refresh(self):
         """Override Qt."""
         super().refresh()
@@ -235,9 +254,16 @@ def __init__(self, parent=None, icon=None, title=None, description=None,
             self._icon_width = 0
 
         self._set_styles()
+        self._set_size_hint()
         self._set_rendered_text()
 
     # ---- Helpers
+    def _set_size_hint(self):
+        """Set the item size according to its content width."""
+        width = int(self._width - self._icon_width)
+        height = int(self.get_height())
+        self.setSizeHint(QSize(width, height))
+
     def _render_text(self, title=None, description=None, section=None):
         """Render the html template for this item."""
         if self._rich_title:
@@ -256,7 +282,6 @@ def _render_text(self, title=None, description=None, section=None):
         padding = self._PADDING
         width = int(self._width - self._icon_width)
         height = int(self.get_height())
-        self.setSizeHint(QSize(width, height))
 
         shortcut = '&lt;' + self._shortcut + '&gt;' if self._shortcut else ''
 
@@ -292,6 +317,11 @@ def _get_height(self):
         return doc.size().height()
 
     # ---- API
+    def set_width(self, value):
+        """Set the content width."""
+        super().set_width(value)
+        self._set_size_hint()
+
     def set_icon(self, icon):
         """Set the QIcon for the list item."""
         self._icon = icon
@@ -6,21 +6,40 @@
 
 """Switcher Proxy Model."""
 
+# Standard library imports
+import bisect
+
 # Third party imports
-from qtpy.QtCore import QSortFilterProxyModel, Qt
+from qtpy.QtCore import QAbstractProxyModel, QModelIndex, QObject
+
 
+class SwitcherProxyModel(QAbstractProxyModel):
+    """
+    A proxy model to perform sorting on the scored items.
 
-class SwitcherProxyModel(QSortFilterProxyModel):
-    """A proxy model to perform sorting on the scored items."""
+    Rows are filtered and sorted in a single pass with Python lists instead
+    of calling filterAcceptsRow and lessThan for every row, as a
+    QSortFilterProxyModel does. This makes it possible to only evaluate the
+    rows that were accepted before when the search text grows (see
+    `refilter`).
+    """
 
     def __init__(self, parent=None):
         """Proxy model to perform sorting on the scored items."""
         super().__init__(parent)
-        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
-        self.setSortCaseSensitivity(Qt.CaseInsensitive)
-        self.setDynamicSortFilter(True)
         self.__filter_by_score = False
+        self.__sort_by = None
+
+        # Source rows in the order they are shown and their sort keys
+        self._rows = []
+        self._keys = []
 
+        # Source row -> proxy row. It's computed when needed because
+        # inserting rows changes it.
+        self._source_to_proxy = None
+
+    # ---- API
+    # -------------------------------------------------------------------------
     def set_filter_by_score(self, value):
         """
         Set whether the items should be filtered by their score result.
@@ -31,37 +50,200 @@ def set_filter_by_score(self, value):
            Indicates whether the items should be filtered by their
            score result.
         """
-        self.__filter_by_score = value
-        self.invalidateFilter()
-
-    def filterAcceptsRow(self, source_row, source_parent):
-        """Override Qt method to filter items by their score result."""
-        item = self.sourceModel().item(source_row)
-        if self.__filter_by_score is False or item.is_action_item():
-            return True
-        else:
-            return not item.get_score() == -1
+        if value != self.__filter_by_score:
+            self.__filter_by_score = value
+            self.refilter()
 
     def sortBy(self, attr):
-        """Override Qt method."""
+        """Sort items by one of their attributes."""
         self.__sort_by = attr
-        self.invalidate()
-        self.sort(0, Qt.AscendingOrder)
+        self.refilter()
+
+    def source_rows(self):
+        """Return the source rows that are shown, in order."""
+        return list(self._rows)
+
+    def refilter(self, narrow=False):
+        """
+        Filter and sort rows again, e.g. because item scores changed.
+
+        Parameters
+        ----------
+        narrow : bool, optional
+            Whether only the rows that are currently shown can still be
+            accepted, e.g. because the search text only grew. In that case,
+            other rows are not evaluated.
+        """
+        self.beginResetModel()
+        if narrow:
+            self._update_rows(self._rows)
+        else:
+            self._update_rows()
+        self.endResetModel()
+
+    # ---- Helpers
+    # -------------------------------------------------------------------------
+    def _accepts(self, item):
+        """Return whether item is shown."""
+        return (
+            self.__filter_by_score is False
+            or item.is_action_item()
+            or item.get_score() != -1
+        )
+
+    def _sort_key(self, item, row):
+        """
+        Return the key used to sort item.
+
+        Rows are sorted by the `sortBy` attribute. Ties and items without
+        that attribute keep their order in the source model.
+        """
+        if self.__sort_by is None:
+            return (False, 0, row)
+
+        value = getattr(item, self.__sort_by, None)
+        if value is None:
+            return (True, 0, row)
+
+        return (False, value, row)
+
+    def _update_rows(self, rows=None):
+        """Compute the rows that are shown out of `rows` (all by default)."""
+        model = self.sourceModel()
+        if model is None:
+            rows = []
+        elif rows is None:
+            rows = range(model.rowCount())
+
+        entries = []
+        for row in rows:
+            item = model.item(row)
+            if self._accepts(item):
+                entries.append((self._sort_key(item, row), row))
+        entries.sort()
+
+        self._keys = [key for key, __ in entries]
+        self._rows = [row for __, row in entries]
+        self._source_to_proxy = None
 
-    def lessThan(self, left, right):
+    def _get_source_to_proxy(self):
+        if self._source_to_proxy is None:
+            self._source_to_proxy = {
+                source_row: proxy_row
+                for proxy_row, source_row in enumerate(self._rows)
+            }
+        return self._source_to_proxy
+
+    def _on_source_rows_inserted(self, parent, first, last):
+        """Show inserted rows in the right position."""
+        model = self.sourceModel()
+        if last != model.rowCount() - 1:
+            # Rows after the inserted ones have new numbers
+            self.refilter()
+            return
+
+        for row in range(first, last + 1):
+            item = model.item(row)
+            if not self._accepts(item):
+                continue
+
+            key = self._sort_key(item, row)
+            position = bisect.bisect(self._keys, key)
+            self.beginInsertRows(QModelIndex(), position, position)
+            self._keys.insert(position, key)
+            self._rows.insert(position, row)
+            self._source_to_proxy = None
+            self.endInsertRows()
+
+    def _on_source_about_to_reset(self, *args):
+        """Reset the model before the source model changes its rows."""
+        self.beginResetModel()
+
+    def _on_source_reset(self, *args):
+        """Compute rows again after the source model changed its rows."""
+        self._update_rows()
+        self.endResetModel()
+
+    def _on_source_data_changed(self, top_left, bottom_right, roles=None):
+        """Forward data changes of the rows that are shown."""
+        if not self._rows:
+            return
+
+        if top_left.row() == bottom_right.row():
+            proxy_row = self._get_source_to_proxy().get(top_left.row())
+            if proxy_row is None:
+                return
+            first = last = proxy_row
+        else:
+            first, last = 0, len(self._rows) - 1
+
+        self.dataChanged.emit(
+            self.index(first, 0), self.index(last, 0), roles or []
+        )
+
+    # ---- Qt overrides
+    # -------------------------------------------------------------------------
+    def setSourceModel(self, model):
+        """Override Qt method to follow the changes of the source model."""
+        super().setSourceModel(model)
+
+        model.rowsInserted.connect(self._on_source_rows_inserted)
+        model.dataChanged.connect(self._on_source_data_changed)
+        for about_to_change, changed in [
+            (model.rowsAboutToBeRemoved, model.rowsRemoved),
+            (model.rowsAboutToBeMoved, model.rowsMoved),
+            (model.modelAboutToBeReset, model.modelReset),
+            (model.layoutAboutToBeChanged, model.layoutChanged),
+        ]:
+            about_to_change.connect(self._on_source_about_to_reset)
+            changed.connect(self._on_source_reset)
+
+        self.refilter()
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        """Override Qt method."""
+        if parent.isValid() or column != 0 or not 0 <= row < len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        """Override Qt method."""
+        if index is None:
+            # This is QObject.parent
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        """Override Qt method."""
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """Override Qt method."""
+        return 0 if parent.isValid() else 1
+
+    def hasChildren(self, parent=QModelIndex()):
         """Override Qt method."""
-        left_item = self.sourceModel().itemFromIndex(left)
-        right_item = self.sourceModel().itemFromIndex(right)
+        return not parent.isValid() and bool(self._rows)
 
-        # Check for attribute, otherwise, check for data
+    def mapToSource(self, proxy_index):
+        """Override Qt method."""
+        model = self.sourceModel()
         if (
-            hasattr(left_item, self.__sort_by)
-            and getattr(left_item, self.__sort_by) is not None
-            and hasattr(right_item, self.__sort_by)
-            and getattr(right_item, self.__sort_by) is not None
+            model is None
+            or not proxy_index.isValid()
+            or not 0 <= proxy_index.row() < len(self._rows)
         ):
-            left_data = getattr(left_item, self.__sort_by)
-            right_data = getattr(right_item, self.__sort_by)
-            return left_data < right_data
+            return QModelIndex()
+        return model.index(
+            self._rows[proxy_index.row()], proxy_index.column()
+        )
+
+    def mapFromSource(self, source_index):
+        """Override Qt method."""
+        if not source_index.isValid():
+            return QModelIndex()
 
-        return super().lessThan(left, right)
+        proxy_row = self._get_source_to_proxy().get(source_index.row())
+        if proxy_row is None:
+            return QModelIndex()
+        return self.index(proxy_row, source_index.column())
@@ -31,7 +31,7 @@
 from spyder.py3compat import to_text_string
 from spyder.utils.palette import SpyderPalette
 from spyder.widgets.helperwidgets import HTMLDelegate
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import NOT_FOUND_SCORE, SearchScorer
 from spyder.plugins.switcher.utils import clean_string
 
 
@@ -144,6 +144,18 @@ def __init__(self, parent, help_text=None):
         self._modes = {}
         self._mode_on = ''
 
+        # Modes for which sig_search_text_available is emitted
+        self._search_modes = {''}
+
+        # Items whose score depends on the search text, the scorer for their
+        # titles and the indexes of the ones that match the last search.
+        # Other items are always shown.
+        self._scored_items = []
+        self._unscored_items = []
+        self._scorer = None
+        self._matches = set()
+        self._last_search_text = None
+
         font_size = self.get_font(SpyderFontType.Interface).pointSize()
         self._item_styles = {
             'title_color': SpyderPalette.COLOR_TEXT_1,
@@ -184,6 +196,11 @@ def __init__(self, parent, help_text=None):
             QAbstractItemView.SelectionMode.SingleSelection
         )
         self.list.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+
+        # Lay out items in batches so that showing many of them doesn't block
+        # the interface.
+        self.list.setLayoutMode(QListView.Batched)
+        self.list.setBatchSize(self._MAX_NUM_ITEMS * 10)
         self.proxy.setSourceModel(self.model)
         self.list.setModel(self.proxy)
 
@@ -216,6 +233,12 @@ def _add_item(self, item, last_item=True):
         item.set_width(self._ITEM_WIDTH)
         self.model.appendRow(item)
 
+        if item.uses_score():
+            self._scored_items.append(item)
+            self._reset_scorer()
+        else:
+            self._unscored_items.append(item)
+
         if last_item:
             # Only set the current row to the first item when the added item is
             # the last one in order to prevent performance issues when
@@ -223,22 +246,118 @@ def _add_item(self, item, last_item=True):
             self.set_current_row(0)
             self.set_height()
 
+    def _reset_scorer(self):
+        """Score all items again in the next search."""
+        self._scorer = None
+        self._matches = set()
+        self._last_search_text = None
+
+    def _set_item_score(self, item, rich_title, score):
+        """Set the search result of an item."""
+        if not self._is_separator(item) and not item.is_action_item():
+            item.set_rich_title(rich_title.replace(" ", "&nbsp;"))
+        item.set_score(score)
+
+    def _update_scores(self, search_text):
+        """
+        Update the scores and rich titles of items for a search text.
+
+        Only the items that match the search text or matched the previous one
+        are updated, so that typing stays fast with many items.
+
+        Returns
+        -------
+        bool
+            Whether the search text extends the previous one, so items can
+            only have been filtered out since then.
+        """
+        template = u"<b>{0}</b>"
+        items = self._scored_items
+
+        if self._scorer is None:
+            titles = [
+                '' if self._is_separator(item) else item.get_title()
+                for item in items
+            ]
+            self._scorer = SearchScorer(titles, template=template)
+
+            # Items still have the score they were added with
+            previous = range(len(items))
+            narrow = False
+        else:
+            previous = self._matches
+            narrow = (
+                self._last_search_text is not None
+                and search_text.startswith(self._last_search_text)
+            )
+
+        matches = self._scorer.get_matches(search_text)
+        current = {index for index, __, __ in matches}
+
+        # Views are updated when the proxy is filtered again after this
+        with signals_blocked(self.model):
+            for index in previous:
+                if index not in current:
+                    item = items[index]
+                    title = '' if self._is_separator(item) else (
+                        item.get_title())
+                    self._set_item_score(item, title, NOT_FOUND_SCORE)
+
+            for index, rich_title, score in matches:
+                self._set_item_score(items[index], rich_title, score)
+
+            # These items have a fixed score, but their titles are also
+            # highlighted
+            if self._unscored_items:
+                unscored_scorer = SearchScorer(
+                    [item.get_title() for item in self._unscored_items],
+                    template=template
+                )
+                results = unscored_scorer.get_scores(search_text)
+                for item, (__, rich_title, score) in zip(
+                    self._unscored_items, results
+                ):
+                    self._set_item_score(item, rich_title, score)
+
+        self._matches = current
+        self._last_search_text = search_text
+        return narrow
+
     # ---- API
     # -------------------------------------------------------------------------
     def clear(self):
         """Remove all items from the list and clear the search text."""
         self.set_placeholder_text('')
         self.model.clear()
+        self._scored_items = []
+        self._unscored_items = []
+        self._reset_scorer()
         self.setMinimumHeight(self._MIN_HEIGHT)
 
     def set_placeholder_text(self, text):
         """Set the text appearing on the empty line edit."""
         self.edit.setPlaceholderText(text)
 
-    def add_mode(self, token, description):
-        """Add mode by token key and description."""
+    def add_mode(self, token, description, search=False):
+        """
+        Add mode by token key and description.
+
+        Parameters
+        ----------
+        token: str
+            Character that selects the mode when it starts the search text.
+        description: str
+            Mode description.
+        search: bool, optional
+            Whether to emit sig_search_text_available when the search text
+            changes in this mode, so that its items can be computed for it.
+            Otherwise, the items added when the mode was selected are
+            filtered.
+        """
         if len(token) == 1:
             self._modes[token] = description
+            if search:
+                self._search_modes.add(token)
         else:
             raise Exception('Token must be of length 1!')
 
@@ -250,11 +369,13 @@ def remove_mode(self, token):
         """Remove mode by token key."""
         if token in self._modes:
             self._modes.pop(token)
+            self._search_modes.discard(token)
 
     def clear_modes(self):
         """Delete all modes spreviously defined."""
         del self._modes
         self._modes = {}
+        self._search_modes = {''}
 
     def add_item(self, icon=None, title=None, description=None, shortcut=None,
                  section=None, data=None, tool_tip=None, action_item=False,
@@ -296,6 +417,7 @@ def setup(self):
 
             # This is necessary to show the Editor items first when results
             # come back from the Editor and Projects.
+            self.list.setUniformItemSizes(False)
             self.proxy.sortBy('_score')
 
             # Show sections
@@ -307,30 +429,18 @@ def setup(self):
             return
 
         # Filter by text
-        titles = []
-        for row in range(self.model.rowCount()):
-            item = self.model.item(row)
-            if isinstance(item, SwitcherItem):
-                title = item.get_title()
-            else:
-                title = ''
-
-            titles.append(title)
-
-        search_text = clean_string(search_text)
-        scores = get_search_scores(to_text_string(search_text),
-                                   titles, template=u"<b>{0}</b>")
-
-        for idx, (title, rich_title, score_value) in enumerate(scores):
-            item = self.model.item(idx)
-            if not self._is_separator(item) and not item.is_action_item():
-                rich_title = rich_title.replace(" ", "&nbsp;")
-                item.set_rich_title(rich_title)
+        search_text = to_text_string(clean_string(search_text))
+        narrow = self._update_scores(search_text)
 
-            item.set_score(score_value)
+        # Filtered items have the same height, so the list doesn't need to
+        # compute it for each one of them.
+        self.list.setUniformItemSizes(bool(search_text))
 
-        self.proxy.set_filter_by_score(True)
-        self.proxy.sortBy('_score')
+        if narrow:
+            self.proxy.refilter(narrow=True)
+        else:
+            self.proxy.set_filter_by_score(True)
+            self.proxy.sortBy('_score')
 
         # Graphical setup
         self.setup_sections()
@@ -347,49 +457,56 @@ def setup_sections(self):
         sections = []
         search_text = self.search_text_without_mode()
 
-        for row in range(self.model.rowCount()):
-            item_row = row
-
-            # When there is search_text, we need to use the proxy model to get
-            # the actual item's row.
-            if search_text:
-                model_index = self.proxy.mapToSource(self.proxy.index(row, 0))
-                item_row = model_index.row()
-
-            # Get item
-            item = self.model.item(item_row)
-
-            # When searching gives no result, the mapped items are None
-            if item is None:
-                continue
-
-            # Get item section
-            if isinstance(item, SwitcherItem):
-                sections.append(item.get_section())
-            else:
-                sections.append('')
-
-            # Decide if we need to make the item's section visible
-            if row != 0:
-                visible = sections[row] != sections[row - 1]
-                if not self._is_separator(item):
-                    item.set_section_visible(visible)
-            else:
-                # We need to remove this when a mode has several sections
-                if not self._mode_on:
-                    item.set_section_visible(True)
+        # When there is search_text, we need to use the proxy model to get
+        # the actual item's rows.
+        if search_text:
+            item_rows = self.proxy.source_rows()
+        else:
+            item_rows = range(self.model.rowCount())
+
+        # Views are updated because the proxy was filtered before this
+        with signals_blocked(self.model):
+            for row, item_row in enumerate(item_rows):
+                # Get item
+                item = self.model.item(item_row)
+
+                # Get item section
+                if isinstance(item, SwitcherItem):
+                    sections.append(item.get_section())
+                else:
+                    sections.append('')
+
+                # Decide if we need to make the item's section visible
+                if row != 0:
+                    visible = sections[row] != sections[row - 1]
+                    if not self._is_separator(item):
+                        item.set_section_visible(visible)
+                else:
+                    # We need to remove this when a mode has several sections
+                    if not self._mode_on:
+                        item.set_section_visible(True)
 
     def remove_section(self, section):
         """Remove all items in a section of the switcher."""
         # As we are removing items from the model, we need to iterate backwards
         # so that the indexes are not affected.
+        removed_scored_items = False
         for row in range(self.model.rowCount() - 1, -1, -1):
             item = self.model.item(row)
             if isinstance(item, SwitcherItem):
                 if item._section == section:
+                    removed_scored_items |= item.uses_score()
                     self.model.removeRow(row)
                     continue
 
+        items = [self.model.item(row) for row in range(self.model.rowCount())]
+        self._unscored_items = [
+            item for item in items if not item.uses_score()
+        ]
+        if removed_scored_items:
+            self._scored_items = [item for item in items if item.uses_score()]
+            self._reset_scorer()
+
     def set_height(self):
         """Set height taking into account the number of items."""
         if self.count() >= self._MAX_NUM_ITEMS:
@@ -490,10 +607,12 @@ def _on_search_text_changed(self):
                     self.sig_mode_selected.emit(key)
                     break
 
-            # Emit this signal only for the files mode for now. We'll see if
-            # it's necessary for other modes later.
-            if self._mode_on == "":
-                self.sig_search_text_available.emit(clean_string(search_text))
+            # Emit this signal only for the files mode and the modes that
+            # compute their items for the search text.
+            if self._mode_on in self._search_modes:
+                self.sig_search_text_available.emit(
+                    clean_string(self.search_text_without_mode())
+                )
             else:
                 self.setup()
         else:
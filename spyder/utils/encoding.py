@@ -248,8 +248,11 @@ def write(text, filename, encoding='utf-8', mode='wb'):
     """
     Write 'text' to file ('filename') assuming 'encoding' in an atomic way
     Return (eventually new) encoding
+
+    'text' can also be bytes that are already encoded with 'encoding'.
     """
-    text, encoding = encode(text, encoding)
+    if not isinstance(text, bytes):
+        text, encoding = encode(text, encoding)
 
     if os.name == 'nt':
         try:
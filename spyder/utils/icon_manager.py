@@ -471,15 +471,101 @@ def icon(self, name, scale_factor=None, resample=False):
                 icon = QIcon(self.get_icon(name))
                 return icon if icon is not None else QIcon()
 
-    def get_icon_by_extension_or_type(self, fname, scale_factor):
-        """Return the icon depending on the file extension"""
+    def get_icon_by_extension_or_type(self, fname, scale_factor,
+                                      is_dir=None):
+        """
+        Return the icon depending on the file extension.
+
+        Parameters
+        ----------
+        fname: str
+            Path of the file or directory.
+        scale_factor: float
+            Scale factor of the icon.
+        is_dir: bool, optional
+            Whether fname is a directory. It's checked on disk if not given,
+            so pass it when it's already known to avoid that.
+
+        Notes
+        -----
+        Icons are cached by extension and scale factor, so only the first
+        file with a given extension needs to guess its mimetype.
+        """
+        if is_dir is None:
+            is_dir = osp.isdir(fname)
+
+        if is_dir:
+            extension = "Folder"
+        else:
+            __, extension = osp.splitext(fname.lower())
+
+        try:
+            return self.ICONS_BY_EXTENSION[(extension, scale_factor)]
+        except KeyError:
+            pass
+
+        icon_by_extension = self._get_icon_by_extension(
+            osp.basename(fname), extension, scale_factor
+        )
+        self.ICONS_BY_EXTENSION[(extension, scale_factor)] = icon_by_extension
+        return icon_by_extension
+
+    def get_icons_by_extension_or_type(self, fnames, scale_factor,
+                                       is_dirs=None):
+        """
+        Return the icons of several files at once.
+
+        Parameters
+        ----------
+        fnames: list
+            Paths of the files or directories.
+        scale_factor: float
+            Scale factor of the icons.
+        is_dirs: list, optional
+            Whether each path is a directory. It's checked on disk if not
+            given.
+
+        Returns
+        -------
+        list
+            Icons in the same order as fnames. Each extension is only
+            resolved once.
+        """
+        if is_dirs is None:
+            is_dirs = [None] * len(fnames)
+
+        return [
+            self.get_icon_by_extension_or_type(fname, scale_factor, is_dir)
+            for fname, is_dir in zip(fnames, is_dirs)
+        ]
+
+    def prewarm_icons_by_extension(self, scale_factor):
+        """
+        Resolve the icons of common file types in advance.
+
+        This avoids creating them while views are being populated, e.g. in
+        the thread QFileSystemModel uses to get file information.
+        """
+        extensions = (
+            list(self.LANGUAGE_ICONS) + list(self.OFFICE_FILES) +
+            ['.ipynb', '.tex', '.txt', '.rst', '.ini', '.toml', '.cfg',
+             '.png', '.jpg', '.svg', '.pdf', '.zip', '']
+        )
+        fnames = ['file' + extension for extension in extensions]
+        self.get_icons_by_extension_or_type(
+            fnames, scale_factor, [False] * len(fnames)
+        )
+        self.get_icon_by_extension_or_type('', scale_factor, is_dir=True)
+
+    def _get_icon_by_extension(self, basename, extension, scale_factor):
+        """Get the icon of a file that's not cached yet."""
+        if extension == "Folder":
+            return self.icon('DirClosedIcon', scale_factor)
+
         application_icons = {}
         application_icons.update(self.BIN_FILES)
         application_icons.update(self.DOCUMENT_FILES)
 
-        basename = osp.basename(fname)
-        __, extension = osp.splitext(basename.lower())
-
         # Catch error when it's not possible to access the Windows registry to
         # check for this.
         # Fixes spyder-ide/spyder#21304
@@ -488,59 +574,49 @@ def get_icon_by_extension_or_type(self, fname, scale_factor):
         except PermissionError:
             mime_type = None
 
-        if osp.isdir(fname):
-            extension = "Folder"
-
-        if (extension, scale_factor) in self.ICONS_BY_EXTENSION:
-            return self.ICONS_BY_EXTENSION[(extension, scale_factor)]
+        icon_by_extension = self.icon('GenericFileIcon')
 
-        if osp.isdir(fname):
-            icon_by_extension = self.icon('DirClosedIcon', scale_factor)
+        if extension in self.OFFICE_FILES:
+            icon_by_extension = self.icon(
+                self.OFFICE_FILES[extension], scale_factor)
+        elif extension in self.LANGUAGE_ICONS:
+            icon_by_extension = self.icon(
+                self.LANGUAGE_ICONS[extension], scale_factor)
         else:
-            icon_by_extension = self.icon('GenericFileIcon')
-
-            if extension in self.OFFICE_FILES:
-                icon_by_extension = self.icon(
-                    self.OFFICE_FILES[extension], scale_factor)
-            elif extension in self.LANGUAGE_ICONS:
-                icon_by_extension = self.icon(
-                    self.LANGUAGE_ICONS[extension], scale_factor)
-            else:
-                if extension == '.ipynb':
-                    icon_by_extension = self.icon('notebook')
-                elif extension == '.tex':
-                    icon_by_extension = self.icon('file_type_tex')
-                elif extension in EDIT_EXTENSIONS:
-                    icon_by_extension = self.icon('TextFileIcon', scale_factor)
-                elif mime_type is not None:
-                    try:
-                        # Fix for spyder-ide/spyder#5080. Even though
-                        # mimetypes.guess_type documentation states that
-                        # the return value will be None or a tuple of
-                        # the form type/subtype, in the Windows registry,
-                        # .sql has a mimetype of text\plain
-                        # instead of text/plain therefore mimetypes is
-                        # returning it incorrectly.
-                        file_type, bin_name = mime_type.split('/')
-                    except ValueError:
-                        file_type = None
-                    if file_type is None:
-                        icon_by_extension = self.icon('binary')
-                    elif file_type == 'audio':
-                        icon_by_extension = self.icon(
-                            'AudioFileIcon', scale_factor)
-                    elif file_type == 'video':
+            if extension == '.ipynb':
+                icon_by_extension = self.icon('notebook')
+            elif extension == '.tex':
+                icon_by_extension = self.icon('file_type_tex')
+            elif extension in EDIT_EXTENSIONS:
+                icon_by_extension = self.icon('TextFileIcon', scale_factor)
+            elif mime_type is not None:
+                try:
+                    # Fix for spyder-ide/spyder#5080. Even though
+                    # mimetypes.guess_type documentation states that
+                    # the return value will be None or a tuple of
+                    # the form type/subtype, in the Windows registry,
+                    # .sql has a mimetype of text\plain
+                    # instead of text/plain therefore mimetypes is
+                    # returning it incorrectly.
+                    file_type, bin_name = mime_type.split('/')
+                except ValueError:
+                    file_type = None
+                if file_type is None:
+                    icon_by_extension = self.icon('binary')
+                elif file_type == 'audio':
+                    icon_by_extension = self.icon(
+                        'AudioFileIcon', scale_factor)
+                elif file_type == 'video':
+                    icon_by_extension = self.icon(
+                        'VideoFileIcon', scale_factor)
+                elif file_type == 'image':
+                    icon_by_extension = self.icon(
+                        'ImageFileIcon', scale_factor)
+                elif file_type == 'application':
+                    if bin_name in application_icons:
                         icon_by_extension = self.icon(
-                            'VideoFileIcon', scale_factor)
-                    elif file_type == 'image':
-                        icon_by_extension = self.icon(
-                            'ImageFileIcon', scale_factor)
-                    elif file_type == 'application':
-                        if bin_name in application_icons:
-                            icon_by_extension = self.icon(
-                                application_icons[bin_name], scale_factor)
+                            application_icons[bin_name], scale_factor)
 
-        self.ICONS_BY_EXTENSION[(extension, scale_factor)] = icon_by_extension
         return icon_by_extension
 
     def base64_from_icon(self, icon_name, width, height):
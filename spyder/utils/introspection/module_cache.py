@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) 2011- Spyder Project Contributors
+#
+# Distributed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+# -----------------------------------------------------------------------------
+
+"""
+Persistent cache of the module and submodule names importable from an
+interpreter.
+
+Names are found by scanning the directories in `sys.path`, so no module is
+imported to build the cache. Each `sys.path` entry is cached separately and
+only rescanned when its directory, or the directories of its top-level
+packages, change. This includes installing, upgrading or removing
+distributions, which adds or removes their dist-info directories.
+
+This file only depends on the standard library because it's run as a script
+with the interpreter whose modules are being cached, which doesn't need to
+have Spyder installed.
+"""
+
+# Standard library imports
+import importlib.machinery
+import importlib.util
+import json
+import os
+import os.path as osp
+import sys
+import tempfile
+
+
+# Version of the cache format. Caches saved with a different version are
+# discarded.
+CACHE_VERSION = 1
+
+# Maximum package nesting level scanned for submodules
+MAX_DEPTH = 6
+
+# Module suffixes supported by this interpreter, sorted from longest to
+# shortest so that e.g. `.cpython-311-x86_64-linux-gnu.so` is removed before
+# `.so`.
+MODULE_SUFFIXES = sorted(
+    set(importlib.machinery.all_suffixes()), key=len, reverse=True)
+
+# Directories that can't contain importable modules
+SKIP_DIRS = {'__pycache__', 'site-packages', 'dist-packages'}
+
+
+def _module_name(filename):
+    """Return the module name for `filename`, or None if it's not one."""
+    for suffix in MODULE_SUFFIXES:
+        if filename.endswith(suffix):
+            name = filename[:-len(suffix)]
+            if name.isidentifier():
+                return name
+            return None
+    return None
+
+
+def _is_package(path):
+    """Check if `path` is a regular package directory."""
+    return osp.isfile(osp.join(path, '__init__.py'))
+
+
+def scan_package(path, prefix, depth=0):
+    """Get the names of all submodules of the package at `path`."""
+    names = []
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return names
+
+    for entry in entries:
+        if entry.name in SKIP_DIRS:
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+
+        if is_dir:
+            if (
+                depth < MAX_DEPTH
+                and entry.name.isidentifier()
+                and _is_package(entry.path)
+            ):
+                name = prefix + entry.name
+                names.append(name)
+                names += scan_package(entry.path, name + '.', depth + 1)
+        else:
+            name = _module_name(entry.name)
+            if name is not None and name != '__init__':
+                names.append(prefix + name)
+
+    return names
+
+
+def scan_path_entry(path):
+    """Get the names of all modules and submodules in a sys.path entry."""
+    if not osp.isdir(path):
+        return []
+
+    names = []
+    for entry in os.scandir(path):
+        if entry.name in SKIP_DIRS:
+            continue
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            continue
+
+        if is_dir:
+            if entry.name.isidentifier():
+                submodules = scan_package(entry.path, entry.name + '.', 1)
+
+                # Directories without __init__.py are only considered
+                # (namespace) packages if they contain modules.
+                if submodules or _is_package(entry.path):
+                    names.append(entry.name)
+                    names += submodules
+        else:
+            name = _module_name(entry.name)
+            if name is not None:
+                names.append(name)
+
+    return sorted(set(names))
+
+
+def path_entry_signature(path):
+    """
+    Get a value that changes when the modules in a sys.path entry change.
+
+    It's made of the mtime of the entry and those of its top-level
+    directories, which change when files are added or removed from them.
+    """
+    try:
+        signature = [os.stat(path).st_mtime_ns]
+    except OSError:
+        return None
+
+    try:
+        entries = sorted(os.scandir(path), key=lambda e: e.name)
+    except OSError:
+        return signature
+
+    for entry in entries:
+        try:
+            if entry.is_dir():
+                signature.append(entry.stat().st_mtime_ns)
+        except OSError:
+            pass
+
+    return signature
+
+
+def load_cache(filename):
+    """Load the module cache saved in `filename`."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache
+
+
+def save_cache(filename, cache):
+    """Save `cache` to `filename` atomically."""
+    dirname = osp.dirname(filename)
+    os.makedirs(dirname, exist_ok=True)
+    fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_filename, filename)
+    except OSError:
+        try:
+            os.remove(tmp_filename)
+        except OSError:
+            pass
+
+
+def find_missing_modules(names):
+    """
+    Get the top-level modules in `names` that can't be imported.
+
+    Their specs are looked up with all import hooks, so modules in zip
+    files, eggs or editable installs are found too, but they are not
+    imported.
+    """
+    missing = []
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                missing.append(name)
+        except (ImportError, ValueError):
+            pass
+    return sorted(missing)
+
+
+def update_cache(filename, paths=None, check_modules=None):
+    """
+    Rescan the sys.path entries that changed since the cache in `filename`
+    was saved, and save it again if needed.
+
+    Parameters
+    ----------
+    filename: str
+        Path of the cache file.
+    paths: list of str, optional
+        sys.path entries to scan. Those of this interpreter by default.
+    check_modules: list of str, optional
+        Top-level modules to look for with `find_missing_modules`.
+
+    Returns
+    -------
+    dict
+        The updated cache.
+    """
+    if paths is None:
+        paths = [p for p in sys.path if p]
+
+    cache = load_cache(filename)
+    old_entries = cache.get('entries', {})
+    entries = {}
+    changed = not cache
+
+    for path in paths:
+        path = osp.abspath(path)
+        if path in entries:
+            continue
+        signature = path_entry_signature(path)
+        old_entry = old_entries.get(path)
+        if old_entry is not None and old_entry['signature'] == signature:
+            entries[path] = old_entry
+        else:
+            entries[path] = {
+                'signature': signature,
+                'modules': scan_path_entry(path)
+            }
+            changed = True
+
+    if set(entries) != set(old_entries):
+        changed = True
+
+    missing = find_missing_modules(check_modules or [])
+    if missing != cache.get('missing', []):
+        changed = True
+
+    cache = {
+        'version': CACHE_VERSION,
+        'executable': sys.executable,
+        'builtins': sorted(sys.builtin_module_names),
+        'paths': list(entries),
+        'entries': entries,
+        'missing': missing
+    }
+
+    if changed:
+        save_cache(filename, cache)
+
+    return cache
+
+
+def get_missing_modules(cache):
+    """Get the top-level modules that were not found when saving `cache`."""
+    return cache.get('missing', [])
+
+
+def get_module_names(cache):
+    """Get the sorted names of all modules in `cache`."""
+    names = set(cache.get('builtins', []))
+    for entry in cache.get('entries', {}).values():
+        names.update(entry['modules'])
+    return sorted(names)
+
+
+def lower_priority():
+    """Lower the priority of this process, so it doesn't compete for CPU."""
+    try:
+        if os.name == 'nt':
+            import ctypes
+            below_normal_priority_class = 0x4000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(
+                kernel32.GetCurrentProcess(), below_normal_priority_class)
+        else:
+            os.nice(10)
+    except (OSError, AttributeError):
+        pass
+
+
+if __name__ == '__main__':
+    # Update the cache for this interpreter.
+    # Usage: python module_cache.py <cache_file> [<module> ...]
+    lower_priority()
+
+    # The first entry of sys.path is the directory of this script, which
+    # is not part of the interpreter's path.
+    del sys.path[0]
+    update_cache(sys.argv[1], check_modules=sys.argv[2:])
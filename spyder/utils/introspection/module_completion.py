@@ -11,11 +11,16 @@
 Module completion auxiliary functions.
 """
 
-import pkgutil
-
-from pickleshare import PickleShareDB
-
+# Standard library imports
+import hashlib
+import os.path as osp
+import subprocess
+import sys
+import threading
+
+# Local imports
 from spyder.config.base import get_conf_path
+from spyder.utils.introspection import module_cache
 
 
 # List of preferred modules
@@ -30,46 +35,142 @@
                      'zlib', 'pytest', 'PyQt4', 'PyQt5', 'PySide',
                      'PySide2', 'os.path']
 
+# Interpreters whose cache is being updated in a thread
+_updating = set()
+_updating_lock = threading.Lock()
 
-def get_submodules(mod):
-    """Get all submodules of a given module"""
-    def catch_exceptions(module):
-        pass
+
+def get_cache_filename(executable=None):
+    """Get the path of the module names cache of `executable`."""
+    if executable is None:
+        executable = sys.executable
+    executable = osp.normcase(osp.realpath(executable))
+    digest = hashlib.sha1(executable.encode('utf-8')).hexdigest()[:16]
+    return get_conf_path(osp.join('module_cache', digest + '.json'))
+
+
+def get_module_cache_command(executable=None, check_modules=None):
+    """
+    Get the command that updates the module names cache of `executable`.
+
+    The command runs `executable`, so the cache contains the modules that can
+    be imported from it, with a low priority. It's meant to be run in a
+    background process (e.g. a QProcess).
+
+    The top-level modules in `check_modules` that can't be imported are
+    saved too (see `load_missing_modules`).
+    """
+    if executable is None:
+        executable = sys.executable
+    return [
+        executable,
+        module_cache.__file__,
+        get_cache_filename(executable),
+        *(check_modules or [])
+    ]
+
+
+def update_module_cache(executable=None, check_modules=None):
+    """
+    Update the module names cache of `executable` and wait for it to finish.
+
+    See `get_module_cache_command` for `check_modules`.
+
+    Returns
+    -------
+    bool
+        Whether the cache was updated successfully.
+    """
+    # This is imported here to keep this module light, because it's imported
+    # by our config system.
+    from spyder.utils.programs import alter_subprocess_kwargs_by_platform
+
+    kwargs = alter_subprocess_kwargs_by_platform(
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
     try:
-        m = __import__(mod)
-        submodules = [mod]
-        submods = pkgutil.walk_packages(m.__path__, m.__name__ + '.',
-                                        catch_exceptions)
-        for sm in submods:
-            sm_name = sm[1]
-            submodules.append(sm_name)
-    except ImportError:
-        return []
-    except:
-        return [mod]
+        process = subprocess.run(
+            get_module_cache_command(executable, check_modules), **kwargs)
+    except OSError:
+        return False
+    return process.returncode == 0
 
-    return submodules
 
+def load_module_names(executable=None):
+    """
+    Get the names of the modules importable from `executable` saved in its
+    cache, or an empty list if there's no cache yet.
+    """
+    if executable is None:
+        executable = sys.executable
+    cache = module_cache.load_cache(get_cache_filename(executable))
+    return module_cache.get_module_names(cache)
 
-def get_preferred_submodules():
+
+def load_missing_modules(executable=None):
     """
-    Get all submodules of the main scientific modules and others of our
-    interest
+    Get the top-level modules that were checked and can't be imported from
+    `executable`, according to its cache.
     """
-    # Path to the modules database
-    modules_path = get_conf_path('db')
+    if executable is None:
+        executable = sys.executable
+    cache = module_cache.load_cache(get_cache_filename(executable))
+    return module_cache.get_missing_modules(cache)
+
+
+def get_module_names(executable=None):
+    """
+    Get the names of all modules and submodules importable from
+    `executable`.
+
+    Names are loaded from the cache saved by a previous session, which is
+    refreshed in the background by the completion plugin (see
+    `get_module_cache_command`). If there's no cache, it's built in a thread
+    and no names are returned until it's ready.
+    """
+    if executable is None:
+        executable = sys.executable
+
+    names = load_module_names(executable)
+    if not names:
+        _update_module_cache_in_thread(executable)
+    return names
 
-    # Modules database
-    modules_db = PickleShareDB(modules_path)
 
-    if 'submodules' in modules_db:
-        return modules_db['submodules']
+def _update_module_cache_in_thread(executable):
+    """Update the module names cache of `executable` without waiting."""
+    with _updating_lock:
+        if executable in _updating:
+            return
+        _updating.add(executable)
 
-    submodules = []
+    def update():
+        try:
+            update_module_cache(executable)
+        finally:
+            with _updating_lock:
+                _updating.discard(executable)
 
-    for m in PREFERRED_MODULES:
-        submods = get_submodules(m)
-        submodules += submods
+    threading.Thread(target=update, daemon=True).start()
 
-    modules_db['submodules'] = submodules
-    return submodules
+
+def get_submodules(mod, names=None):
+    """Get all submodules of a given module"""
+    if names is None:
+        names = get_module_names()
+    prefix = mod + '.'
+    return [name for name in names if name == mod or name.startswith(prefix)]
+
+
+def get_preferred_submodules():
+    """
+    Get all submodules of the main scientific modules and others of our
+    interest
+    """
+    names = get_module_names()
+    preferred = set(PREFERRED_MODULES)
+    return [
+        name for name in names
+        if name in preferred or name.split('.', 1)[0] in preferred
+    ]
@@ -9,21 +9,90 @@
 """
 
 # Stdlib imports
+import os
 import sys
+import time
+import zipfile
 
 # Test library imports
 import pytest
 
 # Local imports
-from spyder.utils.introspection.module_completion import get_preferred_submodules
+from spyder.utils.introspection import module_cache
+from spyder.utils.introspection.module_completion import (
+    get_preferred_submodules, load_missing_modules, load_module_names,
+    update_module_cache)
 
 
 @pytest.mark.skipif(sys.platform == 'darwin',
                     reason="It's very slow on Mac")
 def test_module_completion():
     """Test module_completion."""
+    update_module_cache()
     assert 'numpy.linalg' in get_preferred_submodules()
 
 
+def test_module_cache(tmp_path):
+    """Test that modules are cached per path entry and rescanned on changes."""
+    entry = tmp_path / 'site-packages'
+    package = entry / 'mypackage'
+    (package / 'sub').mkdir(parents=True)
+    (package / '__init__.py').write_text('')
+    (package / 'sub' / '__init__.py').write_text('')
+    (package / 'sub' / 'mod.py').write_text('')
+    (package / '__pycache__').mkdir()
+    (entry / 'single.py').write_text('')
+    (entry / 'not-a-module.py').write_text('')
+    (entry / 'mypackage-1.0.dist-info').mkdir()
+    cache_file = str(tmp_path / 'cache' / 'modules.json')
+
+    cache = module_cache.update_cache(cache_file, paths=[str(entry)])
+    names = module_cache.get_module_names(cache)
+    for name in ['mypackage', 'mypackage.sub', 'mypackage.sub.mod', 'single',
+                 'sys']:
+        assert name in names
+    assert 'not-a-module' not in names
+    assert not any('__pycache__' in name for name in names)
+    assert module_cache.load_cache(cache_file) == cache
+
+    # Unchanged entries are not rescanned
+    os.remove(str(package / 'sub' / 'mod.py'))
+    cache = module_cache.update_cache(cache_file, paths=[str(entry)])
+    assert 'mypackage.sub.mod' in module_cache.get_module_names(cache)
+
+    # Changes to top-level packages invalidate the entry
+    time.sleep(0.01)
+    (package / 'other.py').write_text('')
+    cache = module_cache.update_cache(cache_file, paths=[str(entry)])
+    names = module_cache.get_module_names(cache)
+    assert 'mypackage.other' in names
+    assert 'mypackage.sub.mod' not in names
+
+
+def test_missing_modules(tmp_path, monkeypatch):
+    """Test that only modules that can't be found are reported missing."""
+    zip_path = str(tmp_path / 'modules.zip')
+    with zipfile.ZipFile(zip_path, 'w') as zip_file:
+        zip_file.writestr('zipped.py', '')
+    monkeypatch.syspath_prepend(zip_path)
+    cache_file = str(tmp_path / 'modules.json')
+
+    cache = module_cache.update_cache(
+        cache_file, paths=[], check_modules=['os', 'zipped', 'not_a_module'])
+    assert module_cache.get_missing_modules(cache) == ['not_a_module']
+    assert module_cache.load_cache(cache_file)['missing'] == ['not_a_module']
+
+
+def test_update_module_cache():
+    """Test that the cache is updated in a process run with the interpreter."""
+    assert update_module_cache(sys.executable)
+    names = load_module_names(sys.executable)
+    assert 'json' in names
+    assert 'xml.etree.ElementTree' in names
+
+    assert update_module_cache(sys.executable, ['json', 'not_a_module'])
+    assert load_missing_modules(sys.executable) == ['not_a_module']
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -8,6 +8,7 @@
 String search and match utilities useful when filtering a list of texts.
 """
 
+import heapq
 import re
 
 from spyder.py3compat import to_text_string
@@ -15,6 +16,11 @@
 NOT_FOUND_SCORE = -1
 NO_SCORE = 0
 
+# Characters used to compute scores (see get_search_score)
+SEP = u'-'
+LET = u'x'
+NON_SEPARATORS_RE = re.compile(u'[^ {0}]'.format(SEP))
+
 
 def get_search_regex(query, ignore_case=True):
     """Returns a compiled regex pattern to search for query letters in order.
@@ -235,6 +241,272 @@ def get_search_scores(query, choices, ignore_case=True, template='{}',
     return results
 
 
+def find_subsequence(query, text):
+    """Return the positions of the query letters in text, or None.
+
+    Letters are searched in order and as far to the left as possible, which
+    is how get_search_score highlights them.
+    """
+    positions = []
+    pos = -1
+    for char in query:
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return None
+        positions.append(pos)
+    return positions
+
+
+class SearchScorer:
+    """Score a fixed list of choices against successive queries.
+
+    This gives the same results as get_search_scores, but it's meant to be
+    kept while choices don't change (e.g. while the user types in a filter
+    box), so that:
+
+    - Choices are normalized only once.
+    - Letters are searched with str.find instead of a backtracking regex.
+    - When a query extends the previous one, only the choices that matched
+      the previous query are searched again.
+    - Enriched texts are only built for the results that are returned, and
+      `limit` returns the best results with a heap instead of a full sort.
+
+    Parameters
+    ----------
+    choices : list of str
+        List of sentences/words in which to search for query letters.
+    ignore_case : bool, optional
+        Optional value perform a case insensitive search (True by default).
+    template : str, optional
+        Optional template string to surround letters found in choices.
+
+    Notes
+    -----
+    Query letters are always searched literally. get_search_scores builds a
+    regex with them instead, so e.g. a '.' matches any character there.
+    """
+
+    def __init__(self, choices, ignore_case=True, template='{}'):
+        self.choices = list(choices)
+        self.ignore_case = ignore_case
+        self.template = template
+
+        if ignore_case:
+            self._keys = [choice.lower() for choice in self.choices]
+        else:
+            self._keys = self.choices
+
+        # Masks are computed the first time a choice is scored. Positions in
+        # keys and choices don't correspond if lowering a choice changes its
+        # length, so those are scored by get_search_score instead.
+        self._masks = {}
+        self._fallback = {
+            index for index, (choice, key)
+            in enumerate(zip(self.choices, self._keys))
+            if len(choice) != len(key)
+        }
+
+        self._last_query = None
+        self._last_matches = None
+
+    def _normalize_query(self, query):
+        query = to_text_string(query, encoding='utf-8').replace(' ', '')
+        return query.lower() if self.ignore_case else query
+
+    def _get_matches(self, query):
+        """Return the indexes of the choices that contain query letters."""
+        last_query = self._last_query
+        if last_query and query.startswith(last_query):
+            # Choices that didn't match the previous query can't match
+            # this one
+            candidates = self._last_matches
+        else:
+            candidates = range(len(self.choices))
+
+        keys = self._keys
+        matches = [
+            i for i in candidates
+            if find_subsequence(query, keys[i]) is not None
+        ]
+
+        self._last_query = query
+        self._last_matches = matches
+        return matches
+
+    def _score(self, query, index):
+        """Return (score, positions) for a choice that matches query."""
+        key = self._keys[index]
+        mask = self._masks.get(index)
+        if mask is None:
+            mask = NON_SEPARATORS_RE.sub(LET, key)
+            self._masks[index] = mask
+        length = len(query)
+
+        pos_start = key.find(query)
+        if pos_start >= 0:
+            # Letters in one word, with exact or partial match
+            if query in key.split(u' '):
+                score = pos_start + 1
+            else:
+                score = pos_start + 100
+            positions = range(pos_start, pos_start + length)
+            patterns_text = (
+                mask[:pos_start] + SEP * length + mask[pos_start + length:]
+            )
+        else:
+            # Letters scattered in the choice
+            positions = find_subsequence(query, key)
+            score = positions[0]
+            patterns = list(mask)
+            for pos in positions:
+                patterns[pos] = SEP
+            patterns_text = u''.join(patterns)
+
+        for i in range(length, 0, -1):
+            score += (length - patterns_text.count(SEP * i)) * 100000
+
+        temp = [pat for pat in patterns_text.split(SEP) if pat]
+        if not patterns_text.startswith(SEP):
+            temp = temp[1:]
+        if not patterns_text.endswith(SEP):
+            temp = temp[:-1]
+
+        for pat in temp:
+            score += pat.count(u' ') * 10000
+            score += pat.count(LET) * 100
+
+        return score, positions
+
+    def _enrich(self, index, positions):
+        """Surround the letters at positions with the template."""
+        if index in self._fallback:
+            # Already enriched by get_search_score
+            return positions
+
+        choice = self.choices[index]
+        template = self.template
+        if isinstance(positions, range):
+            start, stop = positions.start, positions.stop
+            return (choice[:start] + template.format(choice[start:stop]) +
+                    choice[stop:])
+
+        text = list(choice)
+        for pos in positions:
+            text[pos] = template.format(text[pos])
+        return u''.join(text)
+
+    def _get_scored(self, query):
+        """
+        Return (score, index, positions) tuples for the choices that match
+        query.
+
+        For choices scored by get_search_score, positions is their enriched
+        text instead.
+        """
+        choices = self.choices
+        scored = []
+        for index in self._get_matches(query):
+            if index in self._fallback:
+                try:
+                    __, enriched_text, score = get_search_score(
+                        query, choices[index], ignore_case=self.ignore_case,
+                        apply_regex=False, template=self.template)
+                except ValueError:
+                    # Letters of the query are split by lowering the choice
+                    continue
+                scored.append((score, index, enriched_text))
+            else:
+                score, positions = self._score(query, index)
+                scored.append((score, index, positions))
+        return scored
+
+    def get_matches(self, query, limit=None):
+        """Search for query inside choices and return the ones that match.
+
+        Parameters
+        ----------
+        query : str
+            String with letters to search in each choice.
+        limit : int, optional
+            Only return this number of matches with the best scores, sorted
+            by score.
+
+        Returns
+        -------
+        results : list of tuples
+            (index, enriched_text, score) tuples, in the order of choices
+            unless `limit` is given. All choices match an empty query.
+        """
+        query = self._normalize_query(query)
+        if not query:
+            return [
+                (index, choice, NO_SCORE)
+                for index, choice in enumerate(self.choices)
+            ][:limit]
+
+        scored = self._get_scored(query)
+        if limit is not None:
+            scored = heapq.nsmallest(limit, scored, key=lambda item: item[0])
+
+        return [
+            (index, self._enrich(index, extra), score)
+            for score, index, extra in scored
+        ]
+
+    def get_scores(self, query, valid_only=False, sort=False, limit=None):
+        """Search for query inside choices and return a list of tuples.
+
+        Parameters
+        ----------
+        query : str
+            String with letters to search in each choice.
+        valid_only : bool, optional
+            Only return choices that contain query letters.
+        sort : bool, optional
+            Sort results by score.
+        limit : int, optional
+            Only return this number of results with the best scores. This
+            implies `valid_only` and `sort`.
+
+        Returns
+        -------
+        results : list of tuples
+            (text, enriched_text, score) tuples, as returned by
+            get_search_scores. Lower scores means better match.
+        """
+        query = self._normalize_query(query)
+        choices = self.choices
+
+        if not query:
+            if limit is not None:
+                return []
+            return [(choice, choice, NO_SCORE) for choice in choices]
+
+        scored = self._get_scored(query)
+
+        def make_result(item):
+            score, index, extra = item
+            return (choices[index], self._enrich(index, extra), score)
+
+        if limit is not None:
+            best = heapq.nsmallest(limit, scored, key=lambda item: item[0])
+            return [make_result(item) for item in best]
+
+        if valid_only:
+            results = [make_result(item) for item in scored]
+        else:
+            results = [
+                (choice, choice, NOT_FOUND_SCORE) for choice in choices
+            ]
+            for item in scored:
+                results[item[1]] = make_result(item)
+
+        if sort:
+            results.sort(key=lambda row: row[-1])
+
+        return results
+
+
 def test():
     template = '<b>{0}</b>'
     names = ['close pane', 'debug continue', 'debug exit', 'debug step into',
@@ -6,6 +6,9 @@
 
 """Tests for conda.py"""
 
+# Standard library imports
+import mimetypes
+
 # Third party imports
 import pytest
 from qtpy.QtGui import QIcon
@@ -29,5 +32,31 @@ def test_icon_mapping():
             raise e
 
 
+def test_icons_by_extension(qapp, tmp_path, mocker):
+    """Test that icons are resolved once per extension and scale factor."""
+    (tmp_path / 'folder.py').mkdir()
+
+    guess_type = mocker.spy(mimetypes, 'guess_type')
+    fnames = [f'file{i}.spam' for i in range(20)]
+    icons = ima.get_icons_by_extension_or_type(fnames, 0.5, [False] * 20)
+    assert len(icons) == 20
+    assert all(icon is icons[0] for icon in icons)
+    assert guess_type.call_count == 1
+
+    # Directories are checked on disk if it's not known
+    folder_icon = ima.get_icon_by_extension_or_type(
+        str(tmp_path / 'folder.py'), 0.5
+    )
+    assert folder_icon is ima.get_icon_by_extension_or_type('', 0.5, True)
+    assert folder_icon is not ima.get_icon_by_extension_or_type(
+        'module.py', 0.5, False
+    )
+
+    # Common types are cached in advance
+    ima.prewarm_icons_by_extension(0.7)
+    assert ('.py', 0.7) in ima.ICONS_BY_EXTENSION
+    assert ('Folder', 0.7) in ima.ICONS_BY_EXTENSION
+
+
 if __name__ == "__main__":
     pytest.main()
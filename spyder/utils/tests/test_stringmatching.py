@@ -10,12 +10,13 @@
 
 # Standard library imports
 import os
+import random
 
 # Test library imports
 import pytest
 
 # Local imports
-from spyder.utils.stringmatching import get_search_scores
+from spyder.utils.stringmatching import SearchScorer, get_search_scores
 
 TEST_FILE = os.path.join(os.path.dirname(__file__), 'data/example.py')
 
@@ -216,5 +217,65 @@ def test_stringmatching_order_filter():
                                      'use previous <b>lay</b>out', 400113)]
 
 
+@pytest.mark.parametrize('ignore_case', [True, False])
+def test_search_scorer(ignore_case):
+    """Test that SearchScorer gives the same results as get_search_scores."""
+    template = '<b>{0}</b>'
+    random.seed(0)
+    words = ['layout', 'Debug', 'step', 're-run', 'switch', 'to', 'pane',
+             'lay', 'run_cell', 'x-y', 'Preferences', 'a', 'İstanbul']
+    names = [
+        ' '.join(random.choice(words) for __ in range(random.randint(1, 4)))
+        for __ in range(500)
+    ]
+    scorer = SearchScorer(names, ignore_case=ignore_case, template=template)
+
+    # Queries that extend the previous one narrow its matches
+    queries = ['l', 'la', 'lay', 'layo', 'ly', 'D', 'de', 'r-r', 'rr',
+               's p', 'stp', 'xy', 'tan', 'q', '', 'pr', 'pref']
+    for query in queries:
+        for valid_only in [False, True]:
+            for sort in [False, True]:
+                expected = get_search_scores(
+                    query, names, ignore_case=ignore_case, template=template,
+                    valid_only=valid_only, sort=sort)
+                results = scorer.get_scores(
+                    query, valid_only=valid_only, sort=sort)
+                assert results == expected
+
+        if query:
+            expected = get_search_scores(
+                query, names, ignore_case=ignore_case, template=template,
+                valid_only=True, sort=True)
+            assert scorer.get_scores(query, limit=10) == expected[:10]
+            assert [
+                (names[index], text, score)
+                for index, text, score in scorer.get_matches(query, limit=10)
+            ] == expected[:10]
+
+
+@pytest.mark.slow
+def test_search_scorer_many_choices():
+    """Test that SearchScorer matches get_search_scores on 50k choices."""
+    random.seed(0)
+    words = ['spyder', 'plugins', 'editor', 'widgets', 'utils', 'tests',
+             'console', 'variable', 'explorer', 'main', 'config', 'api']
+    names = [
+        '/'.join(random.choice(words) for __ in range(random.randint(2, 6)))
+        + '{}.py'.format(i)
+        for i in range(50000)
+    ]
+
+    # Simulate typing in the switcher
+    queries = ['s', 'sp', 'spe', 'spew', 'spewi', 'spewid']
+    scorer = SearchScorer(names)
+    for query in queries:
+        expected = get_search_scores(query, names, valid_only=True,
+                                     sort=True)
+        assert scorer.get_scores(query, valid_only=True,
+                                 sort=True) == expected
+        assert scorer.get_scores(query, limit=100) == expected[:100]
+
+
 if __name__ == "__main__":
     pytest.main()
@@ -11,6 +11,7 @@
 # Standard library imports
 import os
 import os.path as osp
+import subprocess
 import sys
 
 # Test library imports
@@ -19,9 +20,11 @@
 
 # Local imports
 from spyder.config.base import running_in_ci
-from spyder.utils.vcs import (ActionToolNotFound, get_git_refs,
-                              get_git_remotes, get_git_revision, get_vcs_root,
-                              remote_to_url, run_vcs_tool)
+from spyder.utils.vcs import (ActionToolNotFound, get_git_dir,
+                              get_git_index_mtime, get_git_refs,
+                              get_git_remotes, get_git_revision,
+                              get_git_status, get_vcs_root, GitFileStatus,
+                              parse_git_status, remote_to_url, run_vcs_tool)
 
 
 HERE = os.path.abspath(os.path.dirname(__file__))
@@ -29,6 +32,18 @@
 skipnogit = pytest.mark.skipif(not(get_vcs_root(HERE)),
                                reason="Not running from a git repo")
 
+skipnogitprogram = pytest.mark.skipif(programs.find_git() is None,
+                                      reason="Git is not installed")
+
+
+def git(repo, *args):
+    """Run git in repo."""
+    subprocess.run(
+        ['git', '-c', 'user.name=spyder', '-c', 'user.email=spyder@spyder',
+         *args],
+        cwd=str(repo), check=True, capture_output=True
+    )
+
 
 @skipnogit
 @pytest.mark.skipif(running_in_ci(), reason="Not to be run outside of CIs")
@@ -81,6 +96,94 @@ def test_get_git_remotes():
     assert 'origin' in remotes
 
 
+def test_parse_git_status():
+    output = (
+        b'# branch.oid 0123abcd\0'
+        b'1 .M N... 100644 100644 100644 0123 0123 spam.py\0'
+        b'1 A. N... 000000 100644 100644 0000 0123 pkg/ham eggs.py\0'
+        b'1 D. N... 100644 000000 000000 0123 0000 old.py\0'
+        b'2 R. N... 100644 100644 100644 0123 0123 R100 new.py\0orig.py\0'
+        b'u UU N... 100644 100644 100644 100644 01 23 45 conflict.py\0'
+        b'? untracked/\0'
+        b'! build/\0'
+    )
+    assert parse_git_status(output) == {
+        'spam.py': GitFileStatus.Modified,
+        'pkg/ham eggs.py': GitFileStatus.Added,
+        'old.py': GitFileStatus.Deleted,
+        'new.py': GitFileStatus.Renamed,
+        'conflict.py': GitFileStatus.Conflicted,
+        'untracked/': GitFileStatus.Untracked,
+        'build/': GitFileStatus.Ignored,
+    }
+    assert parse_git_status(b'') == {}
+
+
+@skipnogitprogram
+def test_get_git_status(tmp_path):
+    repo = tmp_path / 'repo'
+    (repo / 'pkg').mkdir(parents=True)
+    (repo / 'spam.py').write_text('spam')
+    (repo / 'pkg' / 'ham.py').write_text('ham')
+    (repo / '.gitignore').write_text('build/\n')
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'Initial commit')
+
+    (repo / 'pkg' / 'ham.py').write_text('ham ham')
+    (repo / 'new').mkdir()
+    (repo / 'new' / 'eggs.py').write_text('eggs')
+    (repo / 'build').mkdir()
+    (repo / 'build' / 'spam.py').write_text('spam')
+
+    root = str(repo)
+    assert get_git_status(root) == {
+        osp.join(root, 'pkg'): GitFileStatus.Modified,
+        osp.join(root, 'pkg', 'ham.py'): GitFileStatus.Modified,
+        osp.join(root, 'new'): GitFileStatus.Untracked,
+        osp.join(root, 'build'): GitFileStatus.Ignored,
+    }
+
+    # Not a repository
+    assert get_git_status(str(tmp_path)) == {}
+
+
+@skipnogitprogram
+def test_get_git_index_mtime_worktree(tmp_path):
+    """Test that the index of worktrees and submodules is found."""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    (repo / 'spam.py').write_text('spam')
+    git(repo, 'init', '-q')
+    git(repo, 'add', '.')
+    git(repo, 'commit', '-q', '-m', 'Initial commit')
+    assert get_git_dir(str(repo)) == osp.join(str(repo), '.git')
+    assert get_git_index_mtime(str(repo)) is not None
+
+    # Worktrees have a .git file with an absolute gitdir
+    worktree = tmp_path / 'worktree'
+    git(repo, 'worktree', 'add', '-q', str(worktree))
+    assert (worktree / '.git').is_file()
+    assert get_vcs_root(str(worktree)) == str(worktree)
+    assert osp.samefile(
+        get_git_dir(str(worktree)),
+        osp.join(str(repo), '.git', 'worktrees', 'worktree')
+    )
+    assert get_git_index_mtime(str(worktree)) is not None
+
+    # Submodules have a relative one
+    submodule = repo / 'sub'
+    submodule.mkdir()
+    (submodule / '.git').write_text('gitdir: ../.git/modules/sub\n')
+    (repo / '.git' / 'modules' / 'sub').mkdir(parents=True)
+    assert get_git_index_mtime(str(submodule)) is None
+    (repo / '.git' / 'modules' / 'sub' / 'index').write_bytes(b'')
+    assert get_git_dir(str(submodule)) == osp.join(
+        str(repo), '.git', 'modules', 'sub'
+    )
+    assert get_git_index_mtime(str(submodule)) is not None
+
+
 @pytest.mark.parametrize(
     'input_text, expected_output',
     [
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+#
+
+"""
+Tests for vcs_status.py
+"""
+
+# Standard library imports
+import os
+import os.path as osp
+import subprocess
+
+# Third party imports
+import pytest
+
+# Local imports
+from spyder.utils import programs, vcs_status
+from spyder.utils.vcs import GitFileStatus
+from spyder.utils.vcs_status import VCSStatusService
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a Git repository with a committed file."""
+    def git(*args):
+        subprocess.run(
+            ['git', '-c', 'user.name=spyder', '-c',
+             'user.email=spyder@spyder', *args],
+            cwd=str(tmp_path), check=True, capture_output=True
+        )
+
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'spam.py').write_text('spam')
+    (tmp_path / '.gitignore').write_text('build/\n')
+    git('init', '-q')
+    git('add', '.')
+    git('commit', '-q', '-m', 'Initial commit')
+    return tmp_path
+
+
+@pytest.fixture
+def service(qtbot):
+    service = VCSStatusService()
+    yield service
+    service.close()
+
+
+@pytest.mark.skipif(programs.find_git() is None, reason="Git not installed")
+def test_vcs_status_service(repo, service, qtbot, mocker):
+    """Test that statuses are computed in the background and cached."""
+    root = str(repo)
+    spam = osp.join(root, 'pkg', 'spam.py')
+    (repo / 'build').mkdir()
+    (repo / 'build' / 'ham.py').write_text('ham')
+
+    # Statuses are not known until they're computed
+    get_git_status = mocker.spy(vcs_status, 'get_git_status')
+    with qtbot.waitSignal(service.sig_status_changed, timeout=5000) as blocker:
+        assert service.get_status(spam) is None
+    assert blocker.args == [root]
+    assert service.get_status(spam) is None
+    assert service.get_status(osp.join(root, 'build', 'ham.py')) == (
+        GitFileStatus.Ignored
+    )
+
+    # A single git status is run for all files in the repository
+    for i in range(100):
+        service.get_status(osp.join(root, 'pkg', f'file{i}.py'))
+    service.refresh(root)
+    qtbot.wait(500)
+    assert get_git_status.call_count == 1
+
+    # Changed files are found after invalidating the repository
+    (repo / 'pkg' / 'spam.py').write_text('spam spam')
+    (repo / 'pkg' / 'eggs.py').write_text('eggs')
+    with qtbot.waitSignal(service.sig_status_changed, timeout=5000):
+        service.invalidate(osp.join(root, 'pkg'))
+        service.invalidate(root)
+    assert service.get_status(spam) == GitFileStatus.Modified
+    assert service.get_status(osp.join(root, 'pkg', 'eggs.py')) == (
+        GitFileStatus.Untracked
+    )
+    assert service.get_status(osp.join(root, 'pkg'), is_dir=True) == (
+        GitFileStatus.Modified
+    )
+    assert service.get_color(spam) is not None
+
+    # Files outside repositories don't have a status
+    assert service.get_status(osp.join(osp.dirname(root), 'other.py')) is (
+        None
+    )
+
+
+def test_close_vcs_status_service(qtbot, mocker):
+    """Test that the shared service is stopped and recreated afterwards."""
+    service = vcs_status.get_vcs_status_service()
+    assert vcs_status.get_vcs_status_service() is service
+
+    close = mocker.spy(service, 'close')
+    vcs_status.close_vcs_status_service()
+    close.assert_called_once()
+    assert vcs_status.get_vcs_status_service() is not service
+    vcs_status.close_vcs_status_service()
+
+
+if __name__ == "__main__":
+    pytest.main(['-x', os.path.basename(__file__), '-v', '-rw'])
@@ -51,7 +51,8 @@ def get_vcs_info(path):
     """Return support status dict if path is under VCS root"""
     for info in SUPPORTED:
         vcs_path = osp.join(path, info['rootdir'])
-        if osp.isdir(vcs_path):
+        # Git worktrees and submodules have a .git file instead of a directory
+        if osp.exists(vcs_path):
             return info
 
 
@@ -203,6 +204,167 @@ def get_git_refs(repopath):
     return branches + tags, branch, files_modifed
 
 
+class GitFileStatus:
+    """Status of a file in a Git repository, as reported by `git status`."""
+    Modified = 'modified'
+    Added = 'added'
+    Deleted = 'deleted'
+    Renamed = 'renamed'
+    Conflicted = 'conflicted'
+    Untracked = 'untracked'
+    Ignored = 'ignored'
+
+
+def parse_git_status(output):
+    """
+    Parse the output of `git status --porcelain=v2 -z`.
+
+    Parameters
+    ----------
+    output: bytes
+        Output of the command.
+
+    Returns
+    -------
+    dict
+        Status of the paths that are not unmodified, relative to the
+        repository root and with `/` as separator. Paths of untracked or
+        ignored directories, which are reported as a whole, end with `/`.
+    """
+    statuses = {}
+    entries = iter(output.split(b'\0'))
+    for entry in entries:
+        kind = entry[:1]
+        if kind == b'1':
+            # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+            __, xy, *__, path = entry.split(b' ', 8)
+            if b'D' in xy:
+                status = GitFileStatus.Deleted
+            elif xy[:1] == b'A':
+                status = GitFileStatus.Added
+            else:
+                status = GitFileStatus.Modified
+        elif kind == b'2':
+            # 2 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <score> <path>, followed
+            # by the original path as a separate entry
+            path = entry.split(b' ', 9)[-1]
+            next(entries, None)
+            status = GitFileStatus.Renamed
+        elif kind == b'u':
+            # u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+            path = entry.split(b' ', 10)[-1]
+            status = GitFileStatus.Conflicted
+        elif kind == b'?':
+            path = entry[2:]
+            status = GitFileStatus.Untracked
+        elif kind == b'!':
+            path = entry[2:]
+            status = GitFileStatus.Ignored
+        else:
+            # Headers and the empty entry after the last separator
+            continue
+
+        statuses[os.fsdecode(path)] = status
+
+    return statuses
+
+
+def get_git_dir(repopath):
+    """
+    Return the Git directory of the repository at repopath.
+
+    That's its .git directory, except for worktrees and submodules, whose
+    .git file has a `gitdir:` line pointing to it.
+    """
+    git_path = osp.join(repopath, '.git')
+    if not osp.isfile(git_path):
+        return git_path
+
+    try:
+        with open(git_path, encoding='utf-8') as git_file:
+            content = git_file.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return git_path
+
+    if content.startswith('gitdir:'):
+        # The path is relative to the repository for submodules
+        return osp.normpath(
+            osp.join(repopath, content[len('gitdir:'):].strip())
+        )
+    return git_path
+
+
+def get_git_index_mtime(repopath):
+    """
+    Return the modification time of the Git index of the repository at
+    repopath, or None if it doesn't have one.
+    """
+    try:
+        return os.stat(osp.join(get_git_dir(repopath), 'index')).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_git_status(repopath, git=None):
+    """
+    Get the status of the files in the Git repository at repopath.
+
+    This runs a single `git status` for the whole repository, so it's the
+    way to get the status of many files.
+
+    Parameters
+    ----------
+    repopath: str
+        Root directory of the repository.
+    git: str, optional
+        Path to the git executable. It's looked for if not given.
+
+    Returns
+    -------
+    dict
+        Absolute, normalized paths of the files and directories that are
+        not unmodified and their `GitFileStatus`. Directories that contain
+        changed or untracked files are reported as modified. Paths in
+        untracked or ignored directories are not included, only the
+        directory.
+    """
+    git = git or programs.find_git()
+    if git is None:
+        return {}
+
+    try:
+        output, __ = programs.run_program(
+            git,
+            ['status', '--porcelain=v2', '-z', '--ignored',
+             '--untracked-files=normal'],
+            cwd=repopath,
+        ).communicate()
+    except (subprocess.CalledProcessError, AttributeError, OSError):
+        return {}
+
+    repopath = osp.normpath(repopath)
+    statuses = {}
+    for path, status in parse_git_status(output).items():
+        path = osp.normpath(osp.join(repopath, path.rstrip('/')))
+        statuses[path] = status
+
+    # Mark the directories that contain changes
+    for path, status in list(statuses.items()):
+        if status == GitFileStatus.Ignored:
+            continue
+
+        parent = osp.dirname(path)
+        while (
+            len(parent) > len(repopath)
+            and statuses.get(parent) != GitFileStatus.Modified
+        ):
+            if parent not in statuses:
+                statuses[parent] = GitFileStatus.Modified
+            parent = osp.dirname(parent)
+
+    return statuses
+
+
 def get_git_remotes(fpath):
     """Return git remotes for repo on fpath."""
     remote_data = {}
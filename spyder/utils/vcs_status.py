@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""
+Service to get the version control status of files without blocking the
+interface.
+"""
+
+# Standard library imports
+import logging
+import os.path as osp
+
+# Third party imports
+from qtpy.QtCore import QObject, QTimer, Signal
+from qtpy.QtGui import QColor
+
+# Local imports
+from spyder.utils import programs
+from spyder.utils.palette import SpyderPalette
+from spyder.utils.vcs import (
+    get_git_index_mtime, get_git_status, get_vcs_root, GitFileStatus)
+from spyder.utils.workers import WorkerManager
+
+
+logger = logging.getLogger(__name__)
+
+# Time to wait before refreshing repositories with changed files (ms)
+INVALIDATE_TIMEOUT = 500
+
+# Colors used to show the status of files
+VCS_STATUS_COLORS = {
+    GitFileStatus.Modified: SpyderPalette.COLOR_WARN_2,
+    GitFileStatus.Added: SpyderPalette.COLOR_SUCCESS_2,
+    GitFileStatus.Deleted: SpyderPalette.COLOR_ERROR_2,
+    GitFileStatus.Renamed: SpyderPalette.COLOR_WARN_2,
+    GitFileStatus.Conflicted: SpyderPalette.COLOR_ERROR_2,
+    GitFileStatus.Untracked: SpyderPalette.COLOR_SUCCESS_2,
+    GitFileStatus.Ignored: SpyderPalette.COLOR_DISABLED,
+}
+
+
+class VCSStatusService(QObject):
+    """
+    Status of the files in Git repositories, computed in the background.
+
+    A single `git status` is run per repository and its result is cached
+    until the repository index changes or files in it are reported as
+    changed (see `invalidate`), so widgets can ask for the status of every
+    file they show.
+    """
+
+    sig_status_changed = Signal(str)
+    """
+    This signal is emitted when the statuses of a repository changed.
+
+    Parameters
+    ----------
+    root: str
+        Root directory of the repository.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._worker_manager = WorkerManager(self, max_threads=2)
+        self._git = None
+
+        # Directory -> repository root, or None if it's not in one
+        self._roots = {}
+
+        # Repository root -> (index mtime, statuses)
+        self._statuses = {}
+
+        # Repositories being refreshed, and those that need to be refreshed
+        # again when that finishes
+        self._running = set()
+        self._queued = set()
+
+        self._invalidated = set()
+        self._invalidate_timer = QTimer(self)
+        self._invalidate_timer.setSingleShot(True)
+        self._invalidate_timer.setInterval(INVALIDATE_TIMEOUT)
+        self._invalidate_timer.timeout.connect(self._refresh_invalidated)
+
+    # ---- API
+    # -------------------------------------------------------------------------
+    def get_status(self, path, is_dir=False):
+        """
+        Return the status of a file or directory.
+
+        This doesn't block: if the status of the repository that contains
+        path is not known yet, it's requested and None is returned.
+        `sig_status_changed` is emitted when it's available.
+
+        Parameters
+        ----------
+        path: str
+            Path of the file or directory.
+        is_dir: bool, optional
+            Whether path is a directory.
+
+        Returns
+        -------
+        str or None
+            A `GitFileStatus`, or None if the file is unmodified, not in a
+            Git repository or its status is not known yet.
+        """
+        if not path:
+            return None
+
+        path = osp.normpath(path)
+        root = self.get_root(path if is_dir else osp.dirname(path))
+        if root is None:
+            return None
+
+        if root not in self._statuses:
+            self.refresh(root)
+            return None
+
+        statuses = self._statuses[root][1]
+        status = statuses.get(path)
+        if status is not None:
+            return status
+
+        # Files in untracked and ignored directories are only reported
+        # through them
+        parent = osp.dirname(path)
+        while len(parent) > len(root):
+            status = statuses.get(parent)
+            if status in (GitFileStatus.Untracked, GitFileStatus.Ignored):
+                return status
+            parent = osp.dirname(parent)
+
+        return None
+
+    def get_color(self, path, is_dir=False):
+        """Return the color that shows the status of path, if it has one."""
+        status = self.get_status(path, is_dir)
+        if status is None:
+            return None
+        return QColor(VCS_STATUS_COLORS[status])
+
+    def get_root(self, directory):
+        """Return the root of the Git repository that contains directory."""
+        try:
+            return self._roots[directory]
+        except KeyError:
+            pass
+
+        root = get_vcs_root(directory)
+        if root is not None and not osp.exists(osp.join(root, '.git')):
+            # Only Git repositories are supported
+            root = None
+        if root is not None:
+            root = osp.normpath(root)
+
+        self._roots[directory] = root
+        return root
+
+    def refresh(self, path, force=False):
+        """
+        Refresh the statuses of the repository that contains path.
+
+        Parameters
+        ----------
+        path: str
+            A directory in the repository.
+        force: bool, optional
+            Whether to run `git status` even if the index of the repository
+            didn't change, e.g. because files were modified.
+        """
+        root = self.get_root(osp.normpath(path))
+        if root is None:
+            return
+
+        if root in self._running:
+            if force or root not in self._statuses:
+                self._queued.add(root)
+            return
+
+        if (
+            not force
+            and root in self._statuses
+            and self._statuses[root][0] == get_git_index_mtime(root)
+        ):
+            return
+
+        if self._git is None:
+            self._git = programs.find_git() or ''
+        if not self._git:
+            return
+
+        logger.debug(f"Getting Git status of {root}")
+        self._running.add(root)
+        worker = self._worker_manager.create_python_worker(
+            self._get_status, root, self._git
+        )
+        worker.sig_finished.connect(self._on_status_ready)
+        worker.start()
+
+    def invalidate(self, directory):
+        """
+        Refresh the statuses of the repository that contains directory,
+        because files changed in it.
+
+        Refreshes are delayed a bit, so that changes to many files only run
+        `git status` once.
+        """
+        self._invalidated.add(osp.normpath(directory))
+        self._invalidate_timer.start()
+
+    def close(self):
+        """Stop getting statuses."""
+        self._invalidate_timer.stop()
+        self._worker_manager.terminate_all()
+
+    # ---- Helpers
+    # -------------------------------------------------------------------------
+    def _get_status(self, root, git):
+        """Get the statuses of a repository. This runs in a thread."""
+        try:
+            statuses = get_git_status(root, git)
+        except Exception:
+            logger.debug(f"Error getting Git status of {root}", exc_info=True)
+            statuses = None
+
+        # Git usually updates the index when getting the status, so its
+        # mtime is read after it.
+        return root, get_git_index_mtime(root), statuses
+
+    def _on_status_ready(self, worker, output, error):
+        root, mtime, statuses = output
+        self._running.discard(root)
+        if statuses is not None:
+            old_statuses = self._statuses.get(root, (None, None))[1]
+            self._statuses[root] = (mtime, statuses)
+            if statuses != old_statuses:
+                self.sig_status_changed.emit(root)
+
+        if root in self._queued:
+            self._queued.discard(root)
+            self.refresh(root, force=True)
+
+    def _refresh_invalidated(self):
+        directories, self._invalidated = self._invalidated, set()
+        roots = {self.get_root(directory) for directory in directories}
+        for root in roots:
+            if root is not None and root in self._statuses:
+                self.refresh(root, force=True)
+
+
+_service = None
+
+
+def get_vcs_status_service():
+    """Return the service shared by all widgets."""
+    global _service
+    if _service is None:
+        _service = VCSStatusService()
+    return _service
+
+
+def close_vcs_status_service():
+    """Stop the shared service, if it was created, when Spyder exits."""
+    global _service
+    if _service is not None:
+        _service.close()
+        _service = None
@@ -65,7 +65,7 @@
 from spyder.utils.icon_manager import ima
 from spyder.utils.misc import getcwd_or_home
 from spyder.utils.qthelpers import mimedata2url
-from spyder.utils.stringmatching import get_search_scores, get_search_regex
+from spyder.utils.stringmatching import SearchScorer, get_search_regex
 from spyder.plugins.variableexplorer.widgets.collectionsdelegate import (
     CollectionsDelegate,
     SELECT_ROW_BUTTON_SIZE,
@@ -218,6 +218,7 @@ def __init__(self, parent, data, title="", names=False,
         self.total_rows = None
         self.showndata = None
         self.keys = None
+        self._scorer = None
         self.title = to_text_string(title)  # in case title is not a string
         if self.title:
             self.title = self.title + ' - '
@@ -506,7 +507,9 @@ def update_search_letters(self, text=""):
         """Update search letters with text input in search box."""
         self.letters = text
         names = [str(key) for key in self.keys]
-        results = get_search_scores(text, names, template='<b>{0}</b>')
+        if self._scorer is None or self._scorer.choices != names:
+            self._scorer = SearchScorer(names, template='<b>{0}</b>')
+        results = self._scorer.get_scores(text)
         if results:
             self.normal_text, _, self.scores = zip(*results)
             self.reset()